@@ -0,0 +1,42 @@
+"""Helpers for parsing multiprocessing parameters shared across the library."""
+
+from multiprocessing import cpu_count
+from typing import Optional
+
+
+def parse_num_of_multiprocessing_workers(num_of_multiprocessing_workers: int) -> int:
+    """
+    Parse the number of multiprocessing workers.
+
+    Args:
+        num_of_multiprocessing_workers (int): Requested number of workers. If 0, a single
+            process is used. If negative, all available threads are used.
+
+    Returns:
+        int: Number of workers, at least 1.
+    """
+    if num_of_multiprocessing_workers == 0:
+        num_of_multiprocessing_workers = 1
+    elif num_of_multiprocessing_workers < 0:
+        num_of_multiprocessing_workers = cpu_count()
+
+    return num_of_multiprocessing_workers
+
+
+def parse_multiprocessing_activation_threshold(
+    multiprocessing_activation_threshold: Optional[int], default_threshold: int
+) -> int:
+    """
+    Parse the multiprocessing activation threshold.
+
+    Args:
+        multiprocessing_activation_threshold (Optional[int]): Requested threshold.
+        default_threshold (int): Threshold used if the requested one is None or 0.
+
+    Returns:
+        int: Number of elements required to start processing in multiple processes.
+    """
+    if not multiprocessing_activation_threshold:
+        multiprocessing_activation_threshold = default_threshold
+
+    return multiprocessing_activation_threshold
@@ -0,0 +1,27 @@
+"""Helpers for building DuckDB SQL queries shared across the library."""
+
+
+def quote_sql_identifier(name: str) -> str:
+    """
+    Quote a column or table name for a SQL query.
+
+    Args:
+        name (str): Name to be quoted.
+
+    Returns:
+        str: Name in double quotes, with double quotes inside escaped.
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def quote_sql_literal(value: str) -> str:
+    """
+    Quote a string value for a SQL query.
+
+    Args:
+        value (str): Value to be quoted.
+
+    Returns:
+        str: Value in single quotes, with single quotes inside escaped.
+    """
+    return "'" + value.replace("'", "''") + "'"
@@ -2,13 +2,16 @@
 
 import abc
 from pathlib import Path
-from typing import Any, TypeVar, Union
+from typing import TYPE_CHECKING, Any, TypeVar, Union
 
 import geopandas as gpd
 import pandas as pd
 
 from srai.constants import GEOMETRY_COLUMN
 
+if TYPE_CHECKING:  # pragma: no cover
+    from srai.regionalizers import LazyGeometryRegions
+
 try:  # pragma: no cover
     from pytorch_lightning import LightningModule
 
@@ -119,7 +122,7 @@ class Embedder(abc.ABC):
 
     def _validate_indexes(
         self,
-        regions_gdf: gpd.GeoDataFrame,
+        regions_gdf: Union[gpd.GeoDataFrame, "LazyGeometryRegions"],
         features_gdf: gpd.GeoDataFrame,
         joint_gdf: gpd.GeoDataFrame,
     ) -> None:
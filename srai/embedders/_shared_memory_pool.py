@@ -0,0 +1,221 @@
+"""
+Shared memory worker pool.
+
+This module contains a process pool that keeps numpy arrays in shared memory, so that the workers
+only receive lightweight tasks (e.g. row ranges) instead of pickled copies of the whole data.
+"""
+
+import weakref
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, NamedTuple, Optional, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Shared memory blocks attached in the current (worker) process.
+_ATTACHED_SHARED_MEMORY: dict[str, SharedMemory] = {}
+
+
+class SharedArray(NamedTuple):
+    """
+    Description of a numpy array stored in a shared memory block.
+
+    Attributes:
+        name (str): Name of the shared memory block.
+        shape (tuple[int, ...]): Shape of the array.
+        dtype (str): Data type of the array.
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class _PoolResources:
+    """Process pool and shared memory blocks owned by a `SharedMemoryWorkerPool`."""
+
+    def __init__(self) -> None:
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.shared_memory: dict[str, SharedMemory] = {}
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        for shared_memory in self.shared_memory.values():
+            shared_memory.close()
+            shared_memory.unlink()
+        self.shared_memory.clear()
+
+
+class SharedMemoryWorkerPool:
+    """
+    Process pool with arrays shared between the processes.
+
+    Arrays are copied into shared memory blocks once and can be accessed by tasks executed in
+    the workers using `attach_shared_arrays` function. The underlying process pool is created
+    lazily and reused between subsequent `map` calls until `shutdown` is called or the pool is
+    garbage collected.
+    """
+
+    def __init__(
+        self,
+        num_of_workers: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: tuple[Any, ...] = (),
+    ) -> None:
+        """
+        Init SharedMemoryWorkerPool.
+
+        Args:
+            num_of_workers (int): Number of worker processes.
+            initializer (Callable[..., None], optional): Function called once in each worker
+                process on its start. Defaults to None.
+            initargs (tuple[Any, ...], optional): Arguments passed to the initializer.
+                Defaults to empty tuple.
+        """
+        self.num_of_workers = num_of_workers
+        self._initializer = initializer
+        self._initargs = initargs
+        self._init_resources()
+
+    def _init_resources(self) -> None:
+        self._resources = _PoolResources()
+        self._finalizer = weakref.finalize(self, self._resources.shutdown)
+
+    def share_array(self, array: npt.NDArray[Any]) -> SharedArray:
+        """
+        Copy an array into a new shared memory block.
+
+        Args:
+            array (npt.NDArray[Any]): Array to be shared with the workers.
+
+        Returns:
+            SharedArray: Description of the shared array that can be passed to the tasks.
+        """
+        array = np.ascontiguousarray(array)
+        shared_memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared_array: npt.NDArray[Any] = np.ndarray(
+            array.shape, dtype=array.dtype, buffer=shared_memory.buf
+        )
+        shared_array[...] = array
+        del shared_array
+        self._resources.shared_memory[shared_memory.name] = shared_memory
+        return SharedArray(name=shared_memory.name, shape=array.shape, dtype=array.dtype.str)
+
+    def create_array(self, shape: tuple[int, ...], dtype: npt.DTypeLike) -> SharedArray:
+        """
+        Create a new zero-filled array in a shared memory block.
+
+        Args:
+            shape (tuple[int, ...]): Shape of the array.
+            dtype (npt.DTypeLike): Data type of the array.
+
+        Returns:
+            SharedArray: Description of the shared array that can be passed to the tasks.
+        """
+        return self.share_array(np.zeros(shape, dtype=dtype))
+
+    def read_array(self, shared_array: SharedArray) -> npt.NDArray[Any]:
+        """
+        Copy a shared array back into the memory of the current process.
+
+        Args:
+            shared_array (SharedArray): Description of the shared array.
+
+        Returns:
+            npt.NDArray[Any]: Copy of the shared array.
+        """
+        shared_memory = self._resources.shared_memory[shared_array.name]
+        view: npt.NDArray[Any] = np.ndarray(
+            shared_array.shape, dtype=shared_array.dtype, buffer=shared_memory.buf
+        )
+        result = view.copy()
+        del view
+        return result
+
+    def release(self, *shared_arrays: SharedArray) -> None:
+        """
+        Free shared memory blocks of given arrays.
+
+        Args:
+            *shared_arrays (SharedArray): Descriptions of the shared arrays to free.
+        """
+        for shared_array in shared_arrays:
+            shared_memory = self._resources.shared_memory.pop(shared_array.name, None)
+            if shared_memory is not None:
+                shared_memory.close()
+                shared_memory.unlink()
+
+    def map(self, fn: Callable[[T], R], tasks: Iterable[T], chunksize: int = 1) -> Iterator[R]:
+        """
+        Execute a function over the tasks in worker processes.
+
+        Args:
+            fn (Callable[[T], R]): Function to execute. Has to be picklable.
+            tasks (Iterable[T]): Arguments for each function call.
+            chunksize (int, optional): Number of tasks sent to a worker at once. Defaults to 1.
+
+        Returns:
+            Iterator[R]: Results in the order of the tasks.
+        """
+        if self._resources.executor is None:
+            self._resources.executor = ProcessPoolExecutor(
+                max_workers=self.num_of_workers,
+                initializer=self._initializer,
+                initargs=self._initargs,
+            )
+        return self._resources.executor.map(fn, tasks, chunksize=chunksize)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes and free all shared memory blocks."""
+        self._resources.shutdown()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get pool state without the process pool and shared memory handles."""
+        state = self.__dict__.copy()
+        del state["_resources"]
+        del state["_finalizer"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore pool state with a new, not started process pool."""
+        self.__dict__.update(state)
+        self._init_resources()
+
+
+def attach_shared_arrays(*shared_arrays: SharedArray) -> list[npt.NDArray[Any]]:
+    """
+    Get numpy views of shared arrays inside a worker process.
+
+    Shared memory blocks are attached once per process. Blocks that are not requested anymore are
+    detached, so the memory freed by the pool can be returned to the system.
+
+    Args:
+        *shared_arrays (SharedArray): Descriptions of the shared arrays.
+
+    Returns:
+        list[npt.NDArray[Any]]: Arrays backed by the shared memory blocks.
+    """
+    requested_names = {shared_array.name for shared_array in shared_arrays}
+    for name in list(_ATTACHED_SHARED_MEMORY.keys()):
+        if name not in requested_names:
+            _ATTACHED_SHARED_MEMORY.pop(name).close()
+
+    arrays: list[npt.NDArray[Any]] = []
+    for shared_array in shared_arrays:
+        if shared_array.name not in _ATTACHED_SHARED_MEMORY:
+            _ATTACHED_SHARED_MEMORY[shared_array.name] = SharedMemory(name=shared_array.name)
+        arrays.append(
+            np.ndarray(
+                shared_array.shape,
+                dtype=shared_array.dtype,
+                buffer=_ATTACHED_SHARED_MEMORY[shared_array.name].buf,
+            )
+        )
+    return arrays
@@ -8,24 +8,35 @@ References:
     1. https://arxiv.org/abs/2111.00990
 """
 
-from collections.abc import Collection, Iterator
-from concurrent.futures import ProcessPoolExecutor
+import pickle
+from collections.abc import Iterable, Iterator
 from functools import partial
 from math import ceil
-from multiprocessing import cpu_count
+from types import TracebackType
 from typing import Any, Literal, Optional, Union
 
 import geopandas as gpd
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
+import polars as pl
 from tqdm import tqdm
 
+from srai._multiprocessing import (
+    parse_multiprocessing_activation_threshold,
+    parse_num_of_multiprocessing_workers,
+)
 from srai.constants import FORCE_TERMINAL
-from srai.embedders.count_embedder import CountEmbedder
+from srai.embedders._shared_memory_pool import (
+    SharedArray,
+    SharedMemoryWorkerPool,
+    attach_shared_arrays,
+)
+from srai.embedders.count_embedder import ArrowOrPolarsFrame, CountEmbedder
 from srai.loaders.osm_loaders.filters import GroupedOsmTagsFilter, OsmTagsFilter
-from srai.neighbourhoods import Neighbourhood
+from srai.neighbourhoods import Neighbourhood, NeighbourhoodCSR
 from srai.neighbourhoods._base import IndexType
+from srai.regionalizers import LazyGeometryRegions
 
 
 class ContextualCountEmbedder(CountEmbedder):
@@ -43,6 +54,7 @@ class ContextualCountEmbedder(CountEmbedder):
         aggregation_function: Literal["average", "median", "sum", "min", "max"] = "average",
         num_of_multiprocessing_workers: int = -1,
         multiprocessing_activation_threshold: Optional[int] = None,
+        aggregation_engine: Literal["sparse", "pandas"] = "sparse",
     ) -> None:
         """
         Init ContextualCountEmbedder.
@@ -69,13 +81,23 @@ class ContextualCountEmbedder(CountEmbedder):
             num_of_multiprocessing_workers (int, optional): Number of workers used for
                 multiprocessing. Defaults to -1 which results in a total number of available
                 cpu threads. `0` and `1` values disable multiprocessing.
-                Similar to `n_jobs` parameter from `scikit-learn` library.
+                Similar to `n_jobs` parameter from `scikit-learn` library. Worker processes
+                share the counts matrix through shared memory and are reused between
+                subsequent `transform` calls until `close` is called (or the embedder
+                is used as a context manager).
             multiprocessing_activation_threshold (int, optional): Number of seeds required to start
                 processing on multiple processes. Activating multiprocessing for a small
                 amount of points might not be feasible. Defaults to 100.
+            aggregation_engine (Literal["sparse", "pandas"], optional): Engine used to aggregate
+                values from the neighbours. `sparse` builds a single CSR ring adjacency per
+                distance and reduces all regions at once using segment reductions over its rows.
+                `pandas` aggregates neighbours region by region. Both engines return
+                identical results.
+                Defaults to "sparse".
 
         Raises:
             ValueError: If `neighbourhood_distance` is negative.
+            ValueError: If `aggregation_engine` is unknown.
         """
         super().__init__(expected_output_features, count_subcategories)
 
@@ -87,18 +109,49 @@ class ContextualCountEmbedder(CountEmbedder):
         if self.neighbourhood_distance < 0:
             raise ValueError("Neighbourhood distance must be positive.")
 
-        self.num_of_multiprocessing_workers = _parse_num_of_multiprocessing_workers(
+        if aggregation_engine not in ("sparse", "pandas"):
+            raise ValueError(f"Unknown aggregation engine: {aggregation_engine}")
+        self.aggregation_engine = aggregation_engine
+
+        self.num_of_multiprocessing_workers = parse_num_of_multiprocessing_workers(
             num_of_multiprocessing_workers
         )
-        self.multiprocessing_activation_threshold = _parse_multiprocessing_activation_threshold(
-            multiprocessing_activation_threshold
+        self.multiprocessing_activation_threshold = parse_multiprocessing_activation_threshold(
+            multiprocessing_activation_threshold, 100
         )
+        self._worker_pool: Optional[SharedMemoryWorkerPool] = None
+        self._worker_pool_neighbourhood: Optional[Neighbourhood[IndexType]] = None
+
+    def close(self) -> None:
+        """
+        Stop the worker processes kept between `transform` calls.
+
+        The embedder can still be used afterwards; new worker processes are started
+        on the next `transform` call that requires them.
+        """
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown()
+        self._worker_pool = None
+        self._worker_pool_neighbourhood = None
+
+    def __enter__(self) -> "ContextualCountEmbedder":
+        """Use the embedder as a context manager stopping worker processes on exit."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop the worker processes on exit from the context."""
+        self.close()
 
     def transform(
         self,
-        regions_gdf: gpd.GeoDataFrame,
-        features_gdf: gpd.GeoDataFrame,
-        joint_gdf: gpd.GeoDataFrame,
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame],
+        features_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+        joint_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
     ) -> pd.DataFrame:
         """
         Embed a given GeoDataFrame.
@@ -112,11 +165,17 @@ class ContextualCountEmbedder(CountEmbedder):
         The rows will hold numbers of this type of feature in each region. Numbers can be
         fractional because neighbourhoods are aggregated to represent a single value from
         all neighbours on a given level.
+        Inputs can also be given as pyarrow Tables or polars DataFrames / LazyFrames
+        with `region_id` and `feature_id` columns, like in the `CountEmbedder`.
 
         Args:
-            regions_gdf (gpd.GeoDataFrame): Region indexes and geometries.
-            features_gdf (gpd.GeoDataFrame): Feature indexes, geometries and feature values.
-            joint_gdf (gpd.GeoDataFrame): Joiner result with region-feature multi-index.
+            regions_gdf (Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame]): Region
+                indexes and geometries. Geometries aren't used, so regions without them
+                are accepted.
+            features_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Feature indexes,
+                geometries and feature values.
+            joint_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Joiner result with
+                region-feature multi-index.
 
         Returns:
             pd.DataFrame: Embedding for each region in regions_gdf.
@@ -126,6 +185,7 @@ class ContextualCountEmbedder(CountEmbedder):
             ValueError: If any of the gdfs index names is None.
             ValueError: If joint_gdf.index is not of type pd.MultiIndex or doesn't have 2 levels.
             ValueError: If index levels in gdfs don't overlap correctly.
+            ValueError: If Arrow or polars inputs don't contain the index columns.
         """
         counts_df = super().transform(regions_gdf, features_gdf, joint_gdf)
 
@@ -137,6 +197,34 @@ class ContextualCountEmbedder(CountEmbedder):
 
         return result_df
 
+    def transform_to_polars(
+        self,
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame],
+        features_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+        joint_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+    ) -> pl.DataFrame:
+        """
+        Embed regions like the `transform` function, returning a polars DataFrame.
+
+        Neighbourhoods are aggregated on the pandas embeddings, which are converted
+        into a polars DataFrame with region indexes in the first `region_id` column.
+
+        Args:
+            regions_gdf (Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame]): Region
+                indexes and geometries. Geometries aren't used, so regions without them
+                are accepted.
+            features_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Feature indexes,
+                geometries and feature values.
+            joint_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Joiner result with
+                region-feature multi-index.
+
+        Returns:
+            pl.DataFrame: Embedding for each region in regions_gdf.
+        """
+        return pl.from_pandas(
+            self.transform(regions_gdf, features_gdf, joint_gdf), include_index=True
+        )
+
     def _get_squashed_embeddings(self, counts_df: pd.DataFrame) -> pd.DataFrame:
         """
         Generate embeddings for regions by summing all neighbourhood levels.
@@ -199,7 +287,7 @@ class ContextualCountEmbedder(CountEmbedder):
 
     def _get_aggregated_values_for_distances(
         self, counts_df: pd.DataFrame
-    ) -> Iterator[tuple[int, npt.NDArray[np.float32]]]:
+    ) -> Iterator[tuple[int, npt.NDArray[np.float64]]]:
         """
         Generate aggregated values for neighbours at given distances.
 
@@ -213,151 +301,488 @@ class ContextualCountEmbedder(CountEmbedder):
             counts_df (pd.DataFrame): Calculated features from CountEmbedder.
 
         Yields:
-            Iterator[Tuple[int, npt.NDArray[np.float32]]]: Iterator of distances and values.
+            Iterator[Tuple[int, npt.NDArray[np.float64]]]: Iterator of distances and values.
         """
         if self.neighbourhood_distance == 0:
             return
 
-        number_of_base_columns = len(counts_df.columns)
-
         activate_multiprocessing = (
             self.num_of_multiprocessing_workers > 1
             and len(counts_df.index) >= self.multiprocessing_activation_threshold
         )
 
-        with (
-            tqdm(
-                total=self.neighbourhood_distance * len(counts_df.index) * 2,
-                desc="Generating embeddings for neighbours",
-                disable=FORCE_TERMINAL,
-            ) as pbar,
-            ProcessPoolExecutor(max_workers=self.num_of_multiprocessing_workers) as executor,
-        ):
+        if activate_multiprocessing:
+            yield from self._get_pooled_aggregated_values_for_distances(counts_df)
+        elif self.aggregation_engine == "sparse":
+            yield from self._get_sparse_aggregated_values_for_distances(counts_df)
+        else:
+            yield from self._get_pandas_aggregated_values_for_distances(counts_df)
+
+    def _get_pandas_aggregated_values_for_distances(
+        self, counts_df: pd.DataFrame
+    ) -> Iterator[tuple[int, npt.NDArray[np.float64]]]:
+        """
+        Generate aggregated values for neighbours at given distances region by region.
+
+        Args:
+            counts_df (pd.DataFrame): Calculated features from CountEmbedder.
+
+        Yields:
+            Iterator[Tuple[int, npt.NDArray[np.float64]]]: Iterator of distances and values.
+        """
+        number_of_base_columns = len(counts_df.columns)
+
+        with tqdm(
+            total=self.neighbourhood_distance * len(counts_df.index) * 2,
+            desc="Generating embeddings for neighbours",
+            disable=FORCE_TERMINAL,
+        ) as pbar:
             for distance in range(1, self.neighbourhood_distance + 1):
                 pbar.set_postfix_str(f"Distance: {distance}", refresh=True)
                 if len(counts_df.index) == 0:
                     continue
 
                 neighbours_series = []
+                for result in counts_df.index.map(
+                    lambda region_id, neighbour_distance=distance: counts_df.index.intersection(
+                        self.neighbourhood.get_neighbours_at_distance(
+                            region_id, neighbour_distance, include_center=False
+                        )
+                    ).values
+                ):
+                    neighbours_series.append(result)
+                    pbar.update()
 
-                if activate_multiprocessing:
-                    fn_neighbours = partial(
-                        _get_existing_neighbours_at_distance,
-                        neighbour_distance=distance,
-                        counts_index=counts_df.index,
-                        neighbourhood=self.neighbourhood,
+                values_to_stack = []
+                for neighbours in neighbours_series:
+                    values_to_stack.append(
+                        _get_embeddings_for_neighbours(
+                            neighbours_values=counts_df.loc[neighbours].values,
+                            aggregation_function=self.aggregation_function,
+                            number_of_base_columns=number_of_base_columns,
+                        )
                     )
+                    pbar.update()
 
-                    for result in executor.map(
-                        fn_neighbours,
-                        counts_df.index,
-                        chunksize=ceil(
-                            len(counts_df.index) / (4 * self.num_of_multiprocessing_workers)
-                        ),
-                    ):
-                        neighbours_series.append(result)
-                        pbar.update()
-                else:
-                    for result in counts_df.index.map(
-                        lambda region_id, neighbour_distance=distance: counts_df.index.intersection(
-                            self.neighbourhood.get_neighbours_at_distance(
-                                region_id, neighbour_distance, include_center=False
-                            )
-                        ).values
-                    ):
-                        neighbours_series.append(result)
-                        pbar.update()
+                aggregated_values_stacked = np.stack(values_to_stack)
 
-                if not neighbours_series:
-                    continue
+                yield distance, aggregated_values_stacked
 
-                values_to_stack = []
+    def _get_sparse_aggregated_values_for_distances(
+        self, counts_df: pd.DataFrame
+    ) -> Iterator[tuple[int, npt.NDArray[np.float64]]]:
+        """
+        Generate aggregated values for neighbours at given distances using a sparse ring adjacency.
 
-                if activate_multiprocessing:
-                    fn_embeddings = partial(
-                        _get_embeddings_for_neighbours,
-                        counts_df=counts_df,
-                        aggregation_function=self.aggregation_function,
-                        number_of_base_columns=number_of_base_columns,
-                    )
+        For each distance, a CSR adjacency between regions and their existing neighbours at that
+        distance is built once and all regions are aggregated together with segment reductions
+        over its rows.
 
-                    for result in executor.map(
-                        fn_embeddings,
-                        neighbours_series,
-                        chunksize=ceil(
-                            len(neighbours_series) / (4 * self.num_of_multiprocessing_workers)
-                        ),
-                    ):
-                        values_to_stack.append(result)
-                        pbar.update()
-                else:
-                    for neighbours in neighbours_series:
-                        values_to_stack.append(
-                            _get_embeddings_for_neighbours(
-                                region_ids=neighbours,
-                                counts_df=counts_df,
-                                aggregation_function=self.aggregation_function,
-                                number_of_base_columns=number_of_base_columns,
-                            )
-                        )
-                        pbar.update()
+        Args:
+            counts_df (pd.DataFrame): Calculated features from CountEmbedder.
 
-                aggregated_values_stacked = np.stack(values_to_stack)
+        Yields:
+            Iterator[Tuple[int, npt.NDArray[np.float64]]]: Iterator of distances and values.
+        """
+        counts_values = counts_df.values
 
-                yield distance, aggregated_values_stacked
+        with tqdm(
+            total=self.neighbourhood_distance * len(counts_df.index) * 2,
+            desc="Generating embeddings for neighbours",
+            disable=FORCE_TERMINAL,
+        ) as pbar:
+            for distance in range(1, self.neighbourhood_distance + 1):
+                pbar.set_postfix_str(f"Distance: {distance}", refresh=True)
+                if len(counts_df.index) == 0:
+                    continue
 
+                neighbours = _get_neighbours_at_distance(
+                    region_ids=counts_df.index,
+                    neighbour_distance=distance,
+                    neighbourhood=self.neighbourhood,
+                )
+                indptr, indices = _build_ring_adjacency(
+                    len(counts_df.index),
+                    [(neighbours.indptr, _get_counts_positions(counts_df.index, neighbours))],
+                )
+                pbar.update(len(counts_df.index))
+
+                aggregated_values = _aggregate_csr_rows(
+                    values=counts_values,
+                    indptr=indptr,
+                    indices=indices,
+                    aggregation_function=self.aggregation_function,
+                )
+                pbar.update(len(counts_df.index))
+
+                yield distance, aggregated_values
+
+    def _get_pooled_aggregated_values_for_distances(
+        self, counts_df: pd.DataFrame
+    ) -> Iterator[tuple[int, npt.NDArray[np.float64]]]:
+        """
+        Generate aggregated values for neighbours at given distances using multiple processes.
 
-def _parse_num_of_multiprocessing_workers(num_of_multiprocessing_workers: int) -> int:
-    if num_of_multiprocessing_workers == 0:
-        num_of_multiprocessing_workers = 1
-    elif num_of_multiprocessing_workers < 0:
-        num_of_multiprocessing_workers = cpu_count()
+        The counts matrix and the pickled counts index are copied once into shared memory and
+        the ring adjacency arrays once per distance. Workers only receive row ranges, both for
+        the neighbours search and for the aggregation. Neighbours are returned as positions in
+        the counts index and aggregated values are written directly into a shared output array.
 
-    return num_of_multiprocessing_workers
+        Args:
+            counts_df (pd.DataFrame): Calculated features from CountEmbedder.
 
+        Yields:
+            Iterator[Tuple[int, npt.NDArray[np.float64]]]: Iterator of distances and values.
+        """
+        worker_pool = self._get_worker_pool()
+        number_of_regions = len(counts_df.index)
+        chunksize = ceil(number_of_regions / (4 * self.num_of_multiprocessing_workers))
+        row_ranges = [
+            (row_start, min(row_start + chunksize, number_of_regions))
+            for row_start in range(0, number_of_regions, chunksize)
+        ]
 
-def _parse_multiprocessing_activation_threshold(
-    multiprocessing_activation_threshold: Optional[int],
-) -> int:
-    if not multiprocessing_activation_threshold:
-        multiprocessing_activation_threshold = 100
+        shared_counts_values = worker_pool.share_array(counts_df.values)
+        shared_counts_index = worker_pool.share_array(
+            np.frombuffer(pickle.dumps(counts_df.index), dtype=np.uint8)
+        )
+        try:
+            with tqdm(
+                total=self.neighbourhood_distance * number_of_regions * 2,
+                desc="Generating embeddings for neighbours",
+                disable=FORCE_TERMINAL,
+            ) as pbar:
+                for distance in range(1, self.neighbourhood_distance + 1):
+                    pbar.set_postfix_str(f"Distance: {distance}", refresh=True)
+
+                    neighbours_chunks: list[
+                        tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]
+                    ] = []
+                    for chunk_indptr, chunk_positions in worker_pool.map(
+                        partial(
+                            _get_neighbours_positions_task,
+                            counts_index=shared_counts_index,
+                            neighbour_distance=distance,
+                        ),
+                        row_ranges,
+                    ):
+                        neighbours_chunks.append((chunk_indptr, chunk_positions))
+                        pbar.update(len(chunk_indptr) - 1)
+
+                    indptr, indices = _build_ring_adjacency(len(counts_df.index), neighbours_chunks)
+                    shared_indptr = worker_pool.share_array(indptr)
+                    shared_indices = worker_pool.share_array(indices)
+                    shared_output = worker_pool.create_array(
+                        (number_of_regions, len(counts_df.columns)), dtype=np.float64
+                    )
+                    try:
+                        for row_start, row_end in worker_pool.map(
+                            partial(
+                                _aggregate_rows_task,
+                                counts_values=shared_counts_values,
+                                indptr=shared_indptr,
+                                indices=shared_indices,
+                                output=shared_output,
+                                aggregation_function=self.aggregation_function,
+                                aggregation_engine=self.aggregation_engine,
+                            ),
+                            row_ranges,
+                        ):
+                            pbar.update(row_end - row_start)
+                        aggregated_values = worker_pool.read_array(shared_output)
+                    finally:
+                        worker_pool.release(shared_indptr, shared_indices, shared_output)
+
+                    yield distance, aggregated_values
+        finally:
+            worker_pool.release(shared_counts_values, shared_counts_index)
+
+    def _get_worker_pool(self) -> SharedMemoryWorkerPool:
+        """
+        Get a worker pool reused between distances and subsequent `transform` calls.
+
+        The pool is recreated if the neighbourhood or the number of workers has changed.
+
+        Returns:
+            SharedMemoryWorkerPool: Pool with the neighbourhood set in each worker.
+        """
+        if (
+            self._worker_pool is None
+            or self._worker_pool_neighbourhood is not self.neighbourhood
+            or self._worker_pool.num_of_workers != self.num_of_multiprocessing_workers
+        ):
+            if self._worker_pool is not None:
+                self._worker_pool.shutdown()
+            self._worker_pool = SharedMemoryWorkerPool(
+                num_of_workers=self.num_of_multiprocessing_workers,
+                initializer=_initialize_worker,
+                initargs=(self.neighbourhood,),
+            )
+            self._worker_pool_neighbourhood = self.neighbourhood
 
-    return multiprocessing_activation_threshold
+        return self._worker_pool
 
 
-def _get_existing_neighbours_at_distance(
-    region_id: IndexType,
+def _get_neighbours_at_distance(
+    region_ids: Iterable[IndexType],
     neighbour_distance: int,
     neighbourhood: Neighbourhood[IndexType],
-    counts_index: pd.Index,
-) -> Any:
-    return counts_index.intersection(
-        neighbourhood.get_neighbours_at_distance(
-            region_id, neighbour_distance, include_center=False
-        )
-    ).values
+) -> NeighbourhoodCSR:
+    """
+    Get neighbours at a given distance for multiple regions.
+
+    Args:
+        region_ids (Iterable[IndexType]): Regions for which neighbours are found.
+        neighbour_distance (int): Distance to the neighbours.
+        neighbourhood (Neighbourhood[IndexType]): Neighbourhood used to find the neighbours.
+
+    Returns:
+        NeighbourhoodCSR: Neighbours of the regions with a row for each region.
+    """
+    return neighbourhood.get_neighbours_batch(
+        region_ids, neighbour_distance, at_distance=True, include_center=False
+    )
 
 
 def _get_embeddings_for_neighbours(
-    region_ids: Collection[IndexType],
-    counts_df: pd.DataFrame,
+    neighbours_values: npt.NDArray[Any],
     aggregation_function: Literal["average", "median", "sum", "min", "max"],
     number_of_base_columns: int,
 ) -> Any:
-    if len(region_ids) == 0:  # noqa: FURB115
+    if len(neighbours_values) == 0:  # noqa: FURB115
         return np.zeros((number_of_base_columns,))
 
     if aggregation_function == "average":
-        aggregation = np.nanmean(counts_df.loc[region_ids].values, axis=0)
+        aggregation = np.nanmean(neighbours_values, axis=0)
     elif aggregation_function == "median":
-        aggregation = np.nanmedian(counts_df.loc[region_ids].values, axis=0)
+        aggregation = np.nanmedian(neighbours_values, axis=0)
     elif aggregation_function == "sum":
-        aggregation = np.sum(counts_df.loc[region_ids].values, axis=0)
+        aggregation = np.sum(neighbours_values, axis=0)
     elif aggregation_function == "min":
-        aggregation = np.min(counts_df.loc[region_ids].values, axis=0)
+        aggregation = np.min(neighbours_values, axis=0)
     elif aggregation_function == "max":
-        aggregation = np.max(counts_df.loc[region_ids].values, axis=0)
+        aggregation = np.max(neighbours_values, axis=0)
     else:
         raise ValueError(f"Unknown aggregation function: {aggregation_function}")
 
     return np.nan_to_num(aggregation)
+
+
+# Neighbourhood set once in each worker process of the shared memory pool.
+_WORKER_NEIGHBOURHOOD: Optional[Neighbourhood[Any]] = None
+
+
+def _initialize_worker(neighbourhood: Neighbourhood[IndexType]) -> None:
+    global _WORKER_NEIGHBOURHOOD  # noqa: PLW0603
+    _WORKER_NEIGHBOURHOOD = neighbourhood
+
+
+# Counts index unpickled once in each worker process, with the name of its shared memory block.
+_WORKER_COUNTS_INDEX: Optional[tuple[str, pd.Index]] = None
+
+
+def _get_neighbours_positions_task(
+    row_range: tuple[int, int], counts_index: SharedArray, neighbour_distance: int
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    global _WORKER_COUNTS_INDEX  # noqa: PLW0603
+    assert _WORKER_NEIGHBOURHOOD is not None
+    if _WORKER_COUNTS_INDEX is None or _WORKER_COUNTS_INDEX[0] != counts_index.name:
+        (counts_index_bytes,) = attach_shared_arrays(counts_index)
+        _WORKER_COUNTS_INDEX = (counts_index.name, pickle.loads(counts_index_bytes.tobytes()))
+    index = _WORKER_COUNTS_INDEX[1]
+
+    row_start, row_end = row_range
+    neighbours = _get_neighbours_at_distance(
+        index[row_start:row_end], neighbour_distance, _WORKER_NEIGHBOURHOOD
+    )
+    return neighbours.indptr, _get_counts_positions(index, neighbours)
+
+
+def _aggregate_rows_task(
+    row_range: tuple[int, int],
+    counts_values: SharedArray,
+    indptr: SharedArray,
+    indices: SharedArray,
+    output: SharedArray,
+    aggregation_function: Literal["average", "median", "sum", "min", "max"],
+    aggregation_engine: Literal["sparse", "pandas"],
+) -> tuple[int, int]:
+    values_array, indptr_array, indices_array, output_array = attach_shared_arrays(
+        counts_values, indptr, indices, output
+    )
+    row_start, row_end = row_range
+    if aggregation_engine == "sparse":
+        output_array[row_start:row_end] = _aggregate_csr_rows(
+            values=values_array,
+            indptr=indptr_array[row_start : row_end + 1],
+            indices=indices_array,
+            aggregation_function=aggregation_function,
+        )
+    else:
+        for row in range(row_start, row_end):
+            output_array[row] = _get_embeddings_for_neighbours(
+                neighbours_values=values_array[
+                    indices_array[indptr_array[row] : indptr_array[row + 1]]
+                ],
+                aggregation_function=aggregation_function,
+                number_of_base_columns=values_array.shape[1],
+            )
+    return row_range
+
+
+# Maximal number of gathered neighbour rows reduced at once by the sparse engine.
+_SPARSE_ENGINE_BLOCK_SIZE = 1_000_000
+
+
+def _get_counts_positions(
+    counts_index: pd.Index, neighbours: NeighbourhoodCSR
+) -> npt.NDArray[np.int64]:
+    """
+    Map neighbours to their positions in the counts index.
+
+    Only the regions used as neighbours are looked up, so the cost doesn't depend on the size
+    of the neighbours `index`, which can contain all the regions of the neighbourhood.
+
+    Args:
+        counts_index (pd.Index): Index of regions.
+        neighbours (NeighbourhoodCSR): Neighbours of regions.
+
+    Returns:
+        npt.NDArray[np.int64]: Position in the `counts_index` for each value of
+            `neighbours.indices`, or -1 for neighbours missing from the `counts_index`.
+    """
+    used_nodes, used_nodes_inverse = np.unique(neighbours.indices, return_inverse=True)
+    used_nodes_positions = np.asarray(
+        counts_index.get_indexer(neighbours.index[used_nodes]), dtype=np.int64
+    )
+    positions: npt.NDArray[np.int64] = used_nodes_positions[used_nodes_inverse.reshape(-1)]
+    return positions
+
+
+def _build_ring_adjacency(
+    number_of_regions: int,
+    neighbours_chunks: list[tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Build a CSR adjacency between regions and their existing neighbours.
+
+    Args:
+        number_of_regions (int): Number of regions in the counts index.
+        neighbours_chunks (List[Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]]): CSR row
+            pointers and positions of the neighbours in the counts index (-1 if missing)
+            for consecutive chunks of regions.
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]: CSR row pointers and positions
+            of the neighbours in the counts index, sorted within each row. Neighbours missing
+            from the counts index are skipped.
+    """
+    rows_chunks = []
+    indices_chunks = []
+    row_offset = 0
+    for chunk_indptr, chunk_positions in neighbours_chunks:
+        number_of_rows = len(chunk_indptr) - 1
+        rows_chunks.append(
+            np.repeat(
+                np.arange(row_offset, row_offset + number_of_rows, dtype=np.int64),
+                np.diff(chunk_indptr),
+            )
+        )
+        indices_chunks.append(np.asarray(chunk_positions, dtype=np.int64))
+        row_offset += number_of_rows
+
+    rows = np.concatenate(rows_chunks) if rows_chunks else np.zeros(0, dtype=np.int64)
+    indices = np.concatenate(indices_chunks) if indices_chunks else np.zeros(0, dtype=np.int64)
+
+    existing_neighbours_mask = indices >= 0
+    rows = rows[existing_neighbours_mask]
+    indices = indices[existing_neighbours_mask]
+
+    order = np.lexsort((indices, rows))
+    indices = indices[order]
+
+    indptr = np.zeros(number_of_regions + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=number_of_regions), out=indptr[1:])
+
+    return indptr, indices
+
+
+def _aggregate_csr_rows(
+    values: npt.NDArray[Any],
+    indptr: npt.NDArray[np.int64],
+    indices: npt.NDArray[np.int64],
+    aggregation_function: Literal["average", "median", "sum", "min", "max"],
+) -> npt.NDArray[np.float64]:
+    """
+    Aggregate values of the neighbours for each row of a CSR adjacency.
+
+    Rows without any neighbours are filled with zeros. Rows are processed in blocks to limit
+    the size of the gathered neighbours values.
+
+    Args:
+        values (npt.NDArray[Any]): Values of all regions.
+        indptr (npt.NDArray[np.int64]): CSR row pointers.
+        indices (npt.NDArray[np.int64]): Positions of the neighbours in the values array.
+        aggregation_function (Literal["average", "median", "sum", "min", "max"]): Function used
+            to aggregate data from the neighbours.
+
+    Returns:
+        npt.NDArray[np.float64]: Aggregated values with a row for each row of the adjacency.
+    """
+    if aggregation_function not in ("average", "median", "sum", "min", "max"):
+        raise ValueError(f"Unknown aggregation function: {aggregation_function}")
+
+    number_of_rows = len(indptr) - 1
+    result = np.zeros((number_of_rows, values.shape[1]))
+
+    row_start = 0
+    while row_start < number_of_rows:
+        row_end = int(
+            np.searchsorted(indptr, indptr[row_start] + _SPARSE_ENGINE_BLOCK_SIZE, side="right") - 1
+        )
+        row_end = min(max(row_end, row_start + 1), number_of_rows)
+
+        block_indptr = indptr[row_start : row_end + 1]
+        block_lengths = np.diff(block_indptr)
+        non_empty_rows = block_lengths > 0
+        if non_empty_rows.any():
+            gathered_values = values[indices[block_indptr[0] : block_indptr[-1]]]
+            segment_starts = block_indptr[:-1][non_empty_rows] - block_indptr[0]
+            segment_lengths = block_lengths[non_empty_rows]
+            result[row_start:row_end][non_empty_rows] = _reduce_segments(
+                gathered_values, segment_starts, segment_lengths, aggregation_function
+            )
+
+        row_start = row_end
+
+    return np.nan_to_num(result)
+
+
+def _reduce_segments(
+    gathered_values: npt.NDArray[Any],
+    segment_starts: npt.NDArray[np.int64],
+    segment_lengths: npt.NDArray[np.int64],
+    aggregation_function: Literal["average", "median", "sum", "min", "max"],
+) -> npt.NDArray[np.float64]:
+    if aggregation_function == "sum":
+        return np.add.reduceat(gathered_values, segment_starts, axis=0).astype(np.float64)
+    elif aggregation_function == "average":
+        sums = np.add.reduceat(gathered_values.astype(np.float64), segment_starts, axis=0)
+        averages: npt.NDArray[np.float64] = sums / segment_lengths[:, np.newaxis]
+        return averages
+    elif aggregation_function == "min":
+        return np.minimum.reduceat(gathered_values, segment_starts, axis=0).astype(np.float64)
+    elif aggregation_function == "max":
+        return np.maximum.reduceat(gathered_values, segment_starts, axis=0).astype(np.float64)
+
+    # median - sort values within each segment and take the middle element(s)
+    segment_ids = np.repeat(np.arange(len(segment_starts)), segment_lengths)
+    values_order = np.argsort(gathered_values, axis=0, kind="stable")
+    segments_order = np.argsort(segment_ids[values_order], axis=0, kind="stable")
+    sorted_values = np.take_along_axis(
+        gathered_values, np.take_along_axis(values_order, segments_order, axis=0), axis=0
+    ).astype(np.float64)
+    lower_middle = sorted_values[segment_starts + (segment_lengths - 1) // 2]
+    upper_middle = sorted_values[segment_starts + segment_lengths // 2]
+    medians: npt.NDArray[np.float64] = (lower_middle + upper_middle) / 2
+    return medians
@@ -4,16 +4,36 @@ Count Embedder.
 This module contains count embedder implementation.
 """
 
-from typing import Optional, Union, cast
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union, cast
 
 import geopandas as gpd
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyproj
+import shapely
 
+from srai._optional import import_optional_dependencies
+from srai._sql import quote_sql_identifier, quote_sql_literal
 from srai._typing import is_expected_type
-from srai.constants import FEATURES_INDEX, GEOMETRY_COLUMN, REGIONS_INDEX
+from srai.constants import FEATURES_INDEX, GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
 from srai.embedders import Embedder
+from srai.h3 import convert_h3_index, get_h3_parents
 from srai.loaders.osm_loaders.filters import GroupedOsmTagsFilter, OsmTagsFilter
+from srai.regionalizers import LazyGeometryRegions
+
+if TYPE_CHECKING:  # pragma: no cover
+    import duckdb
+
+ArrowOrPolarsFrame = Union[pa.Table, pl.DataFrame, pl.LazyFrame]
+
+# Maximal number of regions inserted into DuckDB at once.
+_DUCKDB_REGIONS_CHUNK_SIZE = 100_000
 
 
 class CountEmbedder(Embedder):
@@ -25,6 +45,7 @@ class CountEmbedder(Embedder):
             Union[list[str], OsmTagsFilter, GroupedOsmTagsFilter]
         ] = None,
         count_subcategories: bool = True,
+        h3_parent_resolution: Optional[int] = None,
     ) -> None:
         """
         Init CountEmbedder.
@@ -39,15 +60,26 @@ class CountEmbedder(Embedder):
             count_subcategories (bool, optional): Whether to count all subcategories individually
                 or count features only on the highest level based on features column name.
                 Defaults to True.
+            h3_parent_resolution (int, optional): If set, regions have to be H3 cells and
+                features are counted in their parents at this (coarser) resolution. A feature
+                joined with multiple children of a parent is counted once, so the result is
+                the same as for features joined directly with the parents. Defaults to None.
+
+        Raises:
+            ValueError: If h3_parent_resolution is not between 0 and 15.
         """
+        if h3_parent_resolution is not None and not (0 <= h3_parent_resolution <= 15):
+            raise ValueError(f"Resolution {h3_parent_resolution} is not between 0 and 15.")
+
         self.count_subcategories = count_subcategories
+        self.h3_parent_resolution = h3_parent_resolution
         self._parse_expected_output_features(expected_output_features)
 
     def transform(
         self,
-        regions_gdf: gpd.GeoDataFrame,
-        features_gdf: gpd.GeoDataFrame,
-        joint_gdf: gpd.GeoDataFrame,
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame],
+        features_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+        joint_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
     ) -> pd.DataFrame:
         """
         Embed a given GeoDataFrame.
@@ -60,38 +92,437 @@ class CountEmbedder(Embedder):
         the feature name (column) and value (row) e.g. amenity_fuel or type_0.
         The rows will hold numbers of this type of feature in each region.
 
+        Inputs can also be given as pyarrow Tables or polars DataFrames / LazyFrames,
+        which are used without a conversion from pandas. They have to contain
+        `region_id` and `feature_id` columns instead of indexes.
+
         Args:
-            regions_gdf (gpd.GeoDataFrame): Region indexes and geometries.
-            features_gdf (gpd.GeoDataFrame): Feature indexes, geometries and feature values.
-            joint_gdf (gpd.GeoDataFrame): Joiner result with region-feature multi-index.
+            regions_gdf (Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame]): Region
+                indexes and geometries. Geometries aren't used, so regions without them
+                are accepted.
+            features_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Feature indexes,
+                geometries and feature values.
+            joint_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Joiner result with
+                region-feature multi-index.
 
         Returns:
-            pd.DataFrame: Embedding for each region in regions_gdf.
+            pd.DataFrame: Embedding for each region in regions_gdf (or for each parent of
+                the regions if `h3_parent_resolution` is set).
 
         Raises:
             ValueError: If features_gdf is empty and self.expected_output_features is not set.
             ValueError: If any of the gdfs index names is None.
             ValueError: If joint_gdf.index is not of type pd.MultiIndex or doesn't have 2 levels.
             ValueError: If index levels in gdfs don't overlap correctly.
+            ValueError: If Arrow or polars inputs don't contain the index columns.
+            ValueError: If features_gdf contains boolean columns and count_subcategories is True.
+            ValueError: If h3_parent_resolution is set and regions are coarser than it.
+        """
+        return self._count_features(regions_gdf, features_gdf, joint_gdf)
+
+    def transform_to_polars(
+        self,
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame],
+        features_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+        joint_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+    ) -> pl.DataFrame:
+        """
+        Embed regions like the `transform` function, returning a polars DataFrame.
+
+        Counts are returned without a conversion to pandas, with region indexes kept
+        in the first `region_id` column.
+
+        Args:
+            regions_gdf (Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame]): Region
+                indexes and geometries. Geometries aren't used, so regions without them
+                are accepted.
+            features_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Feature indexes,
+                geometries and feature values.
+            joint_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Joiner result with
+                region-feature multi-index.
+
+        Returns:
+            pl.DataFrame: Embedding for each region in regions_gdf (or for each parent of
+                the regions if `h3_parent_resolution` is set).
+
+        Raises:
+            ValueError: If features_gdf is empty and self.expected_output_features is not set.
+            ValueError: If pandas inputs have incorrect indexes, like in `transform`.
+            ValueError: If Arrow or polars inputs don't contain the index columns.
             ValueError: If features_gdf contains boolean columns and count_subcategories is True.
+            ValueError: If h3_parent_resolution is set and regions are coarser than it.
+        """
+        return self._count_features_polars(regions_gdf, features_gdf, joint_gdf)
+
+    def transform_to_arrow(
+        self,
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame],
+        features_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+        joint_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+    ) -> pa.Table:
+        """
+        Embed regions like the `transform_to_polars` function, returning a pyarrow Table.
+
+        Args:
+            regions_gdf (Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame]): Region
+                indexes and geometries. Geometries aren't used, so regions without them
+                are accepted.
+            features_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Feature indexes,
+                geometries and feature values.
+            joint_gdf (Union[gpd.GeoDataFrame, ArrowOrPolarsFrame]): Joiner result with
+                region-feature multi-index.
+
+        Returns:
+            pa.Table: Embedding for each region in regions_gdf with region indexes
+                in the first `region_id` column.
+        """
+        return self.transform_to_polars(regions_gdf, features_gdf, joint_gdf).to_arrow()
+
+    def transform_geoparquet(
+        self,
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions],
+        features_path: Union[str, Path],
+    ) -> pd.DataFrame:
+        """
+        Embed regions with features read from a GeoParquet file.
+
+        Features, such as the ones saved by `OSMPbfLoader.load_to_geoparquet`, are joined
+        with the regions and counted inside DuckDB with the `spatial` extension, so their
+        geometries are never loaded into Python. Features are joined with regions they
+        intersect, like in the `IntersectionJoiner`, and the result is the same as
+        the result of the `transform` function for these features. Regions are reprojected
+        into the CRS from the `geo` metadata of the file (WGS84 if it isn't set).
+
+        Args:
+            regions_gdf (Union[gpd.GeoDataFrame, LazyGeometryRegions]): Region indexes and
+                geometries. Geometries of `LazyGeometryRegions` are materialized chunk by chunk.
+            features_path (Union[str, Path]): Path to the GeoParquet file with features.
+                Every column other than `geometry` and `feature_id` is treated as a feature.
+
+        Returns:
+            pd.DataFrame: Embedding for each region in regions_gdf (or for each parent of
+                the regions if `h3_parent_resolution` is set).
+
+        Raises:
+            ValueError: If features are empty and self.expected_output_features is not set.
+            ValueError: If regions_gdf index name is None.
+            ValueError: If features don't have a geometry column.
+            ValueError: If features have an undefined CRS and regions_gdf has a CRS.
+            ValueError: If features contain only boolean columns and count_subcategories is True.
+            ValueError: If h3_parent_resolution is set and regions are coarser than it.
+        """
+        import_optional_dependencies(dependency_group="osm", modules=["duckdb"])
+
+        if regions_gdf.index.name is None:
+            raise ValueError("regions_gdf must have a named index.")
+
+        features_path = Path(features_path)
+        features_schema = pq.read_schema(features_path)
+        if GEOMETRY_COLUMN not in features_schema.names:
+            raise ValueError("Features must have a geometry column.")
+        features_crs = _get_geoparquet_crs(features_schema)
+        if features_crs is None and getattr(regions_gdf, "crs", None) is not None:
+            raise ValueError("Features GeoParquet file has an undefined CRS.")
+
+        connection = _get_duckdb_spatial_connection()
+        try:
+            return self._count_geoparquet_features(
+                connection, regions_gdf, features_path, features_crs
+            )
+        finally:
+            connection.close()
+
+    def _count_geoparquet_features(
+        self,
+        connection: "duckdb.DuckDBPyConnection",
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions],
+        features_path: Path,
+        features_crs: Optional[pyproj.CRS],
+    ) -> pd.DataFrame:
+        """
+        Count features from a GeoParquet file in regions with a DuckDB spatial join.
+
+        Counts are aggregated in DuckDB into a long table with a row for each region
+        and feature value, which is then placed in a dense matrix in the order of the columns
+        that the `transform` function would return. If `h3_parent_resolution` is set, regions
+        are joined with features first and each feature is counted once per parent.
+        """
+        embedding_index, embedding_positions = self._get_embedding_index(regions_gdf.index)
+        features_relation = connection.read_parquet(str(features_path))
+        features_types = dict(zip(features_relation.columns, features_relation.dtypes))
+        feature_columns = [
+            column for column in features_types if column not in (FEATURES_INDEX, GEOMETRY_COLUMN)
+        ]
+        are_all_columns_bool = all(
+            str(features_types[column]) == "BOOLEAN" for column in feature_columns
+        )
+
+        if len(features_relation) == 0:
+            if self.expected_output_features is not None:
+                return pd.DataFrame(0, index=embedding_index, columns=self.expected_output_features)
+            else:
+                raise ValueError(
+                    "Cannot embed with empty features and no expected_output_features."
+                )
+        if self.count_subcategories and are_all_columns_bool:
+            raise ValueError("Cannot count subcategories with boolean columns.")
+
+        _insert_duckdb_regions(connection, regions_gdf, embedding_positions, features_crs)
+        features_geometry = (
+            quote_sql_identifier(GEOMETRY_COLUMN)
+            if str(features_types[GEOMETRY_COLUMN]) == "GEOMETRY"
+            else f"ST_GeomFromWKB({quote_sql_identifier(GEOMETRY_COLUMN)})"
+        )
+        quoted_columns = [quote_sql_identifier(column) for column in feature_columns]
+        features_file = quote_sql_literal(str(features_path))
+        connection.sql(
+            f"""
+            CREATE TEMP VIEW features AS
+            SELECT
+                *,
+                ST_XMin(geometry) AS xmin,
+                ST_XMax(geometry) AS xmax,
+                ST_YMin(geometry) AS ymin,
+                ST_YMax(geometry) AS ymax
+            FROM (
+                SELECT
+                    file_row_number AS feature_position,
+                    {features_geometry} AS geometry,
+                    {", ".join(quoted_columns)}
+                FROM read_parquet({features_file}, file_row_number = true)
+            )
+            """
+        )
+        connection.sql(
+            f"""
+            CREATE TEMP VIEW joint AS
+            SELECT DISTINCT
+                regions.embedding_position,
+                features.feature_position,
+                {", ".join(f"features.{c}" for c in quoted_columns)}
+            FROM regions
+            JOIN features
+            ON features.xmin <= regions.xmax
+            AND features.xmax >= regions.xmin
+            AND features.ymin <= regions.ymax
+            AND features.ymax >= regions.ymin
+            AND ST_Intersects(regions.geometry, features.geometry)
+            """
+        )
+
+        if self.count_subcategories:
+            # values are named like the columns of polars' to_dummies, sorted within a column
+            values_df = connection.sql(
+                f"""
+                SELECT DISTINCT feature_column, feature_value
+                FROM (
+                    UNPIVOT (
+                        SELECT {", ".join(f"CAST({c} AS VARCHAR) AS {c}" for c in quoted_columns)}
+                        FROM read_parquet({features_file})
+                    )
+                    ON {", ".join(quoted_columns)}
+                    INTO NAME feature_column VALUE feature_value
+                )
+                """
+            ).df()
+            values_names = values_df["feature_column"] + "_" + values_df["feature_value"]
+            embedding_columns = [
+                name
+                for column in feature_columns
+                for name in sorted(values_names[values_df["feature_column"] == column])
+            ]
+            counts_df = connection.sql(
+                f"""
+                SELECT
+                    embedding_position,
+                    feature_column || '_' || feature_value AS embedding_column,
+                    count(*) AS count
+                FROM (
+                    UNPIVOT (
+                        SELECT
+                            embedding_position,
+                            {", ".join(f"CAST({c} AS VARCHAR) AS {c}" for c in quoted_columns)}
+                        FROM joint
+                    )
+                    ON {", ".join(quoted_columns)}
+                    INTO NAME feature_column VALUE feature_value
+                )
+                GROUP BY ALL
+                """
+            ).df()
+        else:
+            embedding_columns = feature_columns
+            aggregations = [
+                f"sum(CAST({c} AS INTEGER))" if are_all_columns_bool else f"count({c})"
+                for c in quoted_columns
+            ]
+            counts_df = connection.sql(
+                f"""
+                SELECT embedding_position, embedding_column, count
+                FROM (
+                    SELECT
+                        embedding_position,
+                        {", ".join(f"{a} AS {c}" for a, c in zip(aggregations, quoted_columns))}
+                    FROM joint
+                    GROUP BY embedding_position
+                )
+                UNPIVOT (count FOR embedding_column IN ({", ".join(quoted_columns)}))
+                """
+            ).df()
+
+        if self.expected_output_features is not None:
+            embedding_columns = list(self.expected_output_features)
+        column_positions = pd.Index(embedding_columns).get_indexer(counts_df["embedding_column"])
+        counts_df = counts_df[column_positions >= 0]
+        embeddings = np.zeros((len(embedding_index), len(embedding_columns)), dtype=np.int32)
+        embeddings[
+            counts_df["embedding_position"].to_numpy(), column_positions[column_positions >= 0]
+        ] = counts_df["count"].to_numpy()
+
+        return pd.DataFrame(
+            embeddings, index=embedding_index, columns=pd.Index(embedding_columns, dtype=object)
+        )
+
+    def _get_embedding_index(
+        self, regions_index: pd.Index
+    ) -> tuple[pd.Index, npt.NDArray[np.int64]]:
+        """
+        Get the index of the embedding and a position in it for each of the regions.
+
+        Positions are equal to the positions of the regions, unless `h3_parent_resolution`
+        is set. Then the embedding is indexed with sorted parents of the regions.
         """
-        self._validate_indexes(regions_gdf, features_gdf, joint_gdf)
-        if features_gdf.empty:
+        if self.h3_parent_resolution is None:
+            return regions_index, np.arange(len(regions_index), dtype=np.int64)
+
+        parents, positions = np.unique(
+            get_h3_parents(regions_index.to_numpy(), self.h3_parent_resolution),
+            return_inverse=True,
+        )
+        embedding_index = convert_h3_index(
+            parents, "uint64" if pd.api.types.is_integer_dtype(regions_index.dtype) else "str"
+        )
+        return (
+            embedding_index.rename(regions_index.name),
+            positions.astype(np.int64),
+        )
+
+    def _count_features(
+        self,
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame],
+        features_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+        joint_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+    ) -> pd.DataFrame:
+        regions_df, features_df, joint_df = self._prepare_frames(
+            regions_gdf, features_gdf, joint_gdf
+        )
+        if _is_frame_empty(features_df):
             if self.expected_output_features is not None:
-                return pd.DataFrame(
-                    0, index=regions_gdf.index, columns=self.expected_output_features
+                regions_index = (
+                    regions_gdf.index
+                    if isinstance(regions_gdf, (pd.DataFrame, LazyGeometryRegions))
+                    and self.h3_parent_resolution is None
+                    else regions_df.collect().to_pandas().set_index(REGIONS_INDEX).index
+                )
+                return pd.DataFrame(0, index=regions_index, columns=self.expected_output_features)
+            else:
+                raise ValueError(
+                    "Cannot embed with empty features_gdf and no expected_output_features."
                 )
+
+        return (
+            self._count_frames(regions_df, features_df, joint_df)
+            .to_pandas()
+            .set_index(REGIONS_INDEX)
+        )
+
+    def _count_features_polars(
+        self,
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame],
+        features_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+        joint_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+    ) -> pl.DataFrame:
+        regions_df, features_df, joint_df = self._prepare_frames(
+            regions_gdf, features_gdf, joint_gdf
+        )
+        if _is_frame_empty(features_df):
+            if self.expected_output_features is not None:
+                return regions_df.with_columns(
+                    [pl.lit(0, pl.Int32).alias(col) for col in self.expected_output_features]
+                ).collect()
             else:
                 raise ValueError(
                     "Cannot embed with empty features_gdf and no expected_output_features."
                 )
 
-        regions_df = pl.from_pandas(regions_gdf[[]], include_index=True).lazy()
-        features_df = pl.from_pandas(
-            features_gdf.drop(columns=GEOMETRY_COLUMN), include_index=True
-        ).lazy()
-        joint_df = pl.from_pandas(joint_gdf[[]], include_index=True).lazy()
+        return self._count_frames(regions_df, features_df, joint_df)
 
+    def _prepare_frames(
+        self,
+        regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions, ArrowOrPolarsFrame],
+        features_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+        joint_gdf: Union[gpd.GeoDataFrame, ArrowOrPolarsFrame],
+    ) -> tuple[pl.LazyFrame, pl.LazyFrame, pl.LazyFrame]:
+        """
+        Validate the inputs and convert them into polars LazyFrames.
+
+        Pandas inputs are validated by their indexes and converted with the indexes as columns.
+        Arrow and polars inputs are used without copies and have to contain `region_id` and
+        `feature_id` columns instead of indexes. Geometries are dropped in both cases.
+        """
+        if all(
+            isinstance(data, (pd.DataFrame, LazyGeometryRegions))
+            for data in (regions_gdf, features_gdf, joint_gdf)
+        ):
+            self._validate_indexes(
+                regions_gdf,
+                cast("gpd.GeoDataFrame", features_gdf),
+                cast("gpd.GeoDataFrame", joint_gdf),
+            )
+
+        regions_df = _to_lazy_frame(regions_gdf, [REGIONS_INDEX], "regions_gdf").select(
+            REGIONS_INDEX
+        )
+        features_df = _to_lazy_frame(features_gdf, [FEATURES_INDEX], "features_gdf")
+        joint_df = _to_lazy_frame(joint_gdf, [REGIONS_INDEX, FEATURES_INDEX], "joint_gdf").select(
+            [REGIONS_INDEX, FEATURES_INDEX]
+        )
+        if self.h3_parent_resolution is not None:
+            regions_df, joint_df = self._map_frames_to_h3_parents(regions_df, joint_df)
+        return regions_df, features_df.drop(GEOMETRY_COLUMN, strict=False), joint_df
+
+    def _map_frames_to_h3_parents(
+        self, regions_df: pl.LazyFrame, joint_df: pl.LazyFrame
+    ) -> tuple[pl.LazyFrame, pl.LazyFrame]:
+        """
+        Replace regions with their H3 parents in regions and joint frames.
+
+        Duplicated parent-feature pairs are dropped from the joint frame, so a feature joined
+        with multiple children of a parent is counted only once.
+        """
+        assert self.h3_parent_resolution is not None
+        regions = regions_df.collect().to_series()
+        parents = pl.Series(
+            get_h3_parents(regions.to_arrow(), self.h3_parent_resolution), dtype=pl.UInt64
+        )
+        if regions.dtype == pl.String:
+            parents = pl.Series(convert_h3_index(parents.to_numpy(), "str").to_numpy())
+        else:
+            parents = parents.cast(regions.dtype)
+        parents_df = pl.DataFrame({REGIONS_INDEX: regions, "h3_parent": parents}).lazy()
+
+        return (
+            parents_df.select(pl.col("h3_parent").alias(REGIONS_INDEX))
+            .unique()
+            .sort(REGIONS_INDEX),
+            joint_df.join(parents_df, on=REGIONS_INDEX, how="inner")
+            .select([pl.col("h3_parent").alias(REGIONS_INDEX), FEATURES_INDEX])
+            .unique(),
+        )
+
+    def _count_frames(
+        self, regions_df: pl.LazyFrame, features_df: pl.LazyFrame, joint_df: pl.LazyFrame
+    ) -> pl.DataFrame:
         features_schema = features_df.collect_schema()
         feature_columns = [col for col in features_schema.names() if col != FEATURES_INDEX]
         dtypes = features_schema.dtypes()
@@ -135,23 +566,16 @@ class CountEmbedder(Embedder):
             region_embeddings, feature_columns
         )
 
-        region_embeddings_df = (
-            (
-                regions_df.join(region_embeddings, on=REGIONS_INDEX, how="left")
-                .fill_null(0)
-                .with_columns(
-                    [
-                        pl.col(REGIONS_INDEX),
-                        *(pl.col(col).cast(pl.Int32) for col in feature_columns),
-                    ]
-                )
+        return (
+            regions_df.join(region_embeddings, on=REGIONS_INDEX, how="left")
+            .fill_null(0)
+            .with_columns(
+                [
+                    pl.col(REGIONS_INDEX),
+                    *(pl.col(col).cast(pl.Int32) for col in feature_columns),
+                ]
             )
-            .collect(streaming=True)
-            .to_pandas()
-            .set_index(REGIONS_INDEX)
-        )
-
-        return region_embeddings_df
+        ).collect(streaming=True)
 
     def _parse_expected_output_features(
         self,
@@ -247,3 +671,126 @@ class CountEmbedder(Embedder):
             [pl.lit(0, pl.Int32).alias(col) for col in missing_features]
         ).select([REGIONS_INDEX, *self.expected_output_features])
         return region_embeddings, list(self.expected_output_features)
+
+
+def _to_lazy_frame(
+    data: Union[pd.DataFrame, LazyGeometryRegions, ArrowOrPolarsFrame],
+    index_columns: list[str],
+    name: str,
+) -> pl.LazyFrame:
+    """
+    Convert embedder input into a polars LazyFrame with index columns.
+
+    Pandas indexes are converted into columns. Arrow Tables are converted without copies,
+    and geometries are dropped from them before the conversion.
+    """
+    frame: pl.LazyFrame
+    if isinstance(data, LazyGeometryRegions):
+        frame = pl.from_pandas(pd.DataFrame(index=data.index), include_index=True).lazy()
+    elif isinstance(data, pd.DataFrame):
+        if index_columns == [FEATURES_INDEX]:
+            data = data.drop(columns=GEOMETRY_COLUMN, errors="ignore")
+        else:
+            data = data[[]]
+        frame = pl.from_pandas(pd.DataFrame(data), include_index=True).lazy()
+    elif isinstance(data, pa.Table):
+        if GEOMETRY_COLUMN in data.column_names:
+            data = data.drop_columns([GEOMETRY_COLUMN])
+        frame = cast("pl.DataFrame", pl.from_arrow(data)).lazy()
+    elif isinstance(data, pl.DataFrame):
+        frame = data.lazy()
+    else:
+        frame = data
+
+    missing_columns = [
+        column for column in index_columns if column not in frame.collect_schema().names()
+    ]
+    if missing_columns:
+        raise ValueError(f"{name} must contain {missing_columns} columns or index levels.")
+    return frame
+
+
+def _is_frame_empty(frame: pl.LazyFrame) -> bool:
+    return bool(frame.select(pl.len()).collect().item() == 0)
+
+
+def _get_duckdb_spatial_connection() -> "duckdb.DuckDBPyConnection":
+    """Create an in-memory DuckDB connection with the spatial extension loaded."""
+    import duckdb
+
+    connection = duckdb.connect()
+    connection.install_extension("spatial")
+    connection.load_extension("spatial")
+    return connection
+
+
+def _get_geoparquet_crs(schema: pa.Schema) -> Optional[pyproj.CRS]:
+    """
+    Read the CRS of the geometry column from the `geo` metadata of a GeoParquet file.
+
+    A missing CRS defaults to WGS84 (OGC:CRS84), as in the GeoParquet specification,
+    and an explicit null means an undefined CRS.
+    """
+    geo_metadata = json.loads((schema.metadata or {}).get(b"geo", b"{}"))
+    column_metadata = geo_metadata.get("columns", {}).get(GEOMETRY_COLUMN, {})
+    if "crs" not in column_metadata:
+        return pyproj.CRS.from_user_input(WGS84_CRS)
+    if column_metadata["crs"] is None:
+        return None
+    return pyproj.CRS.from_user_input(column_metadata["crs"])
+
+
+def _insert_duckdb_regions(
+    connection: "duckdb.DuckDBPyConnection",
+    regions_gdf: Union[gpd.GeoDataFrame, LazyGeometryRegions],
+    embedding_positions: npt.NDArray[np.int64],
+    crs: Optional[pyproj.CRS],
+) -> None:
+    """Save embedding rows positions, geometries and bounding boxes of regions in a DuckDB table."""
+    if isinstance(regions_gdf, LazyGeometryRegions):
+        regions_chunks = regions_gdf.iter_chunks(_DUCKDB_REGIONS_CHUNK_SIZE)
+    else:
+        regions_chunks = iter([regions_gdf])
+
+    connection.sql(
+        """
+        CREATE TEMP TABLE regions (
+            embedding_position BIGINT,
+            geometry GEOMETRY,
+            xmin DOUBLE,
+            ymin DOUBLE,
+            xmax DOUBLE,
+            ymax DOUBLE
+        )
+        """
+    )
+    chunk_start = 0
+    for regions_chunk in regions_chunks:
+        regions_geometries = (
+            regions_chunk[GEOMETRY_COLUMN].to_crs(crs)
+            if regions_chunk.crs is not None and crs is not None
+            else regions_chunk[GEOMETRY_COLUMN]
+        ).to_numpy()
+        bounds = shapely.bounds(regions_geometries).reshape(-1, 4)
+        regions_table = pa.table(
+            {
+                "embedding_position": embedding_positions[
+                    chunk_start : chunk_start + len(regions_chunk)
+                ],
+                "geometry_wkb": shapely.to_wkb(regions_geometries),
+                "xmin": bounds[:, 0],
+                "ymin": bounds[:, 1],
+                "xmax": bounds[:, 2],
+                "ymax": bounds[:, 3],
+            }
+        )
+        connection.register("regions_chunk", regions_table)
+        connection.sql(
+            """
+            INSERT INTO regions
+            SELECT embedding_position, ST_GeomFromWKB(geometry_wkb), xmin, ymin, xmax, ymax
+            FROM regions_chunk
+            """
+        )
+        connection.unregister("regions_chunk")
+        chunk_start += len(regions_chunk)
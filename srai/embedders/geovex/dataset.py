@@ -11,12 +11,11 @@ References:
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
-from tqdm import tqdm
 
 from srai._optional import import_optional_dependencies
-from srai.constants import FORCE_TERMINAL
-from srai.h3 import get_local_ij_index
+from srai.h3 import convert_h3_index, get_local_ij_indexes
 from srai.neighbourhoods import H3Neighbourhood
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -31,11 +30,6 @@ except ImportError:
 
 T = TypeVar("T")
 
-# define a type for the dataset item
-Ij_Index = tuple[int, int]
-Neighbors = list[tuple[int, Ij_Index]]
-CellInfo = tuple[str, int, Neighbors]
-
 
 class HexagonalDataset(Dataset["torch.Tensor"], Generic[T]):  # type: ignore
     """
@@ -70,13 +64,16 @@ class HexagonalDataset(Dataset["torch.Tensor"], Generic[T]):  # type: ignore
         self._k: int = neighbor_k_ring
         # number of columns in the dataset
         self._N: int = data.shape[1]
-        # store the list of valid h3 indices (have all the neighbors in the dataset)
-        self._valid_cells: list[CellInfo] = []
         # store the data as a torch tensor
         self._data_torch = torch.Tensor(data.to_numpy(dtype=np.float32))
-        # iterate over the data and build the valid h3 indices
-        self._invalid_cells, self._valid_cells = self._seperate_valid_invalid_cells(
-            data, neighbourhood, neighbor_k_ring, set(data.index)
+        self._index = data.index
+        # positions of the valid h3 indices (have all the neighbors in the dataset),
+        # with positions and local ij indexes of their neighbors
+        self._valid_positions: npt.NDArray[np.int64]
+        self._neighbors_positions: npt.NDArray[np.int64]
+        self._neighbors_ijs: npt.NDArray[np.int16]
+        self._valid_positions, self._neighbors_positions, self._neighbors_ijs = (
+            self._seperate_valid_invalid_cells(data, neighbourhood, neighbor_k_ring)
         )
 
     def _seperate_valid_invalid_cells(
@@ -84,33 +81,40 @@ class HexagonalDataset(Dataset["torch.Tensor"], Generic[T]):  # type: ignore
         data: pd.DataFrame,
         neighbourhood: H3Neighbourhood,
         neighbor_k_ring: int,
-        all_indices: set[str],
-    ) -> tuple[set[str], list[CellInfo]]:
-        invalid_h3s = set()
-        valid_h3s = []
-
-        for h3_index in tqdm(data.index, total=len(data), disable=FORCE_TERMINAL):
-            neighbors = neighbourhood.get_neighbours_up_to_distance(
-                h3_index, neighbor_k_ring, include_center=False, unchecked=True
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int16]]:
+        # number of neighbors in a k-ring not distorted by a pentagon
+        num_of_neighbors = 3 * neighbor_k_ring * (neighbor_k_ring + 1)
+        if len(data) == 0:
+            return (
+                np.zeros(0, dtype=np.int64),
+                np.zeros((0, num_of_neighbors), dtype=np.int64),
+                np.zeros((0, num_of_neighbors, 2), dtype=np.int16),
             )
-            # check if all the neighbors are in the dataset
-            if len(neighbors.intersection(all_indices)) == len(neighbors):
-                # add the h3_index to the valid h3 indices, with the ring of neighbors
-                valid_h3s.append(
-                    (
-                        h3_index,
-                        data.index.get_loc(h3_index),
-                        [
-                            # get the index of the h3 in the dataset
-                            (data.index.get_loc(_h), get_local_ij_index(h3_index, _h))
-                            for _h in neighbors
-                        ],
-                    )
-                )
-            else:
-                # some of the neighbors are not in the dataset, add the h3_index to the invalid h3s
-                invalid_h3s.add(h3_index)
-        return invalid_h3s, valid_h3s
+
+        h3_cells = convert_h3_index(data.index, "uint64").to_numpy()
+        offsets, neighbor_cells = neighbourhood.get_neighbours_cells(
+            h3_cells, neighbor_k_ring, include_center=False
+        )
+
+        # find positions of the neighbors in the dataset, or -1 if they aren't present
+        sorter = np.argsort(h3_cells)
+        sorted_positions = np.searchsorted(h3_cells, neighbor_cells, sorter=sorter)
+        sorted_positions[sorted_positions == len(h3_cells)] = 0
+        neighbor_positions = sorter[sorted_positions]
+        neighbor_positions[h3_cells[neighbor_positions] != neighbor_cells] = -1
+
+        # a cell is valid if it has a complete ring of neighbors, all of them in the dataset
+        rows = np.repeat(np.arange(len(h3_cells)), np.diff(offsets))
+        missing_neighbors = np.bincount(rows[neighbor_positions < 0], minlength=len(h3_cells))
+        valid_mask = (np.diff(offsets) == num_of_neighbors) & (missing_neighbors == 0)
+        valid_positions = np.flatnonzero(valid_mask).astype(np.int64)
+
+        rows_mask = valid_mask[rows]
+        valid_neighbor_positions = neighbor_positions[rows_mask].reshape(-1, num_of_neighbors)
+        valid_neighbor_ijs = get_local_ij_indexes(
+            h3_cells[valid_positions], neighbor_cells[rows_mask].reshape(-1, num_of_neighbors)
+        )
+        return valid_positions, valid_neighbor_positions.astype(np.int64), valid_neighbor_ijs
 
     def __len__(self) -> int:
         """
@@ -119,7 +123,7 @@ class HexagonalDataset(Dataset["torch.Tensor"], Generic[T]):  # type: ignore
         Returns:
             int: Number of valid h3 indices in the dataset.
         """
-        return len(self._valid_cells)
+        return len(self._valid_positions)
 
     def __getitem__(self, index: Any) -> "torch.Tensor":
         """
@@ -131,10 +135,18 @@ class HexagonalDataset(Dataset["torch.Tensor"], Generic[T]):  # type: ignore
         Returns:
             HexagonalDatasetItem: The dataset item
         """
-        _, target_idx, neighbors_idxs = self._valid_cells[index]
-        return self._build_tensor(target_idx, neighbors_idxs)
+        return self._build_tensor(
+            int(self._valid_positions[index]),
+            self._neighbors_positions[index],
+            self._neighbors_ijs[index],
+        )
 
-    def _build_tensor(self, target_idx: int, neighbors_idxs: Neighbors) -> "torch.Tensor":
+    def _build_tensor(
+        self,
+        target_idx: int,
+        neighbors_idxs: npt.NDArray[np.int64],
+        neighbors_ijs: npt.NDArray[np.int16],
+    ) -> "torch.Tensor":
         import torch
 
         # build the 3d tensor
@@ -159,8 +171,9 @@ class HexagonalDataset(Dataset["torch.Tensor"], Generic[T]):  # type: ignore
         ] = self._data_torch[target_idx]
 
         # set the neighbors of the target h3 to the diagonals of the tensor
-        for neighbor_idx, (i, j) in neighbors_idxs:
-            tensor[:, self._k + i, self._k - j] = self._data_torch[neighbor_idx]
+        i = torch.from_numpy(self._k + neighbors_ijs[:, 0].astype(np.int64))
+        j = torch.from_numpy(self._k - neighbors_ijs[:, 1].astype(np.int64))
+        tensor[:, i, j] = self._data_torch[torch.from_numpy(neighbors_idxs)].T
 
         # return the tensor and the target (which is same as the tensor)
         # should we return the target as a copy of the tensor?
@@ -185,7 +198,8 @@ class HexagonalDataset(Dataset["torch.Tensor"], Generic[T]):  # type: ignore
         Returns:
             List[str]: List of valid h3 indices in the dataset.
         """
-        return [h3_index for h3_index, _, _ in self._valid_cells]
+        valid_cells: list[str] = self._index[self._valid_positions].tolist()
+        return valid_cells
 
     def get_invalid_cells(self) -> list[str]:
         """
@@ -194,4 +208,7 @@ class HexagonalDataset(Dataset["torch.Tensor"], Generic[T]):  # type: ignore
         Returns:
             List[str]: List of invalid h3 indices in the dataset.
         """
-        return list(self._invalid_cells)
+        invalid_mask = np.ones(len(self._index), dtype=bool)
+        invalid_mask[self._valid_positions] = False
+        invalid_cells: list[str] = self._index[invalid_mask].tolist()
+        return invalid_cells
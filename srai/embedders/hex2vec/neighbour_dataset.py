@@ -11,12 +11,13 @@ References:
 from typing import TYPE_CHECKING, Any, Generic, NamedTuple, TypeVar
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from tqdm import tqdm
 
 from srai._optional import import_optional_dependencies
 from srai.constants import FORCE_TERMINAL
-from srai.neighbourhoods import Neighbourhood
+from srai.neighbourhoods import Neighbourhood, NeighbourhoodCSR
 
 if TYPE_CHECKING:  # pragma: no cover
     import torch
@@ -98,30 +99,43 @@ class NeighbourDataset(Dataset[NeighbourDatasetItem], Generic[T]):  # type: igno
         self._build_lookup_tables(data, neighbourhood)
 
     def _build_lookup_tables(self, data: pd.DataFrame, neighbourhood: Neighbourhood[T]) -> None:
-        anchor_df_locs_lookup: list[int] = []
-        positive_df_locs_lookup: list[int] = []
-
-        for region_df_loc, region_index in tqdm(
-            enumerate(data.index), total=len(data), disable=FORCE_TERMINAL
-        ):
-            region_direct_neighbours = neighbourhood.get_neighbours(region_index)
-            neighbours_df_locs: set[int] = {
-                self._region_index_to_df_loc[neighbour_index]
-                for neighbour_index in region_direct_neighbours
-            }
-            anchor_df_locs_lookup.extend([region_df_loc] * len(neighbours_df_locs))
-            positive_df_locs_lookup.extend(neighbours_df_locs)
-
-            indices_excluded_from_negatives = neighbourhood.get_neighbours_up_to_distance(
-                region_index, self._negative_sample_k_distance
+        self._anchor_df_locs_lookup = np.array([], dtype=np.int64)
+        self._positive_df_locs_lookup = np.array([], dtype=np.int64)
+        if data.empty:
+            return
+
+        with tqdm(total=2, disable=FORCE_TERMINAL) as pbar:
+            direct_neighbours = neighbourhood.get_neighbours_batch(data.index, 1)
+            anchor_df_locs, positive_df_locs = self._neighbours_to_df_locs(data, direct_neighbours)
+            self._anchor_df_locs_lookup = anchor_df_locs
+            self._positive_df_locs_lookup = positive_df_locs
+            pbar.update()
+
+            neighbours_excluded_from_negatives = neighbourhood.get_neighbours_batch(
+                data.index, self._negative_sample_k_distance
             )
-            self._excluded_from_negatives[region_df_loc] = {
-                self._region_index_to_df_loc[excluded_index]
-                for excluded_index in indices_excluded_from_negatives
+            region_df_locs, excluded_df_locs = self._neighbours_to_df_locs(
+                data, neighbours_excluded_from_negatives
+            )
+            splits = np.searchsorted(region_df_locs, np.arange(1, len(data)))
+            self._excluded_from_negatives = {
+                region_df_loc: set(region_excluded_df_locs.tolist())
+                for region_df_loc, region_excluded_df_locs in enumerate(
+                    np.split(excluded_df_locs, splits)
+                )
             }
-
-        self._anchor_df_locs_lookup = np.array(anchor_df_locs_lookup)
-        self._positive_df_locs_lookup = np.array(positive_df_locs_lookup)
+            pbar.update()
+
+    def _neighbours_to_df_locs(
+        self, data: pd.DataFrame, neighbours: NeighbourhoodCSR
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Convert neighbours of all the regions into pairs of region and neighbour df locs."""
+        region_df_locs = np.repeat(np.arange(len(data), dtype=np.int64), np.diff(neighbours.indptr))
+        neighbour_df_locs = np.asarray(data.index.get_indexer(neighbours.index), dtype=np.int64)[
+            neighbours.indices
+        ]
+        existing_neighbours_mask = neighbour_df_locs >= 0
+        return region_df_locs[existing_neighbours_mask], neighbour_df_locs[existing_neighbours_mask]
 
     def __len__(self) -> int:
         """
@@ -1,48 +1,147 @@
 """Utility H3 related functions."""
 
-from collections.abc import Iterable
-from typing import Literal, Union, overload
+import multiprocessing
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Literal, NamedTuple, Optional, Union, overload
 
 import geopandas as gpd
 import h3
 import numpy as np
 import numpy.typing as npt
+import pandas as pd
+import pyarrow as pa
+import shapely
 from h3ronpy import __version__ as h3ronpy_version
 from packaging import version
-from shapely.geometry import Polygon
+from shapely.geometry import GeometryCollection, Polygon
 from shapely.geometry.base import BaseGeometry
+from tqdm import tqdm
 
-from srai.constants import GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
+from srai._multiprocessing import (
+    parse_multiprocessing_activation_threshold,
+    parse_num_of_multiprocessing_workers,
+)
+from srai.constants import FORCE_TERMINAL, GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
 
 is_new_h3ronpy_api = version.parse(h3ronpy_version) >= version.parse("0.22.0")
 
 if is_new_h3ronpy_api:
-    from h3ronpy import ContainmentMode, cells_to_string, grid_disk
-    from h3ronpy.vector import cells_to_wkb_polygons, wkb_to_cells
+    from h3ronpy import (
+        ContainmentMode,
+        cells_parse,
+        cells_resolution,
+        cells_to_localij,
+        cells_to_string,
+        cells_valid,
+        change_resolution,
+        change_resolution_list,
+        compact,
+        grid_disk,
+        grid_disk_distances,
+        uncompact,
+    )
+    from h3ronpy.vector import cells_to_wkb_polygons, coordinates_to_cells, wkb_to_cells
 else:
-    from h3ronpy.arrow import cells_to_string, grid_disk
+    from h3ronpy.arrow import (
+        cells_parse,
+        cells_resolution,
+        cells_to_localij,
+        cells_to_string,
+        cells_valid,
+        change_resolution,
+        change_resolution_list,
+        compact,
+        grid_disk,
+        grid_disk_distances,
+        uncompact,
+    )
     from h3ronpy.arrow.vector import (
         ContainmentMode,
         cells_to_wkb_polygons,
+        coordinates_to_cells,
         wkb_to_cells,
     )
 
+DEFAULT_H3_BATCH_SIZE = 1_000_000
+
+# Number of cells in a tile filled by a single worker (tiles are 4 resolutions coarser).
+_MULTIPROCESSING_TILE_SIZE = 7**4
+
 __all__ = [
     "shapely_geometry_to_h3",
+    "shapely_geometry_to_h3_batches",
     "h3_to_geoseries",
     "h3_to_shapely_geometry",
     "get_local_ij_index",
+    "get_local_ij_indexes",
     "ring_buffer_h3_indexes",
     "ring_buffer_geometry",
     "ring_buffer_h3_regions_gdf",
+    "convert_h3_index",
+    "compact_h3_cells",
+    "uncompact_h3_cells",
+    "uncompact_h3_cells_batches",
+    "get_compacted_h3_parents",
+    "get_h3_parents",
+    "roll_up_h3_regions_df",
+    "drill_down_h3_regions_df",
+    "H3GeometryCacheInfo",
+    "set_h3_geometry_cache_size",
+    "get_h3_geometry_cache_info",
+    "clear_h3_geometry_cache",
 ]
 
 
+@overload
+def shapely_geometry_to_h3(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    h3_resolution: int,
+    buffer: bool = True,
+    return_type: Literal["str"] = "str",
+    num_of_multiprocessing_workers: int = 1,
+    multiprocessing_activation_threshold: Optional[int] = None,
+    compact: bool = False,
+) -> list[str]: ...
+
+
+@overload
+def shapely_geometry_to_h3(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    h3_resolution: int,
+    buffer: bool = True,
+    *,
+    return_type: Literal["uint64"],
+    num_of_multiprocessing_workers: int = 1,
+    multiprocessing_activation_threshold: Optional[int] = None,
+    compact: bool = False,
+) -> npt.NDArray[np.uint64]: ...
+
+
+@overload
+def shapely_geometry_to_h3(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    h3_resolution: int,
+    buffer: bool,
+    return_type: Literal["uint64"],
+    num_of_multiprocessing_workers: int = 1,
+    multiprocessing_activation_threshold: Optional[int] = None,
+    compact: bool = False,
+) -> npt.NDArray[np.uint64]: ...
+
+
 def shapely_geometry_to_h3(
     geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
     h3_resolution: int,
     buffer: bool = True,
-) -> list[str]:
+    return_type: Literal["str", "uint64"] = "str",
+    num_of_multiprocessing_workers: int = 1,
+    multiprocessing_activation_threshold: Optional[int] = None,
+    compact: bool = False,
+) -> Union[list[str], npt.NDArray[np.uint64]]:
     """
     Convert Shapely geometry to H3 indexes.
 
@@ -52,9 +151,23 @@ def shapely_geometry_to_h3(
         h3_resolution (int): H3 resolution of the cells. See [1] for a full comparison.
         buffer (bool, optional): Whether to fully cover the geometries with
             H3 Cells (visible on the borders). Defaults to True.
+        return_type (Literal["str", "uint64"], optional): Whether to return a list of H3 string
+            indexes or a sorted numpy array of uint64 cells without any string conversion.
+            Defaults to "str".
+        num_of_multiprocessing_workers (int, optional): Number of workers used for
+            multiprocessing. The area is split into tiles of coarse cells, which are filled
+            with cells in parallel. Defaults to 1 (no multiprocessing). If -1, all available
+            threads are used. If 0, also no multiprocessing is used.
+        multiprocessing_activation_threshold (int, optional): Number of tiles required to
+            start processing in multiple processes. Each tile has up to 2401 cells
+            (4 resolutions coarser). Defaults to 100.
+        compact (bool, optional): Whether to compact the cells, recursively replacing all
+            the children of a parent with the parent itself. The result is a set of cells with
+            mixed resolutions (not finer than `h3_resolution`) covering the same area, which can
+            be expanded back with `uncompact_h3_cells`. Defaults to False.
 
     Returns:
-        List[str]: List of H3 indexes that cover a given geometry.
+        Union[List[str], npt.NDArray[np.uint64]]: H3 indexes that cover a given geometry.
 
     Raises:
         ValueError: If resolution is not between 0 and 15.
@@ -64,6 +177,23 @@ def shapely_geometry_to_h3(
     """
     if not (0 <= h3_resolution <= 15):
         raise ValueError(f"Resolution {h3_resolution} is not between 0 and 15.")
+    _check_return_type(return_type)
+
+    num_of_multiprocessing_workers = parse_num_of_multiprocessing_workers(
+        num_of_multiprocessing_workers
+    )
+    multiprocessing_activation_threshold = parse_multiprocessing_activation_threshold(
+        multiprocessing_activation_threshold, 100
+    )
+    if num_of_multiprocessing_workers > 1:
+        h3_tiles = _get_h3_tiles(geometry, h3_resolution, _MULTIPROCESSING_TILE_SIZE)
+        if h3_tiles is not None and len(h3_tiles.tiles) >= multiprocessing_activation_threshold:
+            h3_cells = _fill_h3_tiles_in_parallel(
+                h3_tiles, h3_resolution, buffer, num_of_multiprocessing_workers
+            )
+            return _format_h3_cells(
+                _compact_h3_cells(h3_cells) if compact else h3_cells, return_type
+            )
 
     wkb = []
     if isinstance(geometry, gpd.GeoSeries):
@@ -75,27 +205,109 @@ def shapely_geometry_to_h3(
     else:
         wkb = [geometry.wkb]
 
-    containment_mode = ContainmentMode.Covers if buffer else ContainmentMode.ContainsCentroid
-    h3_indexes = wkb_to_cells(
-        wkb, resolution=h3_resolution, containment_mode=containment_mode, flatten=True
-    )
+    h3_cells = np.unique(_wkb_to_h3_cells(wkb, h3_resolution, buffer))
+    if compact:
+        h3_cells = _compact_h3_cells(h3_cells)
+
+    return _format_h3_cells(h3_cells, return_type)
+
+
+@overload
+def shapely_geometry_to_h3_batches(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    h3_resolution: int,
+    buffer: bool = True,
+    batch_size: int = DEFAULT_H3_BATCH_SIZE,
+    return_type: Literal["str"] = "str",
+) -> Iterator[list[str]]: ...
+
+
+@overload
+def shapely_geometry_to_h3_batches(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    h3_resolution: int,
+    buffer: bool = True,
+    batch_size: int = DEFAULT_H3_BATCH_SIZE,
+    *,
+    return_type: Literal["uint64"],
+) -> Iterator[npt.NDArray[np.uint64]]: ...
 
-    if is_new_h3ronpy_api:
-        h3_indexes = np.unique(h3_indexes.to_numpy())
-    else:
-        h3_indexes = h3_indexes.unique()
 
-    return [h3.int_to_str(h3_index) for h3_index in h3_indexes.tolist()]
+def shapely_geometry_to_h3_batches(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    h3_resolution: int,
+    buffer: bool = True,
+    batch_size: int = DEFAULT_H3_BATCH_SIZE,
+    return_type: Literal["str", "uint64"] = "str",
+) -> Iterator[Union[list[str], npt.NDArray[np.uint64]]]:
+    """
+    Convert Shapely geometry to H3 indexes in batches of bounded size.
+
+    Streaming version of `shapely_geometry_to_h3` for very large areas. The area is tiled by
+    coarse parent cells and each tile is filled separately, so the peak memory usage depends
+    on the batch size instead of the size of the area. Each cell is assigned to the tile of its
+    parent, so the cells are unique across all the batches. Together, the batches contain the
+    same cells as the result of `shapely_geometry_to_h3`, also next to the antimeridian. Single
+    polygons wider than 180 degrees of longitude are treated by H3 as crossing the antimeridian
+    and should be split before the conversion.
+
+    Args:
+        geometry (Union[BaseGeometry, Iterable[BaseGeometry], GeoSeries, GeoDataFrame]):
+            Shapely geometry to be converted. Expected to be in WGS84 coordinates.
+        h3_resolution (int): H3 resolution of the cells. See [1] for a full comparison.
+        buffer (bool, optional): Whether to fully cover the geometries with
+            H3 Cells (visible on the borders). Defaults to True.
+        batch_size (int, optional): Maximal number of cells in a single batch.
+            Defaults to 1 000 000.
+        return_type (Literal["str", "uint64"], optional): Whether to return batches as lists of
+            H3 string indexes or numpy arrays of uint64 cells. Defaults to "str".
+
+    Yields:
+        Union[List[str], npt.NDArray[np.uint64]]: Batches of unique H3 indexes that cover
+            a given geometry. Cells are sorted within each tile, but not globally.
+
+    Raises:
+        ValueError: If resolution is not between 0 and 15.
+        ValueError: If batch_size is not positive.
+
+    References:
+        1. https://h3geo.org/docs/core-library/restable/
+    """
+    if not (0 <= h3_resolution <= 15):
+        raise ValueError(f"Resolution {h3_resolution} is not between 0 and 15.")
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive, but was {batch_size}.")
+    _check_return_type(return_type)
+
+    pending_batches: list[npt.NDArray[np.uint64]] = []
+    pending_cells = 0
+    for tile_cells in _iter_h3_tiles_cells(geometry, h3_resolution, buffer, batch_size):
+        pending_batches.append(tile_cells)
+        pending_cells += len(tile_cells)
+        while pending_cells >= batch_size:
+            cells = np.concatenate(pending_batches)
+            yield _format_h3_cells(cells[:batch_size], return_type)
+            pending_batches = [cells[batch_size:]]
+            pending_cells = len(pending_batches[0])
+
+    if pending_cells > 0:
+        yield _format_h3_cells(np.concatenate(pending_batches), return_type)
 
 
 # TODO: write tests (#322)
-def h3_to_geoseries(h3_index: Union[int, str, Iterable[Union[int, str]]]) -> gpd.GeoSeries:
+def h3_to_geoseries(
+    h3_index: Union[int, str, Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+) -> gpd.GeoSeries:
     """
     Convert H3 index to GeoPandas GeoSeries.
 
+    If the geometry cache is enabled with `set_h3_geometry_cache_size`, polygons are generated
+    only for the cells missing from the cache.
+
     Args:
-        h3_index (Union[int, str, Iterable[Union[int, str]]]): H3 index (or list of indexes)
-            to be converted.
+        h3_index (Union[int, str, Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]):
+            H3 index (or list of indexes) to be converted. Numpy and pyarrow arrays of uint64
+            cells are passed to the conversion directly.
 
     Returns:
         GeoSeries: Geometries as GeoSeries with default CRS applied.
@@ -103,10 +315,10 @@ def h3_to_geoseries(h3_index: Union[int, str, Iterable[Union[int, str]]]) -> gpd
     if isinstance(h3_index, (str, int)):
         return h3_to_geoseries([h3_index])
     else:
-        h3_int_indexes = list(
-            h3_cell if isinstance(h3_cell, int) else h3.str_to_int(h3_cell) for h3_cell in h3_index
-        )
-        return gpd.GeoSeries.from_wkb(cells_to_wkb_polygons(h3_int_indexes), crs=WGS84_CRS)
+        h3_cells = _to_h3_cells(h3_index)
+        if _H3_GEOMETRY_CACHE.max_size_bytes == 0:
+            return gpd.GeoSeries.from_wkb(cells_to_wkb_polygons(h3_cells), crs=WGS84_CRS)
+        return gpd.GeoSeries.from_wkb(_H3_GEOMETRY_CACHE.get_wkb(h3_cells), crs=WGS84_CRS)
 
 
 @overload
@@ -150,7 +362,7 @@ def get_local_ij_index(
 @overload
 def get_local_ij_index(
     origin_index: str, h3_index: list[str], return_as_numpy: Literal[True]
-) -> npt.NDArray[np.int8]: ...
+) -> npt.NDArray[np.int16]: ...
 
 
 # Last fallback needed as per documentation:
@@ -158,12 +370,12 @@ def get_local_ij_index(
 @overload
 def get_local_ij_index(
     origin_index: str, h3_index: list[str], return_as_numpy: bool
-) -> Union[list[tuple[int, int]], npt.NDArray[np.int8]]: ...
+) -> Union[list[tuple[int, int]], npt.NDArray[np.int16]]: ...
 
 
 def get_local_ij_index(
     origin_index: str, h3_index: Union[str, list[str]], return_as_numpy: bool = False
-) -> Union[tuple[int, int], list[tuple[int, int]], npt.NDArray[np.int8]]:
+) -> Union[tuple[int, int], list[tuple[int, int]], npt.NDArray[np.int16]]:
     """
     Calculate the local H3 ij index based on provided origin index.
 
@@ -177,53 +389,134 @@ def get_local_ij_index(
             or a list of tuples.
 
     Returns:
-        Union[Tuple[int, int], List[Tuple[int, int]], npt.NDArray[np.int8]]: The local ij index of
+        Union[Tuple[int, int], List[Tuple[int, int]], npt.NDArray[np.int16]]: The local ij index of
             the second region (or regions) with respect to the first one.
     """
-    origin_coords = h3.cell_to_local_ij(origin_index, origin_index)
     if isinstance(h3_index, str):
+        origin_coords = h3.cell_to_local_ij(origin_index, origin_index)
         ijs = h3.cell_to_local_ij(origin_index, h3_index)
         return (origin_coords[0] - ijs[0], origin_coords[1] - ijs[1])
-    ijs = np.array([h3.cell_to_local_ij(origin_index, h3_cell) for h3_cell in h3_index])
-    local_ijs = np.array(origin_coords) - ijs
+    local_ijs = get_local_ij_indexes(np.repeat(origin_index, len(h3_index)), h3_index)
 
     if not return_as_numpy:
-        local_ijs = [(coords[0], coords[1]) for coords in local_ijs]
+        return [(i, j) for i, j in local_ijs.tolist()]
 
     return local_ijs
 
 
-def ring_buffer_h3_indexes(h3_indexes: Iterable[Union[int, str]], distance: int) -> list[str]:
+def get_local_ij_indexes(
+    origin_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+) -> npt.NDArray[np.int16]:
+    """
+    Calculate the local H3 ij indexes of many pairs of cells at once.
+
+    Vectorized version of `get_local_ij_index`, calculated with h3ronpy for all the pairs
+    in a single call. Coordinates are centered around the origin cell of each pair.
+
+    Args:
+        origin_indexes (Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]):
+            H3 indexes of the origin regions.
+        h3_indexes (Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]):
+            H3 indexes of the second regions, one for each origin. A two-dimensional numpy
+            array with a row of regions for each origin is also accepted.
+
+    Returns:
+        npt.NDArray[np.int16]: The local ij indexes of the second regions with respect to
+            their origins, with a shape of `h3_indexes` extended by the last axis of size 2.
+
+    Raises:
+        ValueError: If the number of origins doesn't match the number of regions.
+        ValueError: If the coordinates can't be calculated for any of the pairs
+            (e.g. due to pentagon distortion) or don't fit into int16.
+    """
+    origin_cells = _to_h3_cells(origin_indexes)
+    shape: tuple[int, ...]
+    if isinstance(h3_indexes, np.ndarray) and h3_indexes.ndim == 2:
+        shape = h3_indexes.shape
+        if len(origin_cells) != shape[0]:
+            raise ValueError(
+                "Number of origin indexes must match the number of rows of H3 indexes."
+            )
+        h3_cells = _to_h3_cells(h3_indexes.ravel())
+        origin_cells = np.repeat(origin_cells, shape[1])
+    else:
+        h3_cells = _to_h3_cells(h3_indexes)
+        shape = (len(h3_cells),)
+    if len(origin_cells) != len(h3_cells):
+        raise ValueError("Number of origin indexes must match the number of H3 indexes.")
+
+    origin_ijs, origin_failed_mask = _cells_to_local_ij(origin_cells, origin_cells)
+    cell_ijs, cell_failed_mask = _cells_to_local_ij(h3_cells, origin_cells)
+    failed_mask = origin_failed_mask | cell_failed_mask
+    if failed_mask.any():
+        raise ValueError(
+            f"Local ij indexes can't be calculated for {failed_mask.sum()} pairs of cells"
+            " (e.g. due to pentagon distortion)."
+        )
+
+    local_ijs = origin_ijs - cell_ijs
+    if (np.abs(local_ijs) > np.iinfo(np.int16).max).any():
+        raise ValueError("Local ij indexes don't fit into int16.")
+    result: npt.NDArray[np.int16] = local_ijs.astype(np.int16).reshape((*shape, 2))
+    return result
+
+
+@overload
+def ring_buffer_h3_indexes(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    distance: int,
+    return_type: Literal["str"] = "str",
+) -> list[str]: ...
+
+
+@overload
+def ring_buffer_h3_indexes(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    distance: int,
+    return_type: Literal["uint64"],
+) -> npt.NDArray[np.uint64]: ...
+
+
+def ring_buffer_h3_indexes(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    distance: int,
+    return_type: Literal["str", "uint64"] = "str",
+) -> Union[list[str], npt.NDArray[np.uint64]]:
     """
     Buffer H3 indexes by a given number of k-rings.
 
     List of provided H3 indexes will be buffered by a given distance.
 
     Args:
-        h3_indexes (Iterable[Union[int, str]]): List of H3 indexes to be buffered.
+        h3_indexes (Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]): H3 indexes
+            to be buffered. Numpy and pyarrow arrays of uint64 cells are used directly.
         distance (int): The k-ring buffer distance in H3 cells.
+        return_type (Literal["str", "uint64"], optional): Whether to return a list of H3 string
+            indexes or a sorted numpy array of uint64 cells without any string conversion.
+            Defaults to "str".
 
     Returns:
-        List[str]: Buffered list of H3 cells containing both original and new cells.
+        Union[List[str], npt.NDArray[np.uint64]]: Buffered H3 cells containing both original
+            and new cells.
     """
-    assert all(h3.is_valid_cell(h3_cell) for h3_cell in h3_indexes), (
-        "Not all values in h3_indexes are valid H3 cells."
-    )
-
-    h3_int_indexes = list(
-        h3_cell if isinstance(h3_cell, int) else h3.str_to_int(h3_cell) for h3_cell in h3_indexes
-    )
-
-    if is_new_h3ronpy_api:
-        buffered_h3s = np.unique(
-            cells_to_string(grid_disk(h3_int_indexes, distance, flatten=True)).to_numpy()
-        )
-    else:
-        buffered_h3s = set(
-            cells_to_string(grid_disk(h3_int_indexes, distance, flatten=True)).tolist()
+    _check_return_type(return_type)
+    h3_cells = _to_h3_cells(h3_indexes)
+    assert _are_valid_h3_cells(h3_cells).all(), "Not all values in h3_indexes are valid H3 cells."
+
+    buffered_h3_cells = np.unique(
+        np.asarray(
+            pa.array(
+                grid_disk(pa.array(h3_cells, type=pa.uint64()), distance, flatten=True)
+            ).to_numpy(),
+            dtype=np.uint64,
         )
+    )
 
-    return list(buffered_h3s)
+    if return_type == "uint64":
+        return buffered_h3_cells
+    buffered_h3_strings: list[str] = _h3_uint64_to_str(buffered_h3_cells).tolist()
+    return buffered_h3_strings
 
 
 def ring_buffer_geometry(
@@ -236,6 +529,9 @@ def ring_buffer_geometry(
 
     If a GeoDataFrame is passed, the geometry column will be used and the return will be a GeoSeries
 
+    All the geometries are filled with cells and buffered at once, and the cells of each
+    geometry are dissolved by tracing their outline instead of a union of their polygons.
+
     Args:
         geometry (Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame]):
             The geometry to buffer.
@@ -247,20 +543,26 @@ def ring_buffer_geometry(
     """
     if isinstance(geometry, gpd.GeoDataFrame):
         geometry = geometry[GEOMETRY_COLUMN]
-        return geometry.apply(lambda x: ring_buffer_geometry(x, h3_resolution, distance))
 
     if isinstance(geometry, gpd.GeoSeries):
-        return geometry.apply(lambda x: ring_buffer_geometry(x, h3_resolution, distance))
+        return gpd.GeoSeries(
+            _ring_buffer_wkb_geometries(geometry.to_wkb(), h3_resolution, distance),
+            index=geometry.index,
+            crs=geometry.crs,
+        )
 
     if isinstance(geometry, Iterable):
-        return gpd.GeoSeries([ring_buffer_geometry(x, h3_resolution, distance) for x in geometry])
+        return gpd.GeoSeries(
+            _ring_buffer_wkb_geometries(
+                [sub_geometry.wkb for sub_geometry in geometry], h3_resolution, distance
+            )
+        )
 
     assert isinstance(geometry, BaseGeometry)
-    h3s = shapely_geometry_to_h3(geometry, h3_resolution, buffer=True)
-    # buffer all the h3
-    buffered_h3s = ring_buffer_h3_indexes(h3s, distance=distance)
-    # get the bounding geometry
-    return h3_to_geoseries(buffered_h3s).union_all()
+    buffered_geometry: BaseGeometry = _ring_buffer_wkb_geometries(
+        [geometry.wkb], h3_resolution, distance
+    )[0]
+    return buffered_geometry
 
 
 def ring_buffer_h3_regions_gdf(regions_gdf: gpd.GeoDataFrame, distance: int) -> gpd.GeoDataFrame:
@@ -271,15 +573,1045 @@ def ring_buffer_h3_regions_gdf(regions_gdf: gpd.GeoDataFrame, distance: int) ->
 
     Args:
         regions_gdf (gpd.GeoDataFrame): GeoDataFrame with H3 regions from H3Regionalizer.
+            Both string and uint64 indexes are supported and the type of the index is kept.
         distance (int): The k-ring buffer distance in H3 cells.
 
     Returns:
         gpd.GeoDataFrame: Buffered regions_gdf with new H3 cells added.
     """
-    buffered_h3_indexes = ring_buffer_h3_indexes(h3_indexes=regions_gdf.index, distance=distance)
+    buffered_h3_cells = ring_buffer_h3_indexes(
+        h3_indexes=regions_gdf.index, distance=distance, return_type="uint64"
+    )
+    index_dtype = _get_h3_index_dtype(regions_gdf.index)
     buffered_gdf_h3 = gpd.GeoDataFrame(
-        data={REGIONS_INDEX: buffered_h3_indexes},
-        geometry=h3_to_geoseries(buffered_h3_indexes),
+        data={REGIONS_INDEX: convert_h3_index(buffered_h3_cells, index_dtype)},
+        geometry=h3_to_geoseries(buffered_h3_cells),
         crs=WGS84_CRS,
     ).set_index(REGIONS_INDEX)
     return buffered_gdf_h3
+
+
+def convert_h3_index(
+    h3_index: Union[pd.Index, Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    index_dtype: Literal["str", "uint64"],
+) -> pd.Index:
+    """
+    Convert H3 indexes between string and uint64 representations.
+
+    Useful for converting the index of regions created with
+    `H3Regionalizer(index_dtype="uint64")` into strings only when it's needed, e.g. for display.
+
+    Args:
+        h3_index (Union[pd.Index, Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]):
+            H3 indexes to be converted, as strings or integer cells.
+        index_dtype (Literal["str", "uint64"]): Type of the returned index.
+
+    Returns:
+        pd.Index: Converted index. The name of the index is kept if a pd.Index was provided.
+
+    Raises:
+        ValueError: If index_dtype is not "str" or "uint64".
+    """
+    _check_return_type(index_dtype)
+    name = h3_index.name if isinstance(h3_index, pd.Index) else None
+    h3_cells = _to_h3_cells(h3_index.to_numpy() if isinstance(h3_index, pd.Index) else h3_index)
+    if index_dtype == "uint64":
+        return pd.Index(h3_cells, dtype=np.uint64, name=name)
+    return pd.Index(_h3_uint64_to_str(h3_cells), dtype=object, name=name)
+
+
+@overload
+def compact_h3_cells(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    return_type: Literal["str"] = "str",
+) -> list[str]: ...
+
+
+@overload
+def compact_h3_cells(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    return_type: Literal["uint64"],
+) -> npt.NDArray[np.uint64]: ...
+
+
+def compact_h3_cells(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    return_type: Literal["str", "uint64"] = "str",
+) -> Union[list[str], npt.NDArray[np.uint64]]:
+    """
+    Compact H3 cells of a single resolution.
+
+    All the children of a parent are recursively replaced with the parent itself.
+
+    Args:
+        h3_indexes (Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]): H3
+            indexes of a single resolution.
+        return_type (Literal["str", "uint64"], optional): Whether to return a list of H3 string
+            indexes or a sorted numpy array of uint64 cells. Defaults to "str".
+
+    Returns:
+        Union[List[str], npt.NDArray[np.uint64]]: Cells with mixed resolutions covering
+            the same area.
+
+    Raises:
+        ValueError: If the cells have different resolutions.
+    """
+    _check_return_type(return_type)
+    h3_cells = np.unique(_to_h3_cells(h3_indexes))
+    assert _are_valid_h3_cells(h3_cells).all(), "Not all values in h3_indexes are valid H3 cells."
+    if len(np.unique(_get_h3_resolutions(h3_cells))) > 1:
+        raise ValueError("Only cells of a single resolution can be compacted.")
+    return _format_h3_cells(_compact_h3_cells(h3_cells), return_type)
+
+
+@overload
+def uncompact_h3_cells(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    h3_resolution: int,
+    return_type: Literal["str"] = "str",
+) -> list[str]: ...
+
+
+@overload
+def uncompact_h3_cells(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    h3_resolution: int,
+    return_type: Literal["uint64"],
+) -> npt.NDArray[np.uint64]: ...
+
+
+def uncompact_h3_cells(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    h3_resolution: int,
+    return_type: Literal["str", "uint64"] = "str",
+) -> Union[list[str], npt.NDArray[np.uint64]]:
+    """
+    Expand compacted H3 cells into cells of a single resolution.
+
+    Args:
+        h3_indexes (Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]): H3
+            indexes with mixed resolutions, e.g. from `shapely_geometry_to_h3(compact=True)`.
+        h3_resolution (int): Resolution of the expanded cells.
+        return_type (Literal["str", "uint64"], optional): Whether to return a list of H3 string
+            indexes or a sorted numpy array of uint64 cells. Defaults to "str".
+
+    Returns:
+        Union[List[str], npt.NDArray[np.uint64]]: Unique cells at the given resolution.
+
+    Raises:
+        ValueError: If resolution is not between 0 and 15.
+        ValueError: If any of the cells is finer than the given resolution.
+    """
+    _check_return_type(return_type)
+    h3_cells = _to_h3_cells(h3_indexes)
+    _check_uncompact_resolution(h3_cells, h3_resolution)
+    return _format_h3_cells(np.unique(_uncompact_h3_cells(h3_cells, h3_resolution)), return_type)
+
+
+@overload
+def uncompact_h3_cells_batches(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    h3_resolution: int,
+    batch_size: int = DEFAULT_H3_BATCH_SIZE,
+    return_type: Literal["str"] = "str",
+) -> Iterator[list[str]]: ...
+
+
+@overload
+def uncompact_h3_cells_batches(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    h3_resolution: int,
+    batch_size: int = DEFAULT_H3_BATCH_SIZE,
+    *,
+    return_type: Literal["uint64"],
+) -> Iterator[npt.NDArray[np.uint64]]: ...
+
+
+def uncompact_h3_cells_batches(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    h3_resolution: int,
+    batch_size: int = DEFAULT_H3_BATCH_SIZE,
+    return_type: Literal["str", "uint64"] = "str",
+) -> Iterator[Union[list[str], npt.NDArray[np.uint64]]]:
+    """
+    Expand compacted H3 cells into cells of a single resolution lazily, in batches.
+
+    Parents are expanded in the order of the input, only when their children are requested,
+    so the peak memory usage depends on the batch size instead of the size of the expanded area.
+    Parents with more descendants than the batch size are split into their children first.
+
+    Args:
+        h3_indexes (Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]): H3
+            indexes with mixed resolutions, e.g. from `shapely_geometry_to_h3(compact=True)`.
+            Expected not to overlap.
+        h3_resolution (int): Resolution of the expanded cells.
+        batch_size (int, optional): Maximal number of cells in a single batch.
+            Defaults to 1 000 000.
+        return_type (Literal["str", "uint64"], optional): Whether to return batches as lists of
+            H3 string indexes or numpy arrays of uint64 cells. Defaults to "str".
+
+    Yields:
+        Union[List[str], npt.NDArray[np.uint64]]: Batches of cells at the given resolution.
+
+    Raises:
+        ValueError: If resolution is not between 0 and 15.
+        ValueError: If any of the cells is finer than the given resolution.
+        ValueError: If batch_size is not positive.
+    """
+    _check_return_type(return_type)
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be positive, but was {batch_size}.")
+    h3_cells = _to_h3_cells(h3_indexes)
+    _check_uncompact_resolution(h3_cells, h3_resolution)
+
+    pending_cells = list(reversed(h3_cells.tolist()))
+    group: list[int] = []
+    group_size = 0
+    remaining_cells = np.zeros(0, dtype=np.uint64)
+    while pending_cells or group:
+        if pending_cells:
+            h3_cell = pending_cells.pop()
+            children_count = _max_h3_children_count(h3_cell, h3_resolution)
+            if children_count > batch_size and h3.get_resolution(h3.int_to_str(h3_cell)) < (
+                h3_resolution
+            ):
+                children = _change_h3_resolution(
+                    np.array([h3_cell], dtype=np.uint64),
+                    h3.get_resolution(h3.int_to_str(h3_cell)) + 1,
+                )
+                pending_cells.extend(reversed(children.tolist()))
+                continue
+            if group_size + children_count <= batch_size:
+                group.append(h3_cell)
+                group_size += children_count
+                continue
+            pending_cells.append(h3_cell)
+
+        expanded_cells = np.concatenate(
+            (remaining_cells, _uncompact_h3_cells(np.array(group, dtype=np.uint64), h3_resolution))
+        )
+        group, group_size = [], 0
+        while len(expanded_cells) >= batch_size:
+            yield _format_h3_cells(expanded_cells[:batch_size], return_type)
+            expanded_cells = expanded_cells[batch_size:]
+        remaining_cells = expanded_cells
+
+    if len(remaining_cells) > 0:
+        yield _format_h3_cells(remaining_cells, return_type)
+
+
+def get_compacted_h3_parents(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    compacted_h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+) -> npt.NDArray[np.uint64]:
+    """
+    Find cells from a compacted set containing given cells.
+
+    Allows assigning fine cells (e.g. of points) to the regions of a compacted coverage. Only
+    the resolutions present in the compacted set are checked, so the cost doesn't depend on
+    the number of compacted cells.
+
+    Args:
+        h3_indexes (Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]): Cells
+            to be assigned.
+        compacted_h3_indexes
+            (Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]):
+            Non-overlapping cells with mixed resolutions.
+
+    Returns:
+        npt.NDArray[np.uint64]: A cell from the compacted set containing (or equal to) each of
+            the given cells, or 0 if none of them contains it.
+    """
+    h3_cells = _to_h3_cells(h3_indexes)
+    compacted_h3_cells = np.unique(_to_h3_cells(compacted_h3_indexes))
+    parents = np.zeros(len(h3_cells), dtype=np.uint64)
+    if len(h3_cells) == 0 or len(compacted_h3_cells) == 0:
+        return parents
+
+    cells_resolutions = _get_h3_resolutions(h3_cells)
+    for resolution in np.unique(_get_h3_resolutions(compacted_h3_cells)):
+        candidates_mask = (parents == 0) & (cells_resolutions >= resolution)
+        if not candidates_mask.any():
+            continue
+        candidates = _change_h3_resolution(h3_cells[candidates_mask], int(resolution))
+        positions = np.minimum(
+            np.searchsorted(compacted_h3_cells, candidates), len(compacted_h3_cells) - 1
+        )
+        found_mask = compacted_h3_cells[positions] == candidates
+        parents[np.flatnonzero(candidates_mask)[found_mask]] = candidates[found_mask]
+    return parents
+
+
+def _ring_buffer_wkb_geometries(
+    wkb: Iterable[bytes], h3_resolution: int, distance: int
+) -> npt.NDArray[np.object_]:
+    """Buffer WKB geometries with H3 cells and dissolve the cells of each geometry."""
+    if not (0 <= h3_resolution <= 15):
+        raise ValueError(f"Resolution {h3_resolution} is not between 0 and 15.")
+
+    # fill all the geometries at once, keeping the source geometry of each cell
+    cells_lists = pa.array(
+        wkb_to_cells(
+            wkb,
+            resolution=h3_resolution,
+            containment_mode=ContainmentMode.Covers,
+            flatten=False,
+        )
+    )
+    number_of_geometries = len(cells_lists)
+    rows = np.repeat(
+        np.arange(number_of_geometries, dtype=np.int64),
+        np.asarray(cells_lists.value_lengths().fill_null(0).to_numpy(), dtype=np.int64),
+    )
+    h3_cells = np.asarray(cells_lists.flatten().to_numpy(zero_copy_only=False), dtype=np.uint64)
+
+    # buffer each unique cell once and expand the disks for all of its source geometries
+    unique_cells, inverse = np.unique(h3_cells, return_inverse=True)
+    disk_offsets, disk_cells, _ = _grid_disk_distances(unique_cells, distance)
+    disk_sizes = np.diff(disk_offsets)[inverse]
+    positions_in_disks = np.arange(disk_sizes.sum()) - np.repeat(
+        np.cumsum(disk_sizes) - disk_sizes, disk_sizes
+    )
+    buffered_cells = disk_cells[
+        np.repeat(disk_offsets[:-1][inverse], disk_sizes) + positions_in_disks
+    ]
+    buffered_rows = np.repeat(rows, disk_sizes)
+
+    # deduplicate cells of each geometry and group them by geometry
+    order = np.lexsort((buffered_cells, buffered_rows))
+    buffered_cells, buffered_rows = buffered_cells[order], buffered_rows[order]
+    unique_mask = np.ones(len(buffered_cells), dtype=bool)
+    unique_mask[1:] = (buffered_cells[1:] != buffered_cells[:-1]) | (
+        buffered_rows[1:] != buffered_rows[:-1]
+    )
+    buffered_cells, buffered_rows = buffered_cells[unique_mask], buffered_rows[unique_mask]
+    row_offsets = np.searchsorted(buffered_rows, np.arange(number_of_geometries + 1))
+
+    dissolved_geometries = np.empty(number_of_geometries, dtype=object)
+    for row in range(number_of_geometries):
+        dissolved_geometries[row] = _dissolve_h3_cells(
+            buffered_cells[row_offsets[row] : row_offsets[row + 1]]
+        )
+    return dissolved_geometries
+
+
+def _dissolve_h3_cells(h3_cells: npt.NDArray[np.uint64]) -> BaseGeometry:
+    """Merge cells of a single resolution into a (multi)polygon by tracing their outline."""
+    if len(h3_cells) == 0:
+        return GeometryCollection()
+    polygons_wkb = pa.array(
+        cells_to_wkb_polygons(pa.array(h3_cells, type=pa.uint64()), link_cells=True)
+    )
+    polygons = shapely.from_wkb(polygons_wkb.to_numpy(zero_copy_only=False))
+    if len(polygons) == 1:
+        polygon: BaseGeometry = polygons[0]
+        return polygon
+    return shapely.multipolygons(polygons)
+
+
+def get_h3_parents(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+    h3_resolution: int,
+) -> npt.NDArray[np.uint64]:
+    """
+    Get parents of H3 cells at a coarser resolution.
+
+    Parents are derived from uint64 cells with bit operations, so cells with mixed
+    resolutions (e.g. compacted cells) are supported.
+
+    Args:
+        h3_indexes (Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array]): Cells
+            not coarser than `h3_resolution`.
+        h3_resolution (int): Resolution of the parents.
+
+    Returns:
+        npt.NDArray[np.uint64]: A parent of each of the given cells.
+
+    Raises:
+        ValueError: If resolution is not between 0 and 15.
+        ValueError: If any of the cells is coarser than the given resolution.
+    """
+    if not (0 <= h3_resolution <= 15):
+        raise ValueError(f"Resolution {h3_resolution} is not between 0 and 15.")
+    h3_cells = _to_h3_cells(h3_indexes)
+    assert _are_valid_h3_cells(h3_cells).all(), "Not all values in the index are valid H3 cells."
+    if len(h3_cells) > 0 and _get_h3_resolutions(h3_cells).min() < h3_resolution:
+        raise ValueError(f"Some of the cells are coarser than the resolution {h3_resolution}.")
+    return _get_h3_parents(h3_cells, h3_resolution)
+
+
+def roll_up_h3_regions_df(
+    regions_df: pd.DataFrame,
+    h3_resolution: int,
+    aggregation: Union[str, Callable[[pd.Series], Any]] = "sum",
+) -> pd.DataFrame:
+    """
+    Aggregate values of H3 regions in their parents at a coarser resolution.
+
+    Parents are derived from uint64 cells with bit operations and rows are aggregated with
+    a single group-by, so counts or embeddings can be calculated once at a fine resolution
+    and rolled up to any coarser one. Regions with mixed resolutions (e.g. compacted cells)
+    are supported.
+
+    Summed up counts of features are exact only if each feature is joined with a single child
+    (e.g. points). Features intersecting multiple children of a parent (e.g. lines or polygons)
+    are counted once for each of these children. `CountEmbedder(h3_parent_resolution=...)`
+    counts each feature once per parent instead.
+
+    Args:
+        regions_df (pd.DataFrame): Values of H3 regions (e.g. `CountEmbedder` result), indexed
+            with string or uint64 cells not coarser than `h3_resolution`.
+        h3_resolution (int): Resolution of the parents.
+        aggregation (Union[str, Callable[[pd.Series], Any]], optional): Aggregation of
+            the values of children, passed to `pandas.core.groupby.DataFrameGroupBy.agg`.
+            Defaults to "sum".
+
+    Returns:
+        pd.DataFrame: Aggregated values indexed with the parents, sorted by H3 cell. The type
+            and name of the index are kept.
+
+    Raises:
+        ValueError: If resolution is not between 0 and 15.
+        ValueError: If any of the cells is coarser than the given resolution.
+    """
+    parents = get_h3_parents(regions_df.index.to_numpy(), h3_resolution)
+    rolled_up_df = regions_df.set_axis(pd.Index(parents, dtype=np.uint64)).groupby(
+        level=0, sort=True
+    )
+    result_df = rolled_up_df.agg(aggregation)
+    return result_df.set_axis(
+        convert_h3_index(result_df.index, _get_h3_index_dtype(regions_df.index)).rename(
+            regions_df.index.name
+        )
+    )
+
+
+def drill_down_h3_regions_df(regions_df: pd.DataFrame, h3_resolution: int) -> pd.DataFrame:
+    """
+    Broadcast values of H3 regions to their children at a finer resolution.
+
+    Reverse of `roll_up_h3_regions_df`: each row is repeated for all the children of its cell.
+
+    Args:
+        regions_df (pd.DataFrame): Values of non-overlapping H3 regions, indexed with string or
+            uint64 cells not finer than `h3_resolution`.
+        h3_resolution (int): Resolution of the children.
+
+    Returns:
+        pd.DataFrame: Values indexed with the children, grouped by their parents in the order
+            of `regions_df`. The type and name of the index are kept.
+
+    Raises:
+        ValueError: If resolution is not between 0 and 15.
+        ValueError: If any of the cells is finer than the given resolution.
+    """
+    h3_cells = _to_h3_cells(regions_df.index.to_numpy())
+    _check_uncompact_resolution(h3_cells, h3_resolution)
+
+    children_lists = pa.array(
+        change_resolution_list(pa.array(h3_cells, type=pa.uint64()), h3_resolution)
+    )
+    children_counts = np.asarray(children_lists.value_lengths().to_numpy(), dtype=np.int64)
+    children = np.asarray(children_lists.flatten().to_numpy(zero_copy_only=False), dtype=np.uint64)
+    drilled_down_df = regions_df.iloc[np.repeat(np.arange(len(regions_df)), children_counts)]
+    return drilled_down_df.set_axis(
+        convert_h3_index(children, _get_h3_index_dtype(regions_df.index)).rename(
+            regions_df.index.name
+        )
+    )
+
+
+class H3GeometryCacheInfo(NamedTuple):
+    """Statistics of the H3 geometry cache."""
+
+    hits: int
+    misses: int
+    cells: int
+    size_bytes: int
+    max_size_bytes: int
+
+
+def set_h3_geometry_cache_size(max_size_bytes: int) -> None:
+    """
+    Set the size of the process-wide cache of H3 cell polygons used by `h3_to_geoseries`.
+
+    Polygons are kept as WKB, keyed by uint64 cells. When the total size of the cached WKB
+    exceeds the limit, the least recently used cells are evicted. Useful in iterative
+    workflows converting the same cells to geometries many times, e.g. buffering regions,
+    regionalizing neighbouring areas or plotting.
+
+    Args:
+        max_size_bytes (int): Maximal total size of the cached WKB in bytes. If 0, the cache
+            is disabled and cleared. The cache is disabled by default.
+
+    Raises:
+        ValueError: If max_size_bytes is negative.
+    """
+    if max_size_bytes < 0:
+        raise ValueError(f"Cache size must not be negative, but was {max_size_bytes}.")
+    _H3_GEOMETRY_CACHE.resize(max_size_bytes)
+
+
+def get_h3_geometry_cache_info() -> H3GeometryCacheInfo:
+    """
+    Get statistics of the H3 geometry cache.
+
+    Returns:
+        H3GeometryCacheInfo: Number of hits and misses, number of cached cells,
+            current and maximal size of the cache in bytes.
+    """
+    return _H3_GEOMETRY_CACHE.info()
+
+
+def clear_h3_geometry_cache() -> None:
+    """Remove all the cells from the H3 geometry cache and reset its statistics."""
+    _H3_GEOMETRY_CACHE.clear()
+
+
+class _H3GeometryCache:
+    """Cell to WKB polygon cache with LRU eviction bounded by the total size of the WKB."""
+
+    def __init__(self, max_size_bytes: int = 0) -> None:
+        self.max_size_bytes = max_size_bytes
+        self._wkb: OrderedDict[int, bytes] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get_wkb(self, h3_cells: npt.NDArray[np.uint64]) -> npt.NDArray[np.object_]:
+        """Get WKB polygons of the cells, generating and caching only the missing ones."""
+        wkb = np.empty(len(h3_cells), dtype=object)
+        missing_positions = []
+        with self._lock:
+            for position, h3_cell in enumerate(h3_cells.tolist()):
+                cell_wkb = self._wkb.get(h3_cell)
+                if cell_wkb is None:
+                    missing_positions.append(position)
+                else:
+                    self._wkb.move_to_end(h3_cell)
+                    wkb[position] = cell_wkb
+            self._hits += len(h3_cells) - len(missing_positions)
+            self._misses += len(missing_positions)
+
+        if missing_positions:
+            missing_cells, inverse = np.unique(h3_cells[missing_positions], return_inverse=True)
+            missing_wkb = np.asarray(
+                pa.array(cells_to_wkb_polygons(pa.array(missing_cells, type=pa.uint64()))).to_numpy(
+                    zero_copy_only=False
+                ),
+                dtype=object,
+            )
+            wkb[missing_positions] = missing_wkb[inverse]
+            with self._lock:
+                for h3_cell, cell_wkb in zip(missing_cells.tolist(), missing_wkb):
+                    self._put(h3_cell, cell_wkb)
+        return wkb
+
+    def resize(self, max_size_bytes: int) -> None:
+        with self._lock:
+            self.max_size_bytes = max_size_bytes
+            self._evict()
+
+    def info(self) -> H3GeometryCacheInfo:
+        with self._lock:
+            return H3GeometryCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                cells=len(self._wkb),
+                size_bytes=self._size_bytes,
+                max_size_bytes=self.max_size_bytes,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._wkb.clear()
+            self._size_bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def _put(self, h3_cell: int, cell_wkb: bytes) -> None:
+        if h3_cell in self._wkb or len(cell_wkb) > self.max_size_bytes:
+            return
+        self._wkb[h3_cell] = cell_wkb
+        self._size_bytes += len(cell_wkb)
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._size_bytes > self.max_size_bytes:
+            _, cell_wkb = self._wkb.popitem(last=False)
+            self._size_bytes -= len(cell_wkb)
+
+
+_H3_GEOMETRY_CACHE = _H3GeometryCache()
+
+
+def _check_return_type(return_type: str) -> None:
+    if return_type not in ("str", "uint64"):
+        raise ValueError(f"Unknown return type: {return_type}. Expected 'str' or 'uint64'.")
+
+
+def _to_h3_cells(
+    h3_indexes: Union[Iterable[Union[int, str]], npt.NDArray[np.uint64], pa.Array],
+) -> npt.NDArray[np.uint64]:
+    """
+    Convert H3 indexes of any supported type into an array of uint64 cells.
+
+    Integer numpy and pyarrow arrays are used without copying where possible. String indexes are
+    parsed all at once, and the ones that can't be parsed are returned as invalid zero cells.
+    """
+    if isinstance(h3_indexes, pa.ChunkedArray):
+        h3_indexes = h3_indexes.combine_chunks()
+    if isinstance(h3_indexes, pa.Array):
+        if pa.types.is_string(h3_indexes.type) or pa.types.is_large_string(h3_indexes.type):
+            return _h3_str_to_uint64(h3_indexes)
+        return np.asarray(
+            h3_indexes.cast(pa.uint64()).fill_null(0).to_numpy(zero_copy_only=False),
+            dtype=np.uint64,
+        )
+
+    values = (
+        h3_indexes
+        if isinstance(h3_indexes, np.ndarray)
+        else np.asarray(list(h3_indexes), dtype=object)
+    )
+    if values.dtype.kind in "iu":
+        return values.astype(np.uint64, copy=False)
+
+    values_type = pd.api.types.infer_dtype(values, skipna=False)
+    if values_type == "empty":
+        return np.zeros(0, dtype=np.uint64)
+    if values_type == "string":
+        return _h3_str_to_uint64(values)
+    if values_type == "integer":
+        return values.astype(np.uint64)
+
+    is_string = np.fromiter(
+        (isinstance(value, str) for value in values), dtype=bool, count=len(values)
+    )
+    h3_cells = np.zeros(len(values), dtype=np.uint64)
+    h3_cells[is_string] = _h3_str_to_uint64(values[is_string])
+    h3_cells[~is_string] = values[~is_string].astype(np.uint64)
+    return h3_cells
+
+
+def _wkb_to_h3_cells(
+    wkb: Iterable[bytes], h3_resolution: int, buffer: bool
+) -> npt.NDArray[np.uint64]:
+    """Fill WKB geometries with cells, possibly with duplicates."""
+    containment_mode = ContainmentMode.Covers if buffer else ContainmentMode.ContainsCentroid
+    h3_indexes = wkb_to_cells(
+        wkb, resolution=h3_resolution, containment_mode=containment_mode, flatten=True
+    )
+    return np.asarray(pa.array(h3_indexes).to_numpy(zero_copy_only=False), dtype=np.uint64)
+
+
+class _H3Tiles(NamedTuple):
+    """Coarse cells tiling an area, with regions containing all their descendants."""
+
+    area: BaseGeometry
+    tile_resolution: int
+    tiles: npt.NDArray[np.uint64]
+    regions: npt.NDArray[np.object_]
+    covered: npt.NDArray[np.bool_]
+
+
+def _get_h3_tiles(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    h3_resolution: int,
+    max_tile_size: int,
+) -> Optional[_H3Tiles]:
+    """
+    Tile a geometry with coarse cells.
+
+    Tiles are coarse cells with at most `max_tile_size` children at `h3_resolution`. Descendants
+    of a cell stick out of its polygon by less than a fifth of its edge length, so the tile
+    polygon buffered by half of the edge length contains all of them.
+    """
+    if isinstance(geometry, gpd.GeoDataFrame):
+        geometry = geometry[GEOMETRY_COLUMN]
+    geometries = [geometry] if isinstance(geometry, BaseGeometry) else list(geometry)
+    area = shapely.union_all(geometries)
+    if area.is_empty:
+        return None
+    shapely.prepare(area)
+
+    tile_resolution = max(0, h3_resolution - int(np.log(max_tile_size) / np.log(7)))
+    area_tiles = np.unique(_wkb_to_h3_cells([area.wkb], tile_resolution, buffer=True))
+    _, tiles, _ = _grid_disk_distances(area_tiles, 1)
+    tiles = np.unique(tiles)
+
+    tiles_regions = _h3_cells_clipping_regions(tiles)
+    intersecting_mask = shapely.intersects(area, tiles_regions)
+    tiles, tiles_regions = tiles[intersecting_mask], tiles_regions[intersecting_mask]
+    covered_mask = np.asarray(shapely.contains(area, tiles_regions), dtype=bool)
+    return _H3Tiles(area, tile_resolution, tiles, tiles_regions, covered_mask)
+
+
+def _fill_h3_tile(
+    area: BaseGeometry,
+    tile: np.uint64,
+    tile_region: BaseGeometry,
+    is_covered: bool,
+    tile_resolution: int,
+    h3_resolution: int,
+    buffer: bool,
+) -> npt.NDArray[np.uint64]:
+    """
+    Fill a part of the area within a single tile with cells.
+
+    The area is clipped to the tile region and only the cells with the tile as their parent are
+    kept. Tiles fully within the area are filled with their children directly.
+    """
+    if is_covered:
+        return _change_h3_resolution(np.array([tile], dtype=np.uint64), h3_resolution)
+
+    clipped_polygons = [
+        part
+        for part in shapely.get_parts(shapely.intersection(area, tile_region))
+        if part.geom_type == "Polygon" and not part.is_empty
+    ]
+    if not clipped_polygons:
+        return np.zeros(0, dtype=np.uint64)
+    cells = np.unique(
+        _wkb_to_h3_cells([part.wkb for part in clipped_polygons], h3_resolution, buffer)
+    )
+    tile_cells: npt.NDArray[np.uint64] = cells[
+        _change_h3_resolution(cells, tile_resolution) == tile
+    ]
+    return tile_cells
+
+
+def _iter_h3_tiles_cells(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    h3_resolution: int,
+    buffer: bool,
+    max_tile_size: int,
+) -> Iterator[npt.NDArray[np.uint64]]:
+    """Fill a geometry with cells tile by tile, with cells unique across the tiles."""
+    h3_tiles = _get_h3_tiles(geometry, h3_resolution, max_tile_size)
+    if h3_tiles is None:
+        return
+
+    for tile, tile_region, is_covered in zip(h3_tiles.tiles, h3_tiles.regions, h3_tiles.covered):
+        cells = _fill_h3_tile(
+            h3_tiles.area,
+            tile,
+            tile_region,
+            is_covered,
+            h3_tiles.tile_resolution,
+            h3_resolution,
+            buffer,
+        )
+        if len(cells) > 0:
+            yield cells
+
+
+def _fill_h3_tiles_in_parallel(
+    h3_tiles: _H3Tiles, h3_resolution: int, buffer: bool, num_of_multiprocessing_workers: int
+) -> npt.NDArray[np.uint64]:
+    """
+    Fill tiles with cells in multiple processes.
+
+    Workers are started with the "spawn" method, because forking a process with running
+    native thread pools (used by h3ronpy and pyarrow) can deadlock the children.
+    """
+    tiles_chunks = [
+        chunk
+        for chunk in np.array_split(
+            np.arange(len(h3_tiles.tiles)), 4 * num_of_multiprocessing_workers
+        )
+        if len(chunk) > 0
+    ]
+    fill_task = partial(
+        _fill_h3_tiles_task,
+        tile_resolution=h3_tiles.tile_resolution,
+        h3_resolution=h3_resolution,
+        buffer=buffer,
+    )
+    cells_chunks = []
+    with (
+        ProcessPoolExecutor(
+            max_workers=num_of_multiprocessing_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(shapely.to_wkb(h3_tiles.area),),
+        ) as executor,
+        tqdm(total=len(h3_tiles.tiles), desc="Generating H3 cells", disable=FORCE_TERMINAL) as pbar,
+    ):
+        for chunk, cells in zip(
+            tiles_chunks,
+            executor.map(
+                fill_task,
+                (h3_tiles.tiles[chunk] for chunk in tiles_chunks),
+                (shapely.to_wkb(h3_tiles.regions[chunk]) for chunk in tiles_chunks),
+                (h3_tiles.covered[chunk] for chunk in tiles_chunks),
+            ),
+        ):
+            cells_chunks.append(cells)
+            pbar.update(len(chunk))
+
+    return np.unique(np.concatenate(cells_chunks))
+
+
+# Area to fill with cells, loaded once in each worker process.
+_WORKER_AREA: Optional[BaseGeometry] = None
+
+
+def _initialize_worker(area_wkb: bytes) -> None:
+    global _WORKER_AREA  # noqa: PLW0603
+    _WORKER_AREA = shapely.from_wkb(area_wkb)
+    shapely.prepare(_WORKER_AREA)
+
+
+def _fill_h3_tiles_task(
+    tiles: npt.NDArray[np.uint64],
+    tiles_regions_wkb: npt.NDArray[np.object_],
+    covered: npt.NDArray[np.bool_],
+    tile_resolution: int,
+    h3_resolution: int,
+    buffer: bool,
+) -> npt.NDArray[np.uint64]:
+    assert _WORKER_AREA is not None
+    tiles_regions = shapely.from_wkb(tiles_regions_wkb)
+    return np.concatenate(
+        [
+            np.zeros(0, dtype=np.uint64),
+            *(
+                _fill_h3_tile(
+                    _WORKER_AREA,
+                    tile,
+                    tile_region,
+                    is_covered,
+                    tile_resolution,
+                    h3_resolution,
+                    buffer,
+                )
+                for tile, tile_region, is_covered in zip(tiles, tiles_regions, covered)
+            ),
+        ]
+    )
+
+
+def _h3_cells_clipping_regions(h3_cells: npt.NDArray[np.uint64]) -> npt.NDArray[np.object_]:
+    """
+    Get regions containing all the descendants of cells.
+
+    Cells are buffered in continuous longitudes, so polygons crossing the antimeridian are
+    unwrapped first, and parts of the regions sticking out of the [-180, 180] range are moved
+    to the other side of the antimeridian. Cells containing a pole use the band of latitudes
+    covered by their 1-disk.
+    """
+    if len(h3_cells) == 0:
+        return np.zeros(0, dtype=object)
+
+    polygons = h3_to_geoseries(h3_cells).to_numpy()
+    rings = shapely.get_exterior_ring(polygons)
+    coordinates = shapely.get_coordinates(rings)
+    rings_lengths = shapely.get_num_coordinates(rings)
+    rings_offsets = np.concatenate(([0], np.cumsum(rings_lengths)))
+
+    bounds = shapely.bounds(polygons)
+    crossing_mask = np.repeat((bounds[:, 2] - bounds[:, 0]) > 180, rings_lengths)
+    coordinates[crossing_mask & (coordinates[:, 0] < 0), 0] += 360
+    polygons = shapely.polygons(
+        shapely.linearrings(coordinates, indices=np.repeat(np.arange(len(h3_cells)), rings_lengths))
+    )
+
+    edges_lengths = np.linalg.norm(np.diff(coordinates, axis=0), axis=1)
+    edges_lengths[rings_offsets[1:-1] - 1] = 0
+    max_edges_lengths = np.maximum.reduceat(edges_lengths, rings_offsets[:-1])
+    regions = shapely.buffer(polygons, 0.5 * max_edges_lengths, quad_segs=2)
+
+    regions = shapely.union_all(
+        np.stack(
+            [
+                shapely.intersection(regions, shapely.box(-180, -90, 180, 90)),
+                _translate_longitudes(
+                    shapely.intersection(regions, shapely.box(180, -90, 540, 90)), -360
+                ),
+                _translate_longitudes(
+                    shapely.intersection(regions, shapely.box(-540, -90, -180, 90)), 360
+                ),
+            ],
+            axis=1,
+        ),
+        axis=1,
+    )
+
+    h3_resolution = h3.get_resolution(h3.int_to_str(int(h3_cells[0])))
+    for pole_latitude in (90, -90):
+        pole_cell = np.uint64(h3.str_to_int(h3.latlng_to_cell(pole_latitude, 0, h3_resolution)))
+        for position in np.flatnonzero(h3_cells == pole_cell):
+            _, disk_cells, _ = _grid_disk_distances(h3_cells[position].reshape(1), 1)
+            _, min_latitude, _, max_latitude = h3_to_geoseries(disk_cells).total_bounds
+            regions[position] = (
+                shapely.box(-180, min_latitude, 180, 90)
+                if pole_latitude > 0
+                else shapely.box(-180, -90, 180, max_latitude)
+            )
+    return np.asarray(regions, dtype=object)
+
+
+def _translate_longitudes(
+    geometries: npt.NDArray[np.object_], offset: float
+) -> npt.NDArray[np.object_]:
+    return np.asarray(
+        shapely.transform(geometries, lambda coordinates: coordinates + [offset, 0]), dtype=object
+    )
+
+
+def _change_h3_resolution(
+    h3_cells: npt.NDArray[np.uint64], h3_resolution: int
+) -> npt.NDArray[np.uint64]:
+    """Get parents (with one value per cell) or all the children of cells at a resolution."""
+    changed_cells = pa.array(change_resolution(pa.array(h3_cells, type=pa.uint64()), h3_resolution))
+    return np.asarray(changed_cells.to_numpy(zero_copy_only=False), dtype=np.uint64)
+
+
+def _compact_h3_cells(h3_cells: npt.NDArray[np.uint64]) -> npt.NDArray[np.uint64]:
+    """Compact unique cells of a single resolution into a sorted mixed-resolution set."""
+    compacted_cells = pa.array(compact(pa.array(h3_cells, type=pa.uint64())))
+    return np.sort(np.asarray(compacted_cells.to_numpy(zero_copy_only=False), dtype=np.uint64))
+
+
+def _uncompact_h3_cells(
+    h3_cells: npt.NDArray[np.uint64], h3_resolution: int
+) -> npt.NDArray[np.uint64]:
+    """Expand cells not finer than the resolution into their descendants, in the input order."""
+    uncompacted_cells = pa.array(uncompact(pa.array(h3_cells, type=pa.uint64()), h3_resolution))
+    return np.asarray(uncompacted_cells.to_numpy(zero_copy_only=False), dtype=np.uint64)
+
+
+def _check_uncompact_resolution(h3_cells: npt.NDArray[np.uint64], h3_resolution: int) -> None:
+    if not (0 <= h3_resolution <= 15):
+        raise ValueError(f"Resolution {h3_resolution} is not between 0 and 15.")
+    assert _are_valid_h3_cells(h3_cells).all(), "Not all values in h3_indexes are valid H3 cells."
+    if len(h3_cells) > 0 and _get_h3_resolutions(h3_cells).max() > h3_resolution:
+        raise ValueError(f"Some of the cells are finer than the resolution {h3_resolution}.")
+
+
+def _get_h3_resolutions(h3_cells: npt.NDArray[np.uint64]) -> npt.NDArray[np.uint8]:
+    """Get resolutions of multiple cells at once."""
+    resolutions = pa.array(cells_resolution(pa.array(h3_cells, type=pa.uint64())))
+    return np.asarray(resolutions.to_numpy(zero_copy_only=False), dtype=np.uint8)
+
+
+def _get_h3_parents(h3_cells: npt.NDArray[np.uint64], h3_resolution: int) -> npt.NDArray[np.uint64]:
+    """
+    Get parents of cells not coarser than the resolution with bit operations.
+
+    The resolution is stored in bits 52-55 of a cell and each finer resolution adds a 3-bit
+    digit, with unused digits set to 7. A parent keeps the digits up to its resolution.
+    """
+    resolution_mask = np.uint64(0xF << 52)
+    unused_digits = np.uint64((1 << (3 * (15 - h3_resolution))) - 1)
+    parents: npt.NDArray[np.uint64] = (
+        (h3_cells & ~resolution_mask) | np.uint64(h3_resolution << 52) | unused_digits
+    )
+    return parents
+
+
+def _get_h3_index_dtype(index: pd.Index) -> Literal["str", "uint64"]:
+    """Get the type of H3 regions index."""
+    return "uint64" if pd.api.types.is_integer_dtype(index.dtype) else "str"
+
+
+def _max_h3_children_count(h3_cell: int, h3_resolution: int) -> int:
+    """Upper bound of the number of descendants of a cell at a resolution."""
+    return int(7 ** (h3_resolution - h3.get_resolution(h3.int_to_str(h3_cell))))
+
+
+def _format_h3_cells(
+    h3_cells: npt.NDArray[np.uint64], return_type: Literal["str", "uint64"]
+) -> Union[list[str], npt.NDArray[np.uint64]]:
+    if return_type == "uint64":
+        return h3_cells
+    h3_strings: list[str] = _h3_uint64_to_str(h3_cells).tolist()
+    return h3_strings
+
+
+def _points_to_h3_cells(points: gpd.GeoSeries, h3_resolution: int) -> npt.NDArray[np.uint64]:
+    """Get cells containing WGS84 points, all at once."""
+    h3_cells = coordinates_to_cells(
+        np.asarray(points.y, dtype=np.float64),
+        np.asarray(points.x, dtype=np.float64),
+        h3_resolution,
+    )
+    return np.asarray(pa.array(h3_cells).to_numpy(zero_copy_only=False), dtype=np.uint64)
+
+
+def _cells_to_local_ij(
+    h3_cells: npt.NDArray[np.uint64], anchor_cells: npt.NDArray[np.uint64]
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.bool_]]:
+    """Get IJ coordinates of cells anchored by paired cells, with a mask of failed ones."""
+    if len(h3_cells) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=bool)
+    local_ij = pa.record_batch(
+        cells_to_localij(
+            pa.array(h3_cells, type=pa.uint64()),
+            pa.array(anchor_cells, type=pa.uint64()),
+            set_failing_to_invalid=True,
+        )
+    )
+    i, j = local_ij.column("i"), local_ij.column("j")
+    coordinates = np.stack(
+        [
+            np.asarray(i.fill_null(0).to_numpy(), dtype=np.int64),
+            np.asarray(j.fill_null(0).to_numpy(), dtype=np.int64),
+        ],
+        axis=1,
+    )
+    failed_mask = np.asarray(
+        (i.is_null().to_numpy(zero_copy_only=False) | j.is_null().to_numpy(zero_copy_only=False)),
+        dtype=bool,
+    )
+    return coordinates, failed_mask
+
+
+def _are_valid_h3_cells(h3_cells: npt.NDArray[np.uint64]) -> npt.NDArray[np.bool_]:
+    """Check validity of multiple uint64 cells at once."""
+    valid_cells = pa.array(cells_valid(pa.array(h3_cells, type=pa.uint64())))
+    return np.asarray(valid_cells.is_valid().to_numpy(zero_copy_only=False), dtype=bool)
+
+
+def _h3_str_to_uint64(
+    h3_indexes: Union[Iterable[str], npt.NDArray[np.object_], pa.Array],
+) -> npt.NDArray[np.uint64]:
+    """Parse H3 string indexes into an array of uint64 cells, with zeros for invalid ones."""
+    strings = (
+        h3_indexes if isinstance(h3_indexes, pa.Array) else pa.array(h3_indexes, type=pa.string())
+    )
+    parsed_cells = pa.array(cells_parse(strings, set_failing_to_invalid=True))
+    return np.asarray(parsed_cells.fill_null(0).to_numpy(zero_copy_only=False), dtype=np.uint64)
+
+
+def _h3_uint64_to_str(h3_cells: npt.NDArray[np.uint64]) -> npt.NDArray[np.object_]:
+    """Convert an array of uint64 cells into H3 string indexes."""
+    strings = pa.array(cells_to_string(pa.array(h3_cells, type=pa.uint64())))
+    return np.asarray(strings.to_numpy(zero_copy_only=False), dtype=object)
+
+
+def _grid_disk_distances(
+    h3_cells: npt.NDArray[np.uint64], distance: int
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.uint64], npt.NDArray[np.int64]]:
+    """
+    Get cells of the k-disks around multiple cells at once.
+
+    Args:
+        h3_cells (npt.NDArray[np.uint64]): Centers of the disks.
+        distance (int): The k-disk distance in H3 cells.
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.uint64], npt.NDArray[np.int64]]: Offsets of
+            each disk in the flat arrays, flat array of the disk cells and flat array of their
+            distances from the center.
+    """
+    disks = pa.record_batch(grid_disk_distances(pa.array(h3_cells, type=pa.uint64()), distance))
+    cells_lists = disks.column(0)
+    distances_lists = disks.column(1)
+    offsets = np.asarray(cells_lists.offsets.to_numpy(), dtype=np.int64)
+    offsets = offsets - offsets[0]
+    cells = np.asarray(cells_lists.flatten().to_numpy(zero_copy_only=False), dtype=np.uint64)
+    distances = np.asarray(distances_lists.flatten().to_numpy(zero_copy_only=False), dtype=np.int64)
+    return offsets, cells, distances
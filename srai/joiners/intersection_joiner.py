@@ -4,11 +4,15 @@ Intersection Joiner.
 This module contains intersection joiner implementation.
 """
 
+from typing import Union
+
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 
 from srai.constants import FEATURES_INDEX, GEOMETRY_COLUMN, REGIONS_INDEX
 from srai.joiners import Joiner
+from srai.regionalizers import LazyGeometryRegions
 
 
 class IntersectionJoiner(Joiner):
@@ -21,7 +25,7 @@ class IntersectionJoiner(Joiner):
 
     def transform(
         self,
-        regions: gpd.GeoDataFrame,
+        regions: Union[gpd.GeoDataFrame, LazyGeometryRegions],
         features: gpd.GeoDataFrame,
         return_geom: bool = False,
     ) -> gpd.GeoDataFrame:
@@ -30,8 +34,13 @@ class IntersectionJoiner(Joiner):
 
         Does not apply any grouping to regions.
 
+        Regions without geometries (`LazyGeometryRegions`) are supported. Point features are
+        then assigned to regions using the grid directly (each point is assigned to a single
+        region), and the rest of the features are joined with chunks of materialized geometries.
+
         Args:
-            regions (gpd.GeoDataFrame): regions with which features are joined
+            regions (Union[gpd.GeoDataFrame, LazyGeometryRegions]): regions with which features
+                are joined
             features (gpd.GeoDataFrame): features to be joined
             return_geom (bool): whether to return geometry of the joined features.
                 Defaults to False.
@@ -40,7 +49,7 @@ class IntersectionJoiner(Joiner):
             GeoDataFrame with an intersection of regions and features, which contains
             a MultiIndex and optionaly a geometry with the intersection
         """
-        if GEOMETRY_COLUMN not in regions.columns:
+        if not isinstance(regions, LazyGeometryRegions) and GEOMETRY_COLUMN not in regions.columns:
             raise ValueError("Regions must have a geometry column.")
         if GEOMETRY_COLUMN not in features.columns:
             raise ValueError("Features must have a geometry column.")
@@ -52,7 +61,9 @@ class IntersectionJoiner(Joiner):
 
         result_gdf: gpd.GeoDataFrame
 
-        if return_geom:
+        if isinstance(regions, LazyGeometryRegions):
+            result_gdf = self._join_lazy_regions(regions, features, return_geom)
+        elif return_geom:
             result_gdf = self._join_with_geom(regions, features)
         else:
             result_gdf = self._join_without_geom(regions, features)
@@ -110,3 +121,49 @@ class IntersectionJoiner(Joiner):
             }
         ).set_index([REGIONS_INDEX, FEATURES_INDEX])
         return joint
+
+    def _join_lazy_regions(
+        self, regions: LazyGeometryRegions, features: gpd.GeoDataFrame, return_geom: bool
+    ) -> gpd.GeoDataFrame:
+        """
+        Join features to regions without geometries.
+
+        Args:
+            regions (LazyGeometryRegions): regions with which features are joined
+            features (gpd.GeoDataFrame): features to be joined
+            return_geom (bool): whether to return geometry of the joined features.
+
+        Returns:
+            GeoDataFrame with an intersection of regions and features, which contains
+            a MultiIndex and optionaly a geometry with the intersection
+        """
+        joined_parts = []
+        points_mask = np.zeros(len(features), dtype=bool)
+        if regions.can_locate_points:
+            points_mask = np.asarray(features[GEOMETRY_COLUMN].geom_type == "Point")
+            if points_mask.any():
+                points = features[points_mask]
+                region_idx = regions.locate_points(points[GEOMETRY_COLUMN])
+                located_mask = region_idx >= 0
+                points_joint = gpd.GeoDataFrame(
+                    {
+                        REGIONS_INDEX: regions.index[region_idx[located_mask]],
+                        FEATURES_INDEX: points.index[located_mask],
+                    }
+                ).set_index([REGIONS_INDEX, FEATURES_INDEX])
+                if return_geom:
+                    points_joint = points_joint.set_geometry(
+                        points[GEOMETRY_COLUMN].to_numpy()[located_mask], crs=features.crs
+                    )
+                joined_parts.append(points_joint)
+
+        other_features = features[~points_mask]
+        if not other_features.empty:
+            for regions_chunk in regions.iter_chunks():
+                if return_geom:
+                    joined_parts.append(self._join_with_geom(regions_chunk, other_features))
+                else:
+                    joined_parts.append(self._join_without_geom(regions_chunk, other_features))
+
+        joint = gpd.GeoDataFrame(pd.concat(joined_parts, ignore_index=False))
+        return joint
@@ -1,5 +1,6 @@
 """Filters."""
 
+from ._compiled import CompiledOsmTagsFilter, compile_osm_tags_filter
 from ._typing import (
     GroupedOsmTagsFilter,
     OsmTagsFilter,
@@ -14,6 +15,8 @@ __all__ = [
     "GroupedOsmTagsFilter",
     "OsmTagsFilter",
     "merge_osm_tags_filter",
+    "CompiledOsmTagsFilter",
+    "compile_osm_tags_filter",
     "BASE_OSM_GROUPS_FILTER",
     "GEOFABRIK_LAYERS",
     "HEX2VEC_FILTER",
@@ -0,0 +1,413 @@
+"""
+Compiled OSM tags filter.
+
+This module contains the CompiledOsmTagsFilter class, that matches OSM features against
+`OsmTagsFilter` or `GroupedOsmTagsFilter` definitions with precomputed lookup tables,
+and a function compiling filters with a cache.
+"""
+
+from collections.abc import Hashable
+from functools import lru_cache
+from typing import Optional, Union, cast
+
+import geopandas as gpd
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from srai._sql import quote_sql_identifier, quote_sql_literal
+from srai._typing import is_expected_type
+from srai.constants import GEOMETRY_COLUMN
+from srai.loaders.osm_loaders.filters._typing import GroupedOsmTagsFilter, OsmTagsFilter
+
+__all__ = ["CompiledOsmTagsFilter", "compile_osm_tags_filter"]
+
+# Codes of tag values and lookup tables of groups matched by unique values of a tag column.
+_EncodedTag = tuple[npt.NDArray[np.intp], npt.NDArray[np.bool_], npt.NDArray[np.bool_]]
+
+
+class CompiledOsmTagsFilter:
+    """
+    Compiled OSM tags filter.
+
+    Filter definition is parsed once into an inverted index, which maps each tag key
+    to its filter values (encoded as categories) and to the groups matched by each value
+    or by any value of the tag. Features are matched by looking up the groups of unique values
+    of each tag column, so the filter isn't interpreted again for every group and row.
+
+    A compiled filter is immutable and can be reused for many loaders and areas, eg. by getting it
+    with the cached `compile_osm_tags_filter` function. It can also be translated into
+    an equivalent DuckDB SQL predicate.
+
+    Tags with a `True` value match features with a non-empty value of the tag. Tags with
+    a `False` value don't match any features.
+    """
+
+    def __init__(self, tags: Union[OsmTagsFilter, GroupedOsmTagsFilter]) -> None:
+        """
+        Initializes the CompiledOsmTagsFilter.
+
+        Args:
+            tags (Union[OsmTagsFilter, GroupedOsmTagsFilter]): OSM tags filter definition.
+
+        Raises:
+            AttributeError: When provided tags don't match both
+                `OsmTagsFilter` or `GroupedOsmTagsFilter`.
+        """
+        if is_expected_type(tags, OsmTagsFilter):
+            self.is_grouped = False
+            self.group_names: tuple[str, ...] = ()
+            groups_filters = [cast("OsmTagsFilter", tags)]
+        elif is_expected_type(tags, GroupedOsmTagsFilter):
+            self.is_grouped = True
+            self.group_names = tuple(tags)
+            groups_filters = list(cast("GroupedOsmTagsFilter", tags).values())
+        else:
+            raise AttributeError(
+                "Provided tags don't match required type definitions"
+                " (OsmTagsFilter or GroupedOsmTagsFilter)."
+            )
+
+        # tags of each group in the order of the filter, without negative filters
+        self._groups_tags: list[list[tuple[str, Union[list[str], bool]]]] = []
+        values: dict[str, list[str]] = {}
+        for osm_filter in groups_filters:
+            group_tags: list[tuple[str, Union[list[str], bool]]] = []
+            for osm_tag_key, osm_tag_value in osm_filter.items():
+                if isinstance(osm_tag_value, bool):
+                    if osm_tag_value:
+                        group_tags.append((osm_tag_key, True))
+                    continue
+                tag_values = [osm_tag_value] if isinstance(osm_tag_value, str) else osm_tag_value
+                group_tags.append((osm_tag_key, list(tag_values)))
+                values.setdefault(osm_tag_key, []).extend(tag_values)
+            self._groups_tags.append(group_tags)
+
+        self.keys: tuple[str, ...] = tuple(
+            dict.fromkeys(key for group_tags in self._groups_tags for key, _ in group_tags)
+        )
+        self.values_index: dict[str, pd.Index] = {
+            key: pd.Index(pd.unique(pd.Series(values.get(key, []), dtype=object)), dtype=object)
+            for key in self.keys
+        }
+
+        # an additional last row of the values lookup table is selected by other values
+        n_groups = len(self._groups_tags)
+        self._value_groups: dict[str, npt.NDArray[np.bool_]] = {
+            key: np.zeros((len(self.values_index[key]) + 1, n_groups), dtype=bool)
+            for key in self.keys
+        }
+        self._any_value_groups: dict[str, npt.NDArray[np.bool_]] = {
+            key: np.zeros(n_groups, dtype=bool) for key in self.keys
+        }
+        for group_id, group_tags in enumerate(self._groups_tags):
+            for osm_tag_key, osm_tag_value in group_tags:
+                if isinstance(osm_tag_value, bool):
+                    self._any_value_groups[osm_tag_key][group_id] = True
+                else:
+                    value_codes = self.values_index[osm_tag_key].get_indexer(osm_tag_value)
+                    self._value_groups[osm_tag_key][value_codes, group_id] = True
+
+    def get_matching_groups(self, key: str, value: str) -> list[str]:
+        """
+        Get names of the groups matched by a single OSM tag.
+
+        Args:
+            key (str): OSM tag key.
+            value (str): OSM tag value.
+
+        Returns:
+            List[str]: Names of the matched groups in the order of the filter.
+
+        Raises:
+            ValueError: If the filter isn't a `GroupedOsmTagsFilter`.
+        """
+        if not self.is_grouped:
+            raise ValueError("Only a compiled GroupedOsmTagsFilter has groups.")
+        if key not in self._value_groups:
+            return []
+        value_code = self.values_index[key].get_indexer([value])[0]
+        groups_mask = self._value_groups[key][value_code]
+        if value:
+            groups_mask = groups_mask | self._any_value_groups[key]
+        return [self.group_names[group_id] for group_id in np.flatnonzero(groups_mask)]
+
+    def match(self, features_df: pd.DataFrame) -> npt.NDArray[np.bool_]:
+        """
+        Get a boolean mask of features matching any tag of the filter.
+
+        Args:
+            features_df (pd.DataFrame): Features with OSM tags in separate columns.
+                Missing tag columns don't match any features.
+
+        Returns:
+            npt.NDArray[np.bool_]: Mask of matching rows.
+        """
+        mask = np.zeros(len(features_df), dtype=bool)
+        for codes, matching_values, _ in self._encode_tags(features_df).values():
+            mask |= matching_values.any(axis=1)[codes]
+        return mask
+
+    def group_features(self, features_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """
+        Group raw OSM features into groups defined in the filter.
+
+        Values are built by concatenation of matching tag key and value with
+        an equal sign (eg. amenity=parking). Since many tags can match a definition
+        of a single group, a first match in the order of the filter is used as a feature value.
+        Groups without any matching features are omitted.
+
+        Args:
+            features_gdf (gpd.GeoDataFrame): Features with OSM tags in separate columns.
+
+        Returns:
+            gpd.GeoDataFrame: Geometries of features with columns named after the groups.
+
+        Raises:
+            ValueError: If the filter isn't a `GroupedOsmTagsFilter`.
+        """
+        if not self.is_grouped:
+            raise ValueError("Only a compiled GroupedOsmTagsFilter can group features.")
+        if len(features_gdf) == 0:
+            return features_gdf[[GEOMETRY_COLUMN]]
+
+        encoded_tags = self._encode_tags(features_gdf)
+        grouped_columns: dict[str, pd.Series] = {}
+        for group_id, group_tags in enumerate(self._groups_tags):
+            group_keys = [key for key, _ in group_tags if key in encoded_tags]
+            mask = np.zeros(len(features_gdf), dtype=bool)
+            for key in group_keys:
+                codes, matching_values, _ = encoded_tags[key]
+                mask |= matching_values[codes, group_id]
+            if not mask.any():
+                continue
+
+            # coalesce values of the tags, assigned only to the rows without a previous match
+            values = pd.Series(None, index=features_gdf.index, dtype=object)
+            unmatched = mask.copy()
+            for key in group_keys:
+                if not unmatched.any():
+                    break
+                codes, _, present_values = encoded_tags[key]
+                matched = unmatched & present_values[codes, group_id]
+                values.iloc[matched] = (
+                    f"{key}=" + features_gdf[key].iloc[matched].astype(str)
+                ).to_numpy()
+                unmatched &= ~matched
+            grouped_columns[self.group_names[group_id]] = values.where(mask)
+
+        return (
+            pd.concat(
+                [
+                    features_gdf[[GEOMETRY_COLUMN]],
+                    pd.DataFrame(grouped_columns, index=features_gdf.index, dtype=object),
+                ],
+                axis=1,
+            )
+            .replace(to_replace=[None], value=np.nan)
+            .dropna(how="all", axis="columns")
+        )
+
+    def to_duckdb_predicate(
+        self, group_name: Optional[str] = None, tags_column: Optional[str] = None
+    ) -> str:
+        """
+        Get a DuckDB SQL predicate selecting features matching the filter.
+
+        Predicate can be used in a `WHERE` clause of a query reading features,
+        eg. from a GeoParquet file saved by `OSMPbfLoader.load_to_geoparquet`.
+
+        Args:
+            group_name (Optional[str], optional): Name of a single group to match. If None,
+                features matching any group are selected. Defaults to None.
+            tags_column (Optional[str], optional): Name of a `MAP(VARCHAR, VARCHAR)` column with
+                all tags of features. If None, tags are expected in separate columns, with
+                a column for each key of the filter. Defaults to None.
+
+        Returns:
+            str: SQL predicate.
+
+        Raises:
+            ValueError: If the group doesn't exist in the filter.
+        """
+        if group_name is None:
+            osm_tags = [
+                (
+                    key,
+                    True if self._any_value_groups[key].any() else self.values_index[key].to_list(),
+                )
+                for key in self.keys
+            ]
+        else:
+            osm_tags = self._groups_tags[self._get_group_id(group_name)]
+        return _get_sql_predicate(osm_tags, tags_column)
+
+    def to_duckdb_group_expressions(self, tags_column: Optional[str] = None) -> dict[str, str]:
+        """
+        Get DuckDB SQL expressions calculating values of the groups for each feature.
+
+        Expressions return the same values as `group_features`: the first matching tag key
+        and value concatenated with an equal sign, or NULL if the group doesn't match.
+
+        Args:
+            tags_column (Optional[str], optional): Name of a `MAP(VARCHAR, VARCHAR)` column with
+                all tags of features. If None, tags are expected in separate columns, with
+                a column for each key of the filter. Defaults to None.
+
+        Returns:
+            Dict[str, str]: SQL expression for each group name.
+
+        Raises:
+            ValueError: If the filter isn't a `GroupedOsmTagsFilter`.
+        """
+        if not self.is_grouped:
+            raise ValueError("Only a compiled GroupedOsmTagsFilter has groups.")
+
+        expressions = {}
+        for group_name, group_tags in zip(self.group_names, self._groups_tags):
+            if not group_tags:
+                expressions[group_name] = "NULL"
+                continue
+            value_cases = " ".join(
+                f"WHEN {_get_sql_tag_predicate(key, value, tags_column, any_value=True)}"
+                f" THEN {quote_sql_literal(f'{key}=')}"
+                f" || CAST({_get_sql_tag_value(key, tags_column)} AS VARCHAR)"
+                for key, value in group_tags
+            )
+            expressions[group_name] = (
+                f"CASE WHEN {_get_sql_predicate(group_tags, tags_column)}"
+                f" THEN CASE {value_cases} END END"
+            )
+        return expressions
+
+    def _get_group_id(self, group_name: str) -> int:
+        if group_name not in self.group_names:
+            raise ValueError(f"Group {group_name!r} doesn't exist in the filter.")
+        return self.group_names.index(group_name)
+
+    def _encode_tags(self, features_df: pd.DataFrame) -> dict[str, _EncodedTag]:
+        """
+        Encode tag columns of features and look up the groups matched by their values.
+
+        Each tag column is factorized into integer codes. Unique values are mapped to
+        the filter values once, so groups of each row are selected with its code.
+
+        Args:
+            features_df (pd.DataFrame): Features with OSM tags in separate columns.
+
+        Returns:
+            Dict[str, Tuple[npt.NDArray[np.intp], npt.NDArray[np.bool_], npt.NDArray[np.bool_]]]:
+                Codes of the rows and lookup tables of groups matched by each unique value
+                for the tag columns present in the features. The first table matches values
+                with the filter, and the second one selects values used as the first matching
+                value. They differ only for `True` filters, which match non-empty values,
+                but take the first matching value from any present value. Missing values
+                have a code equal to -1, which selects an additional last row of the tables.
+        """
+        encoded_tags = {}
+        for key in self.keys:
+            if key not in features_df.columns:
+                continue
+            codes, uniques = pd.factorize(features_df[key])
+            unique_values = np.asarray(uniques, dtype=object)
+            value_codes = np.append(self.values_index[key].get_indexer(unique_values), -1)
+            value_groups = self._value_groups[key][value_codes]
+            any_value_groups = self._any_value_groups[key][None, :]
+            non_empty_values = np.zeros(len(unique_values) + 1, dtype=bool)
+            non_empty_values[:-1] = [bool(value) for value in unique_values]
+            present_values = np.ones(len(unique_values) + 1, dtype=bool)
+            present_values[-1] = False
+            encoded_tags[key] = (
+                codes,
+                value_groups | (non_empty_values[:, None] & any_value_groups),
+                value_groups | (present_values[:, None] & any_value_groups),
+            )
+        return encoded_tags
+
+
+def compile_osm_tags_filter(
+    tags: Union[OsmTagsFilter, GroupedOsmTagsFilter],
+) -> CompiledOsmTagsFilter:
+    """
+    Compile OSM tags filter into a `CompiledOsmTagsFilter`.
+
+    Compiled filters are cached, so equal filter definitions (with the same order of groups
+    and tags) share a single compiled filter.
+
+    Args:
+        tags (Union[OsmTagsFilter, GroupedOsmTagsFilter]): OSM tags filter definition.
+
+    Returns:
+        CompiledOsmTagsFilter: Compiled filter.
+
+    Raises:
+        AttributeError: When provided tags don't match both
+            `OsmTagsFilter` or `GroupedOsmTagsFilter`.
+    """
+    if not isinstance(tags, dict):
+        raise AttributeError(
+            "Provided tags don't match required type definitions"
+            " (OsmTagsFilter or GroupedOsmTagsFilter)."
+        )
+    return _compile_frozen_osm_tags_filter(_freeze_osm_tags_filter(tags))
+
+
+@lru_cache(maxsize=128)
+def _compile_frozen_osm_tags_filter(frozen_tags: Hashable) -> CompiledOsmTagsFilter:
+    return CompiledOsmTagsFilter(_thaw_osm_tags_filter(frozen_tags))
+
+
+def _freeze_osm_tags_filter(tags: object) -> Hashable:
+    """Convert a filter definition into nested tuples, keeping the order of its items."""
+    if isinstance(tags, dict):
+        return (dict, tuple((key, _freeze_osm_tags_filter(value)) for key, value in tags.items()))
+    if isinstance(tags, list):
+        return (list, tuple(tags))
+    return tags
+
+
+def _thaw_osm_tags_filter(frozen_tags: Hashable) -> Union[OsmTagsFilter, GroupedOsmTagsFilter]:
+    """Convert nested tuples back into a filter definition."""
+
+    def _thaw(value: Hashable) -> object:
+        if isinstance(value, tuple) and value[0] is dict:
+            return {key: _thaw(item) for key, item in value[1]}
+        if isinstance(value, tuple) and value[0] is list:
+            return list(value[1])
+        return value
+
+    return cast("Union[OsmTagsFilter, GroupedOsmTagsFilter]", _thaw(frozen_tags))
+
+
+def _get_sql_tag_value(key: str, tags_column: Optional[str]) -> str:
+    if tags_column is None:
+        return quote_sql_identifier(key)
+    return f"map_extract({quote_sql_identifier(tags_column)}, {quote_sql_literal(key)})[1]"
+
+
+def _get_sql_tag_predicate(
+    key: str, value: Union[list[str], bool], tags_column: Optional[str], any_value: bool = False
+) -> str:
+    """Get SQL predicate of a single tag, matching any present value if `any_value` is True."""
+    tag_value = _get_sql_tag_value(key, tags_column)
+    if isinstance(value, bool):
+        if any_value:
+            return f"{tag_value} IS NOT NULL"
+        return f"({tag_value} IS NOT NULL AND {tag_value} <> '')"
+    if not value:
+        return "FALSE"
+    return f"{tag_value} IN ({', '.join(quote_sql_literal(item) for item in value)})"
+
+
+def _get_sql_predicate(
+    osm_tags: list[tuple[str, Union[list[str], bool]]], tags_column: Optional[str]
+) -> str:
+    if not osm_tags:
+        return "FALSE"
+    if len(osm_tags) == 1:
+        return _get_sql_tag_predicate(*osm_tags[0], tags_column)
+    return (
+        "("
+        + " OR ".join(_get_sql_tag_predicate(key, value, tags_column) for key, value in osm_tags)
+        + ")"
+    )
@@ -4,15 +4,17 @@ OSM PBF Loader.
 This module contains loader capable of loading OpenStreetMap features from `*.osm.pbf` files.
 """
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal, Optional, Union
 
 import geopandas as gpd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from shapely.geometry.base import BaseGeometry
 
 from srai._optional import import_optional_dependencies
-from srai.constants import GEOMETRY_COLUMN, WGS84_CRS
+from srai.constants import FEATURES_INDEX, GEOMETRY_COLUMN, WGS84_CRS
 from srai.loaders.osm_loaders._base import OSMLoader
 from srai.loaders.osm_loaders.filters import GroupedOsmTagsFilter, OsmTagsFilter
 
@@ -203,6 +205,94 @@ class OSMPbfLoader(OSMLoader):
 
         return geoparquet_file_path
 
+    def load_iter(
+        self,
+        area: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+        tags: Union[OsmTagsFilter, GroupedOsmTagsFilter],
+        batch_size: int = 100_000,
+        ignore_cache: bool = False,
+        explode_tags: bool = True,
+        keep_all_tags: bool = False,
+    ) -> Iterator[gpd.GeoDataFrame]:
+        """
+        Load OSM features with specified tags for a given area in batches of bounded size.
+
+        Features are saved to a GeoParquet file with `load_to_geoparquet` and read back
+        row group by row group, so only a single batch is kept in memory at once. Batches
+        have the same columns as the result of the `load` function for the whole area,
+        with features already grouped if `tags` is a `GroupedOsmTagsFilter`.
+
+        Args:
+            area (Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame]):
+                Area for which to download objects.
+            tags (Union[OsmTagsFilter, GroupedOsmTagsFilter]): A dictionary
+                specifying which tags to download. See `load` function for details.
+            batch_size (int, optional): Maximal number of features in a single batch.
+                Defaults to 100_000.
+            ignore_cache: (bool, optional): Whether to ignore precalculated geoparquet files or not.
+                Defaults to False.
+            explode_tags: (bool, optional): Whether to split OSM tags into multiple columns or keep
+                them in a single dict. Defaults to True.
+            keep_all_tags: (bool, optional): Whether to keep all tags related to the element,
+                or return only those defined in the `tags_filter`. When True, will override
+                the optional grouping defined in the `tags_filter`. Defaults to False.
+
+        Raises:
+            ValueError: If batch size is lower than 1.
+
+        Yields:
+            Iterator[gpd.GeoDataFrame]: Batches of features as GeoDataFrames.
+        """
+        if batch_size < 1:
+            raise ValueError(f"Batch size must be positive (got {batch_size}).")
+
+        geoparquet_file_path = self.load_to_geoparquet(
+            area=area,
+            tags=tags,
+            ignore_cache=ignore_cache,
+            explode_tags=explode_tags,
+            keep_all_tags=keep_all_tags,
+        )
+        yield from self._iter_geoparquet_batches(geoparquet_file_path, batch_size)
+
+    def _iter_geoparquet_batches(
+        self, geoparquet_file_path: Path, batch_size: int
+    ) -> Iterator[gpd.GeoDataFrame]:
+        """
+        Read features from a GeoParquet file saved by `QuackOSM` in batches.
+
+        Columns without any values in the whole file are found in the statistics of row groups
+        and skipped, so every batch has the same columns as the `load` function result.
+
+        Args:
+            geoparquet_file_path (Path): Path to the GeoParquet file.
+            batch_size (int): Maximal number of features in a single batch.
+
+        Yields:
+            Iterator[gpd.GeoDataFrame]: Batches of features as GeoDataFrames.
+        """
+        parquet_file = pq.ParquetFile(geoparquet_file_path)
+        features_columns = [
+            column
+            for column in parquet_file.schema_arrow.names
+            if column not in (FEATURES_INDEX, GEOMETRY_COLUMN)
+            and not _is_column_empty(parquet_file, column)
+        ]
+        columns = [FEATURES_INDEX, GEOMETRY_COLUMN, *sorted(features_columns)]
+
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            geometry_column = batch.column(GEOMETRY_COLUMN)
+            if isinstance(geometry_column.type, pa.ExtensionType):
+                geometry_column = geometry_column.storage
+            features_df = batch.drop_columns(GEOMETRY_COLUMN).to_pandas(maps_as_pydicts="strict")
+            yield gpd.GeoDataFrame(
+                features_df,
+                geometry=gpd.GeoSeries.from_wkb(
+                    geometry_column.to_numpy(zero_copy_only=False), index=features_df.index
+                ),
+                crs=WGS84_CRS,
+            ).set_index(FEATURES_INDEX)[[GEOMETRY_COLUMN, *sorted(features_columns)]]
+
     def _get_pbf_file_reader(
         self, area_wgs84: gpd.GeoDataFrame, tags: Union[OsmTagsFilter, GroupedOsmTagsFilter]
     ) -> "PbfFileReader":
@@ -217,3 +307,24 @@ class OSMPbfLoader(OSMLoader):
             verbosity_mode=self.verbosity_mode,
         )
         return pbf_reader
+
+
+def _is_column_empty(parquet_file: pq.ParquetFile, column: str) -> bool:
+    """Check in statistics of row groups whether a flat column has only missing values."""
+    if pa.types.is_null(parquet_file.schema_arrow.field(column).type):
+        return True
+    metadata = parquet_file.metadata
+    column_ids = [
+        column_id
+        for column_id in range(metadata.num_columns)
+        if metadata.schema.column(column_id).path == column
+    ]
+    if len(column_ids) != 1:
+        return False
+    null_count = 0
+    for row_group_id in range(metadata.num_row_groups):
+        statistics = metadata.row_group(row_group_id).column(column_ids[0]).statistics
+        if statistics is None or not statistics.has_null_count:
+            return False
+        null_count += statistics.null_count
+    return bool(null_count == metadata.num_rows)
@@ -6,8 +6,19 @@ neighbourhood calculation methods - both dedicated to a specific regionalization
 and general ones.
 """
 
-from ._base import Neighbourhood
+from ._base import Neighbourhood, NeighbourhoodCSR
 from .adjacency_neighbourhood import AdjacencyNeighbourhood
 from .h3_neighbourhood import H3Neighbourhood
+from .precomputed_neighbourhood import PrecomputedNeighbourhood
+from .s2_neighbourhood import S2Neighbourhood
+from .slippy_map_neighbourhood import SlippyMapNeighbourhood
 
-__all__ = ["Neighbourhood", "AdjacencyNeighbourhood", "H3Neighbourhood"]
+__all__ = [
+    "Neighbourhood",
+    "NeighbourhoodCSR",
+    "AdjacencyNeighbourhood",
+    "H3Neighbourhood",
+    "PrecomputedNeighbourhood",
+    "S2Neighbourhood",
+    "SlippyMapNeighbourhood",
+]
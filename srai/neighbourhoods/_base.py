@@ -2,14 +2,46 @@
 
 import operator
 from abc import ABC, abstractmethod
+from collections.abc import Collection, Iterable
+from pathlib import Path
 from queue import Queue
-from typing import Generic, Optional, TypeVar
+from typing import Any, Callable, Generic, NamedTuple, Optional, TypeVar, Union
 
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
 from functional import seq
 
 IndexType = TypeVar("IndexType")
 
 
+class NeighbourhoodCSR(NamedTuple):
+    """
+    Neighbours of multiple regions in a compressed sparse row (CSR) format.
+
+    Neighbours of the i-th queried region are stored as positions in the `index`
+    in `indices[indptr[i]:indptr[i + 1]]`, sorted in ascending order.
+
+    Rows always follow the order of the queried regions, but the order of the `index` depends
+    on the implementation. It can start with the queried regions, or be the whole set of regions
+    known to the neighbourhood (e.g. the index of the regions of `AdjacencyNeighbourhood`),
+    so positions of the queried regions have to be looked up with `index.get_indexer`.
+    The `index` returned by `adjacency_matrix` is always equal to its rows.
+
+    Attributes:
+        index (pd.Index): Unique mapping of positions used in `indices` to the region indexes.
+            Contains all the found neighbours and at least the queried regions known
+            to the neighbourhood.
+        indptr (npt.NDArray[np.int64]): Row pointers with a length equal to the number of
+            queried regions plus one.
+        indices (npt.NDArray[np.int64]): Positions of the neighbours in the `index`.
+    """
+
+    index: pd.Index
+    indptr: npt.NDArray[np.int64]
+    indices: npt.NDArray[np.int64]
+
+
 class Neighbourhood(ABC, Generic[IndexType]):
     """
     Neighbourhood interface.
@@ -23,6 +55,12 @@ class Neighbourhood(ABC, Generic[IndexType]):
     `get_neighbours_up_to_distance` and `get_neighbours_at_distance` methods for performance
     reasons.  See the `H3Neighbourhood` class for an example. The class also provides a
     `_handle_center` method, which can be used to handle including/excluding the center region.
+
+    Neighbours of many regions at once can be queried with the `get_neighbours_batch` and
+    `adjacency_matrix` methods, which return integer CSR arrays. By default, they expand
+    the frontiers of all the queried regions together, calling `get_neighbours` only once for each
+    visited region. Subclasses can provide direct neighbours of many regions at once by overriding
+    the `_get_direct_neighbours_batch` method, or override the batch methods completely.
     """
 
     def __init__(self, include_center: bool = False) -> None:
@@ -115,6 +153,224 @@ class Neighbourhood(ABC, Generic[IndexType]):
         )
         return neighbours_at_distance
 
+    def get_neighbours_batch(
+        self,
+        indexes: Iterable[IndexType],
+        distance: int,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> NeighbourhoodCSR:
+        """
+        Get the neighbours of multiple regions at once.
+
+        Results are equal to calling `get_neighbours_up_to_distance` (or
+        `get_neighbours_at_distance` if `at_distance` is set) for each region separately.
+
+        Args:
+            indexes (Iterable[IndexType]): Unique identifiers of the regions.
+                Dependant on the implementation.
+            distance (int): Distance to the neighbours.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            NeighbourhoodCSR: Neighbours of the regions with a row for each queried region.
+        """
+        queried_index = pd.Index(indexes)
+        if distance < 0:
+            return _neighbours_to_csr(queried_index, [[] for _ in range(len(queried_index))])
+
+        node_index, rows, nodes, distances = self._get_neighbours_with_distances_batch(
+            queried_index, distance
+        )
+
+        if at_distance:
+            mask = (distances == distance) & (distances > 0)
+        else:
+            mask = distances > 0
+        if self._resolve_include_center(include_center) and (distance == 0 or not at_distance):
+            mask |= distances == 0
+
+        return _pairs_to_csr(node_index, len(queried_index), rows[mask], nodes[mask])
+
+    def adjacency_matrix(
+        self,
+        distance: int = 1,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> NeighbourhoodCSR:
+        """
+        Get the neighbours of all the regions known to the neighbourhood.
+
+        Args:
+            distance (int): Distance to the neighbours. Defaults to 1.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            NeighbourhoodCSR: Neighbours with a row for each region in the `index`.
+
+        Raises:
+            NotImplementedError: If the neighbourhood doesn't have a defined set of regions.
+        """
+        return self.get_neighbours_batch(
+            self._get_all_indexes(),
+            distance,
+            at_distance=at_distance,
+            include_center=include_center,
+        )
+
+    def save(self, path: Union[Path, str], ring_distances: Optional[Iterable[int]] = None) -> None:
+        """
+        Save the neighbourhood to a directory.
+
+        Direct neighbours of all the regions are saved in a versioned format consisting of
+        the regions index and CSR arrays. Neighbours at exactly the given `ring_distances` can be
+        additionally precomputed and saved as well.
+
+        Args:
+            path (Union[Path, str]): Path to the directory.
+            ring_distances (Optional[Iterable[int]]): Additional distances, for which neighbours
+                at exactly that distance are precomputed and saved. Defaults to None.
+
+        Raises:
+            NotImplementedError: If the neighbourhood doesn't have a defined set of regions.
+        """
+        from srai.neighbourhoods.precomputed_neighbourhood import save_neighbourhood
+
+        save_neighbourhood(self, path, ring_distances)
+
+    @staticmethod
+    def load(path: Union[Path, str], mmap: bool = True) -> "Neighbourhood[Any]":
+        """
+        Load a neighbourhood saved with the `save` method.
+
+        Loaded neighbourhood is a `PrecomputedNeighbourhood` answering the queries from the saved
+        neighbours, regardless of the class of the saved neighbourhood.
+
+        Args:
+            path (Union[Path, str]): Path to the directory.
+            mmap (bool): Whether to memory-map the saved arrays instead of reading them into memory.
+                Allows sharing a single graph between multiple processes. Defaults to True.
+
+        Returns:
+            Neighbourhood[Any]: The loaded neighbourhood.
+        """
+        from srai.neighbourhoods.precomputed_neighbourhood import load_neighbourhood
+
+        return load_neighbourhood(path, mmap=mmap)
+
+    def _get_all_indexes(self) -> pd.Index:
+        """
+        Get indexes of all the regions known to the neighbourhood.
+
+        Raises:
+            NotImplementedError: If the neighbourhood doesn't have a defined set of regions.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} doesn't have a defined set of regions."
+            " Use `get_neighbours_batch` with explicit indexes instead."
+        )
+
+    def _get_direct_neighbours_batch(
+        self, indexes: list[IndexType]
+    ) -> Iterable[Collection[IndexType]]:
+        """
+        Get the direct neighbours of multiple regions, without the regions themselves.
+
+        Args:
+            indexes (List[IndexType]): Unique identifiers of the regions.
+
+        Returns:
+            Iterable[Collection[IndexType]]: Neighbours of each region in order of the indexes.
+        """
+        return (self.get_neighbours(index, include_center=False) for index in indexes)
+
+    def _get_neighbours_with_distances_batch(
+        self, queried_index: pd.Index, distance: int
+    ) -> tuple[pd.Index, npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Expand the frontiers of all the queried regions together up to a given distance.
+
+        Each visited region is expanded only once using `_get_direct_neighbours_batch` and
+        the frontiers are propagated over the gathered integer adjacency.
+
+        Args:
+            queried_index (pd.Index): Unique identifiers of the regions.
+            distance (int): Maximum distance to the neighbours.
+
+        Returns:
+            Tuple[pd.Index, npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+                Index of all visited regions and, for each visited (row, region) pair,
+                the row of the queried region, the position of the visited region
+                and the distance between them.
+        """
+        node_positions: dict[Any, int] = {}
+        query_nodes = np.fromiter(
+            (node_positions.setdefault(index, len(node_positions)) for index in queried_index),
+            dtype=np.int64,
+            count=len(queried_index),
+        )
+
+        # direct adjacency of the already expanded regions in the CSR format
+        expanded_rows: list[int] = []
+        adjacency_indptr = np.zeros(1, dtype=np.int64)
+        adjacency_indices = np.zeros(0, dtype=np.int64)
+
+        def get_adjacency(
+            frontier_nodes: npt.NDArray[np.int64],
+        ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+            nonlocal adjacency_indptr, adjacency_indices
+
+            expanded_rows.extend([-1] * (len(node_positions) - len(expanded_rows)))
+            nodes_to_expand = np.unique(
+                frontier_nodes[np.asarray(expanded_rows, dtype=np.int64)[frontier_nodes] < 0]
+            )
+            if len(nodes_to_expand) > 0:
+                node_ids = list(node_positions.keys())
+                lengths = []
+                flat_neighbours: list[int] = []
+                for neighbours in self._get_direct_neighbours_batch(
+                    [node_ids[node] for node in nodes_to_expand]
+                ):
+                    lengths.append(len(neighbours))
+                    flat_neighbours.extend(
+                        node_positions.setdefault(neighbour, len(node_positions))
+                        for neighbour in neighbours
+                    )
+                for row_offset, node in enumerate(nodes_to_expand):
+                    expanded_rows[node] = len(adjacency_indptr) - 1 + row_offset
+                adjacency_indptr = np.concatenate(
+                    (adjacency_indptr, adjacency_indptr[-1] + np.cumsum(lengths, dtype=np.int64))
+                )
+                adjacency_indices = np.concatenate(
+                    (adjacency_indices, np.asarray(flat_neighbours, dtype=np.int64))
+                )
+                expanded_rows.extend([-1] * (len(node_positions) - len(expanded_rows)))
+
+            return (
+                adjacency_indptr,
+                adjacency_indices,
+                np.asarray(expanded_rows, dtype=np.int64)[frontier_nodes],
+            )
+
+        rows, nodes, distances = _expand_frontiers(query_nodes, distance, get_adjacency)
+        return (
+            pd.Index(list(node_positions.keys()), dtype=queried_index.dtype),
+            rows,
+            nodes,
+            distances,
+        )
+
+    def _resolve_include_center(self, include_center_override: Optional[bool]) -> bool:
+        if include_center_override is None:
+            return self.include_center
+        return include_center_override
+
     def _get_neighbours_with_distances(
         self, index: IndexType, distance: int
     ) -> set[tuple[IndexType, int]]:
@@ -165,3 +421,181 @@ class Neighbourhood(ABC, Generic[IndexType]):
                 else:
                     neighbours.discard(index)
         return neighbours
+
+
+def _neighbours_to_csr(
+    queried_index: pd.Index, neighbours: Iterable[Collection[Any]]
+) -> NeighbourhoodCSR:
+    """
+    Convert neighbours of each queried region into the CSR format.
+
+    Args:
+        queried_index (pd.Index): Unique identifiers of the queried regions.
+        neighbours (Iterable[Collection[Any]]): Neighbours of each queried region.
+
+    Returns:
+        NeighbourhoodCSR: Neighbours of the regions with a row for each queried region.
+    """
+    node_positions: dict[Any, int] = {}
+    for index in queried_index:
+        node_positions.setdefault(index, len(node_positions))
+
+    lengths = []
+    flat_nodes: list[int] = []
+    for region_neighbours in neighbours:
+        lengths.append(len(region_neighbours))
+        flat_nodes.extend(
+            node_positions.setdefault(neighbour, len(node_positions))
+            for neighbour in region_neighbours
+        )
+
+    rows = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+    return _pairs_to_csr(
+        pd.Index(list(node_positions.keys()), dtype=queried_index.dtype),
+        len(queried_index),
+        rows,
+        np.asarray(flat_nodes, dtype=np.int64),
+    )
+
+
+def _pairs_to_csr(
+    index: pd.Index,
+    number_of_rows: int,
+    rows: npt.NDArray[np.int64],
+    nodes: npt.NDArray[np.int64],
+) -> NeighbourhoodCSR:
+    order = np.lexsort((nodes, rows))
+    indptr = np.zeros(number_of_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=number_of_rows), out=indptr[1:])
+    return NeighbourhoodCSR(index=index, indptr=indptr, indices=nodes[order].astype(np.int64))
+
+
+def _expand_frontiers_over_adjacency(
+    node_index: pd.Index,
+    adjacency_indptr: npt.NDArray[np.int64],
+    adjacency_indices: npt.NDArray[np.integer[Any]],
+    queried_index: pd.Index,
+    distance: int,
+) -> tuple[pd.Index, npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Expand the frontiers of the queried regions over a precomputed adjacency of all regions.
+
+    Queried regions missing from the `node_index` are appended to it without any neighbours.
+
+    Args:
+        node_index (pd.Index): Regions of the adjacency.
+        adjacency_indptr (npt.NDArray[np.int64]): CSR row pointers of the adjacency.
+        adjacency_indices (npt.NDArray[np.integer[Any]]): Positions of the direct neighbours.
+        queried_index (pd.Index): Unique identifiers of the queried regions.
+        distance (int): Maximum distance to the neighbours.
+
+    Returns:
+        Tuple[pd.Index, npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+            Index of the regions and, for each visited (row, region) pair, the row of the queried
+            region, the position of the visited region and the distance between them.
+    """
+    query_nodes = np.asarray(node_index.get_indexer(queried_index), dtype=np.int64)
+    unknown_nodes_mask = query_nodes < 0
+    if unknown_nodes_mask.any():
+        unknown_index = queried_index[unknown_nodes_mask].unique()
+        node_index = node_index.append(unknown_index)
+        adjacency_indptr = np.concatenate(
+            (adjacency_indptr, np.full(len(unknown_index), adjacency_indptr[-1]))
+        )
+        query_nodes[unknown_nodes_mask] = node_index.get_indexer(queried_index[unknown_nodes_mask])
+
+    rows, nodes, distances = _expand_frontiers(
+        query_nodes,
+        distance,
+        lambda frontier_nodes: (adjacency_indptr, adjacency_indices, frontier_nodes),
+    )
+    return node_index, rows, nodes, distances
+
+
+def _expand_frontiers(
+    query_nodes: npt.NDArray[np.int64],
+    distance: int,
+    get_adjacency: Callable[
+        [npt.NDArray[np.int64]],
+        tuple[npt.NDArray[np.int64], npt.NDArray[np.integer[Any]], npt.NDArray[np.int64]],
+    ],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Expand the frontiers of multiple regions together over an integer adjacency.
+
+    Args:
+        query_nodes (npt.NDArray[np.int64]): Positions of the queried regions.
+        distance (int): Maximum distance to the neighbours.
+        get_adjacency (Callable): Function returning CSR row pointers, CSR values and rows
+            of the adjacency for the given frontier positions.
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]: For each
+            visited (row, region) pair, the row of the queried region, the position of the visited
+            region and the distance between them.
+    """
+    frontier_rows = np.arange(len(query_nodes), dtype=np.int64)
+    frontier_nodes = np.asarray(query_nodes, dtype=np.int64)
+    visited_keys = np.unique(_encode_pairs(frontier_rows, frontier_nodes))
+    all_rows, all_nodes, all_distances = (
+        [frontier_rows],
+        [frontier_nodes],
+        [np.zeros(len(frontier_rows), dtype=np.int64)],
+    )
+
+    for current_distance in range(1, distance + 1):
+        if len(frontier_rows) == 0:
+            break
+
+        adjacency_indptr, adjacency_indices, adjacency_rows = get_adjacency(frontier_nodes)
+        owners, neighbour_nodes = _gather_csr_rows(
+            adjacency_indptr, adjacency_indices, adjacency_rows
+        )
+        candidate_keys = np.unique(_encode_pairs(frontier_rows[owners], neighbour_nodes))
+        new_keys = candidate_keys[~np.isin(candidate_keys, visited_keys, assume_unique=True)]
+        visited_keys = np.union1d(visited_keys, new_keys)
+
+        frontier_rows, frontier_nodes = _decode_pairs(new_keys)
+        all_rows.append(frontier_rows)
+        all_nodes.append(frontier_nodes)
+        all_distances.append(np.full(len(new_keys), current_distance, dtype=np.int64))
+
+    return np.concatenate(all_rows), np.concatenate(all_nodes), np.concatenate(all_distances)
+
+
+def _gather_csr_rows(
+    indptr: npt.NDArray[np.integer[Any]],
+    indices: npt.NDArray[np.integer[Any]],
+    rows: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Gather values of multiple CSR rows at once.
+
+    Args:
+        indptr (npt.NDArray[np.integer[Any]]): CSR row pointers.
+        indices (npt.NDArray[np.integer[Any]]): CSR values.
+        rows (npt.NDArray[np.int64]): Rows to gather. Can contain duplicates.
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]: Position in `rows` of the row owning
+            each gathered value and the gathered values.
+    """
+    starts = np.asarray(indptr[rows], dtype=np.int64)
+    lengths = np.asarray(indptr[rows + 1], dtype=np.int64) - starts
+    owners = np.repeat(np.arange(len(rows), dtype=np.int64), lengths)
+    offsets = np.arange(len(owners), dtype=np.int64) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    return owners, np.asarray(indices[starts[owners] + offsets], dtype=np.int64)
+
+
+def _encode_pairs(
+    rows: npt.NDArray[np.int64], nodes: npt.NDArray[np.int64]
+) -> npt.NDArray[np.int64]:
+    return (rows << 32) | nodes
+
+
+def _decode_pairs(
+    keys: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    return keys >> 32, keys & 0xFFFFFFFF
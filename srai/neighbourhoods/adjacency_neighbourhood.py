@@ -5,13 +5,24 @@ This module contains the AdjacencyNeighbourhood class, that allows to get the ne
 region based on its borders.
 """
 
-from collections.abc import Hashable
-from typing import Optional
+from collections.abc import Hashable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
 
 import geopandas as gpd
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import shapely
+from tqdm import tqdm
 
-from srai.constants import GEOMETRY_COLUMN
+from srai._multiprocessing import (
+    parse_multiprocessing_activation_threshold,
+    parse_num_of_multiprocessing_workers,
+)
+from srai.constants import FORCE_TERMINAL, GEOMETRY_COLUMN
 from srai.neighbourhoods import Neighbourhood
+from srai.neighbourhoods._base import NeighbourhoodCSR, _expand_frontiers_over_adjacency
 
 
 class AdjacencyNeighbourhood(Neighbourhood[Hashable]):
@@ -23,6 +34,9 @@ class AdjacencyNeighbourhood(Neighbourhood[Hashable]):
 
     By default, a lookup table will be populated lazily based on queries. A dedicated function
     `generate_neighbourhoods` allows for precalculation of all the neighbourhoods at once.
+
+    Neighbours are found using the spatial index of the regions and stored as integer positions
+    of the regions in a compressed sparse row (CSR) format.
     """
 
     def __init__(self, regions_gdf: gpd.GeoDataFrame, include_center: bool = False) -> None:
@@ -42,13 +56,108 @@ class AdjacencyNeighbourhood(Neighbourhood[Hashable]):
         if GEOMETRY_COLUMN not in regions_gdf.columns:
             raise ValueError("Regions must have a geometry column.")
         self.regions_gdf = regions_gdf
-        self.lookup: dict[Hashable, set[Hashable]] = {}
+        self._positions_dtype = np.int32 if len(regions_gdf.index) < 2**31 else np.int64
+        self._adjacency_indptr: Optional[npt.NDArray[np.int64]] = None
+        self._adjacency_indices: Optional[npt.NDArray[np.integer[Any]]] = None
+        self._lazy_adjacency: dict[int, npt.NDArray[np.integer[Any]]] = {}
+        self._lookup: Optional[dict[Hashable, set[Hashable]]] = None
+
+    @property
+    def lookup(self) -> dict[Hashable, set[Hashable]]:
+        """
+        Get the already calculated neighbourhoods as a dictionary.
+
+        The dictionary is built from the CSR arrays on the first access and cached until new
+        neighbourhoods are calculated. It shouldn't be modified.
+
+        Returns:
+            Dict[Hashable, Set[Hashable]]: Mapping of regions to their direct neighbours.
+        """
+        if self._lookup is None:
+            if self._adjacency_indptr is not None:
+                positions: Iterable[int] = range(len(self.regions_gdf.index))
+            else:
+                positions = self._lazy_adjacency.keys()
+            self._lookup = {
+                self.regions_gdf.index[position]: set(
+                    self.regions_gdf.index[self._get_adjacent_positions(position)]
+                )
+                for position in positions
+            }
+        return self._lookup
+
+    def generate_neighbourhoods(
+        self,
+        num_of_multiprocessing_workers: int = 1,
+        multiprocessing_activation_threshold: Optional[int] = None,
+    ) -> None:
+        """
+        Generate the lookup table for all regions.
+
+        All neighbourhoods are calculated in one pass using a spatial index query.
+
+        Args:
+            num_of_multiprocessing_workers (int, optional): Number of workers used for
+                multiprocessing. Regions are split into spatially coherent chunks queried
+                in parallel. Defaults to 1 (no multiprocessing). If -1, all available
+                threads are used. If 0, also no multiprocessing is used.
+            multiprocessing_activation_threshold (int, optional): Number of regions required to
+                start processing in multiple processes. Defaults to 100 000.
+        """
+        if self._adjacency_indptr is not None:
+            return
+
+        num_of_multiprocessing_workers = parse_num_of_multiprocessing_workers(
+            num_of_multiprocessing_workers
+        )
+        multiprocessing_activation_threshold = parse_multiprocessing_activation_threshold(
+            multiprocessing_activation_threshold, 100_000
+        )
+        number_of_regions = len(self.regions_gdf.index)
+        geometries = self.regions_gdf.geometry.values
+
+        if (
+            num_of_multiprocessing_workers > 1
+            and number_of_regions >= multiprocessing_activation_threshold
+        ):
+            # regions sorted along the Hilbert curve are split into spatially coherent chunks
+            hilbert_order = np.argsort(
+                np.asarray(self.regions_gdf.geometry.hilbert_distance()), kind="stable"
+            ).astype(np.int64)
+            number_of_chunks = 4 * num_of_multiprocessing_workers
+            chunks = np.array_split(hilbert_order, number_of_chunks)
+            query_positions_chunks = []
+            neighbour_positions_chunks = []
+            with (
+                ProcessPoolExecutor(
+                    max_workers=num_of_multiprocessing_workers,
+                    initializer=_initialize_worker,
+                    initargs=(shapely.to_wkb(geometries),),
+                ) as executor,
+                tqdm(
+                    total=number_of_regions,
+                    desc="Generating neighbourhoods",
+                    disable=FORCE_TERMINAL,
+                ) as pbar,
+            ):
+                for chunk, (query_positions, neighbour_positions) in zip(
+                    chunks, executor.map(_query_touching_regions_task, chunks)
+                ):
+                    query_positions_chunks.append(chunk[query_positions])
+                    neighbour_positions_chunks.append(neighbour_positions)
+                    pbar.update(len(chunk))
+            query_positions = np.concatenate(query_positions_chunks)
+            neighbour_positions = np.concatenate(neighbour_positions_chunks)
+        else:
+            query_positions, neighbour_positions = self.regions_gdf.sindex.query(
+                geometries, predicate="touches"
+            )
 
-    def generate_neighbourhoods(self) -> None:
-        """Generate the lookup table for all regions."""
-        for region_id in self.regions_gdf.index:
-            if region_id not in self.lookup:
-                self.lookup[region_id] = self._get_adjacent_neighbours(region_id)
+        self._adjacency_indptr, self._adjacency_indices = _pairs_to_adjacency(
+            query_positions, neighbour_positions, number_of_regions, self._positions_dtype
+        )
+        self._lazy_adjacency.clear()
+        self._lookup = None
 
     def get_neighbours(
         self, index: Hashable, include_center: Optional[bool] = None
@@ -67,19 +176,96 @@ class AdjacencyNeighbourhood(Neighbourhood[Hashable]):
         if self._index_incorrect(index):
             return set()
 
-        if index not in self.lookup:
-            self.lookup[index] = self._get_adjacent_neighbours(index)
-
-        neighbours = self.lookup[index]
+        neighbours = self._get_adjacent_neighbours(index)
         neighbours = self._handle_center(
             index, 1, neighbours, at_distance=False, include_center_override=include_center
         )
         return neighbours
 
+    def _get_all_indexes(self) -> pd.Index:
+        return self.regions_gdf.index
+
+    def adjacency_matrix(
+        self,
+        distance: int = 1,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> NeighbourhoodCSR:
+        """
+        Get the neighbours of all the regions.
+
+        The lookup table for all regions is generated first if it's missing.
+
+        Args:
+            distance (int): Distance to the neighbours. Defaults to 1.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            NeighbourhoodCSR: Neighbours with a row for each region in the `regions_gdf`.
+        """
+        self.generate_neighbourhoods()
+        return super().adjacency_matrix(distance, at_distance, include_center)
+
+    def _get_neighbours_with_distances_batch(
+        self, queried_index: pd.Index, distance: int
+    ) -> tuple[pd.Index, npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Expand the frontiers directly over the integer adjacency of the regions.
+
+        Falls back to the generic implementation if the lookup table isn't generated.
+        """
+        if self._adjacency_indptr is None or self._adjacency_indices is None:
+            return super()._get_neighbours_with_distances_batch(queried_index, distance)
+
+        return _expand_frontiers_over_adjacency(
+            self.regions_gdf.index,
+            self._adjacency_indptr,
+            self._adjacency_indices,
+            queried_index,
+            distance,
+        )
+
+    def _get_direct_neighbours_batch(self, indexes: list[Hashable]) -> Iterable[set[Hashable]]:
+        """
+        Get the direct neighbours of multiple regions, without the regions themselves.
+
+        Regions missing from the lookup table are calculated together with a single
+        spatial index query.
+
+        Args:
+            indexes (List[Hashable]): Unique identifiers of the regions.
+
+        Returns:
+            Iterable[Set[Hashable]]: Neighbours of each region in order of the indexes.
+        """
+        positions = self.regions_gdf.index.get_indexer(pd.Index(indexes))
+        if self._adjacency_indptr is None:
+            missing_positions = np.unique(
+                [
+                    position
+                    for position in positions
+                    if position >= 0 and position not in self._lazy_adjacency
+                ]
+            ).astype(np.int64)
+            if len(missing_positions) > 0:
+                self._query_adjacent_positions(missing_positions)
+
+        return (
+            set(self.regions_gdf.index[self._get_adjacent_positions(position)]) - {index}
+            if position >= 0
+            else set()
+            for index, position in zip(indexes, positions)
+        )
+
     def _get_adjacent_neighbours(self, index: Hashable) -> set[Hashable]:
         """
         Get the direct neighbours of a region using `touches` [1] operator from the Shapely library.
 
+        Candidates are taken from the spatial index of the regions.
+
         Args:
             index (Hashable): Unique identifier of the region.
 
@@ -89,11 +275,59 @@ class AdjacencyNeighbourhood(Neighbourhood[Hashable]):
         References:
             1. https://shapely.readthedocs.io/en/stable/reference/shapely.touches.html
         """
-        current_region = self.regions_gdf.loc[index]
-        neighbours = self.regions_gdf[
-            self.regions_gdf.geometry.touches(current_region[GEOMETRY_COLUMN])
-        ]
-        return set(neighbours.index)
+        position = self.regions_gdf.index.get_loc(index)
+        if self._adjacency_indptr is None and position not in self._lazy_adjacency:
+            self._query_adjacent_positions(np.array([position], dtype=np.int64))
+        return set(self.regions_gdf.index[self._get_adjacent_positions(position)])
+
+    def _query_adjacent_positions(self, positions: npt.NDArray[np.int64]) -> None:
+        """Find the neighbours of regions at given positions and save them in the lookup table."""
+        query_positions, neighbour_positions = self.regions_gdf.sindex.query(
+            self.regions_gdf.geometry.values[positions], predicate="touches"
+        )
+        indptr, indices = _pairs_to_adjacency(
+            query_positions, neighbour_positions, len(positions), self._positions_dtype
+        )
+        for row, position in enumerate(positions):
+            self._lazy_adjacency[int(position)] = indices[indptr[row] : indptr[row + 1]]
+        self._lookup = None
+
+    def _get_adjacent_positions(self, position: int) -> npt.NDArray[np.integer[Any]]:
+        if self._adjacency_indptr is not None and self._adjacency_indices is not None:
+            return self._adjacency_indices[
+                self._adjacency_indptr[position] : self._adjacency_indptr[position + 1]
+            ]
+        return self._lazy_adjacency[position]
 
     def _index_incorrect(self, index: Hashable) -> bool:
         return index not in self.regions_gdf.index
+
+
+def _pairs_to_adjacency(
+    query_positions: npt.NDArray[np.int64],
+    neighbour_positions: npt.NDArray[np.int64],
+    number_of_rows: int,
+    positions_dtype: type[np.integer[Any]],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.integer[Any]]]:
+    order = np.lexsort((neighbour_positions, query_positions))
+    indptr = np.zeros(number_of_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(query_positions, minlength=number_of_rows), out=indptr[1:])
+    return indptr, neighbour_positions[order].astype(positions_dtype)
+
+
+# Spatial index of all the regions built once in each worker process.
+_WORKER_TREE: Optional[shapely.STRtree] = None
+
+
+def _initialize_worker(geometries_wkb: npt.NDArray[np.object_]) -> None:
+    global _WORKER_TREE  # noqa: PLW0603
+    _WORKER_TREE = shapely.STRtree(shapely.from_wkb(geometries_wkb))
+
+
+def _query_touching_regions_task(
+    positions: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    assert _WORKER_TREE is not None
+    geometries = _WORKER_TREE.geometries.take(positions)
+    query_positions, neighbour_positions = _WORKER_TREE.query(geometries, predicate="touches")
+    return query_positions.astype(np.int64), neighbour_positions.astype(np.int64)
@@ -4,23 +4,39 @@ H3 neighbourhood.
 This module contains the H3Neighbourhood class, that allows to get the neighbours of an H3 region.
 """
 
-from typing import Optional
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 import geopandas as gpd
 import h3
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pyarrow as pa
 
+from srai.h3 import _grid_disk_distances, _h3_uint64_to_str, _to_h3_cells
 from srai.neighbourhoods import Neighbourhood
+from srai.neighbourhoods._base import NeighbourhoodCSR, _pairs_to_csr
 
+if TYPE_CHECKING:  # pragma: no cover
+    from srai.regionalizers import LazyGeometryRegions
 
-class H3Neighbourhood(Neighbourhood[str]):
+H3Index = Union[str, int]
+
+
+class H3Neighbourhood(Neighbourhood[H3Index]):
     """
     H3 Neighbourhood.
 
-    This class allows to get the neighbours of an H3 region.
+    This class allows to get the neighbours of an H3 region. Regions can be identified either by
+    H3 string indexes or by uint64 cells (e.g. from `H3Regionalizer(index_dtype="uint64")`).
+    Neighbours are returned in the same form as the queried regions.
     """
 
     def __init__(
-        self, regions_gdf: Optional[gpd.GeoDataFrame] = None, include_center: bool = False
+        self,
+        regions_gdf: Optional[Union[gpd.GeoDataFrame, "LazyGeometryRegions"]] = None,
+        include_center: bool = False,
     ) -> None:
         """
         Initializes the H3Neighbourhood.
@@ -33,7 +49,8 @@ class H3Neighbourhood(Neighbourhood[str]):
             even when there is no path of length k between the two regions.
 
         Args:
-            regions_gdf (Optional[gpd.GeoDataFrame], optional): The regions that are being analyzed.
+            regions_gdf (Optional[Union[gpd.GeoDataFrame, LazyGeometryRegions]], optional): The
+                regions that are being analyzed. Only their index is used.
                 The H3Neighbourhood will only look for neighbours among these regions.
                 Defaults to None.
             include_center (bool): Whether to include the region itself in the neighbours.
@@ -41,48 +58,49 @@ class H3Neighbourhood(Neighbourhood[str]):
             unless overridden in the function call.
         """
         super().__init__(include_center)
-        self._available_indices: Optional[set[str]] = None
+        self._available_indices: Optional[set[H3Index]] = None
+        self._available_cells: Optional[npt.NDArray[np.uint64]] = None
         if regions_gdf is not None:
             self._available_indices = set(regions_gdf.index)
 
-    def get_neighbours(self, index: str, include_center: Optional[bool] = None) -> set[str]:
+    def get_neighbours(self, index: H3Index, include_center: Optional[bool] = None) -> set[H3Index]:
         """
         Get the direct neighbours of an H3 region using its index.
 
         Args:
-            index (str): H3 index of the region.
+            index (H3Index): H3 index of the region, as a string or an integer cell.
             include_center (Optional[bool]): Whether to include the region itself in the neighbours.
             If None, the value set in __init__ is used. Defaults to None.
 
         Returns:
-            Set[str]: Indexes of the neighbours.
+            Set[H3Index]: Indexes of the neighbours.
         """
         return self.get_neighbours_up_to_distance(index, 1, include_center)
 
     def get_neighbours_up_to_distance(
         self,
-        index: str,
+        index: H3Index,
         distance: int,
         include_center: Optional[bool] = None,
         unchecked: bool = False,
-    ) -> set[str]:
+    ) -> set[H3Index]:
         """
         Get the neighbours of an H3 region up to a certain distance.
 
         Args:
-            index (str): H3 index of the region.
+            index (H3Index): H3 index of the region, as a string or an integer cell.
             distance (int): Distance to the neighbours.
             include_center (Optional[bool]): Whether to include the region itself in the neighbours.
                 If None, the value set in __init__ is used. Defaults to None.
             unchecked (bool): Whether to check if the neighbours are in the available indices.
 
         Returns:
-            Set[str]: Indexes of the neighbours up to the given distance.
+            Set[H3Index]: Indexes of the neighbours up to the given distance.
         """
         if self._distance_incorrect(distance):
             return set()
 
-        neighbours: set[str] = set(h3.grid_disk(index, distance))
+        neighbours: set[H3Index] = set(_h3_api(index).grid_disk(_h3_cell(index), distance))
         neighbours = self._handle_center(
             index, distance, neighbours, at_distance=False, include_center_override=include_center
         )
@@ -91,33 +109,148 @@ class H3Neighbourhood(Neighbourhood[str]):
         return self._select_available(neighbours)
 
     def get_neighbours_at_distance(
-        self, index: str, distance: int, include_center: Optional[bool] = None
-    ) -> set[str]:
+        self, index: H3Index, distance: int, include_center: Optional[bool] = None
+    ) -> set[H3Index]:
         """
         Get the neighbours of an H3 region at a certain distance.
 
         Args:
-            index (str): H3 index of the region.
+            index (H3Index): H3 index of the region, as a string or an integer cell.
             distance (int): Distance to the neighbours.
             include_center (Optional[bool]): Whether to include the region itself in the neighbours.
             If None, the value set in __init__ is used. Defaults to None.
 
         Returns:
-            Set[str]: Indexes of the neighbours at the given distance.
+            Set[H3Index]: Indexes of the neighbours at the given distance.
         """
         if self._distance_incorrect(distance):
             return set()
 
-        neighbours: set[str] = set(h3.grid_ring(index, distance))
+        neighbours: set[H3Index] = set(_h3_api(index).grid_ring(_h3_cell(index), distance))
         neighbours = self._handle_center(
             index, distance, neighbours, at_distance=True, include_center_override=include_center
         )
         return self._select_available(neighbours)
 
-    def _select_available(self, indices: set[str]) -> set[str]:
+    def get_neighbours_batch(
+        self,
+        indexes: Iterable[H3Index],
+        distance: int,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> NeighbourhoodCSR:
+        """
+        Get the neighbours of multiple H3 regions at once.
+
+        Neighbours are found with `get_neighbours_cells` for all the regions together.
+
+        Args:
+            indexes (Iterable[H3Index]): H3 indexes of the regions.
+            distance (int): Distance to the neighbours.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            NeighbourhoodCSR: Neighbours of the regions with a row for each queried region.
+        """
+        queried_index = pd.Index(indexes)
+        queried_cells = _to_h3_cells(queried_index.to_numpy())
+        offsets, neighbour_cells = self.get_neighbours_cells(
+            queried_cells, distance, at_distance=at_distance, include_center=include_center
+        )
+        node_cells = np.unique(np.concatenate((queried_cells, neighbour_cells)))
+        rows = np.repeat(np.arange(len(queried_cells), dtype=np.int64), np.diff(offsets))
+        return _pairs_to_csr(
+            pd.Index(
+                node_cells
+                if pd.api.types.is_integer_dtype(queried_index.dtype)
+                else _h3_uint64_to_str(node_cells)
+            ),
+            len(queried_cells),
+            rows,
+            np.searchsorted(node_cells, neighbour_cells).astype(np.int64),
+        )
+
+    def get_neighbours_cells(
+        self,
+        h3_cells: Union[npt.NDArray[np.uint64], pa.Array],
+        distance: int,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.uint64]]:
+        """
+        Get the neighbours of multiple H3 cells given as uint64 integers.
+
+        The disks of all the cells are calculated at once with h3ronpy and the neighbours
+        are checked against the available regions with a binary search over a sorted array.
+
+        Args:
+            h3_cells (Union[npt.NDArray[np.uint64], pa.Array]): H3 cells of the regions.
+            distance (int): Distance to the neighbours.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Tuple[npt.NDArray[np.int64], npt.NDArray[np.uint64]]: Offsets of the neighbours of
+                each cell (with a length equal to the number of cells plus one) and a flat array
+                of the neighbours.
+        """
+        cells = np.asarray(h3_cells, dtype=np.uint64)
+        if self._distance_incorrect(distance):
+            return np.zeros(len(cells) + 1, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+
+        offsets, neighbour_cells, distances = _grid_disk_distances(cells, distance)
+
+        if at_distance:
+            mask = (distances == distance) & (distances > 0)
+        else:
+            mask = distances > 0
+        if self._resolve_include_center(include_center) and (distance == 0 or not at_distance):
+            mask |= distances == 0
+        if self._available_indices is not None:
+            mask &= self._is_available(neighbour_cells)
+
+        rows = np.repeat(np.arange(len(cells), dtype=np.int64), np.diff(offsets))[mask]
+        selected_offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(cells)), out=selected_offsets[1:])
+        return selected_offsets, neighbour_cells[mask]
+
+    def _is_available(self, h3_cells: npt.NDArray[np.uint64]) -> npt.NDArray[np.bool_]:
+        if self._available_cells is None:
+            assert self._available_indices is not None
+            self._available_cells = np.unique(_to_h3_cells(list(self._available_indices)))
+        if len(self._available_cells) == 0:
+            return np.zeros(len(h3_cells), dtype=bool)
+        positions = np.searchsorted(self._available_cells, h3_cells)
+        positions[positions == len(self._available_cells)] = 0
+        return np.asarray(self._available_cells[positions] == h3_cells)
+
+    def _get_all_indexes(self) -> pd.Index:
+        if self._available_indices is None:
+            raise NotImplementedError(
+                "H3Neighbourhood without regions doesn't have a defined set of regions."
+                " Use `get_neighbours_batch` with explicit indexes instead."
+            )
+        return pd.Index(sorted(self._available_indices))
+
+    def _select_available(self, indices: set[H3Index]) -> set[H3Index]:
         if self._available_indices is None:
             return indices
         return indices.intersection(self._available_indices)
 
     def _distance_incorrect(self, distance: int) -> bool:
         return distance < 0
+
+
+def _h3_api(index: H3Index) -> Any:
+    """Select the h3 API matching the type of the index."""
+    return h3 if isinstance(index, str) else h3.api.basic_int
+
+
+def _h3_cell(index: H3Index) -> H3Index:
+    """Convert integer indexes (e.g. numpy scalars) into python integers accepted by h3."""
+    return index if isinstance(index, str) else int(index)
@@ -0,0 +1,352 @@
+"""
+Precomputed neighbourhood.
+
+This module contains the PrecomputedNeighbourhood class, that allows to get the neighbours of
+regions from precomputed adjacency tables, usually loaded from disk with `Neighbourhood.load`.
+"""
+
+import json
+from collections.abc import Hashable, Iterable, Mapping
+from pathlib import Path
+from typing import Any, Literal, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from srai.neighbourhoods._base import (
+    Neighbourhood,
+    NeighbourhoodCSR,
+    _expand_frontiers_over_adjacency,
+    _gather_csr_rows,
+    _pairs_to_csr,
+)
+
+NEIGHBOURHOOD_FORMAT_VERSION = 1
+
+_CONFIG_FILE_NAME = "config.json"
+_INDEX_FILE_NAME = "index.parquet"
+
+
+class PrecomputedNeighbourhood(Neighbourhood[Hashable]):
+    """
+    Precomputed Neighbourhood.
+
+    This class allows to get the neighbours of regions from precomputed ring tables. The ring at
+    distance 1 contains the direct neighbours of all the regions and is required. Rings at other
+    distances are optional - if present, they are used directly, otherwise neighbours are found
+    by expanding the direct neighbours.
+
+    Rings are kept as integer CSR arrays, which can be memory-mapped from disk. Memory-mapped
+    rings aren't copied when the neighbourhood is pickled (e.g. sent to worker processes) -
+    they are reopened from the same files instead, so all the processes share a single graph.
+    """
+
+    def __init__(
+        self,
+        regions_index: pd.Index,
+        rings: Mapping[int, tuple[npt.NDArray[np.int64], npt.NDArray[np.integer[Any]]]],
+        include_center: bool = False,
+    ) -> None:
+        """
+        Init PrecomputedNeighbourhood.
+
+        Args:
+            regions_index (pd.Index): Index of all the regions.
+            rings (Mapping[int, Tuple[npt.NDArray[np.int64], npt.NDArray[np.integer[Any]]]]):
+                CSR row pointers and positions of the neighbours in the `regions_index` for each
+                distance, with rows in order of the `regions_index`. Has to contain distance 1.
+            include_center (bool): Whether to include the region itself in the neighbours.
+            This is the default value used for all the methods of the class,
+            unless overridden in the function call.
+
+        Raises:
+            ValueError: If rings don't contain direct neighbours or their shapes are incorrect.
+        """
+        super().__init__(include_center)
+        if 1 not in rings:
+            raise ValueError("Rings must contain direct neighbours (distance 1).")
+        for distance, (indptr, _) in rings.items():
+            if distance < 1:
+                raise ValueError(f"Ring distance must be at least 1, but was {distance}.")
+            if len(indptr) != len(regions_index) + 1:
+                raise ValueError(
+                    f"Ring at distance {distance} has {len(indptr) - 1} rows,"
+                    f" but there are {len(regions_index)} regions."
+                )
+        self.regions_index = regions_index
+        self._rings = dict(rings)
+        self._rings_path: Optional[Path] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state for pickling, with distances instead of memory-mapped rings."""
+        state = self.__dict__.copy()
+        if self._rings_path is not None:
+            state["_rings"] = sorted(self._rings.keys())
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the state after unpickling, reopening memory-mapped rings."""
+        self.__dict__.update(state)
+        if self._rings_path is not None:
+            self._rings = _load_rings(self._rings_path, state["_rings"], mmap_mode="r")
+
+    @property
+    def ring_distances(self) -> list[int]:
+        """Distances with precomputed rings."""
+        return sorted(self._rings.keys())
+
+    def get_neighbours(
+        self, index: Hashable, include_center: Optional[bool] = None
+    ) -> set[Hashable]:
+        """
+        Get the direct neighbours of a region using its index.
+
+        Args:
+            index (Hashable): Unique identifier of the region.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Set[Hashable]: Indexes of the neighbours.
+        """
+        return self.get_neighbours_up_to_distance(index, 1, include_center)
+
+    def get_neighbours_up_to_distance(
+        self, index: Hashable, distance: int, include_center: Optional[bool] = None
+    ) -> set[Hashable]:
+        """
+        Get the neighbours of a region up to a certain distance.
+
+        Args:
+            index (Hashable): Unique identifier of the region.
+            distance (int): Maximum distance to the neighbours.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Set[Hashable]: Indexes of the neighbours.
+        """
+        return self._batch_row_to_set(
+            self.get_neighbours_batch([index], distance, include_center=include_center)
+        )
+
+    def get_neighbours_at_distance(
+        self, index: Hashable, distance: int, include_center: Optional[bool] = None
+    ) -> set[Hashable]:
+        """
+        Get the neighbours of a region at a certain distance.
+
+        Args:
+            index (Hashable): Unique identifier of the region.
+            distance (int): Distance to the neighbours.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Set[Hashable]: Indexes of the neighbours.
+        """
+        return self._batch_row_to_set(
+            self.get_neighbours_batch(
+                [index], distance, at_distance=True, include_center=include_center
+            )
+        )
+
+    def get_neighbours_batch(
+        self,
+        indexes: Iterable[Hashable],
+        distance: int,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> NeighbourhoodCSR:
+        """
+        Get the neighbours of multiple regions at once.
+
+        Precomputed rings are used if all the required distances are available.
+
+        Args:
+            indexes (Iterable[Hashable]): Unique identifiers of the regions.
+            distance (int): Distance to the neighbours.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            NeighbourhoodCSR: Neighbours of the regions with a row for each queried region.
+        """
+        required_distances = [distance] if at_distance else list(range(1, distance + 1))
+        if distance < 1 or not all(
+            ring_distance in self._rings for ring_distance in required_distances
+        ):
+            return super().get_neighbours_batch(indexes, distance, at_distance, include_center)
+
+        queried_index = pd.Index(indexes)
+        node_index = self.regions_index
+        query_nodes = np.asarray(node_index.get_indexer(queried_index), dtype=np.int64)
+        unknown_nodes_mask = query_nodes < 0
+        if unknown_nodes_mask.any():
+            node_index = node_index.append(queried_index[unknown_nodes_mask].unique())
+            query_nodes[unknown_nodes_mask] = node_index.get_indexer(
+                queried_index[unknown_nodes_mask]
+            )
+        known_rows = np.flatnonzero(~unknown_nodes_mask)
+
+        rows_chunks = []
+        nodes_chunks = []
+        for ring_distance in required_distances:
+            indptr, indices = self._rings[ring_distance]
+            owners, nodes = _gather_csr_rows(indptr, indices, query_nodes[known_rows])
+            rows_chunks.append(known_rows[owners])
+            nodes_chunks.append(nodes)
+
+        if not at_distance and self._resolve_include_center(include_center):
+            rows_chunks.append(np.arange(len(queried_index), dtype=np.int64))
+            nodes_chunks.append(query_nodes)
+
+        return _pairs_to_csr(
+            node_index,
+            len(queried_index),
+            np.concatenate(rows_chunks),
+            np.concatenate(nodes_chunks),
+        )
+
+    def adjacency_matrix(
+        self,
+        distance: int = 1,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> NeighbourhoodCSR:
+        """
+        Get the neighbours of all the regions.
+
+        Args:
+            distance (int): Distance to the neighbours. Defaults to 1.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            NeighbourhoodCSR: Neighbours with a row for each region in the `regions_index`.
+        """
+        if at_distance and distance in self._rings:
+            indptr, indices = self._rings[distance]
+            return NeighbourhoodCSR(
+                index=self.regions_index,
+                indptr=np.asarray(indptr, dtype=np.int64),
+                indices=np.asarray(indices, dtype=np.int64),
+            )
+        return super().adjacency_matrix(distance, at_distance, include_center)
+
+    def _get_all_indexes(self) -> pd.Index:
+        return self.regions_index
+
+    def _get_neighbours_with_distances_batch(
+        self, queried_index: pd.Index, distance: int
+    ) -> tuple[pd.Index, npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        adjacency_indptr, adjacency_indices = self._rings[1]
+        return _expand_frontiers_over_adjacency(
+            self.regions_index, adjacency_indptr, adjacency_indices, queried_index, distance
+        )
+
+    def _batch_row_to_set(self, neighbours: NeighbourhoodCSR) -> set[Hashable]:
+        return set(
+            neighbours.index[neighbours.indices[neighbours.indptr[0] : neighbours.indptr[1]]]
+        )
+
+
+def save_neighbourhood(
+    neighbourhood: Neighbourhood[Any],
+    path: Union[Path, str],
+    ring_distances: Optional[Iterable[int]] = None,
+) -> None:
+    """
+    Save neighbours of all the regions of a neighbourhood to a directory.
+
+    Args:
+        neighbourhood (Neighbourhood[Any]): Neighbourhood with a defined set of regions.
+        path (Union[Path, str]): Path to the directory.
+        ring_distances (Optional[Iterable[int]]): Additional distances, for which neighbours
+            at exactly that distance are precomputed and saved. Defaults to None.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    distances = sorted({1, *(ring_distances or [])})
+    if distances[0] < 1:
+        raise ValueError(f"Ring distance must be at least 1, but was {distances[0]}.")
+
+    regions_index: Optional[pd.Index] = None
+    for distance in distances:
+        neighbours = neighbourhood.adjacency_matrix(
+            distance, at_distance=True, include_center=False
+        )
+        if regions_index is None:
+            regions_index = neighbours.index
+            pd.DataFrame(index=regions_index).to_parquet(path / _INDEX_FILE_NAME)
+        if not neighbours.index.equals(regions_index):
+            positions = np.asarray(regions_index.get_indexer(neighbours.index), dtype=np.int64)
+            neighbours = neighbours._replace(indices=positions[neighbours.indices])
+
+        positions_dtype = np.int32 if len(regions_index) < 2**31 else np.int64
+        np.save(path / f"ring_{distance}_indptr.npy", neighbours.indptr.astype(np.int64))
+        np.save(path / f"ring_{distance}_indices.npy", neighbours.indices.astype(positions_dtype))
+
+    config = {
+        "format_version": NEIGHBOURHOOD_FORMAT_VERSION,
+        "neighbourhood_class": type(neighbourhood).__name__,
+        "include_center": neighbourhood.include_center,
+        "number_of_regions": len(regions_index) if regions_index is not None else 0,
+        "ring_distances": distances,
+    }
+    with (path / _CONFIG_FILE_NAME).open("w") as f:
+        json.dump(config, f, ensure_ascii=False, indent=4)
+
+
+def load_neighbourhood(path: Union[Path, str], mmap: bool = True) -> PrecomputedNeighbourhood:
+    """
+    Load a neighbourhood saved with `save_neighbourhood`.
+
+    Args:
+        path (Union[Path, str]): Path to the directory.
+        mmap (bool): Whether to memory-map the CSR arrays instead of reading them into memory.
+            Defaults to True.
+
+    Returns:
+        PrecomputedNeighbourhood: The loaded neighbourhood.
+
+    Raises:
+        ValueError: If the saved format version isn't supported.
+    """
+    path = Path(path)
+    with (path / _CONFIG_FILE_NAME).open("r") as f:
+        config = json.load(f)
+
+    format_version = config.get("format_version")
+    if format_version != NEIGHBOURHOOD_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported neighbourhood format version: {format_version}."
+            f" Supported version: {NEIGHBOURHOOD_FORMAT_VERSION}."
+        )
+
+    regions_index = pd.read_parquet(path / _INDEX_FILE_NAME).index
+    rings = _load_rings(path, config["ring_distances"], mmap_mode="r" if mmap else None)
+    neighbourhood = PrecomputedNeighbourhood(
+        regions_index=regions_index, rings=rings, include_center=config["include_center"]
+    )
+    if mmap:
+        neighbourhood._rings_path = path.resolve()
+    return neighbourhood
+
+
+def _load_rings(
+    path: Path, distances: Iterable[int], mmap_mode: Optional[Literal["r"]]
+) -> dict[int, tuple[npt.NDArray[np.int64], npt.NDArray[np.integer[Any]]]]:
+    return {
+        distance: (
+            np.load(path / f"ring_{distance}_indptr.npy", mmap_mode=mmap_mode),
+            np.load(path / f"ring_{distance}_indices.npy", mmap_mode=mmap_mode),
+        )
+        for distance in distances
+    }
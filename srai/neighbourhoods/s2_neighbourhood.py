@@ -0,0 +1,233 @@
+"""
+S2 neighbourhood.
+
+This module contains the S2Neighbourhood class, that allows to get the neighbours of an S2 region.
+"""
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Literal, Optional, Union
+
+import geopandas as gpd
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from srai.neighbourhoods import Neighbourhood
+from srai.neighbourhoods._base import NeighbourhoodCSR, _pairs_to_csr
+from srai.s2 import convert_s2_index, get_s2_disks
+
+if TYPE_CHECKING:  # pragma: no cover
+    from srai.regionalizers import LazyGeometryRegions
+
+S2Index = Union[str, int]
+
+
+class S2Neighbourhood(Neighbourhood[S2Index]):
+    """
+    S2 Neighbourhood.
+
+    This class allows to get the neighbours of an S2 region. Regions can be identified either by
+    S2 tokens or by 64-bit cell ids (e.g. from `S2Regionalizer(index_dtype="int64")`).
+    Neighbours are returned in the same form as the queried regions.
+
+    Neighbours are calculated from the cell ids. Direct neighbours of a cell are the cells of
+    the same level sharing an edge or, by default, a vertex with it, so there are no floating
+    point errors of geometric checks.
+    """
+
+    def __init__(
+        self,
+        regions_gdf: Optional[Union[gpd.GeoDataFrame, "LazyGeometryRegions"]] = None,
+        include_center: bool = False,
+        vertex_neighbours: bool = True,
+    ) -> None:
+        """
+        Initializes the S2Neighbourhood.
+
+        If a regions GeoDataFrame is provided, only the neighbours
+        that are in the regions GeoDataFrame will be returned by the methods of this instance.
+        NOTICE: If a region is a part of the k-th ring of a region
+            and is included in the GeoDataFrame, it will be returned
+            by get_neighbours_at_distance method with distance k
+            even when there is no path of length k between the two regions.
+
+        Args:
+            regions_gdf (Optional[Union[gpd.GeoDataFrame, LazyGeometryRegions]], optional): The
+                regions that are being analyzed. Only their index is used.
+                The S2Neighbourhood will only look for neighbours among these regions.
+                Defaults to None.
+            include_center (bool): Whether to include the region itself in the neighbours.
+            This is the default value used for all the methods of the class,
+            unless overridden in the function call.
+            vertex_neighbours (bool): Whether cells sharing only a vertex are direct neighbours.
+                Otherwise only the 4 cells sharing an edge are. Defaults to True.
+        """
+        super().__init__(include_center)
+        self.vertex_neighbours = vertex_neighbours
+        self._available_cells: Optional[npt.NDArray[np.int64]] = None
+        self._regions_index_dtype: Literal["str", "int64"] = "str"
+        if regions_gdf is not None:
+            if pd.api.types.is_integer_dtype(regions_gdf.index.dtype):
+                self._regions_index_dtype = "int64"
+            self._available_cells = np.unique(
+                convert_s2_index(regions_gdf.index, "int64").to_numpy()
+            )
+
+    def get_neighbours(self, index: S2Index, include_center: Optional[bool] = None) -> set[S2Index]:
+        """
+        Get the direct neighbours of an S2 region using its index.
+
+        Args:
+            index (S2Index): S2 token or 64-bit cell id of the region.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Set[S2Index]: Indexes of the neighbours.
+        """
+        return self.get_neighbours_up_to_distance(index, 1, include_center)
+
+    def get_neighbours_up_to_distance(
+        self, index: S2Index, distance: int, include_center: Optional[bool] = None
+    ) -> set[S2Index]:
+        """
+        Get the neighbours of an S2 region up to a certain distance.
+
+        Args:
+            index (S2Index): S2 token or 64-bit cell id of the region.
+            distance (int): Distance to the neighbours.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Set[S2Index]: Indexes of the neighbours up to the given distance.
+        """
+        neighbours = self.get_neighbours_batch(
+            [index], distance, at_distance=False, include_center=include_center
+        )
+        return set(neighbours.index[neighbours.indices])
+
+    def get_neighbours_at_distance(
+        self, index: S2Index, distance: int, include_center: Optional[bool] = None
+    ) -> set[S2Index]:
+        """
+        Get the neighbours of an S2 region at a certain distance.
+
+        Args:
+            index (S2Index): S2 token or 64-bit cell id of the region.
+            distance (int): Distance to the neighbours.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Set[S2Index]: Indexes of the neighbours at the given distance.
+        """
+        neighbours = self.get_neighbours_batch(
+            [index], distance, at_distance=True, include_center=include_center
+        )
+        return set(neighbours.index[neighbours.indices])
+
+    def get_neighbours_batch(
+        self,
+        indexes: Iterable[S2Index],
+        distance: int,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> NeighbourhoodCSR:
+        """
+        Get the neighbours of multiple S2 regions at once.
+
+        Neighbours are found with `get_neighbours_cells` for all the regions together.
+
+        Args:
+            indexes (Iterable[S2Index]): S2 tokens or 64-bit cell ids of the regions.
+            distance (int): Distance to the neighbours.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            NeighbourhoodCSR: Neighbours of the regions with a row for each queried region.
+        """
+        queried_index = pd.Index(indexes)
+        queried_cells = convert_s2_index(queried_index, "int64").to_numpy()
+        offsets, neighbour_cells = self.get_neighbours_cells(
+            queried_cells, distance, at_distance=at_distance, include_center=include_center
+        )
+        node_cells = np.unique(np.concatenate((queried_cells, neighbour_cells)))
+        rows = np.repeat(np.arange(len(queried_cells), dtype=np.int64), np.diff(offsets))
+        return _pairs_to_csr(
+            convert_s2_index(
+                node_cells,
+                "int64" if pd.api.types.is_integer_dtype(queried_index.dtype) else "str",
+            ),
+            len(queried_cells),
+            rows,
+            np.searchsorted(node_cells, neighbour_cells).astype(np.int64),
+        )
+
+    def get_neighbours_cells(
+        self,
+        s2_cells: npt.NDArray[np.int64],
+        distance: int,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Get the neighbours of multiple S2 cells given as 64-bit cell ids.
+
+        The disks of all the cells are calculated at once with `get_s2_disks` and the neighbours
+        are checked against the available regions with a binary search over a sorted array.
+
+        Args:
+            s2_cells (npt.NDArray[np.int64]): 64-bit cell ids of the regions,
+                stored as signed int64.
+            distance (int): Distance to the neighbours.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]: Offsets of the neighbours of
+                each cell (with a length equal to the number of cells plus one) and a flat array
+                of the neighbours.
+        """
+        cells = np.asarray(s2_cells, dtype=np.int64)
+        if distance < 0:
+            return np.zeros(len(cells) + 1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        offsets, neighbour_cells, distances = get_s2_disks(
+            cells, distance, vertex_neighbours=self.vertex_neighbours
+        )
+
+        if at_distance:
+            mask = (distances == distance) & (distances > 0)
+        else:
+            mask = distances > 0
+        if self._resolve_include_center(include_center) and (distance == 0 or not at_distance):
+            mask |= distances == 0
+        if self._available_cells is not None:
+            mask &= self._is_available(neighbour_cells)
+
+        rows = np.repeat(np.arange(len(cells), dtype=np.int64), np.diff(offsets))[mask]
+        selected_offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(cells)), out=selected_offsets[1:])
+        return selected_offsets, neighbour_cells[mask]
+
+    def _is_available(self, s2_cells: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+        assert self._available_cells is not None
+        if len(self._available_cells) == 0:
+            return np.zeros(len(s2_cells), dtype=bool)
+        positions = np.searchsorted(self._available_cells, s2_cells)
+        positions[positions == len(self._available_cells)] = 0
+        return np.asarray(self._available_cells[positions] == s2_cells)
+
+    def _get_all_indexes(self) -> pd.Index:
+        if self._available_cells is None:
+            raise NotImplementedError(
+                "S2Neighbourhood without regions doesn't have a defined set of regions."
+                " Use `get_neighbours_batch` with explicit indexes instead."
+            )
+        return convert_s2_index(self._available_cells, self._regions_index_dtype)
@@ -0,0 +1,281 @@
+"""
+Slippy map neighbourhood.
+
+This module contains the SlippyMapNeighbourhood class, that allows to get the neighbours
+of a Slippy map tile.
+"""
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Optional, Union
+
+import geopandas as gpd
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from srai.neighbourhoods import Neighbourhood
+from srai.neighbourhoods._base import NeighbourhoodCSR, _pairs_to_csr
+from srai.slippy_map import get_slippy_map_index, parse_slippy_map_index
+
+if TYPE_CHECKING:  # pragma: no cover
+    from srai.regionalizers import LazyGeometryRegions
+
+# Bit offsets of zoom and x in integer keys of the tiles.
+_ZOOM_SHIFT = 58
+_X_SHIFT = 29
+
+
+class SlippyMapNeighbourhood(Neighbourhood[str]):
+    """
+    Slippy Map Neighbourhood.
+
+    This class allows to get the neighbours of Slippy map tiles identified by "x_y_z" strings,
+    as returned by the `SlippyMapRegionalizer`. Neighbours are calculated with integer arithmetic
+    on x and y numbers of the tiles. Direct neighbours of a tile are the 8 tiles sharing an edge
+    or a corner with it, so the k-th ring is a square of tiles. Tiles don't wrap around
+    the antimeridian, the same as tiles touching each other in `AdjacencyNeighbourhood`.
+    """
+
+    def __init__(
+        self,
+        regions_gdf: Optional[Union[gpd.GeoDataFrame, "LazyGeometryRegions"]] = None,
+        include_center: bool = False,
+    ) -> None:
+        """
+        Initializes the SlippyMapNeighbourhood.
+
+        If a regions GeoDataFrame is provided, only the neighbours
+        that are in the regions GeoDataFrame will be returned by the methods of this instance.
+        NOTICE: If a region is a part of the k-th ring of a region
+            and is included in the GeoDataFrame, it will be returned
+            by get_neighbours_at_distance method with distance k
+            even when there is no path of length k between the two regions.
+
+        Args:
+            regions_gdf (Optional[Union[gpd.GeoDataFrame, LazyGeometryRegions]], optional): The
+                regions that are being analyzed. Only their index is used.
+                The SlippyMapNeighbourhood will only look for neighbours among these regions.
+                Defaults to None.
+            include_center (bool): Whether to include the region itself in the neighbours.
+            This is the default value used for all the methods of the class,
+            unless overridden in the function call.
+
+        Raises:
+            ValueError: If any of the regions is not identified by an "x_y_z" string.
+        """
+        super().__init__(include_center)
+        self._available_keys: Optional[npt.NDArray[np.int64]] = None
+        if regions_gdf is not None:
+            self._available_keys = np.unique(
+                _get_tiles_keys(*parse_slippy_map_index(regions_gdf.index))
+            )
+
+    def get_neighbours(self, index: str, include_center: Optional[bool] = None) -> set[str]:
+        """
+        Get the direct neighbours of a Slippy map tile using its index.
+
+        Args:
+            index (str): "x_y_z" identifier of the tile.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Set[str]: Indexes of the neighbours.
+        """
+        return self.get_neighbours_up_to_distance(index, 1, include_center)
+
+    def get_neighbours_up_to_distance(
+        self, index: str, distance: int, include_center: Optional[bool] = None
+    ) -> set[str]:
+        """
+        Get the neighbours of a Slippy map tile up to a certain distance.
+
+        Args:
+            index (str): "x_y_z" identifier of the tile.
+            distance (int): Distance to the neighbours.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Set[str]: Indexes of the neighbours up to the given distance.
+        """
+        neighbours = self.get_neighbours_batch(
+            [index], distance, at_distance=False, include_center=include_center
+        )
+        return set(neighbours.index[neighbours.indices])
+
+    def get_neighbours_at_distance(
+        self, index: str, distance: int, include_center: Optional[bool] = None
+    ) -> set[str]:
+        """
+        Get the neighbours of a Slippy map tile at a certain distance.
+
+        Args:
+            index (str): "x_y_z" identifier of the tile.
+            distance (int): Distance to the neighbours.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Set[str]: Indexes of the neighbours at the given distance.
+        """
+        neighbours = self.get_neighbours_batch(
+            [index], distance, at_distance=True, include_center=include_center
+        )
+        return set(neighbours.index[neighbours.indices])
+
+    def get_neighbours_batch(
+        self,
+        indexes: Iterable[str],
+        distance: int,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> NeighbourhoodCSR:
+        """
+        Get the neighbours of multiple Slippy map tiles at once.
+
+        Neighbours are found with `get_neighbours_tiles` for all the tiles together.
+
+        Args:
+            indexes (Iterable[str]): "x_y_z" identifiers of the tiles.
+            distance (int): Distance to the neighbours.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            NeighbourhoodCSR: Neighbours of the regions with a row for each queried region.
+        """
+        queried_x, queried_y, queried_zoom = parse_slippy_map_index(indexes)
+        offsets, x, y, zoom = self.get_neighbours_tiles(
+            queried_x,
+            queried_y,
+            queried_zoom,
+            distance,
+            at_distance=at_distance,
+            include_center=include_center,
+        )
+        queried_keys = _get_tiles_keys(queried_x, queried_y, queried_zoom)
+        neighbour_keys = _get_tiles_keys(x, y, zoom)
+        node_keys = np.unique(np.concatenate((queried_keys, neighbour_keys)))
+        rows = np.repeat(np.arange(len(queried_keys), dtype=np.int64), np.diff(offsets))
+        return _pairs_to_csr(
+            get_slippy_map_index(*_get_tiles_from_keys(node_keys)),
+            len(queried_keys),
+            rows,
+            np.searchsorted(node_keys, neighbour_keys).astype(np.int64),
+        )
+
+    def get_neighbours_tiles(
+        self,
+        x: npt.ArrayLike,
+        y: npt.ArrayLike,
+        zoom: npt.ArrayLike,
+        distance: int,
+        at_distance: bool = False,
+        include_center: Optional[bool] = None,
+    ) -> tuple[
+        npt.NDArray[np.int64],
+        npt.NDArray[np.int64],
+        npt.NDArray[np.int64],
+        npt.NDArray[np.int64],
+    ]:
+        """
+        Get the neighbours of multiple Slippy map tiles given as x, y and zoom arrays.
+
+        Neighbours of all the tiles are calculated at once by adding offsets of the ring
+        tiles to the x and y numbers, and checked against the available regions with
+        a binary search over a sorted array of integer keys.
+
+        Args:
+            x (npt.ArrayLike): X numbers of the tiles.
+            y (npt.ArrayLike): Y numbers of the tiles.
+            zoom (npt.ArrayLike): Zoom level of all tiles or of each tile.
+            distance (int): Distance to the neighbours.
+            at_distance (bool): Whether to return only the neighbours at exactly the given
+                distance, or all the neighbours up to the given distance. Defaults to False.
+            include_center (Optional[bool]): Whether to include the region itself in the neighbours.
+            If None, the value set in __init__ is used. Defaults to None.
+
+        Returns:
+            Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64],
+                npt.NDArray[np.int64]]: Offsets of the neighbours of each tile (with a length
+                equal to the number of tiles plus one) and flat arrays of x, y and zoom
+                of the neighbours.
+        """
+        tiles_x = np.asarray(x, dtype=np.int64).reshape(-1)
+        tiles_y = np.asarray(y, dtype=np.int64).reshape(-1)
+        tiles_zoom = np.broadcast_to(np.asarray(zoom, dtype=np.int64), tiles_x.shape)
+        if distance < 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return np.zeros(len(tiles_x) + 1, dtype=np.int64), empty, empty.copy(), empty.copy()
+
+        dx, dy = (
+            grid.reshape(-1)
+            for grid in np.meshgrid(
+                np.arange(-distance, distance + 1), np.arange(-distance, distance + 1)
+            )
+        )
+        distances = np.maximum(np.abs(dx), np.abs(dy))
+        if at_distance:
+            ring_mask = (distances == distance) & (distances > 0)
+        else:
+            ring_mask = distances > 0
+        if self._resolve_include_center(include_center) and (distance == 0 or not at_distance):
+            ring_mask |= distances == 0
+        dx, dy = dx[ring_mask], dy[ring_mask]
+
+        neighbours_x = tiles_x[:, None] + dx[None, :]
+        neighbours_y = tiles_y[:, None] + dy[None, :]
+        neighbours_zoom = np.broadcast_to(tiles_zoom[:, None], neighbours_x.shape)
+        n_rows = np.left_shift(1, neighbours_zoom)
+        mask = (
+            (neighbours_x >= 0)
+            & (neighbours_x < n_rows)
+            & (neighbours_y >= 0)
+            & (neighbours_y < n_rows)
+        )
+        if self._available_keys is not None:
+            mask &= self._is_available(_get_tiles_keys(neighbours_x, neighbours_y, neighbours_zoom))
+
+        offsets = np.zeros(len(tiles_x) + 1, dtype=np.int64)
+        np.cumsum(mask.sum(axis=1), out=offsets[1:])
+        return offsets, neighbours_x[mask], neighbours_y[mask], neighbours_zoom[mask]
+
+    def _is_available(self, tiles_keys: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+        assert self._available_keys is not None
+        if len(self._available_keys) == 0:
+            return np.zeros(tiles_keys.shape, dtype=bool)
+        positions = np.searchsorted(self._available_keys, tiles_keys)
+        positions[positions == len(self._available_keys)] = 0
+        return np.asarray(self._available_keys[positions] == tiles_keys)
+
+    def _get_all_indexes(self) -> pd.Index:
+        if self._available_keys is None:
+            raise NotImplementedError(
+                "SlippyMapNeighbourhood without regions doesn't have a defined set of regions."
+                " Use `get_neighbours_batch` with explicit indexes instead."
+            )
+        return get_slippy_map_index(*_get_tiles_from_keys(self._available_keys))
+
+
+def _get_tiles_keys(
+    x: npt.NDArray[np.int64], y: npt.NDArray[np.int64], zoom: npt.NDArray[np.int64]
+) -> npt.NDArray[np.int64]:
+    """Combine zoom, x and y of the tiles into sortable integer keys."""
+    return np.asarray(
+        np.left_shift(zoom, _ZOOM_SHIFT) | np.left_shift(x, _X_SHIFT) | y, dtype=np.int64
+    )
+
+
+def _get_tiles_from_keys(
+    tiles_keys: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Split integer keys of the tiles into x, y and zoom."""
+    mask = (1 << _X_SHIFT) - 1
+    return (
+        np.right_shift(tiles_keys, _X_SHIFT) & mask,
+        tiles_keys & mask,
+        np.right_shift(tiles_keys, _ZOOM_SHIFT),
+    )
@@ -11,7 +11,6 @@ from collections.abc import Hashable
 from contextlib import suppress
 from functools import partial
 from math import ceil
-from multiprocessing import cpu_count
 from typing import Optional, Union, cast
 
 import geopandas as gpd
@@ -34,6 +33,10 @@ from spherical_geometry.polygon import SphericalPolygon
 from tqdm import tqdm
 from tqdm.contrib.concurrent import process_map
 
+from srai._multiprocessing import (
+    parse_multiprocessing_activation_threshold,
+    parse_num_of_multiprocessing_workers,
+)
 from srai.constants import FORCE_TERMINAL, GEOMETRY_COLUMN, WGS84_CRS
 
 SPHERE_PARTS: list[SphericalPolygon] = []
@@ -123,11 +126,11 @@ def generate_voronoi_regions(
     if not _check_if_in_bounds(seeds):
         raise ValueError("Seeds outside Earth WGS84 bounding box.")
 
-    num_of_multiprocessing_workers = _parse_num_of_multiprocessing_workers(
+    num_of_multiprocessing_workers = parse_num_of_multiprocessing_workers(
         num_of_multiprocessing_workers
     )
-    multiprocessing_activation_threshold = _parse_multiprocessing_activation_threshold(
-        multiprocessing_activation_threshold
+    multiprocessing_activation_threshold = parse_multiprocessing_activation_threshold(
+        multiprocessing_activation_threshold, 100
     )
 
     unit_sphere_ellipsoid = Ellipsoid(
@@ -330,24 +333,6 @@ def generate_voronoi_regions(
     return generated_regions
 
 
-def _parse_num_of_multiprocessing_workers(num_of_multiprocessing_workers: int) -> int:
-    if num_of_multiprocessing_workers == 0:
-        num_of_multiprocessing_workers = 1
-    elif num_of_multiprocessing_workers < 0:
-        num_of_multiprocessing_workers = cpu_count()
-
-    return num_of_multiprocessing_workers
-
-
-def _parse_multiprocessing_activation_threshold(
-    multiprocessing_activation_threshold: Optional[int],
-) -> int:
-    if not multiprocessing_activation_threshold:
-        multiprocessing_activation_threshold = 100
-
-    return multiprocessing_activation_threshold
-
-
 def _parse_geodataframe_seeds(
     gdf: gpd.GeoDataFrame,
 ) -> tuple[list[Point], list[Hashable]]:
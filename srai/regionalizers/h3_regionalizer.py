@@ -13,11 +13,33 @@ References:
     2. https://uber.github.io/h3-py/api_comparison
 """
 
+from collections.abc import Iterator
+from functools import partial
+from pathlib import Path
+from typing import Literal, Optional, Union
+
 import geopandas as gpd
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
 
+from srai._multiprocessing import (
+    parse_multiprocessing_activation_threshold,
+    parse_num_of_multiprocessing_workers,
+)
 from srai.constants import GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
-from srai.h3 import h3_to_geoseries, shapely_geometry_to_h3
+from srai.h3 import (
+    DEFAULT_H3_BATCH_SIZE,
+    _points_to_h3_cells,
+    compact_h3_cells,
+    convert_h3_index,
+    get_compacted_h3_parents,
+    h3_to_geoseries,
+    shapely_geometry_to_h3,
+    shapely_geometry_to_h3_batches,
+)
 from srai.regionalizers import Regionalizer
+from srai.regionalizers.lazy_geometry_regions import LazyGeometryRegions
 
 
 class H3Regionalizer(Regionalizer):
@@ -28,7 +50,15 @@ class H3Regionalizer(Regionalizer):
     into H3 cells - hexagons with pentagons as a very rare exception
     """
 
-    def __init__(self, resolution: int, buffer: bool = True) -> None:
+    def __init__(
+        self,
+        resolution: int,
+        buffer: bool = True,
+        index_dtype: Literal["str", "uint64"] = "str",
+        num_of_multiprocessing_workers: int = 1,
+        multiprocessing_activation_threshold: Optional[int] = None,
+        compact: bool = False,
+    ) -> None:
         """
         Init H3Regionalizer.
 
@@ -36,9 +66,25 @@ class H3Regionalizer(Regionalizer):
             resolution (int): Resolution of the cells. See [1] for a full comparison.
             buffer (bool, optional): Whether to fully cover the geometries with
                 H3 Cells (visible on the borders). Defaults to True.
+            index_dtype (Literal["str", "uint64"], optional): Type of the regions index.
+                With "uint64", cells are kept as integers and never converted to strings.
+                Neighbourhoods, joiners and embedders accept such an index directly.
+                Defaults to "str".
+            num_of_multiprocessing_workers (int, optional): Number of workers used for
+                multiprocessing. The area is split into tiles of coarse cells, which are filled
+                with cells in parallel. Defaults to 1 (no multiprocessing). If -1, all available
+                threads are used. If 0, also no multiprocessing is used.
+            multiprocessing_activation_threshold (int, optional): Number of tiles required to
+                start processing in multiple processes. Each tile has up to 2401 cells
+                (4 resolutions coarser). Defaults to 100.
+            compact (bool, optional): Whether to return compacted cells with mixed resolutions
+                (not finer than `resolution`) instead of cells of a single resolution. Covers
+                the same area with far fewer regions. Cells can be expanded back with
+                `srai.h3.uncompact_h3_cells`. Defaults to False.
 
         Raises:
             ValueError: If resolution is not between 0 and 15.
+            ValueError: If index_dtype is not "str" or "uint64".
 
         References:
             1. https://h3geo.org/docs/core-library/restable/
@@ -46,8 +92,19 @@ class H3Regionalizer(Regionalizer):
         if not (0 <= resolution <= 15):
             raise ValueError(f"Resolution {resolution} is not between 0 and 15.")
 
+        if index_dtype not in ("str", "uint64"):
+            raise ValueError(f"Unknown index dtype: {index_dtype}. Expected 'str' or 'uint64'.")
+
         self.resolution = resolution
         self.buffer = buffer
+        self.index_dtype = index_dtype
+        self.compact = compact
+        self.num_of_multiprocessing_workers = parse_num_of_multiprocessing_workers(
+            num_of_multiprocessing_workers
+        )
+        self.multiprocessing_activation_threshold = parse_multiprocessing_activation_threshold(
+            multiprocessing_activation_threshold, 100
+        )
 
     def transform(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """
@@ -65,23 +122,144 @@ class H3Regionalizer(Regionalizer):
         Raises:
             ValueError: If provided GeoDataFrame has no crs defined.
         """
+        h3_cells = self._get_h3_cells(gdf)
+        h3_index = convert_h3_index(h3_cells, self.index_dtype).rename(REGIONS_INDEX)
+        gdf_h3 = gpd.GeoDataFrame(
+            geometry=h3_to_geoseries(h3_cells).set_axis(h3_index),
+            crs=WGS84_CRS,
+        )
+
+        return gdf_h3.to_crs(gdf.crs)
+
+    def transform_lazy(self, gdf: gpd.GeoDataFrame) -> LazyGeometryRegions:
+        """
+        Regionalize a given GeoDataFrame without creating geometries of the cells.
+
+        Cells are the same as the ones returned by `transform`, but their polygons are
+        created only when requested from the returned object.
+
+        Args:
+            gdf (gpd.GeoDataFrame): (Multi)Polygons to be regionalized.
+
+        Returns:
+            LazyGeometryRegions: H3 cells with geometries derived from their indexes on demand.
+
+        Raises:
+            ValueError: If provided GeoDataFrame has no crs defined.
+        """
+        h3_cells = self._get_h3_cells(gdf)
+        return LazyGeometryRegions(
+            index=convert_h3_index(h3_cells, self.index_dtype).rename(REGIONS_INDEX),
+            geometry_function=h3_to_geoseries,
+            crs=gdf.crs,
+            points_function=(
+                partial(self._locate_points, compacted_h3_cells=h3_cells)
+                if self.compact
+                else self._locate_points
+            ),
+        )
+
+    def transform_iter(
+        self, gdf: gpd.GeoDataFrame, batch_size: int = DEFAULT_H3_BATCH_SIZE
+    ) -> Iterator[gpd.GeoDataFrame]:
+        """
+        Regionalize a given GeoDataFrame in batches of bounded size.
+
+        The area is tiled by coarse H3 cells and filled tile by tile, so the peak memory usage
+        depends on the batch size instead of the size of the area. Together, the batches contain
+        the same cells as the result of `transform`, each cell exactly once.
+        If `compact` is set, each batch is compacted separately, so the batches cover the same
+        area as the result of `transform`, but may contain more cells.
+
+        Args:
+            gdf (gpd.GeoDataFrame): (Multi)Polygons to be regionalized.
+            batch_size (int, optional): Maximal number of cells in a single batch.
+                Defaults to 1 000 000.
+
+        Yields:
+            gpd.GeoDataFrame: Batches of H3 cells.
+
+        Raises:
+            ValueError: If provided GeoDataFrame has no crs defined.
+            ValueError: If batch_size is not positive.
+        """
         gdf_wgs84 = gdf.to_crs(crs=WGS84_CRS)
 
         gdf_exploded = self._explode_multipolygons(gdf_wgs84)
 
-        h3_indexes = list(
-            set(
-                shapely_geometry_to_h3(
-                    gdf_exploded[GEOMETRY_COLUMN],
-                    h3_resolution=self.resolution,
-                    buffer=self.buffer,
-                )
+        for h3_cells_batch in shapely_geometry_to_h3_batches(
+            gdf_exploded[GEOMETRY_COLUMN],
+            h3_resolution=self.resolution,
+            buffer=self.buffer,
+            batch_size=batch_size,
+            return_type="uint64",
+        ):
+            h3_cells = (
+                compact_h3_cells(h3_cells_batch, return_type="uint64")
+                if self.compact
+                else h3_cells_batch
+            )
+            h3_index = convert_h3_index(h3_cells, self.index_dtype).rename(REGIONS_INDEX)
+            gdf_h3 = gpd.GeoDataFrame(
+                geometry=h3_to_geoseries(h3_cells).set_axis(h3_index),
+                crs=WGS84_CRS,
             )
+            yield gdf_h3.to_crs(gdf.crs)
+
+    def transform_to_geoparquet(
+        self,
+        gdf: gpd.GeoDataFrame,
+        path: Union[str, Path],
+        batch_size: int = DEFAULT_H3_BATCH_SIZE,
+    ) -> Path:
+        """
+        Regionalize a given GeoDataFrame and save cells to a partitioned GeoParquet dataset.
+
+        Batches from `transform_iter` are written one by one as separate files
+        in the given directory, so all the cells never have to be kept in memory.
+
+        Args:
+            gdf (gpd.GeoDataFrame): (Multi)Polygons to be regionalized.
+            path (Union[str, Path]): Path to the output directory.
+            batch_size (int, optional): Maximal number of cells in a single file.
+                Defaults to 1 000 000.
+
+        Returns:
+            Path: Path to the output directory. Can be read with `gpd.read_parquet`.
+
+        Raises:
+            ValueError: If provided GeoDataFrame has no crs defined.
+            ValueError: If batch_size is not positive.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for batch_number, gdf_h3 in enumerate(self.transform_iter(gdf, batch_size=batch_size)):
+            gdf_h3.to_parquet(path / f"part-{batch_number:05d}.parquet")
+        return path
+
+    def _get_h3_cells(self, gdf: gpd.GeoDataFrame) -> npt.NDArray[np.uint64]:
+        gdf_wgs84 = gdf.to_crs(crs=WGS84_CRS)
+
+        gdf_exploded = self._explode_multipolygons(gdf_wgs84)
+
+        return shapely_geometry_to_h3(
+            gdf_exploded[GEOMETRY_COLUMN],
+            h3_resolution=self.resolution,
+            buffer=self.buffer,
+            return_type="uint64",
+            num_of_multiprocessing_workers=self.num_of_multiprocessing_workers,
+            multiprocessing_activation_threshold=self.multiprocessing_activation_threshold,
+            compact=self.compact,
         )
-        gdf_h3 = gpd.GeoDataFrame(
-            data={REGIONS_INDEX: h3_indexes},
-            geometry=h3_to_geoseries(h3_indexes),
-            crs=WGS84_CRS,
-        ).set_index(REGIONS_INDEX)
 
-        return gdf_h3.to_crs(gdf.crs)
+    def _locate_points(
+        self,
+        points: gpd.GeoSeries,
+        compacted_h3_cells: Optional[npt.NDArray[np.uint64]] = None,
+    ) -> pd.Index:
+        h3_cells = _points_to_h3_cells(points, self.resolution)
+        if compacted_h3_cells is not None:
+            parents = get_compacted_h3_parents(h3_cells, compacted_h3_cells)
+            # Cells outside of the compacted regions are kept as they are and aren't matched.
+            h3_cells = np.where(parents != 0, parents, h3_cells)
+        return convert_h3_index(h3_cells, self.index_dtype)
@@ -0,0 +1,158 @@
+"""
+Lazy geometry regions.
+
+This module contains the LazyGeometryRegions class, that keeps only the index of regions
+from grid regionalizers and derives their geometries from the index on demand.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import Any, Callable, Optional
+
+import geopandas as gpd
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pyproj import CRS
+
+from srai.constants import GEOMETRY_COLUMN, WGS84_CRS
+
+DEFAULT_GEOMETRY_CHUNK_SIZE = 100_000
+
+
+class LazyGeometryRegions:
+    """
+    Lazy Geometry Regions.
+
+    Regions of a grid (e.g. H3 cells) kept only as an index. Polygons of the regions are derived
+    from their indexes only for the requested rows or chunk by chunk, so regions covering large
+    areas at high resolutions don't have to be kept in memory as geometries.
+
+    Embedders and neighbourhoods use only the `index` of the regions, so they can work directly
+    on this object. `IntersectionJoiner` joins points using the grid directly, without
+    materializing any polygons, and other geometries chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        index: pd.Index,
+        geometry_function: Callable[[pd.Index], gpd.GeoSeries],
+        crs: Any = WGS84_CRS,
+        points_function: Optional[Callable[[gpd.GeoSeries], pd.Index]] = None,
+    ) -> None:
+        """
+        Init LazyGeometryRegions.
+
+        Args:
+            index (pd.Index): Unique index of the regions.
+            geometry_function (Callable[[pd.Index], gpd.GeoSeries]): Function returning
+                geometries of the given regions in the WGS84 CRS, in the same order.
+            crs (Any, optional): CRS of the materialized geometries. Defaults to WGS84_CRS.
+            points_function (Optional[Callable[[gpd.GeoSeries], pd.Index]], optional): Function
+                returning indexes of grid cells containing the given WGS84 points, in the same
+                order. If None, points are joined using the materialized geometries.
+                Defaults to None.
+        """
+        self._index = index
+        self._geometry_function = geometry_function
+        self._points_function = points_function
+        self.crs = CRS.from_user_input(crs)
+
+    @property
+    def index(self) -> pd.Index:
+        """Index of the regions."""
+        return self._index
+
+    @property
+    def can_locate_points(self) -> bool:
+        """Whether points can be assigned to regions without materializing geometries."""
+        return self._points_function is not None
+
+    def __len__(self) -> int:
+        """Number of regions."""
+        return len(self._index)
+
+    def get_geometry(self, indexes: Optional[Iterable[Any]] = None) -> gpd.GeoSeries:
+        """
+        Materialize geometries of the regions.
+
+        Args:
+            indexes (Optional[Iterable[Any]], optional): Indexes of the regions.
+                If None, geometries of all the regions are returned. Defaults to None.
+
+        Returns:
+            gpd.GeoSeries: Geometries of the regions in the requested order.
+
+        Raises:
+            KeyError: If any of the indexes isn't present in the regions.
+        """
+        if indexes is None:
+            selected_index = self._index
+        else:
+            selected_index = pd.Index(indexes, name=self._index.name)
+            missing_mask = self._index.get_indexer(selected_index) < 0
+            if missing_mask.any():
+                raise KeyError(
+                    f"Indexes not present in the regions: {selected_index[missing_mask].tolist()}"
+                )
+        return self._materialize(selected_index)
+
+    def to_gdf(self) -> gpd.GeoDataFrame:
+        """
+        Materialize geometries of all the regions into a GeoDataFrame.
+
+        Returns:
+            gpd.GeoDataFrame: Regions with geometries, like the ones returned by `transform`.
+        """
+        return gpd.GeoDataFrame(geometry=self.get_geometry(), crs=self.crs)
+
+    def iter_chunks(
+        self, chunk_size: int = DEFAULT_GEOMETRY_CHUNK_SIZE
+    ) -> Iterator[gpd.GeoDataFrame]:
+        """
+        Iterate over the regions with materialized geometries in chunks.
+
+        Args:
+            chunk_size (int, optional): Maximal number of regions in a chunk.
+                Defaults to 100 000.
+
+        Yields:
+            gpd.GeoDataFrame: Consecutive chunks of regions with geometries.
+
+        Raises:
+            ValueError: If chunk_size is not positive.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive, but was {chunk_size}.")
+        for chunk_start in range(0, len(self._index), chunk_size):
+            chunk_index = self._index[chunk_start : chunk_start + chunk_size]
+            yield gpd.GeoDataFrame(geometry=self._materialize(chunk_index), crs=self.crs)
+
+    def locate_points(self, points: gpd.GeoSeries) -> npt.NDArray[np.int64]:
+        """
+        Find positions of the regions containing given points without materializing geometries.
+
+        Points on the border of two regions are assigned to exactly one of them.
+
+        Args:
+            points (gpd.GeoSeries): Point geometries.
+
+        Returns:
+            npt.NDArray[np.int64]: Position of a region in the `index` for each point,
+                or -1 if a point isn't located in any of the regions.
+
+        Raises:
+            ValueError: If the regions can't locate points.
+        """
+        if self._points_function is None:
+            raise ValueError("These regions can't locate points without geometries.")
+        points_wgs84 = points.to_crs(WGS84_CRS) if points.crs is not None else points
+        cells = self._points_function(points_wgs84)
+        return np.asarray(self._index.get_indexer(cells), dtype=np.int64)
+
+    def _materialize(self, index: pd.Index) -> gpd.GeoSeries:
+        geometry = self._geometry_function(index).set_axis(index).rename(GEOMETRY_COLUMN)
+        if geometry.crs is None:
+            geometry = geometry.set_crs(WGS84_CRS)
+        if not self.crs.equals(geometry.crs):
+            geometry = geometry.to_crs(self.crs)
+        return geometry
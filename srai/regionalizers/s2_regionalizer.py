@@ -2,24 +2,26 @@
 S2 Regionalizer.
 
 This module exposes Google's S2 Geospatial Indexing System [1] as a regionalizer.
-It uses the Python API [2].
+Cells are calculated with vectorized functions from `srai.s2`, using the lookup tables
+of the `s2sphere` library [2].
 
 References:
     1. https://s2geometry.io/
-    2. https://github.com/JoaoCarabetta/s2-py
+    2. https://github.com/sidewalklabs/s2sphere
 """
 
-import json
-from typing import Any
+from typing import Literal
 
 import geopandas as gpd
-from functional import seq
-from functional.pipeline import Sequence
-from s2 import s2
-from shapely.geometry import Polygon
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import shapely
 
 from srai.constants import GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
 from srai.regionalizers import Regionalizer
+from srai.regionalizers.lazy_geometry_regions import LazyGeometryRegions
+from srai.s2 import convert_s2_index, points_to_s2, s2_to_geoseries, shapely_geometry_to_s2
 
 
 class S2Regionalizer(Regionalizer):
@@ -29,7 +31,12 @@ class S2Regionalizer(Regionalizer):
     S2 Regionalizer gives an opportunity to divide the given geometries into square S2 cells.
     """
 
-    def __init__(self, resolution: int, buffer: bool = True) -> None:
+    def __init__(
+        self,
+        resolution: int,
+        buffer: bool = True,
+        index_dtype: Literal["str", "int64"] = "str",
+    ) -> None:
         """
         Init S2 Regionalizer.
 
@@ -38,9 +45,13 @@ class S2Regionalizer(Regionalizer):
                 a full comparison.
             buffer (bool, optional): If True then fully cover geometries with S2 cells.
                 Otherwise only use those cells that fully fit into them. Defaults to True.
+            index_dtype (Literal["str", "int64"], optional): Type of the regions index.
+                With "str", cells are identified with S2 tokens. With "int64", 64-bit cell ids
+                are kept as signed integers and never converted to strings. Defaults to "str".
 
         Raises:
             ValueError: If resolution is not between 0 and 30.
+            ValueError: If index_dtype is not "str" or "int64".
 
         References:
             1. https://s2geometry.io/resources/s2cell_statistics.html
@@ -48,13 +59,20 @@ class S2Regionalizer(Regionalizer):
         if not (0 <= resolution <= 30):
             raise ValueError(f"Resolution {resolution} is not between 0 and 30.")
 
+        if index_dtype not in ("str", "int64"):
+            raise ValueError(f"Unknown index dtype: {index_dtype}. Expected 'str' or 'int64'.")
+
         self.resolution = resolution
         self.buffer = buffer
+        self.index_dtype = index_dtype
 
     def transform(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """
         Regionalize a given GeoDataFrame.
 
+        Cells are sorted by their ids. Attributes of the given GeoDataFrame are copied
+        from the first geometry matching each cell.
+
         Args:
             gdf (gpd.GeoDataFrame): GeoDataFrame to be regionalized.
 
@@ -63,40 +81,67 @@ class S2Regionalizer(Regionalizer):
         """
         gdf_wgs84 = gdf.to_crs(crs=WGS84_CRS)
 
-        s2_gdf = self._fill_with_s2_cells(self._explode_multipolygons(gdf_wgs84))
+        s2_cells = self._get_s2_cells(gdf_wgs84)
+        s2_index = convert_s2_index(s2_cells, self.index_dtype).rename(REGIONS_INDEX)
+        res = gpd.GeoDataFrame(
+            index=s2_index, geometry=s2_to_geoseries(s2_cells).to_numpy(), crs=WGS84_CRS
+        )
 
-        # s2 library fills also holes in Polygons, so here we remove redundant cells
-        res: gpd.GeoDataFrame = gpd.sjoin(
-            s2_gdf,
-            gdf_wgs84,
-            how="inner",
-            predicate="intersects" if self.buffer else "within",
-        ).drop(columns=["index_right"])
+        attributes_df = gdf_wgs84.drop(columns=GEOMETRY_COLUMN)
+        if not attributes_df.columns.empty:
+            res = res.join(
+                attributes_df.iloc[self._get_first_matching_geometries(res, gdf_wgs84)].set_axis(
+                    s2_index
+                )
+            )
 
-        res = res[~res.index.duplicated(keep="first")]
+        return res
 
-        res.index.name = REGIONS_INDEX
+    def transform_lazy(self, gdf: gpd.GeoDataFrame) -> LazyGeometryRegions:
+        """
+        Regionalize a given GeoDataFrame without creating geometries of the cells.
 
-        return res
+        Cells are the same as the ones returned by `transform`, but their polygons are
+        created only when requested from the returned object.
 
-    def _fill_with_s2_cells(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-        geo_json = json.loads(gdf.to_json())
-        cells = (
-            seq(geo_json["features"])
-            .flat_map(lambda f: self._geojson_to_cells(f[GEOMETRY_COLUMN], self.resolution))
-            .to_dict()
-        )
-        cells_gdf = gpd.GeoDataFrame(
-            None,
-            index=cells.keys(),
-            geometry=list(cells.values()),
+        Args:
+            gdf (gpd.GeoDataFrame): GeoDataFrame to be regionalized.
+
+        Returns:
+            LazyGeometryRegions: S2 cells with geometries derived from their ids on demand.
+        """
+        gdf_wgs84 = gdf.to_crs(crs=WGS84_CRS)
+        return LazyGeometryRegions(
+            index=convert_s2_index(self._get_s2_cells(gdf_wgs84), self.index_dtype).rename(
+                REGIONS_INDEX
+            ),
+            geometry_function=s2_to_geoseries,
             crs=WGS84_CRS,
+            points_function=self._locate_points,
         )
 
-        return cells_gdf
+    def _get_s2_cells(self, gdf_wgs84: gpd.GeoDataFrame) -> npt.NDArray[np.int64]:
+        return shapely_geometry_to_s2(
+            gdf_wgs84[GEOMETRY_COLUMN],
+            s2_resolution=self.resolution,
+            buffer=self.buffer,
+            return_type="int64",
+        )
 
-    def _geojson_to_cells(self, geo_json: dict[str, Any], res: int) -> Sequence:
-        raw_cells = s2.polyfill(geo_json, res, with_id=True, geo_json_conformant=True)
-        cells: Sequence = seq(raw_cells).map(lambda c: (c["id"], Polygon(c[GEOMETRY_COLUMN])))
+    def _get_first_matching_geometries(
+        self, s2_gdf: gpd.GeoDataFrame, gdf_wgs84: gpd.GeoDataFrame
+    ) -> npt.NDArray[np.int64]:
+        cell_positions, geometry_positions = shapely.STRtree(
+            gdf_wgs84[GEOMETRY_COLUMN].to_numpy()
+        ).query(
+            s2_gdf[GEOMETRY_COLUMN].to_numpy(),
+            predicate="intersects" if self.buffer else "within",
+        )
+        first_geometry_positions = np.full(len(s2_gdf), len(gdf_wgs84), dtype=np.int64)
+        np.minimum.at(first_geometry_positions, cell_positions, geometry_positions)
+        return first_geometry_positions
 
-        return cells
+    def _locate_points(self, points: gpd.GeoSeries) -> pd.Index:
+        return convert_s2_index(
+            points_to_s2(points, self.resolution, return_type="int64"), self.index_dtype
+        )
@@ -7,16 +7,22 @@ References:
     1. https://wiki.openstreetmap.org/wiki/Slippy_map_tilenames
 """
 
-from itertools import product
-from typing import Any
-
 import geopandas as gpd
 import numpy as np
-import shapely.geometry as shpg
-from functional import seq
+import numpy.typing as npt
+import pandas as pd
 
 from srai.constants import GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
 from srai.regionalizers import Regionalizer
+from srai.regionalizers.lazy_geometry_regions import LazyGeometryRegions
+from srai.slippy_map import (
+    coordinates_to_slippy_map_tiles,
+    get_slippy_map_index,
+    points_to_slippy_map,
+    shapely_geometry_to_slippy_map_tiles,
+    slippy_map_tiles_to_coordinates,
+    slippy_map_to_geoseries,
+)
 
 
 class SlippyMapRegionalizer(Regionalizer):
@@ -41,6 +47,8 @@ class SlippyMapRegionalizer(Regionalizer):
         """
         Regionalize a given GeoDataFrame.
 
+        Tiles are sorted by their x and y numbers.
+
         Args:
             gdf (gpd.GeoDataFrame): GeoDataFrame to be regionalized.
 
@@ -51,56 +59,51 @@ class SlippyMapRegionalizer(Regionalizer):
             ValueError: If provided GeoDataFrame has no crs defined.
         """
         gdf_wgs84 = gdf.to_crs(crs=WGS84_CRS)
-        gdf_exploded = self._explode_multipolygons(gdf_wgs84)
-
-        values = (
-            seq(gdf_exploded[GEOMETRY_COLUMN])
-            .map(self._to_cells)
-            .flatten()
-            .map(
-                lambda item: (
-                    item
-                    | {
-                        REGIONS_INDEX: f"{item['x']}_{item['y']}_{self.zoom}",
-                        "z": self.zoom,
-                    }
-                )
-            )
-            .to_list()
+        x, y = self._get_tiles(gdf_wgs84)
+        tiles_index = get_slippy_map_index(x, y, self.zoom).rename(REGIONS_INDEX)
+
+        return gpd.GeoDataFrame(
+            {
+                "x": x,
+                "y": y,
+                GEOMETRY_COLUMN: slippy_map_to_geoseries(tiles_index).to_numpy(),
+                "z": np.full(len(tiles_index), self.zoom, dtype=np.int64),
+            },
+            index=tiles_index,
+            geometry=GEOMETRY_COLUMN,
+            crs=WGS84_CRS,
         )
 
-        gdf = gpd.GeoDataFrame(values, geometry=GEOMETRY_COLUMN, crs=WGS84_CRS).set_index(
-            REGIONS_INDEX
-        )
-        return gdf.drop_duplicates()
-
-    def _to_cells(self, polygon: shpg.Polygon) -> list[dict[str, Any]]:
-        gdf_bounds = polygon.bounds
-        x_start, y_start = self._coordinates_to_x_y(gdf_bounds[1], gdf_bounds[0])
-        x_end, y_end = self._coordinates_to_x_y(gdf_bounds[3], gdf_bounds[2])
-        tiles = []
-        for x, y in product(range(x_start, x_end + 1), range(y_end, y_start + 1)):
-            tile_polygon = self._polygon_from_x_y(x, y)
-            if not self._should_skip_tile(polygon, tile_polygon):
-                tiles.append(dict(x=x, y=y, geometry=tile_polygon))
-        return tiles
-
-    def _polygon_from_x_y(self, x: int, y: int) -> shpg.Polygon:
-        latitude_start, longitude_start = self._x_y_to_coordinates(x, y)
-        latitude_end, longitude_end = self._x_y_to_coordinates(x + 1, y + 1)
-        tile_polygon = shpg.box(
-            minx=longitude_start, miny=latitude_start, maxx=longitude_end, maxy=latitude_end
-        )
-        return tile_polygon
-
-    def _should_skip_tile(self, area: shpg.Polygon, tile: shpg.Polygon) -> bool:
+    def transform_lazy(self, gdf: gpd.GeoDataFrame) -> LazyGeometryRegions:
         """
-        Check if tile is outside area boundaries.
+        Regionalize a given GeoDataFrame without creating geometries of the tiles.
 
-        If so, skip it.
+        Tiles are the same as the ones returned by `transform`, but their polygons are
+        created from "x_y_z" identifiers only when requested from the returned object.
+
+        Args:
+            gdf (gpd.GeoDataFrame): GeoDataFrame to be regionalized.
+
+        Returns:
+            LazyGeometryRegions: Tiles with geometries derived from their ids on demand.
         """
-        intersects: bool = tile.intersects(area)
-        return not intersects
+        gdf_wgs84 = gdf.to_crs(crs=WGS84_CRS)
+        x, y = self._get_tiles(gdf_wgs84)
+        return LazyGeometryRegions(
+            index=get_slippy_map_index(x, y, self.zoom).rename(REGIONS_INDEX),
+            geometry_function=slippy_map_to_geoseries,
+            crs=WGS84_CRS,
+            points_function=self._locate_points,
+        )
+
+    def _get_tiles(
+        self, gdf_wgs84: gpd.GeoDataFrame
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        gdf_exploded = self._explode_multipolygons(gdf_wgs84)
+        return shapely_geometry_to_slippy_map_tiles(gdf_exploded[GEOMETRY_COLUMN], self.zoom)
+
+    def _locate_points(self, points: gpd.GeoSeries) -> pd.Index:
+        return points_to_slippy_map(points, self.zoom)
 
     def _coordinates_to_x_y(self, latitude: float, longitude: float) -> tuple[int, int]:
         """
@@ -108,11 +111,8 @@ class SlippyMapRegionalizer(Regionalizer):
 
         Based on https://wiki.openstreetmap.org/wiki/Slippy_map_tilenames#Implementations.
         """
-        n_rows = 2**self.zoom
-        x_tile = int(n_rows * ((longitude + 180) / 360))
-        lat_radian = np.radians(latitude)
-        y_tile = int((1 - np.arcsinh(np.tan(lat_radian)) / np.pi) / 2 * n_rows)
-        return x_tile, y_tile
+        x_tile, y_tile = coordinates_to_slippy_map_tiles(latitude, longitude, self.zoom)
+        return int(x_tile), int(y_tile)
 
     def _x_y_to_coordinates(self, x: int, y: int) -> tuple[float, float]:
         """
@@ -120,8 +120,5 @@ class SlippyMapRegionalizer(Regionalizer):
 
         Based on https://wiki.openstreetmap.org/wiki/Slippy_map_tilenames#Implementations.
         """
-        n = 2.0**self.zoom
-        lon_deg = x / n * 360.0 - 180.0
-        lat_rad = np.arctan(np.sinh(np.pi * (1 - 2 * y / n)))
-        lat_deg = np.degrees(lat_rad)
-        return (lat_deg, lon_deg)
+        lat_deg, lon_deg = slippy_map_tiles_to_coordinates(x, y, self.zoom)
+        return (float(lat_deg), float(lon_deg))
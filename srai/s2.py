@@ -0,0 +1,633 @@
+"""
+Utility S2 related functions.
+
+Cells are processed as numpy arrays of 64-bit cell ids with vectorized implementations of
+the S2 cell hierarchy [1], using the lookup tables of the `s2sphere` library [2].
+
+References:
+    1. https://s2geometry.io/devguide/s2cell_hierarchy
+    2. https://github.com/sidewalklabs/s2sphere
+"""
+
+from collections.abc import Iterable
+from typing import Literal, Union, overload
+
+import geopandas as gpd
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import shapely
+from s2sphere import LatLng, LatLngRect, LineInterval, RegionCoverer, SphereInterval
+from s2sphere.sphere import INVERT_MASK, LOOKUP_IJ, LOOKUP_POS, SWAP_MASK
+from shapely.geometry.base import BaseGeometry
+
+from srai.constants import GEOMETRY_COLUMN, WGS84_CRS
+
+__all__ = [
+    "shapely_geometry_to_s2",
+    "s2_to_geoseries",
+    "convert_s2_index",
+    "points_to_s2",
+    "get_s2_disks",
+]
+
+S2_MAX_LEVEL = 30
+
+_LOOKUP_POS = np.asarray(LOOKUP_POS, dtype=np.int64)
+_LOOKUP_IJ = np.asarray(LOOKUP_IJ, dtype=np.int64)
+_ORIENTATION_MASK = SWAP_MASK | INVERT_MASK
+# Number of cells of the coarse covering of each geometry's bounding box refined to the level.
+_COARSE_COVERING_SIZE = 16
+# Number of points sampled on each edge of a cell used for pruning coarse cells.
+_EDGE_SAMPLES = 4
+# Distance (relative to the cell size) within which coarse cells are kept during refinement.
+_PRUNING_MARGIN = 0.1
+
+
+@overload
+def shapely_geometry_to_s2(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    s2_resolution: int,
+    buffer: bool = True,
+    return_type: Literal["str"] = "str",
+) -> list[str]: ...
+
+
+@overload
+def shapely_geometry_to_s2(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    s2_resolution: int,
+    buffer: bool = True,
+    *,
+    return_type: Literal["int64"],
+) -> npt.NDArray[np.int64]: ...
+
+
+def shapely_geometry_to_s2(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    s2_resolution: int,
+    buffer: bool = True,
+    return_type: Literal["str", "int64"] = "str",
+) -> Union[list[str], npt.NDArray[np.int64]]:
+    """
+    Convert Shapely geometry to S2 cells.
+
+    The geometry is covered with a few coarse cells, which are recursively split into their
+    children, keeping only the ones intersecting the geometry. Cells are processed level by
+    level as arrays, so holes of polygons are removed without a spatial join.
+
+    Args:
+        geometry (Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame]):
+            Shapely geometry to be converted. Expected to be in WGS84 CRS.
+        s2_resolution (int): S2 level of the cells (0-30).
+        buffer (bool, optional): Whether to fully cover the geometries with cells intersecting
+            them. Otherwise only cells within the geometries are returned. Defaults to True.
+        return_type (Literal["str", "int64"], optional): Whether to return a list of S2 tokens
+            or a numpy array of 64-bit cell ids, stored as signed int64. Defaults to "str".
+
+    Returns:
+        Union[List[str], npt.NDArray[np.int64]]: Unique S2 cells sorted by cell id.
+
+    Raises:
+        ValueError: If resolution is not between 0 and 30.
+        ValueError: If return_type is not "str" or "int64".
+    """
+    _check_return_type(return_type)
+    if isinstance(geometry, gpd.GeoDataFrame):
+        geometry = geometry[GEOMETRY_COLUMN]
+    if isinstance(geometry, BaseGeometry):
+        geometry = [geometry]
+    s2_cells, _ = _cover_geometries(np.asarray(list(geometry), dtype=object), s2_resolution, buffer)
+    return _format_s2_cells(np.unique(s2_cells), return_type)
+
+
+def s2_to_geoseries(
+    s2_index: Union[str, int, Iterable[Union[str, int]], npt.NDArray[np.int64]],
+) -> gpd.GeoSeries:
+    """
+    Convert S2 cells to GeoPandas GeoSeries.
+
+    Args:
+        s2_index (Union[str, int, Iterable[Union[str, int]], npt.NDArray[np.int64]]): S2 token,
+            cell id (or a list of them) to be converted.
+
+    Returns:
+        GeoSeries: Square polygons of the cells with WGS84 CRS.
+    """
+    if isinstance(s2_index, (str, int)):
+        s2_index = [s2_index]
+    face, i, j, level = _decode_s2_cells(_to_s2_cells(s2_index))
+    return gpd.GeoSeries(_get_s2_cells_polygons(face, i, j, level), crs=WGS84_CRS)
+
+
+def convert_s2_index(
+    s2_index: Union[pd.Index, Iterable[Union[str, int]], npt.NDArray[np.int64]],
+    index_dtype: Literal["str", "int64"],
+) -> pd.Index:
+    """
+    Convert S2 indexes between tokens and int64 cell ids.
+
+    Args:
+        s2_index (Union[pd.Index, Iterable[Union[str, int]], npt.NDArray[np.int64]]):
+            S2 indexes to be converted, as tokens or cell ids.
+        index_dtype (Literal["str", "int64"]): Type of the returned index.
+
+    Returns:
+        pd.Index: Converted index. The name of the index is kept if a pd.Index was provided.
+
+    Raises:
+        ValueError: If index_dtype is not "str" or "int64".
+    """
+    _check_return_type(index_dtype)
+    name = s2_index.name if isinstance(s2_index, pd.Index) else None
+    s2_cells = _to_s2_cells(s2_index.to_numpy() if isinstance(s2_index, pd.Index) else s2_index)
+    if index_dtype == "int64":
+        return pd.Index(s2_cells.view(np.int64), dtype=np.int64, name=name)
+    return pd.Index(_s2_uint64_to_tokens(s2_cells), dtype=object, name=name)
+
+
+@overload
+def points_to_s2(
+    points: gpd.GeoSeries, s2_resolution: int, return_type: Literal["str"] = "str"
+) -> list[str]: ...
+
+
+@overload
+def points_to_s2(
+    points: gpd.GeoSeries, s2_resolution: int, return_type: Literal["int64"]
+) -> npt.NDArray[np.int64]: ...
+
+
+def points_to_s2(
+    points: gpd.GeoSeries,
+    s2_resolution: int,
+    return_type: Literal["str", "int64"] = "str",
+) -> Union[list[str], npt.NDArray[np.int64]]:
+    """
+    Get S2 cells containing points, all at once.
+
+    Args:
+        points (gpd.GeoSeries): Point geometries in WGS84 CRS.
+        s2_resolution (int): S2 level of the cells (0-30).
+        return_type (Literal["str", "int64"], optional): Whether to return a list of S2 tokens
+            or a numpy array of 64-bit cell ids, stored as signed int64. Defaults to "str".
+
+    Returns:
+        Union[List[str], npt.NDArray[np.int64]]: Cell containing each of the points,
+            in the same order.
+
+    Raises:
+        ValueError: If resolution is not between 0 and 30.
+        ValueError: If return_type is not "str" or "int64".
+    """
+    _check_return_type(return_type)
+    _check_s2_resolution(s2_resolution)
+    return _format_s2_cells(_points_to_s2_cells(points, s2_resolution), return_type)
+
+
+def get_s2_disks(
+    s2_index: Union[Iterable[Union[str, int]], npt.NDArray[np.int64]],
+    distance: int,
+    vertex_neighbours: bool = True,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Get cells up to a given distance from many S2 cells at once.
+
+    Direct neighbours of a cell are the cells of the same level sharing an edge with it and,
+    if `vertex_neighbours` is set, also the ones sharing only a vertex, the same as in
+    `CellId.get_all_neighbors` of the S2 libraries. Neighbours across the edges of cube faces
+    are found by projecting a point just beyond the edge onto the adjacent face. Distances are
+    numbers of hops between direct neighbours, calculated for all the cells together level by
+    level.
+
+    Args:
+        s2_index (Union[Iterable[Union[str, int]], npt.NDArray[np.int64]]): S2 tokens
+            or 64-bit cell ids of the cells.
+        distance (int): Maximum distance to the neighbours.
+        vertex_neighbours (bool, optional): Whether cells sharing only a vertex are direct
+            neighbours. Defaults to True.
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]: Offsets of
+            the disk of each cell (with a length equal to the number of cells plus one), a flat
+            array of 64-bit ids (stored as signed int64) of the cells in the disks, including
+            the cells themselves, and their distances from the center of the disk.
+            Cells of each disk are sorted by their distance.
+
+    Raises:
+        ValueError: If distance is negative.
+    """
+    if distance < 0:
+        raise ValueError(f"Distance {distance} is negative.")
+    offsets, s2_cells, distances = _get_s2_disks(
+        _to_s2_cells(s2_index), distance, vertex_neighbours
+    )
+    return offsets, s2_cells.view(np.int64), distances
+
+
+def _check_return_type(return_type: str) -> None:
+    if return_type not in ("str", "int64"):
+        raise ValueError(f"Unknown return type: {return_type}. Expected 'str' or 'int64'.")
+
+
+def _check_s2_resolution(s2_resolution: int) -> None:
+    if not (0 <= s2_resolution <= S2_MAX_LEVEL):
+        raise ValueError(f"Resolution {s2_resolution} is not between 0 and 30.")
+
+
+def _format_s2_cells(
+    s2_cells: npt.NDArray[np.uint64], return_type: Literal["str", "int64"]
+) -> Union[list[str], npt.NDArray[np.int64]]:
+    if return_type == "int64":
+        return s2_cells.view(np.int64)
+    return _s2_uint64_to_tokens(s2_cells)
+
+
+def _to_s2_cells(
+    s2_index: Union[Iterable[Union[str, int]], npt.NDArray[np.int64]],
+) -> npt.NDArray[np.uint64]:
+    """Parse S2 tokens or (signed or unsigned) cell ids into an array of uint64 cell ids."""
+    if isinstance(s2_index, np.ndarray) and np.issubdtype(s2_index.dtype, np.integer):
+        return s2_index.astype(np.int64, copy=False).view(np.uint64)
+    values = list(s2_index)
+    if values and isinstance(values[0], str):
+        return np.array([int(token.ljust(16, "0"), 16) for token in values], dtype=np.uint64)
+    return np.array(values, dtype=np.int64).view(np.uint64)
+
+
+def _s2_uint64_to_tokens(s2_cells: npt.NDArray[np.uint64]) -> list[str]:
+    return [f"{s2_cell:016x}".rstrip("0") or "X" for s2_cell in s2_cells.tolist()]
+
+
+def _encode_s2_cells(
+    face: npt.NDArray[np.int64],
+    i: npt.NDArray[np.int64],
+    j: npt.NDArray[np.int64],
+    level: npt.NDArray[np.int64],
+) -> npt.NDArray[np.uint64]:
+    """Get ids of cells given by their face, level and coordinates within the level."""
+    leaf_i = i << (S2_MAX_LEVEL - level)
+    leaf_j = j << (S2_MAX_LEVEL - level)
+    position = face.astype(np.uint64) << np.uint64(2 * S2_MAX_LEVEL)
+    bits = face & SWAP_MASK
+    for k in range(7, -1, -1):
+        bits = bits + (((leaf_i >> (4 * k)) & 15) << 6) + (((leaf_j >> (4 * k)) & 15) << 2)
+        bits = _LOOKUP_POS[bits]
+        position |= (bits >> 2).astype(np.uint64) << np.uint64(8 * k)
+        bits &= _ORIENTATION_MASK
+    leaf_ids = position * np.uint64(2) + np.uint64(1)
+    lsb = np.uint64(1) << (2 * (S2_MAX_LEVEL - level)).astype(np.uint64)
+    s2_cells: npt.NDArray[np.uint64] = (leaf_ids & ~(lsb * np.uint64(2) - np.uint64(1))) | lsb
+    return s2_cells
+
+
+def _decode_s2_cells(
+    s2_cells: npt.NDArray[np.uint64],
+) -> tuple[
+    npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]
+]:
+    """Get faces, coordinates within the level and levels of cells."""
+    face = (s2_cells >> np.uint64(2 * S2_MAX_LEVEL + 1)).astype(np.int64)
+    lsb = s2_cells & (~s2_cells + np.uint64(1))
+    level = S2_MAX_LEVEL - np.log2(lsb.astype(np.float64)).astype(np.int64) // 2
+    leaf_i = np.zeros(len(s2_cells), dtype=np.int64)
+    leaf_j = np.zeros(len(s2_cells), dtype=np.int64)
+    bits = face & SWAP_MASK
+    for k in range(7, -1, -1):
+        number_of_bits = S2_MAX_LEVEL - 7 * 4 if k == 7 else 4
+        position_bits = (s2_cells >> np.uint64(8 * k + 1)) & np.uint64(
+            (1 << (2 * number_of_bits)) - 1
+        )
+        bits = _LOOKUP_IJ[bits + (position_bits.astype(np.int64) << 2)]
+        leaf_i += (bits >> 6) << (4 * k)
+        leaf_j += ((bits >> 2) & 15) << (4 * k)
+        bits &= _ORIENTATION_MASK
+    return face, leaf_i >> (S2_MAX_LEVEL - level), leaf_j >> (S2_MAX_LEVEL - level), level
+
+
+def _st_to_uv(st: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    uv: npt.NDArray[np.float64] = np.where(
+        st >= 0.5, (4 * st * st - 1) / 3, (1 - 4 * (1 - st) * (1 - st)) / 3
+    )
+    return uv
+
+
+def _uv_to_st(uv: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    st: npt.NDArray[np.float64] = np.where(
+        uv >= 0,
+        0.5 * np.sqrt(np.maximum(1 + 3 * uv, 0)),
+        1 - 0.5 * np.sqrt(np.maximum(1 - 3 * uv, 0)),
+    )
+    return st
+
+
+def _face_uv_to_xyz(
+    face: npt.NDArray[np.int64], u: npt.NDArray[np.float64], v: npt.NDArray[np.float64]
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    ones = np.ones_like(u)
+    x = np.choose(face, [ones, -u, -u, -ones, v, v])
+    y = np.choose(face, [u, ones, -v, -v, -ones, u])
+    z = np.choose(face, [v, v, ones, -u, -u, -ones])
+    return x, y, z
+
+
+def _xyz_to_face_uv(
+    x: npt.NDArray[np.float64], y: npt.NDArray[np.float64], z: npt.NDArray[np.float64]
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    abs_x, abs_y, abs_z = np.abs(x), np.abs(y), np.abs(z)
+    # ties are resolved the same way as in the s2 libraries
+    axis = np.where(
+        abs_x > abs_y, np.where(abs_x > abs_z, 0, 2), np.where(abs_y > abs_z, 1, 2)
+    ).astype(np.int64)
+    face = np.where(np.choose(axis, [x, y, z]) < 0, axis + 3, axis)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u = np.choose(face, [y / x, -x / y, -x / z, z / x, z / y, -y / z])
+        v = np.choose(face, [z / x, z / y, -y / z, y / x, -x / y, -x / z])
+    return face, u, v
+
+
+def _face_uv_to_lng_lat(
+    face: npt.NDArray[np.int64], u: npt.NDArray[np.float64], v: npt.NDArray[np.float64]
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    x, y, z = _face_uv_to_xyz(face, u, v)
+    return np.degrees(np.arctan2(y, x)), np.degrees(np.arctan2(z, np.hypot(x, y)))
+
+
+def _get_s2_cells_boundaries(
+    face: npt.NDArray[np.int64],
+    i: npt.NDArray[np.int64],
+    j: npt.NDArray[np.int64],
+    level: npt.NDArray[np.int64],
+    edge_samples: int,
+) -> npt.NDArray[np.float64]:
+    """
+    Get boundaries of cells as (longitude, latitude) coordinates.
+
+    Each edge of a cell is sampled with `edge_samples` points, starting from its vertex,
+    in the order of the S2 cell vertices. Returns an array of shape (cells, 4 * samples, 2).
+    """
+    cell_size = (1 << (S2_MAX_LEVEL - level)).astype(np.float64)[:, None]
+    steps = np.arange(edge_samples, dtype=np.float64) / edge_samples
+    # (u, v) steps along the edges between vertices (0, 0), (1, 0), (1, 1), (0, 1)
+    i_steps = np.concatenate([steps, np.ones(edge_samples), 1 - steps, np.zeros(edge_samples)])
+    j_steps = np.concatenate([np.zeros(edge_samples), steps, np.ones(edge_samples), 1 - steps])
+    max_size = float(1 << S2_MAX_LEVEL)
+    u = _st_to_uv((i[:, None] + i_steps[None, :]) * cell_size / max_size)
+    v = _st_to_uv((j[:, None] + j_steps[None, :]) * cell_size / max_size)
+    lng, lat = _face_uv_to_lng_lat(np.broadcast_to(face[:, None], u.shape), u, v)
+    return np.stack([lng, lat], axis=-1)
+
+
+def _get_s2_cells_polygons(
+    face: npt.NDArray[np.int64],
+    i: npt.NDArray[np.int64],
+    j: npt.NDArray[np.int64],
+    level: npt.NDArray[np.int64],
+) -> npt.NDArray[np.object_]:
+    """Get polygons of cells made of their 4 vertices, like in the `s2` library."""
+    if len(face) == 0:
+        return np.empty(0, dtype=object)
+    polygons: npt.NDArray[np.object_] = shapely.polygons(
+        _get_s2_cells_boundaries(face, i, j, level, 1)
+    )
+    return polygons
+
+
+def _points_to_s2_cells(points: gpd.GeoSeries, s2_resolution: int) -> npt.NDArray[np.uint64]:
+    """Get cells containing WGS84 points, all at once."""
+    lng = np.radians(np.asarray(points.x, dtype=np.float64))
+    lat = np.radians(np.asarray(points.y, dtype=np.float64))
+    face, u, v = _xyz_to_face_uv(np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat))
+    max_size = 1 << S2_MAX_LEVEL
+    leaf_i = np.clip(np.floor(_uv_to_st(u) * max_size), 0, max_size - 1).astype(np.int64)
+    leaf_j = np.clip(np.floor(_uv_to_st(v) * max_size), 0, max_size - 1).astype(np.int64)
+    level = np.full(len(face), s2_resolution, dtype=np.int64)
+    return _encode_s2_cells(
+        face,
+        leaf_i >> (S2_MAX_LEVEL - s2_resolution),
+        leaf_j >> (S2_MAX_LEVEL - s2_resolution),
+        level,
+    )
+
+
+def _get_s2_cells_neighbours(
+    s2_cells: npt.NDArray[np.uint64], vertex_neighbours: bool
+) -> npt.NDArray[np.uint64]:
+    """
+    Get direct neighbours of cells, with a row of 8 (or 4 edge) neighbours for each cell.
+
+    Rows can contain duplicates for cells touching the vertices of the cube.
+    """
+    face, i, j, level = _decode_s2_cells(s2_cells)
+    if vertex_neighbours:
+        i_offsets = np.array([-1, 0, 1, -1, 1, -1, 0, 1], dtype=np.int64)
+        j_offsets = np.array([-1, -1, -1, 0, 0, 1, 1, 1], dtype=np.int64)
+    else:
+        i_offsets = np.array([0, 1, 0, -1], dtype=np.int64)
+        j_offsets = np.array([-1, 0, 1, 0], dtype=np.int64)
+
+    shifts = (S2_MAX_LEVEL - level)[:, None]
+    cell_sizes = np.left_shift(1, shifts)
+    # leaf coordinates of the lower left corners of the neighbours
+    leaf_i = np.left_shift(i[:, None], shifts) + i_offsets[None, :] * cell_sizes
+    leaf_j = np.left_shift(j[:, None], shifts) + j_offsets[None, :] * cell_sizes
+    neighbour_face = np.repeat(face[:, None], len(i_offsets), axis=1)
+
+    max_size = 1 << S2_MAX_LEVEL
+    off_face = (leaf_i < 0) | (leaf_i >= max_size) | (leaf_j < 0) | (leaf_j >= max_size)
+    if off_face.any():
+        # linear projection of a leaf cell just beyond the edge, like in `FromFaceIJWrap`
+        u = (2 * np.clip(leaf_i[off_face], -1, max_size) + 1 - max_size) / max_size
+        v = (2 * np.clip(leaf_j[off_face], -1, max_size) + 1 - max_size) / max_size
+        wrapped_face, u, v = _xyz_to_face_uv(*_face_uv_to_xyz(neighbour_face[off_face], u, v))
+        neighbour_face[off_face] = wrapped_face
+        leaf_i[off_face] = np.clip(np.floor(max_size * 0.5 * (u + 1)), 0, max_size - 1)
+        leaf_j[off_face] = np.clip(np.floor(max_size * 0.5 * (v + 1)), 0, max_size - 1)
+
+    shifts = np.broadcast_to(shifts, leaf_i.shape)
+    return _encode_s2_cells(
+        neighbour_face.reshape(-1),
+        np.right_shift(leaf_i, shifts).reshape(-1),
+        np.right_shift(leaf_j, shifts).reshape(-1),
+        (S2_MAX_LEVEL - shifts).reshape(-1),
+    ).reshape(leaf_i.shape)
+
+
+def _get_s2_disks(
+    s2_cells: npt.NDArray[np.uint64], distance: int, vertex_neighbours: bool
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.uint64], npt.NDArray[np.int64]]:
+    """
+    Get disks of cells sorted by distance, with offsets of the disk of each cell.
+
+    Disks not reaching the edges of the cube face are squares (or diamonds without vertex
+    neighbours) of cells on the same face, so they are created directly from the coordinates
+    of the cells. Only disks of the cells close to the face edges are searched.
+    """
+    face, i, j, level = _decode_s2_cells(s2_cells)
+    level_size = np.left_shift(1, level)
+    interior = (i >= distance) & (i + distance < level_size)
+    interior &= (j >= distance) & (j + distance < level_size)
+
+    i_offsets, j_offsets = (
+        grid.reshape(-1)
+        for grid in np.meshgrid(
+            np.arange(-distance, distance + 1), np.arange(-distance, distance + 1)
+        )
+    )
+    if vertex_neighbours:
+        offsets_distances = np.maximum(np.abs(i_offsets), np.abs(j_offsets))
+    else:
+        offsets_distances = np.abs(i_offsets) + np.abs(j_offsets)
+    offsets_order = np.argsort(offsets_distances, kind="stable")
+    offsets_order = offsets_order[offsets_distances[offsets_order] <= distance]
+    i_offsets, j_offsets = i_offsets[offsets_order], j_offsets[offsets_order]
+    offsets_distances = offsets_distances[offsets_order]
+
+    interior_rows = np.flatnonzero(interior)
+    disk_size = len(offsets_order)
+    interior_cells = _encode_s2_cells(
+        np.repeat(face[interior], disk_size),
+        (i[interior][:, None] + i_offsets[None, :]).reshape(-1),
+        (j[interior][:, None] + j_offsets[None, :]).reshape(-1),
+        np.repeat(level[interior], disk_size),
+    )
+
+    edge_rows = np.flatnonzero(~interior)
+    edge_disks_rows, edge_cells, edge_distances = _search_s2_disks(
+        s2_cells[edge_rows], distance, vertex_neighbours
+    )
+
+    all_rows = np.concatenate((np.repeat(interior_rows, disk_size), edge_rows[edge_disks_rows]))
+    order = np.argsort(all_rows, kind="stable")
+    offsets = np.zeros(len(s2_cells) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(all_rows, minlength=len(s2_cells)), out=offsets[1:])
+    return (
+        offsets,
+        np.concatenate((interior_cells, edge_cells))[order],
+        np.concatenate((np.tile(offsets_distances, len(interior_rows)), edge_distances))[order],
+    )
+
+
+def _search_s2_disks(
+    s2_cells: npt.NDArray[np.uint64], distance: int, vertex_neighbours: bool
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.uint64], npt.NDArray[np.int64]]:
+    """
+    Get disks of cells with a breadth-first search over all the cells together.
+
+    Neighbours of cells at a distance k can only be at distances k - 1, k and k + 1, so new
+    cells are checked only against the last two rings. Returns rows of the queried cells,
+    cells of their disks and distances for all the visited pairs, ordered by distance.
+    """
+    rows = [np.arange(len(s2_cells), dtype=np.int64)]
+    cells = [s2_cells]
+    distances = [np.zeros(len(s2_cells), dtype=np.int64)]
+    for current_distance in range(1, distance + 1):
+        if len(cells[-1]) == 0:
+            break
+        neighbours = _get_s2_cells_neighbours(cells[-1], vertex_neighbours)
+        candidate_rows = np.repeat(rows[-1], neighbours.shape[1])
+        candidate_cells = neighbours.reshape(-1)
+
+        previous_rows = np.concatenate(rows[-2:])
+        all_rows = np.concatenate((previous_rows, candidate_rows))
+        _, cell_positions = np.unique(
+            np.concatenate((*cells[-2:], candidate_cells)), return_inverse=True
+        )
+        keys = all_rows * (int(cell_positions.max()) + 1) + cell_positions.reshape(-1)
+        new_keys, first_positions = np.unique(keys[len(previous_rows) :], return_index=True)
+        new_positions = first_positions[~np.isin(new_keys, keys[: len(previous_rows)])]
+
+        rows.append(candidate_rows[new_positions])
+        cells.append(candidate_cells[new_positions])
+        distances.append(np.full(len(new_positions), current_distance, dtype=np.int64))
+
+    return np.concatenate(rows), np.concatenate(cells), np.concatenate(distances)
+
+
+def _get_coarse_covering(bounds: npt.NDArray[np.float64], s2_resolution: int) -> list[int]:
+    """Cover bounding boxes with a few cells not finer than the resolution."""
+    coverer = RegionCoverer()
+    coverer.min_level = 0
+    coverer.max_level = s2_resolution
+    coverer.max_cells = _COARSE_COVERING_SIZE
+    cell_ids: list[int] = []
+    for min_lng, min_lat, max_lng, max_lat in bounds.tolist():
+        lat_lo, lat_hi = LatLng.from_degrees(min_lat, 0), LatLng.from_degrees(max_lat, 0)
+        lng_lo, lng_hi = LatLng.from_degrees(0, min_lng), LatLng.from_degrees(0, max_lng)
+        rect = LatLngRect(
+            LineInterval(lat_lo.lat().radians, lat_hi.lat().radians),
+            SphereInterval(lng_lo.lng().radians, lng_hi.lng().radians),
+        )
+        cell_ids.extend(cell_id.id() for cell_id in coverer.get_covering(rect))
+    return cell_ids
+
+
+def _cover_geometries(
+    geometries: npt.NDArray[np.object_], s2_resolution: int, buffer: bool
+) -> tuple[npt.NDArray[np.uint64], npt.NDArray[np.int64]]:
+    """
+    Cover geometries with cells at a single level.
+
+    Bounding boxes of the geometries are covered with a few coarse cells, which are split into
+    children level by level. Children further from all the geometries than a fraction of their
+    size are dropped with a spatial index query, using boundaries sampled along the cell edges.
+    Finally, the cells are checked against the geometries using their 4 vertices.
+
+    Returns:
+        Tuple[npt.NDArray[np.uint64], npt.NDArray[np.int64]]: Unique cell ids and a position of
+            the first geometry matching each of the cells.
+    """
+    _check_s2_resolution(s2_resolution)
+    parts = shapely.get_parts(geometries)
+    parts = parts[~shapely.is_empty(parts)]
+    if len(parts) == 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+
+    coarse_cells = np.unique(
+        np.array(_get_coarse_covering(shapely.bounds(parts), s2_resolution), dtype=np.uint64)
+    )
+    face, i, j, level = _decode_s2_cells(coarse_cells)
+    tree = shapely.STRtree(geometries)
+
+    final_cells: list[tuple[npt.NDArray[np.int64], ...]] = []
+    while len(face) > 0:
+        final_mask = level == s2_resolution
+        final_cells.append((face[final_mask], i[final_mask], j[final_mask]))
+
+        face, i, j, level = face[~final_mask], i[~final_mask], j[~final_mask], level[~final_mask]
+        # split the remaining cells into their 4 children
+        face, level = np.repeat(face, 4), np.repeat(level, 4) + 1
+        i = np.repeat(i, 4) * 2 + np.tile([0, 1, 0, 1], len(i))
+        j = np.repeat(j, 4) * 2 + np.tile([0, 0, 1, 1], len(j))
+        if len(face) == 0:
+            break
+
+        boundaries = _get_s2_cells_boundaries(face, i, j, level, _EDGE_SAMPLES)
+        cell_sizes = np.ptp(boundaries[..., 1], axis=1)
+        # cells containing a pole or crossing the antimeridian can't be checked in WGS84
+        kept_mask = (np.ptp(boundaries[..., 0], axis=1) > 180) | (
+            np.abs(boundaries[..., 1]).max(axis=1) > 89.9
+        )
+        close_cells, _ = tree.query(
+            shapely.polygons(boundaries),
+            predicate="dwithin",
+            distance=_PRUNING_MARGIN * cell_sizes,
+        )
+        kept_mask[close_cells] = True
+        face, i, j, level = face[kept_mask], i[kept_mask], j[kept_mask], level[kept_mask]
+
+    face = np.concatenate([cells[0] for cells in final_cells])
+    i = np.concatenate([cells[1] for cells in final_cells])
+    j = np.concatenate([cells[2] for cells in final_cells])
+    level = np.full(len(face), s2_resolution, dtype=np.int64)
+    polygons = _get_s2_cells_polygons(face, i, j, level)
+    cell_positions, geometry_positions = tree.query(
+        polygons, predicate="intersects" if buffer else "within"
+    )
+
+    s2_cells = _encode_s2_cells(face, i, j, level)[cell_positions]
+    order = np.lexsort((geometry_positions, s2_cells))
+    s2_cells, geometry_positions = s2_cells[order], geometry_positions[order]
+    first_mask = np.ones(len(s2_cells), dtype=bool)
+    first_mask[1:] = s2_cells[1:] != s2_cells[:-1]
+    return s2_cells[first_mask], geometry_positions[first_mask].astype(np.int64)
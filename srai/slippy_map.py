@@ -0,0 +1,222 @@
+"""
+Utility Slippy map tiles related functions.
+
+Tiles [1] are processed as numpy arrays of their x and y numbers at a given zoom. Regions
+are identified with "x_y_z" strings, as in the `SlippyMapRegionalizer`.
+
+References:
+    1. https://wiki.openstreetmap.org/wiki/Slippy_map_tilenames
+"""
+
+from collections.abc import Iterable
+from typing import Union
+
+import geopandas as gpd
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+from srai.constants import GEOMETRY_COLUMN, WGS84_CRS
+
+__all__ = [
+    "coordinates_to_slippy_map_tiles",
+    "slippy_map_tiles_to_coordinates",
+    "shapely_geometry_to_slippy_map_tiles",
+    "get_slippy_map_index",
+    "parse_slippy_map_index",
+    "slippy_map_to_geoseries",
+    "points_to_slippy_map",
+]
+
+# Number of candidate tiles checked against geometries at once.
+_TILES_CHUNK_SIZE = 1_000_000
+
+
+def coordinates_to_slippy_map_tiles(
+    latitudes: npt.ArrayLike, longitudes: npt.ArrayLike, zoom: int
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Convert latitudes and longitudes into x and y numbers of tiles containing them.
+
+    Coordinates outside of the Web Mercator bounds are assigned to the nearest tiles.
+
+    Based on https://wiki.openstreetmap.org/wiki/Slippy_map_tilenames#Implementations.
+
+    Args:
+        latitudes (npt.ArrayLike): Latitudes in degrees.
+        longitudes (npt.ArrayLike): Longitudes in degrees.
+        zoom (int): Zoom level of the tiles.
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]: X and y numbers of the tiles.
+    """
+    n_rows = 2**zoom
+    x_tiles = np.floor(n_rows * ((np.asarray(longitudes, dtype=np.float64) + 180) / 360))
+    lat_radians = np.radians(np.asarray(latitudes, dtype=np.float64))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        y_tiles = np.floor((1 - np.arcsinh(np.tan(lat_radians)) / np.pi) / 2 * n_rows)
+    return (
+        np.clip(x_tiles, 0, n_rows - 1).astype(np.int64),
+        np.clip(np.nan_to_num(y_tiles), 0, n_rows - 1).astype(np.int64),
+    )
+
+
+def slippy_map_tiles_to_coordinates(
+    x: npt.ArrayLike, y: npt.ArrayLike, zoom: npt.ArrayLike
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    Convert x and y numbers of tiles into latitudes and longitudes of their north-west corners.
+
+    Based on https://wiki.openstreetmap.org/wiki/Slippy_map_tilenames#Implementations.
+
+    Args:
+        x (npt.ArrayLike): X numbers of the tiles.
+        y (npt.ArrayLike): Y numbers of the tiles.
+        zoom (npt.ArrayLike): Zoom level of all tiles or of each tile.
+
+    Returns:
+        Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]: Latitudes and longitudes
+            in degrees.
+    """
+    n = 2.0 ** np.asarray(zoom, dtype=np.float64)
+    longitudes = np.asarray(x, dtype=np.float64) / n * 360.0 - 180.0
+    latitudes = np.degrees(
+        np.arctan(np.sinh(np.pi * (1 - 2 * np.asarray(y, dtype=np.float64) / n)))
+    )
+    return latitudes, longitudes
+
+
+def shapely_geometry_to_slippy_map_tiles(
+    geometry: Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame],
+    zoom: int,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Convert Shapely geometry to Slippy map tiles intersecting it.
+
+    Candidate tiles from the bounding box of each geometry are created in bulk and checked
+    against the geometries with a single array call per chunk of candidates.
+
+    Args:
+        geometry (Union[BaseGeometry, Iterable[BaseGeometry], gpd.GeoSeries, gpd.GeoDataFrame]):
+            Shapely geometry to be converted. Expected to be in WGS84 CRS.
+        zoom (int): Zoom level of the tiles.
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]: X and y numbers of unique tiles,
+            sorted by x and then by y.
+    """
+    if isinstance(geometry, gpd.GeoDataFrame):
+        geometry = geometry[GEOMETRY_COLUMN]
+    if isinstance(geometry, BaseGeometry):
+        geometry = [geometry]
+
+    geometries = np.asarray(list(geometry), dtype=object)
+    geometries = geometries[~shapely.is_empty(geometries)]
+    shapely.prepare(geometries)
+
+    bounds = shapely.bounds(geometries).reshape(-1, 4)
+    x_start, y_start = coordinates_to_slippy_map_tiles(bounds[:, 3], bounds[:, 0], zoom)
+    x_end, y_end = coordinates_to_slippy_map_tiles(bounds[:, 1], bounds[:, 2], zoom)
+    heights = y_end - y_start + 1
+    offsets = np.concatenate([[0], np.cumsum((x_end - x_start + 1) * heights)])
+
+    n_rows = 2**zoom
+    tiles_keys = [np.empty(0, dtype=np.int64)]
+    for chunk_start in range(0, int(offsets[-1]), _TILES_CHUNK_SIZE):
+        positions = np.arange(chunk_start, min(chunk_start + _TILES_CHUNK_SIZE, offsets[-1]))
+        geometry_ids = np.searchsorted(offsets, positions, side="right") - 1
+        local_positions = positions - offsets[geometry_ids]
+        x = x_start[geometry_ids] + local_positions // heights[geometry_ids]
+        y = y_start[geometry_ids] + local_positions % heights[geometry_ids]
+        intersecting = shapely.intersects(_get_tiles_polygons(x, y, zoom), geometries[geometry_ids])
+        tiles_keys.append(np.unique(x[intersecting] * n_rows + y[intersecting]))
+
+    unique_tiles_keys = np.unique(np.concatenate(tiles_keys))
+    return unique_tiles_keys // n_rows, unique_tiles_keys % n_rows
+
+
+def get_slippy_map_index(x: npt.ArrayLike, y: npt.ArrayLike, zoom: npt.ArrayLike) -> pd.Index:
+    """
+    Get "x_y_z" identifiers of Slippy map tiles.
+
+    Args:
+        x (npt.ArrayLike): X numbers of the tiles.
+        y (npt.ArrayLike): Y numbers of the tiles.
+        zoom (npt.ArrayLike): Zoom level of all tiles or of each tile.
+
+    Returns:
+        pd.Index: Identifiers of the tiles.
+    """
+    x_str = np.asarray(x, dtype=np.int64).astype(str)
+    y_str = np.asarray(y, dtype=np.int64).astype(str)
+    zoom_str = np.broadcast_to(np.asarray(zoom, dtype=np.int64), x_str.shape).astype(str)
+    return pd.Index(
+        np.char.add(np.char.add(np.char.add(np.char.add(x_str, "_"), y_str), "_"), zoom_str),
+        dtype=object,
+    )
+
+
+def parse_slippy_map_index(
+    index: Iterable[str],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Get x, y and zoom of Slippy map tiles from their "x_y_z" identifiers.
+
+    Args:
+        index (Iterable[str]): Identifiers of the tiles.
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]: X and y
+            numbers and zoom levels of the tiles.
+
+    Raises:
+        ValueError: If any of the identifiers is not in the "x_y_z" format.
+    """
+    parts = pd.Series(list(index), dtype=object).str.split("_", expand=True)
+    if len(parts) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy(), empty.copy()
+    if parts.shape[1] != 3 or parts.isna().any(axis=None):
+        raise ValueError("Slippy map tiles identifiers must be in the 'x_y_z' format.")
+    values = parts.to_numpy(dtype=np.int64)
+    return values[:, 0], values[:, 1], values[:, 2]
+
+
+def slippy_map_to_geoseries(index: Iterable[str]) -> gpd.GeoSeries:
+    """
+    Convert Slippy map tiles identifiers to GeoSeries with their polygons.
+
+    Args:
+        index (Iterable[str]): Identifiers of the tiles in the "x_y_z" format.
+
+    Returns:
+        gpd.GeoSeries: Polygons of the tiles in WGS84 CRS.
+    """
+    x, y, zoom = parse_slippy_map_index(index)
+    return gpd.GeoSeries(_get_tiles_polygons(x, y, zoom), crs=WGS84_CRS)
+
+
+def points_to_slippy_map(points: gpd.GeoSeries, zoom: int) -> pd.Index:
+    """
+    Get identifiers of Slippy map tiles containing points.
+
+    Args:
+        points (gpd.GeoSeries): Point geometries in WGS84 CRS.
+        zoom (int): Zoom level of the tiles.
+
+    Returns:
+        pd.Index: Identifier of the tile containing each of the points, in the same order.
+    """
+    x, y = coordinates_to_slippy_map_tiles(points.y.to_numpy(), points.x.to_numpy(), zoom)
+    return get_slippy_map_index(x, y, zoom)
+
+
+def _get_tiles_polygons(
+    x: npt.NDArray[np.int64], y: npt.NDArray[np.int64], zoom: npt.ArrayLike
+) -> npt.NDArray[np.object_]:
+    north, west = slippy_map_tiles_to_coordinates(x, y, zoom)
+    south, east = slippy_map_tiles_to_coordinates(x + 1, y + 1, zoom)
+    polygons: npt.NDArray[np.object_] = shapely.box(west, south, east, north)
+    return polygons
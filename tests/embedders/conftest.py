@@ -6,6 +6,7 @@ import pytest
 from shapely import geometry
 
 from srai.constants import FEATURES_INDEX, REGIONS_INDEX, WGS84_CRS
+from srai.h3 import convert_h3_index
 
 TRAINER_KWARGS = {"max_epochs": 1, "accelerator": "cpu", "deterministic": True}
 
@@ -128,6 +129,14 @@ def gdf_regions_int(gdf_regions) -> gpd.GeoDataFrame:
     return regions_gdf
 
 
+@pytest.fixture  # type: ignore
+def gdf_regions_uint64(gdf_regions) -> gpd.GeoDataFrame:
+    """Get GeoDataFrame with 3 hexagonal regions with uint64 H3 cells index."""
+    regions_gdf = gdf_regions.copy()
+    regions_gdf.index = convert_h3_index(regions_gdf.index, "uint64")
+    return regions_gdf
+
+
 @pytest.fixture  # type: ignore
 def gdf_features() -> gpd.GeoDataFrame:
     """Get GeoDataFrame with example OSM-like features."""
@@ -334,6 +343,16 @@ def gdf_joint_int(gdf_joint) -> gpd.GeoDataFrame:
     return joint_gdf
 
 
+@pytest.fixture  # type: ignore
+def gdf_joint_uint64(gdf_joint) -> gpd.GeoDataFrame:
+    """Get joint GeoDataFrame for matching regions with uint64 index and features."""
+    joint_gdf = gdf_joint.copy()
+    joint_gdf.index = joint_gdf.index.set_levels(
+        convert_h3_index(joint_gdf.index.levels[0], "uint64"), level=REGIONS_INDEX
+    )
+    return joint_gdf
+
+
 @pytest.fixture  # type: ignore
 def gdf_joint_boolean() -> gpd.GeoDataFrame:
     """Get joint GeoDataFrame for matching regions and features from this module."""
@@ -8,7 +8,7 @@ import pandas as pd
 import pytest
 
 from srai.embedders.geovex.dataset import HexagonalDataset
-from srai.h3 import get_local_ij_index
+from srai.h3 import convert_h3_index, get_local_ij_index
 from srai.neighbourhoods import AdjacencyNeighbourhood, H3Neighbourhood
 
 ROOT_REGION = "891e205194bffff"
@@ -123,3 +123,31 @@ def test_dataset_item(regions_data_df: pd.DataFrame) -> None:
         ]
     )
     assert np.all(ijs.transpose(1, 0, -1) == desired)
+
+
+def test_uint64_index(regions_data_df: pd.DataFrame) -> None:
+    """Test if HexagonalDataset returns the same items for uint64 and string indexes."""
+    import torch
+
+    ring_distance = 3
+    dataset = HexagonalDataset(
+        regions_data_df, H3Neighbourhood(regions_data_df), neighbor_k_ring=ring_distance
+    )
+    regions_data_df_uint64 = regions_data_df.set_axis(
+        convert_h3_index(regions_data_df.index, "uint64")
+    )
+    dataset_uint64 = HexagonalDataset(
+        regions_data_df_uint64,
+        H3Neighbourhood(regions_data_df_uint64),
+        neighbor_k_ring=ring_distance,
+    )
+
+    assert len(dataset) == len(dataset_uint64)
+    assert convert_h3_index(dataset_uint64.get_valid_cells(), "str").to_list() == (
+        dataset.get_valid_cells()
+    )
+    assert sorted(dataset.get_valid_cells() + dataset.get_invalid_cells()) == sorted(
+        regions_data_df.index
+    )
+    for item_index in range(0, len(dataset), 50):
+        assert torch.equal(dataset[item_index], dataset_uint64[item_index])
@@ -1,22 +1,27 @@
 """ContextualCountEmbedder tests."""
 
+import pickle
 from contextlib import nullcontext as does_not_raise
 from pathlib import Path
 from typing import Any, Literal, Union
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import polars as pl
 import pytest
 from pandas.testing import assert_frame_equal
 from parametrization import Parametrization as P
 from shapely.geometry import Polygon
 
-from srai.constants import REGIONS_INDEX, WGS84_CRS
-from srai.embedders import ContextualCountEmbedder
+from srai.constants import GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
+from srai.embedders import ContextualCountEmbedder, contextual_count_embedder
+from srai.embedders._shared_memory_pool import SharedMemoryWorkerPool
+from srai.h3 import convert_h3_index
 from srai.joiners import IntersectionJoiner
 from srai.loaders.osm_loaders import OSMPbfLoader
 from srai.loaders.osm_loaders.filters import GEOFABRIK_LAYERS, OsmTagsFilter
-from srai.neighbourhoods import H3Neighbourhood
+from srai.neighbourhoods import AdjacencyNeighbourhood, H3Neighbourhood, Neighbourhood
 from srai.regionalizers import H3Regionalizer
 
 
@@ -974,6 +979,7 @@ def specified_features_expected_subcategories_embedding_df_concatenated_distance
     "max",
     None,
 )
+@pytest.mark.parametrize("aggregation_engine", ["sparse", "pandas"])  # type: ignore
 def test_correct_embedding(
     expected_embedding_fixture: str,
     neighbourhood_distance: int,
@@ -981,6 +987,7 @@ def test_correct_embedding(
     count_subcategories: bool,
     aggregation_function: Literal["average", "median", "sum", "min", "max"],
     expected_features_fixture: Union[str, None],
+    aggregation_engine: Literal["sparse", "pandas"],
     request: Any,
 ) -> None:
     """Test if ContextualCountEmbedder returns correct result with different parameters."""
@@ -1000,6 +1007,7 @@ def test_correct_embedding(
         count_subcategories=count_subcategories,
         concatenate_vectors=concatenate_features,
         aggregation_function=aggregation_function,
+        aggregation_engine=aggregation_engine,
     )
     embedding_df = embedder.transform(
         regions_gdf=gdf_regions, features_gdf=gdf_features, joint_gdf=gdf_joint
@@ -1013,12 +1021,227 @@ def test_correct_embedding(
     )
 
 
+@pytest.mark.parametrize("aggregation_engine", ["sparse", "pandas"])  # type: ignore
+@pytest.mark.parametrize("with_regions", [False, True])  # type: ignore
+def test_uint64_regions_index(
+    aggregation_engine: Literal["sparse", "pandas"],
+    with_regions: bool,
+    gdf_regions: gpd.GeoDataFrame,
+    gdf_regions_uint64: gpd.GeoDataFrame,
+    gdf_features: gpd.GeoDataFrame,
+    gdf_joint: gpd.GeoDataFrame,
+    gdf_joint_uint64: gpd.GeoDataFrame,
+) -> None:
+    """Test if uint64 H3 cells index gives the same embeddings as the string index."""
+    embeddings = [
+        ContextualCountEmbedder(
+            neighbourhood=H3Neighbourhood(regions_gdf if with_regions else None),
+            neighbourhood_distance=2,
+            aggregation_engine=aggregation_engine,
+        ).transform(regions_gdf=regions_gdf, features_gdf=gdf_features, joint_gdf=joint_gdf)
+        for regions_gdf, joint_gdf in (
+            (gdf_regions, gdf_joint),
+            (gdf_regions_uint64, gdf_joint_uint64),
+        )
+    ]
+
+    assert embeddings[1].index.dtype == np.uint64
+    assert_frame_equal(
+        embeddings[1].set_axis(convert_h3_index(embeddings[1].index, "str")), embeddings[0]
+    )
+
+
 def test_negative_nighbourhood_distance() -> None:
     """Test checks if negative neighbouthood distance is disallowed."""
     with pytest.raises(ValueError):
         ContextualCountEmbedder(neighbourhood=H3Neighbourhood(), neighbourhood_distance=-1)
 
 
+def test_unknown_aggregation_engine() -> None:
+    """Test checks if unknown aggregation engine is disallowed."""
+    with pytest.raises(ValueError):
+        ContextualCountEmbedder(
+            neighbourhood=H3Neighbourhood(),
+            neighbourhood_distance=1,
+            aggregation_engine="unknown",  # type: ignore[arg-type]
+        )
+
+
+@pytest.fixture  # type: ignore
+def random_counts_regions_gdf() -> gpd.GeoDataFrame:
+    """Get H3 regions for random counts."""
+    return H3Regionalizer(resolution=9).transform(
+        gpd.GeoDataFrame(
+            geometry=[Polygon([(17.0, 51.0), (17.05, 51.0), (17.05, 51.03), (17.0, 51.03)])],
+            crs=WGS84_CRS,
+        )
+    )
+
+
+@pytest.fixture  # type: ignore
+def random_counts_df(random_counts_regions_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
+    """Get random counts for H3 regions with some of the regions missing."""
+    regions = random_counts_regions_gdf
+    rng = np.random.default_rng(seed=42)
+    # drop some regions to have incomplete rings
+    return pd.DataFrame(
+        rng.integers(0, 5, size=(len(regions), 4)),
+        index=regions.index,
+        columns=["amenity", "leisure", "shop", "tourism"],
+    ).sample(frac=0.7, random_state=42)
+
+
+def _get_embeddings(embedder: ContextualCountEmbedder, counts_df: pd.DataFrame) -> pd.DataFrame:
+    if embedder.concatenate_vectors:
+        return embedder._get_concatenated_embeddings(counts_df)
+    return embedder._get_squashed_embeddings(counts_df)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "aggregation_function", ["average", "median", "sum", "min", "max"]
+)
+@pytest.mark.parametrize("concatenate_features", [False, True])  # type: ignore
+@pytest.mark.parametrize("sparse_engine_block_size", [1, 7, 1_000_000])  # type: ignore
+def test_sparse_engine_matches_pandas_engine(
+    aggregation_function: Literal["average", "median", "sum", "min", "max"],
+    concatenate_features: bool,
+    sparse_engine_block_size: int,
+    random_counts_df: pd.DataFrame,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test if sparse aggregation engine returns exactly the same values as the pandas engine."""
+    monkeypatch.setattr(
+        "srai.embedders.contextual_count_embedder._SPARSE_ENGINE_BLOCK_SIZE",
+        sparse_engine_block_size,
+    )
+    results = [
+        _get_embeddings(
+            ContextualCountEmbedder(
+                neighbourhood=H3Neighbourhood(),
+                neighbourhood_distance=3,
+                concatenate_vectors=concatenate_features,
+                aggregation_function=aggregation_function,
+                aggregation_engine=aggregation_engine,  # type: ignore[arg-type]
+                num_of_multiprocessing_workers=1,
+            ),
+            random_counts_df,
+        )
+        for aggregation_engine in ("sparse", "pandas")
+    ]
+
+    assert_frame_equal(results[0], results[1], check_exact=True)
+
+
+@pytest.mark.parametrize("aggregation_function", ["average", "median", "max"])  # type: ignore
+@pytest.mark.parametrize("aggregation_engine", ["sparse", "pandas"])  # type: ignore
+@pytest.mark.parametrize("neighbourhood_type", ["h3", "adjacency"])  # type: ignore
+def test_multiprocessing_matches_single_process(
+    aggregation_function: Literal["average", "median", "sum", "min", "max"],
+    aggregation_engine: Literal["sparse", "pandas"],
+    neighbourhood_type: str,
+    random_counts_df: pd.DataFrame,
+    random_counts_regions_gdf: gpd.GeoDataFrame,
+) -> None:
+    """Test if the shared memory worker pool returns the same values and is reused."""
+    neighbourhood: Neighbourhood[Any]
+    if neighbourhood_type == "h3":
+        neighbourhood = H3Neighbourhood()
+    else:
+        neighbourhood = AdjacencyNeighbourhood(random_counts_regions_gdf)
+        neighbourhood.generate_neighbourhoods()
+
+    expected_result = _get_embeddings(
+        ContextualCountEmbedder(
+            neighbourhood=neighbourhood,
+            neighbourhood_distance=3,
+            concatenate_vectors=True,
+            aggregation_function=aggregation_function,
+            aggregation_engine="pandas",
+            num_of_multiprocessing_workers=1,
+        ),
+        random_counts_df,
+    )
+
+    with ContextualCountEmbedder(
+        neighbourhood=neighbourhood,
+        neighbourhood_distance=3,
+        concatenate_vectors=True,
+        aggregation_function=aggregation_function,
+        aggregation_engine=aggregation_engine,
+        num_of_multiprocessing_workers=2,
+        multiprocessing_activation_threshold=10,
+    ) as embedder:
+        first_result = _get_embeddings(embedder, random_counts_df)
+        assert embedder._worker_pool is not None
+        worker_pool = embedder._worker_pool
+        executor = worker_pool._resources.executor
+        second_result = _get_embeddings(embedder, random_counts_df)
+
+        assert executor is not None
+        assert worker_pool._resources.executor is executor
+        assert not worker_pool._resources.shared_memory
+
+    assert embedder._worker_pool is None
+    assert worker_pool._resources.executor is None
+
+    assert_frame_equal(first_result, expected_result, check_exact=True)
+    assert_frame_equal(second_result, expected_result, check_exact=True)
+
+
+def test_close_stops_worker_pool(random_counts_df: pd.DataFrame) -> None:
+    """Test if closing the embedder stops worker processes and they are restarted on demand."""
+    embedder = ContextualCountEmbedder(
+        neighbourhood=H3Neighbourhood(),
+        neighbourhood_distance=2,
+        num_of_multiprocessing_workers=2,
+        multiprocessing_activation_threshold=10,
+    )
+    first_result = _get_embeddings(embedder, random_counts_df)
+    assert embedder._worker_pool is not None
+    worker_pool = embedder._worker_pool
+
+    embedder.close()
+
+    assert embedder._worker_pool is None
+    assert worker_pool._resources.executor is None
+    try:
+        assert_frame_equal(_get_embeddings(embedder, random_counts_df), first_result)
+        assert embedder._worker_pool is not None
+    finally:
+        embedder.close()
+    embedder.close()
+
+
+def test_neighbours_positions_task(
+    random_counts_df: pd.DataFrame, random_counts_regions_gdf: gpd.GeoDataFrame
+) -> None:
+    """Test if workers return neighbours as positions in the counts index without any index."""
+    neighbourhood = AdjacencyNeighbourhood(random_counts_regions_gdf)
+    neighbourhood.generate_neighbourhoods()
+    pool = SharedMemoryWorkerPool(num_of_workers=1)
+    shared_counts_index = pool.share_array(
+        np.frombuffer(pickle.dumps(random_counts_df.index), dtype=np.uint8)
+    )
+    previous_neighbourhood = contextual_count_embedder._WORKER_NEIGHBOURHOOD
+    try:
+        contextual_count_embedder._initialize_worker(neighbourhood)
+        indptr, positions = contextual_count_embedder._get_neighbours_positions_task(
+            (5, 15), counts_index=shared_counts_index, neighbour_distance=1
+        )
+    finally:
+        contextual_count_embedder._WORKER_NEIGHBOURHOOD = previous_neighbourhood
+        contextual_count_embedder._WORKER_COUNTS_INDEX = None
+        pool.shutdown()
+
+    assert len(indptr) == 11
+    for row, region_id in enumerate(random_counts_df.index[5:15]):
+        expected = neighbourhood.get_neighbours(region_id)
+        row_positions = positions[indptr[row] : indptr[row + 1]]
+        existing_neighbours = random_counts_df.index[row_positions[row_positions >= 0]]
+        assert set(existing_neighbours) == expected.intersection(random_counts_df.index)
+        assert (row_positions < 0).sum() == len(expected.difference(random_counts_df.index))
+
+
 @pytest.mark.parametrize(  # type: ignore
     "regions_fixture,features_fixture,joint_fixture,expected_features_fixture,expectation",
     [
@@ -1055,6 +1278,7 @@ def test_negative_nighbourhood_distance() -> None:
 @pytest.mark.parametrize("concatenate_features", [False, True])  # type: ignore
 @pytest.mark.parametrize("count_subcategories", [False, True])  # type: ignore
 @pytest.mark.parametrize("neighbourhood_distance", [0, 1, 2])  # type: ignore
+@pytest.mark.parametrize("aggregation_engine", ["sparse", "pandas"])  # type: ignore
 def test_empty(
     regions_fixture: str,
     features_fixture: str,
@@ -1062,6 +1286,7 @@ def test_empty(
     concatenate_features: bool,
     count_subcategories: bool,
     neighbourhood_distance: int,
+    aggregation_engine: Literal["sparse", "pandas"],
     expected_features_fixture: Union[str, None],
     expectation: Any,
     request: Any,
@@ -1078,6 +1303,7 @@ def test_empty(
         expected_output_features=expected_output_features,
         count_subcategories=count_subcategories,
         concatenate_vectors=concatenate_features,
+        aggregation_engine=aggregation_engine,
     )
     gdf_regions: gpd.GeoDataFrame = request.getfixturevalue(regions_fixture)
     gdf_features: gpd.GeoDataFrame = request.getfixturevalue(features_fixture)
@@ -1095,6 +1321,32 @@ def test_empty(
         assert (embedding == 0).all().all()
 
 
+@pytest.mark.parametrize("concatenate_features", [False, True])  # type: ignore
+def test_polars_inputs_and_outputs(
+    concatenate_features: bool,
+    gdf_regions: gpd.GeoDataFrame,
+    gdf_features: gpd.GeoDataFrame,
+    gdf_joint: gpd.GeoDataFrame,
+) -> None:
+    """Test ContextualCountEmbedder on polars inputs and with polars output."""
+    embedder = ContextualCountEmbedder(
+        neighbourhood=H3Neighbourhood(),
+        neighbourhood_distance=1,
+        concatenate_vectors=concatenate_features,
+    )
+    expected_df = embedder.transform(gdf_regions, gdf_features, gdf_joint)
+
+    polars_df = embedder.transform_to_polars(
+        *(
+            pl.from_pandas(pd.DataFrame(gdf.drop(columns=GEOMETRY_COLUMN)), include_index=True)
+            for gdf in (gdf_regions, gdf_features, gdf_joint)
+        )
+    )
+
+    assert polars_df.columns[0] == REGIONS_INDEX
+    assert_frame_equal(polars_df.to_pandas().set_index(REGIONS_INDEX), expected_df)
+
+
 @pytest.mark.parametrize(  # type: ignore
     "regions_fixture,features_fixture,joint_fixture,expectation",
     [
@@ -1,19 +1,26 @@
 """CountEmbedder tests."""
 
 from contextlib import nullcontext as does_not_raise
-from typing import TYPE_CHECKING, Any, Union
+from pathlib import Path
+from typing import Any, Optional, Union
 from unittest import TestCase
 
+import geopandas as gpd
+import h3
+import numpy as np
 import pandas as pd
+import polars as pl
+import pyarrow as pa
 import pytest
 from pandas.testing import assert_frame_equal
+from shapely.geometry import LineString
 
-from srai.constants import REGIONS_INDEX
+from srai.constants import FEATURES_INDEX, GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
 from srai.embedders import CountEmbedder
+from srai.h3 import convert_h3_index, get_h3_parents, h3_to_geoseries
+from srai.joiners import IntersectionJoiner
 from srai.loaders.osm_loaders.filters import GroupedOsmTagsFilter, OsmTagsFilter
-
-if TYPE_CHECKING:  # pragma: no cover
-    import geopandas as gpd
+from srai.regionalizers import LazyGeometryRegions
 
 ut = TestCase()
 
@@ -469,3 +476,369 @@ def test_osm_tags_filter_parsing(
         )
 
         ut.assertCountEqual(embedder.expected_output_features, expected_output_features)
+
+
+def test_uint64_regions_index(
+    gdf_regions: "gpd.GeoDataFrame",
+    gdf_regions_uint64: "gpd.GeoDataFrame",
+    gdf_features: "gpd.GeoDataFrame",
+    gdf_joint: "gpd.GeoDataFrame",
+    gdf_joint_uint64: "gpd.GeoDataFrame",
+) -> None:
+    """Test if CountEmbedder keeps uint64 H3 cells index without converting it to strings."""
+    embedder = CountEmbedder()
+    embedding_df = embedder.transform(
+        regions_gdf=gdf_regions, features_gdf=gdf_features, joint_gdf=gdf_joint
+    )
+    uint64_embedding_df = embedder.transform(
+        regions_gdf=gdf_regions_uint64, features_gdf=gdf_features, joint_gdf=gdf_joint_uint64
+    )
+
+    assert uint64_embedding_df.index.dtype == np.uint64
+    assert_frame_equal(
+        uint64_embedding_df.set_axis(convert_h3_index(uint64_embedding_df.index, "str")),
+        embedding_df,
+    )
+
+
+def test_lazy_geometry_regions(
+    gdf_regions: "gpd.GeoDataFrame",
+    gdf_features: "gpd.GeoDataFrame",
+    gdf_joint: "gpd.GeoDataFrame",
+) -> None:
+    """Test if CountEmbedder works on regions without geometries."""
+    lazy_regions = LazyGeometryRegions(index=gdf_regions.index, geometry_function=h3_to_geoseries)
+    embedder = CountEmbedder()
+
+    assert_frame_equal(
+        embedder.transform(
+            regions_gdf=lazy_regions, features_gdf=gdf_features, joint_gdf=gdf_joint
+        ),
+        embedder.transform(regions_gdf=gdf_regions, features_gdf=gdf_features, joint_gdf=gdf_joint),
+    )
+
+
+def test_h3_parent_resolution(
+    gdf_regions: "gpd.GeoDataFrame",
+    gdf_features: "gpd.GeoDataFrame",
+    gdf_joint: "gpd.GeoDataFrame",
+) -> None:
+    """Test if CountEmbedder counts features in parents of the regions."""
+    parents = convert_h3_index(get_h3_parents(gdf_regions.index, 7), "str").rename(REGIONS_INDEX)
+    parent_regions = LazyGeometryRegions(
+        index=parents.unique().sort_values(), geometry_function=h3_to_geoseries
+    )
+    parent_joint = (
+        gdf_joint.set_axis(
+            pd.MultiIndex.from_arrays(
+                [
+                    parents[gdf_regions.index.get_indexer(gdf_joint.index.get_level_values(0))],
+                    gdf_joint.index.get_level_values(1),
+                ]
+            )
+        )
+        .loc[lambda df: ~df.index.duplicated()]
+        .sort_index()
+    )
+
+    parent_embedding_df = CountEmbedder(h3_parent_resolution=7).transform(
+        regions_gdf=gdf_regions, features_gdf=gdf_features, joint_gdf=gdf_joint
+    )
+
+    assert parent_embedding_df.index.name == REGIONS_INDEX
+    assert_frame_equal(
+        parent_embedding_df,
+        CountEmbedder().transform(
+            regions_gdf=parent_regions, features_gdf=gdf_features, joint_gdf=parent_joint
+        ),
+    )
+
+    with pytest.raises(ValueError):
+        CountEmbedder(h3_parent_resolution=16)
+
+
+@pytest.mark.parametrize("index_dtype", ["str", "uint64"])  # type: ignore
+def test_h3_parent_resolution_feature_in_many_children(index_dtype: str) -> None:
+    """Test if a feature intersecting multiple children of a parent is counted once."""
+    children = h3.cell_to_children(h3.latlng_to_cell(51.1, 17.0, 7), 9)
+    line = LineString([(17.0, 51.1), (17.001, 51.1)])
+    regions_gdf = gpd.GeoDataFrame(
+        geometry=h3_to_geoseries(children).values,
+        index=convert_h3_index(children, index_dtype).rename(REGIONS_INDEX),
+        crs=WGS84_CRS,
+    )
+    features_gdf = gpd.GeoDataFrame(
+        {"highway": ["primary"]},
+        geometry=[line],
+        index=pd.Index(["way/1"], name=FEATURES_INDEX),
+        crs=WGS84_CRS,
+    )
+    joint_gdf = gpd.GeoDataFrame(
+        geometry=[line] * len(children),
+        index=pd.MultiIndex.from_arrays(
+            [regions_gdf.index, ["way/1"] * len(children)], names=[REGIONS_INDEX, FEATURES_INDEX]
+        ),
+        crs=WGS84_CRS,
+    )
+
+    embedder = CountEmbedder(count_subcategories=False, h3_parent_resolution=7)
+    embedding_df = embedder.transform(
+        regions_gdf=regions_gdf, features_gdf=features_gdf, joint_gdf=joint_gdf
+    )
+    polars_df = embedder.transform_to_polars(
+        regions_gdf=regions_gdf, features_gdf=features_gdf, joint_gdf=joint_gdf
+    )
+
+    assert embedding_df.index.dtype == regions_gdf.index.dtype
+    assert (
+        embedding_df.index.tolist()
+        == convert_h3_index([h3.cell_to_parent(children[0], 7)], index_dtype).tolist()
+    )
+    assert embedding_df["highway"].tolist() == [1]
+    assert polars_df["highway"].to_list() == [1]
+
+
+def _to_frame(
+    gdf: "gpd.GeoDataFrame", frame_type: str
+) -> Union[pa.Table, pl.DataFrame, pl.LazyFrame]:
+    df = pd.DataFrame(gdf.drop(columns=GEOMETRY_COLUMN)).reset_index()
+    if frame_type == "arrow":
+        return pa.Table.from_pandas(df, preserve_index=False)
+    if frame_type == "polars":
+        return pl.from_pandas(df)
+    return pl.from_pandas(df).lazy()
+
+
+@pytest.mark.parametrize("frame_type", ["arrow", "polars", "lazy"])  # type: ignore
+@pytest.mark.parametrize(  # type: ignore
+    "features_fixture,count_subcategories,expected_output_features",
+    [
+        ("gdf_features", False, None),
+        ("gdf_features", True, None),
+        ("gdf_features", True, ["amenity_pub", "leisure_park"]),
+        ("gdf_features_boolean", False, None),
+    ],
+)
+def test_arrow_and_polars_inputs(
+    frame_type: str,
+    features_fixture: str,
+    count_subcategories: bool,
+    expected_output_features: Optional[list[str]],
+    gdf_regions: "gpd.GeoDataFrame",
+    gdf_joint: "gpd.GeoDataFrame",
+    request: Any,
+) -> None:
+    """Test if CountEmbedder returns the same embeddings for Arrow and polars inputs."""
+    gdf_features = request.getfixturevalue(features_fixture)
+    embedder = CountEmbedder(
+        expected_output_features=expected_output_features,
+        count_subcategories=count_subcategories,
+    )
+    expected_df = embedder.transform(
+        regions_gdf=gdf_regions, features_gdf=gdf_features, joint_gdf=gdf_joint
+    )
+
+    embedding_df = embedder.transform(
+        regions_gdf=_to_frame(gdf_regions, frame_type),
+        features_gdf=_to_frame(gdf_features, frame_type),
+        joint_gdf=_to_frame(gdf_joint, frame_type),
+    )
+
+    assert_frame_equal(embedding_df, expected_df)
+
+
+@pytest.mark.parametrize("h3_parent_resolution", [None, 7])  # type: ignore
+def test_polars_and_arrow_outputs(
+    h3_parent_resolution: Optional[int],
+    gdf_regions: "gpd.GeoDataFrame",
+    gdf_features: "gpd.GeoDataFrame",
+    gdf_joint: "gpd.GeoDataFrame",
+) -> None:
+    """Test if CountEmbedder returns embeddings as polars DataFrames and Arrow Tables."""
+    embedder = CountEmbedder(h3_parent_resolution=h3_parent_resolution)
+    expected_df = embedder.transform(
+        regions_gdf=gdf_regions, features_gdf=gdf_features, joint_gdf=gdf_joint
+    )
+
+    polars_df = embedder.transform_to_polars(
+        regions_gdf=gdf_regions, features_gdf=gdf_features, joint_gdf=gdf_joint
+    )
+    arrow_table = embedder.transform_to_arrow(
+        regions_gdf=_to_frame(gdf_regions, "arrow"),
+        features_gdf=_to_frame(gdf_features, "arrow"),
+        joint_gdf=_to_frame(gdf_joint, "arrow"),
+    )
+
+    assert isinstance(polars_df, pl.DataFrame)
+    assert isinstance(arrow_table, pa.Table)
+    assert polars_df.columns[0] == REGIONS_INDEX
+    assert_frame_equal(polars_df.to_pandas().set_index(REGIONS_INDEX), expected_df)
+    assert_frame_equal(arrow_table.to_pandas().set_index(REGIONS_INDEX), expected_df)
+
+
+def test_empty_polars_output(
+    gdf_regions: "gpd.GeoDataFrame",
+    gdf_features_empty: "gpd.GeoDataFrame",
+    gdf_joint_empty: "gpd.GeoDataFrame",
+) -> None:
+    """Test if CountEmbedder returns zero counts as polars DataFrame for empty features."""
+    polars_df = CountEmbedder(expected_output_features=["amenity", "leisure"]).transform_to_polars(
+        regions_gdf=gdf_regions, features_gdf=gdf_features_empty, joint_gdf=gdf_joint_empty
+    )
+
+    assert polars_df.columns == [REGIONS_INDEX, "amenity", "leisure"]
+    assert len(polars_df) == len(gdf_regions)
+    assert polars_df.select(pl.exclude(REGIONS_INDEX).sum()).row(0) == (0, 0)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "input_name,missing_column",
+    [
+        ("regions_gdf", REGIONS_INDEX),
+        ("features_gdf", FEATURES_INDEX),
+        ("joint_gdf", REGIONS_INDEX),
+        ("joint_gdf", FEATURES_INDEX),
+    ],
+)
+def test_missing_frame_columns(
+    input_name: str,
+    missing_column: str,
+    gdf_regions: "gpd.GeoDataFrame",
+    gdf_features: "gpd.GeoDataFrame",
+    gdf_joint: "gpd.GeoDataFrame",
+) -> None:
+    """Test if CountEmbedder raises an error for polars inputs without index columns."""
+    inputs = {
+        "regions_gdf": _to_frame(gdf_regions, "polars"),
+        "features_gdf": _to_frame(gdf_features, "polars"),
+        "joint_gdf": _to_frame(gdf_joint, "polars"),
+    }
+    inputs[input_name] = inputs[input_name].drop(missing_column)
+
+    with pytest.raises(ValueError, match=input_name):
+        CountEmbedder().transform(**inputs)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "features_fixture,count_subcategories,expected_output_features",
+    [
+        ("gdf_features", True, None),
+        ("gdf_features", False, None),
+        ("gdf_features", True, ["amenity_pub", "leisure_park"]),
+        ("gdf_features", False, ["amenity", "shop"]),
+        ("gdf_features_boolean", False, None),
+    ],
+)
+def test_geoparquet_features(
+    features_fixture: str,
+    count_subcategories: bool,
+    expected_output_features: Union[list[str], None],
+    gdf_regions: "gpd.GeoDataFrame",
+    tmp_path: Path,
+    request: Any,
+) -> None:
+    """Test if counting features from a GeoParquet file in DuckDB returns the same embeddings."""
+    gdf_features: gpd.GeoDataFrame = request.getfixturevalue(features_fixture)
+    features_path = tmp_path / "features.parquet"
+    gdf_features.to_parquet(features_path)
+    embedder = CountEmbedder(
+        expected_output_features=expected_output_features,
+        count_subcategories=count_subcategories,
+    )
+
+    embedding_df = embedder.transform_geoparquet(gdf_regions, features_path)
+
+    assert_frame_equal(
+        embedding_df,
+        embedder.transform(
+            regions_gdf=gdf_regions,
+            features_gdf=gdf_features,
+            joint_gdf=IntersectionJoiner().transform(gdf_regions, gdf_features),
+        ),
+    )
+    lazy_regions = LazyGeometryRegions(index=gdf_regions.index, geometry_function=h3_to_geoseries)
+    assert_frame_equal(embedder.transform_geoparquet(lazy_regions, features_path), embedding_df)
+
+
+def test_geoparquet_h3_parent_resolution(
+    gdf_regions: "gpd.GeoDataFrame", gdf_features: "gpd.GeoDataFrame", tmp_path: Path
+) -> None:
+    """Test if features from a GeoParquet file are counted once in parents of the regions."""
+    features_path = tmp_path / "features.parquet"
+    gdf_features.to_parquet(features_path)
+    embedder = CountEmbedder(h3_parent_resolution=7)
+
+    assert_frame_equal(
+        embedder.transform_geoparquet(gdf_regions, features_path),
+        embedder.transform(
+            regions_gdf=gdf_regions,
+            features_gdf=gdf_features,
+            joint_gdf=IntersectionJoiner().transform(gdf_regions, gdf_features),
+        ),
+    )
+
+
+def test_geoparquet_features_crs(
+    gdf_regions: "gpd.GeoDataFrame", gdf_features: "gpd.GeoDataFrame", tmp_path: Path
+) -> None:
+    """Test if regions are reprojected into the CRS of features from a GeoParquet file."""
+    wgs84_features_path = tmp_path / "features_wgs84.parquet"
+    gdf_features.to_parquet(wgs84_features_path)
+    projected_features_path = tmp_path / "features_3857.parquet"
+    gdf_features.to_crs(3857).to_parquet(projected_features_path)
+    embedder = CountEmbedder()
+
+    assert_frame_equal(
+        embedder.transform_geoparquet(gdf_regions, projected_features_path),
+        embedder.transform_geoparquet(gdf_regions, wgs84_features_path),
+    )
+
+
+def test_geoparquet_undefined_crs(
+    gdf_regions: "gpd.GeoDataFrame", gdf_features: "gpd.GeoDataFrame", tmp_path: Path
+) -> None:
+    """Test if features without a defined CRS are rejected."""
+    features_path = tmp_path / "features.parquet"
+    gdf_features.set_crs(None, allow_override=True).to_parquet(features_path)
+
+    with pytest.raises(ValueError, match="undefined CRS"):
+        CountEmbedder().transform_geoparquet(gdf_regions, features_path)
+
+
+def test_geoparquet_missing_geometry(
+    gdf_regions: "gpd.GeoDataFrame", gdf_features: "gpd.GeoDataFrame", tmp_path: Path
+) -> None:
+    """Test if features without a geometry column are rejected."""
+    features_path = tmp_path / "features.parquet"
+    pd.DataFrame(gdf_features.drop(columns=GEOMETRY_COLUMN)).to_parquet(features_path)
+
+    with pytest.raises(ValueError, match="geometry column"):
+        CountEmbedder().transform_geoparquet(gdf_regions, features_path)
+
+
+def test_geoparquet_empty_features(
+    gdf_regions: "gpd.GeoDataFrame", gdf_features: "gpd.GeoDataFrame", tmp_path: Path
+) -> None:
+    """Test if empty GeoParquet features are handled like empty features_gdf."""
+    features_path = tmp_path / "features.parquet"
+    gdf_features.iloc[:0].to_parquet(features_path)
+
+    embedding_df = CountEmbedder(expected_output_features=["amenity_pub"]).transform_geoparquet(
+        gdf_regions, features_path
+    )
+
+    assert (embedding_df.index == gdf_regions.index).all()
+    assert (embedding_df["amenity_pub"] == 0).all()
+    with pytest.raises(ValueError):
+        CountEmbedder().transform_geoparquet(gdf_regions, features_path)
+
+
+def test_geoparquet_unnamed_regions_index(
+    gdf_regions: "gpd.GeoDataFrame", gdf_features: "gpd.GeoDataFrame", tmp_path: Path
+) -> None:
+    """Test if regions without an index name are rejected."""
+    features_path = tmp_path / "features.parquet"
+    gdf_features.to_parquet(features_path)
+
+    with pytest.raises(ValueError):
+        CountEmbedder().transform_geoparquet(gdf_regions.rename_axis(None), features_path)
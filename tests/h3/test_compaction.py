@@ -0,0 +1,113 @@
+"""H3 compaction tests."""
+
+from contextlib import nullcontext as does_not_raise
+from typing import Any
+
+import h3
+import numpy as np
+import pytest
+from shapely.geometry import box
+
+from srai.h3 import (
+    compact_h3_cells,
+    get_compacted_h3_parents,
+    shapely_geometry_to_h3,
+    uncompact_h3_cells,
+    uncompact_h3_cells_batches,
+)
+
+WROCLAW_BOX = box(16.9, 51.0, 17.2, 51.2)
+
+
+@pytest.mark.parametrize("resolution", [6, 8])  # type: ignore
+@pytest.mark.parametrize("buffer", [True, False])  # type: ignore
+def test_compact_round_trip(resolution: int, buffer: bool) -> None:
+    """Test if compacted coverage expands back to the full coverage."""
+    h3_cells = shapely_geometry_to_h3(WROCLAW_BOX, resolution, buffer=buffer, return_type="uint64")
+    compacted_h3_cells = shapely_geometry_to_h3(
+        WROCLAW_BOX, resolution, buffer=buffer, return_type="uint64", compact=True
+    )
+
+    assert len(compacted_h3_cells) <= len(h3_cells)
+    assert all(
+        h3.get_resolution(h3.int_to_str(h3_cell)) <= resolution
+        for h3_cell in compacted_h3_cells.tolist()
+    )
+    np.testing.assert_array_equal(
+        compacted_h3_cells, compact_h3_cells(h3_cells, return_type="uint64")
+    )
+    np.testing.assert_array_equal(
+        uncompact_h3_cells(compacted_h3_cells, resolution, return_type="uint64"), h3_cells
+    )
+
+
+def test_compact_str() -> None:
+    """Test if compaction returns the parent for all of its children as strings."""
+    parent = h3.latlng_to_cell(51.1, 17.0, 5)
+    children = h3.cell_to_children(parent, 7)
+
+    assert compact_h3_cells(children) == [parent]
+    assert sorted(uncompact_h3_cells([parent], 7)) == sorted(children)
+
+
+def test_compact_mixed_resolutions() -> None:
+    """Test if compacting cells with mixed resolutions is disallowed."""
+    with pytest.raises(ValueError):
+        compact_h3_cells(["8a1e2009016ffff", "891e2009017ffff"])
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "resolution,expectation",
+    [
+        (8, does_not_raise()),
+        (7, pytest.raises(ValueError)),
+        (16, pytest.raises(ValueError)),
+    ],
+)
+def test_uncompact_resolution(resolution: int, expectation: Any) -> None:
+    """Test if cells can't be expanded to a coarser resolution."""
+    compacted_h3_cells = shapely_geometry_to_h3(WROCLAW_BOX, 8, compact=True)
+    with expectation:
+        uncompact_h3_cells(compacted_h3_cells, resolution)
+    with expectation:
+        next(uncompact_h3_cells_batches(compacted_h3_cells, resolution))
+
+
+@pytest.mark.parametrize("batch_size", [1, 5, 7, 100, 1_000_000])  # type: ignore
+def test_uncompact_batches(batch_size: int) -> None:
+    """Test if batches contain the same cells as the full expansion."""
+    compacted_h3_cells = shapely_geometry_to_h3(WROCLAW_BOX, 8, compact=True)
+    h3_cells = uncompact_h3_cells(compacted_h3_cells, 8)
+
+    batches = list(uncompact_h3_cells_batches(compacted_h3_cells, 8, batch_size=batch_size))
+    batched_h3_cells = [h3_cell for batch in batches for h3_cell in batch]
+
+    assert all(len(batch) == batch_size for batch in batches[:-1])
+    assert 0 < len(batches[-1]) <= batch_size
+    assert len(batched_h3_cells) == len(set(batched_h3_cells))
+    assert set(batched_h3_cells) == set(h3_cells)
+
+
+def test_uncompact_batches_invalid_batch_size() -> None:
+    """Test if non-positive batch size is disallowed."""
+    with pytest.raises(ValueError):
+        next(uncompact_h3_cells_batches(["851e2003fffffff"], 8, batch_size=0))
+
+
+def test_get_compacted_h3_parents() -> None:
+    """Test if cells are assigned to the compacted cells containing them."""
+    compacted_h3_cells = shapely_geometry_to_h3(
+        WROCLAW_BOX, 8, buffer=False, return_type="uint64", compact=True
+    )
+    h3_cells = uncompact_h3_cells(compacted_h3_cells, 9, return_type="uint64")
+    outside_h3_cell = np.uint64(h3.str_to_int(h3.latlng_to_cell(0, 0, 9)))
+
+    parents = get_compacted_h3_parents(np.append(h3_cells, outside_h3_cell), compacted_h3_cells)
+
+    assert parents[-1] == 0
+    assert np.isin(parents[:-1], compacted_h3_cells).all()
+    assert all(
+        h3.cell_to_parent(h3.int_to_str(h3_cell), h3.get_resolution(h3.int_to_str(parent)))
+        == h3.int_to_str(parent)
+        for h3_cell, parent in zip(h3_cells.tolist(), parents[:-1].tolist())
+    )
@@ -0,0 +1,93 @@
+"""H3 geometry cache tests."""
+
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+from shapely.geometry import box
+
+from srai.h3 import (
+    clear_h3_geometry_cache,
+    get_h3_geometry_cache_info,
+    h3_to_geoseries,
+    set_h3_geometry_cache_size,
+    shapely_geometry_to_h3,
+)
+
+CACHE_SIZE = 10_000_000
+
+
+@pytest.fixture(autouse=True)  # type: ignore
+def geometry_cache() -> Iterator[None]:
+    """Enable an empty geometry cache for a test and disable it afterwards."""
+    set_h3_geometry_cache_size(CACHE_SIZE)
+    clear_h3_geometry_cache()
+    yield
+    set_h3_geometry_cache_size(0)
+    clear_h3_geometry_cache()
+
+
+@pytest.fixture  # type: ignore
+def h3_cells() -> np.ndarray:
+    """Get example uint64 cells."""
+    return shapely_geometry_to_h3(box(16.9, 51.0, 17.0, 51.05), 9, return_type="uint64")
+
+
+def test_cached_geometries_equal(h3_cells: np.ndarray) -> None:
+    """Test if cached geometries are equal to the generated ones."""
+    geometries = h3_to_geoseries(h3_cells)
+    cached_geometries = h3_to_geoseries(h3_cells[::-1])
+
+    assert cached_geometries.geom_equals_exact(
+        geometries[::-1].reset_index(drop=True), tolerance=0
+    ).all()
+    assert cached_geometries.crs == geometries.crs
+
+
+def test_statistics(h3_cells: np.ndarray) -> None:
+    """Test if hits and misses are counted."""
+    h3_to_geoseries(h3_cells)
+    h3_to_geoseries(np.concatenate((h3_cells[:10], h3_cells[:10])))
+
+    cache_info = get_h3_geometry_cache_info()
+    assert cache_info.misses == len(h3_cells)
+    assert cache_info.hits == 20
+    assert cache_info.cells == len(h3_cells)
+    assert 0 < cache_info.size_bytes <= CACHE_SIZE
+    assert cache_info.max_size_bytes == CACHE_SIZE
+
+    clear_h3_geometry_cache()
+    assert get_h3_geometry_cache_info()[:4] == (0, 0, 0, 0)
+
+
+def test_lru_eviction(h3_cells: np.ndarray) -> None:
+    """Test if least recently used cells are evicted when the cache is full."""
+    h3_to_geoseries(h3_cells[:2])
+    cell_size = get_h3_geometry_cache_info().size_bytes // 2
+    set_h3_geometry_cache_size(3 * cell_size)
+
+    h3_to_geoseries(h3_cells[[0]])
+    h3_to_geoseries(h3_cells[2:4])
+    assert get_h3_geometry_cache_info().cells == 3
+    assert get_h3_geometry_cache_info().size_bytes <= 3 * cell_size
+
+    hits = get_h3_geometry_cache_info().hits
+    h3_to_geoseries(h3_cells[[0]])
+    assert get_h3_geometry_cache_info().hits == hits + 1
+    h3_to_geoseries(h3_cells[[1]])
+    assert get_h3_geometry_cache_info().hits == hits + 1
+
+
+def test_disabled(h3_cells: np.ndarray) -> None:
+    """Test if disabled cache doesn't keep any cells."""
+    set_h3_geometry_cache_size(0)
+    h3_to_geoseries(h3_cells)
+
+    assert get_h3_geometry_cache_info().cells == 0
+    assert get_h3_geometry_cache_info().misses == 0
+
+
+def test_negative_size() -> None:
+    """Test if negative cache size is disallowed."""
+    with pytest.raises(ValueError):
+        set_h3_geometry_cache_size(-1)
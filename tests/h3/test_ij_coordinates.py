@@ -4,7 +4,7 @@ import h3
 import numpy as np
 import pytest
 
-from srai.h3 import get_local_ij_index
+from srai.h3 import get_local_ij_index, get_local_ij_indexes, ring_buffer_h3_indexes
 
 
 @pytest.mark.parametrize(
@@ -102,3 +102,46 @@ def test_pentagon_error(h3_origin: str, h3_cell: str) -> None:
     """Test checks if method fails over pentagon pairs."""
     with pytest.raises(h3._cy.error_system.H3FailedError):
         get_local_ij_index(origin_index=h3_origin, h3_index=h3_cell)
+
+
+@pytest.mark.parametrize(
+    "h3_origin",
+    [
+        "891e2040d4bffff",
+        "871e20400ffffff",
+        "821f77fffffffff",
+    ],
+)  # type: ignore
+def test_batched_equal_to_single(h3_origin: str) -> None:
+    """Test checks if batched coordinates are equal to the ones calculated one by one."""
+    h3_cells = ring_buffer_h3_indexes([h3_origin], distance=3)
+    expected_coordinates = [get_local_ij_index(h3_origin, h3_cell) for h3_cell in h3_cells]
+
+    coordinates = get_local_ij_indexes([h3_origin] * len(h3_cells), h3_cells)
+    assert coordinates.dtype == np.int16
+    np.testing.assert_array_equal(coordinates, expected_coordinates)
+
+    coordinates_2d = get_local_ij_indexes(
+        [h3_origin, h3_origin], np.array([h3_cells, h3_cells], dtype=object)
+    )
+    assert coordinates_2d.shape == (2, len(h3_cells), 2)
+    np.testing.assert_array_equal(coordinates_2d[1], expected_coordinates)
+
+
+def test_batched_length_mismatch() -> None:
+    """Test checks if number of origins has to match the number of cells."""
+    with pytest.raises(ValueError):
+        get_local_ij_indexes(["891e2040d4bffff"], ["891e2040d4bffff", "891e2040d4bffff"])
+
+
+@pytest.mark.parametrize(
+    "h3_origin, h3_cell",
+    [
+        ("83a75dfffffffff", "83a791fffffffff"),
+        ("836200fffffffff", "837400fffffffff"),
+    ],
+)  # type: ignore
+def test_batched_pentagon_error(h3_origin: str, h3_cell: str) -> None:
+    """Test checks if batched method fails over pentagon pairs."""
+    with pytest.raises(ValueError):
+        get_local_ij_indexes([h3_origin], [h3_cell])
@@ -3,11 +3,19 @@
 from typing import Any, Callable
 
 import geopandas as gpd
+import h3
+import numpy as np
+import pyarrow as pa
 import pytest
+from shapely.geometry import MultiPolygon, Point, Polygon, box
 
+from srai.constants import WGS84_CRS
 from srai.h3 import (
+    h3_to_geoseries,
     ring_buffer_geometry,
+    ring_buffer_h3_indexes,
     ring_buffer_h3_regions_gdf,
+    shapely_geometry_to_h3,
 )
 from srai.regionalizers.geocode import geocode_to_region_gdf
 from srai.regionalizers.h3_regionalizer import H3Regionalizer
@@ -43,9 +51,90 @@ def test_ring_buffer_geometry(
     ring_buffer_geometry(parsed_geometry, h3_resolution=resolution, distance=distance)
 
 
+@pytest.mark.parametrize("distance", [0, 1, 3])  # type: ignore
+def test_ring_buffer_geometry_equal_to_union(distance: int) -> None:
+    """Test checks if dissolved buffers are equal to the union of buffered cells."""
+    geometries = gpd.GeoSeries(
+        [
+            box(16.9, 51.0, 17.0, 51.05),
+            Point(17.0, 51.0),
+            box(16.95, 51.02, 17.05, 51.1),
+            MultiPolygon([box(0, 0, 0.05, 0.05), box(1, 1, 1.05, 1.05)]),
+            Polygon(),
+        ],
+        index=["a", "b", "c", "d", "e"],
+        crs=WGS84_CRS,
+    )
+
+    buffered_geometries = ring_buffer_geometry(geometries, h3_resolution=8, distance=distance)
+
+    assert buffered_geometries.index.equals(geometries.index)
+    assert buffered_geometries.crs == geometries.crs
+    assert buffered_geometries["e"].is_empty
+    for geometry, buffered_geometry in zip(geometries[:-1], buffered_geometries[:-1]):
+        expected_geometry = h3_to_geoseries(
+            ring_buffer_h3_indexes(
+                shapely_geometry_to_h3(geometry, 8, return_type="uint64"),
+                distance=distance,
+                return_type="uint64",
+            )
+        ).union_all()
+        assert buffered_geometry.geom_type == expected_geometry.geom_type
+        assert buffered_geometry.symmetric_difference(expected_geometry).area < 1e-12
+    assert ring_buffer_geometry(geometries["a"], h3_resolution=8, distance=distance).equals(
+        buffered_geometries["a"]
+    )
+
+
 def test_ring_buffer_h3_regions_gdf() -> None:
     """Test checks if ring_buffer_h3_regions_gdf function works."""
     gdf_wro = geocode_to_region_gdf("Wrocław, PL")
     regions_gdf = H3Regionalizer(8).transform(gdf_wro)
 
     ring_buffer_h3_regions_gdf(regions_gdf, distance=10)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "h3_cells_parser_function",
+    [
+        lambda h3_indexes: h3_indexes,
+        lambda h3_indexes: [h3.str_to_int(h3_index) for h3_index in h3_indexes],
+        lambda h3_indexes: [h3_indexes[0], *(h3.str_to_int(i) for i in h3_indexes[1:])],
+        lambda h3_indexes: np.array([h3.str_to_int(i) for i in h3_indexes], dtype=np.uint64),
+        lambda h3_indexes: pa.array([h3.str_to_int(i) for i in h3_indexes], type=pa.uint64()),
+    ],
+)
+@pytest.mark.parametrize("distance", [0, 1, 3])  # type: ignore
+def test_ring_buffer_h3_indexes(
+    h3_cells_parser_function: Callable[[list[str]], Any],
+    distance: int,
+    expected_h3_indexes: list[str],
+) -> None:
+    """Test checks if ring_buffer_h3_indexes returns the same cells for different input types."""
+    expected_buffered_h3_indexes = set().union(
+        *(h3.grid_disk(h3_index, distance) for h3_index in expected_h3_indexes)
+    )
+
+    h3_cells = h3_cells_parser_function(expected_h3_indexes)
+    buffered_h3_indexes = ring_buffer_h3_indexes(h3_cells, distance)
+    buffered_h3_cells = ring_buffer_h3_indexes(h3_cells, distance, return_type="uint64")
+
+    assert set(buffered_h3_indexes) == expected_buffered_h3_indexes
+    assert buffered_h3_cells.dtype == np.uint64
+    assert {h3.int_to_str(int(h3_cell)) for h3_cell in buffered_h3_cells} == (
+        expected_buffered_h3_indexes
+    )
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "h3_indexes",
+    [
+        ["891e205194bffff", "invalid"],
+        [h3.str_to_int("891e205194bffff"), 123],
+        np.array([123], dtype=np.uint64),
+    ],
+)
+def test_ring_buffer_h3_indexes_invalid_cells(h3_indexes: Any) -> None:
+    """Test checks if ring_buffer_h3_indexes validates the cells."""
+    with pytest.raises(AssertionError):
+        ring_buffer_h3_indexes(h3_indexes, 1)
@@ -0,0 +1,109 @@
+"""H3 roll-up and drill-down tests."""
+
+from typing import Literal
+
+import h3
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+from shapely.geometry import box
+
+from srai.constants import REGIONS_INDEX
+from srai.h3 import (
+    convert_h3_index,
+    drill_down_h3_regions_df,
+    roll_up_h3_regions_df,
+    shapely_geometry_to_h3,
+)
+
+
+@pytest.fixture  # type: ignore
+def regions_df() -> pd.DataFrame:
+    """Get example values of H3 regions at resolution 9."""
+    h3_cells = shapely_geometry_to_h3(box(16.9, 51.0, 17.0, 51.05), 9)
+    return pd.DataFrame(
+        {
+            "count": np.arange(len(h3_cells), dtype=np.int32),
+            "value": np.linspace(0, 1, len(h3_cells)),
+        },
+        index=pd.Index(h3_cells, name=REGIONS_INDEX),
+    )
+
+
+@pytest.mark.parametrize("resolution", [0, 5, 7, 9])  # type: ignore
+@pytest.mark.parametrize("index_dtype", ["str", "uint64"])  # type: ignore
+def test_roll_up(
+    resolution: int, index_dtype: Literal["str", "uint64"], regions_df: pd.DataFrame
+) -> None:
+    """Test if values are aggregated in the parents of the regions."""
+    regions_df = regions_df.set_axis(convert_h3_index(regions_df.index, index_dtype))
+    parents = pd.Index(
+        [
+            h3.cell_to_parent(h3_cell, resolution)
+            for h3_cell in convert_h3_index(regions_df.index, "str")
+        ]
+    )
+    expected_df = regions_df.groupby(convert_h3_index(parents, index_dtype)).sum()
+
+    rolled_up_df = roll_up_h3_regions_df(regions_df, resolution)
+
+    assert rolled_up_df.index.name == REGIONS_INDEX
+    assert rolled_up_df.index.dtype == regions_df.index.dtype
+    assert rolled_up_df["count"].dtype == np.int32
+    assert_frame_equal(rolled_up_df, expected_df, check_names=False)
+
+
+def test_roll_up_aggregation(regions_df: pd.DataFrame) -> None:
+    """Test if custom aggregation is used."""
+    rolled_up_df = roll_up_h3_regions_df(regions_df, 7, aggregation="max")
+    assert rolled_up_df["count"].max() == regions_df["count"].max()
+    assert len(rolled_up_df) < len(regions_df)
+
+
+def test_roll_up_mixed_resolutions(regions_df: pd.DataFrame) -> None:
+    """Test if regions with mixed resolutions (e.g. compacted) are rolled up."""
+    coarse_cell = h3.cell_to_parent(regions_df.index[0], 6)
+    mixed_df = pd.concat(
+        [regions_df, pd.DataFrame({"count": [5], "value": [0.5]}, index=[coarse_cell])]
+    )
+    rolled_up_df = roll_up_h3_regions_df(mixed_df, 6)
+    children_mask = [h3.cell_to_parent(h3_cell, 6) == coarse_cell for h3_cell in regions_df.index]
+    assert rolled_up_df.loc[coarse_cell, "count"] == 5 + regions_df["count"][children_mask].sum()
+
+
+def test_roll_up_incorrect_resolution(regions_df: pd.DataFrame) -> None:
+    """Test if regions can't be rolled up to a finer resolution."""
+    with pytest.raises(ValueError):
+        roll_up_h3_regions_df(regions_df, 10)
+    with pytest.raises(ValueError):
+        roll_up_h3_regions_df(regions_df, -1)
+
+
+@pytest.mark.parametrize("index_dtype", ["str", "uint64"])  # type: ignore
+def test_drill_down(index_dtype: Literal["str", "uint64"], regions_df: pd.DataFrame) -> None:
+    """Test if values are broadcast to the children of the regions."""
+    regions_df = regions_df.set_axis(convert_h3_index(regions_df.index, index_dtype))
+
+    drilled_down_df = drill_down_h3_regions_df(regions_df, 11)
+
+    assert len(drilled_down_df) == 49 * len(regions_df)
+    assert drilled_down_df.index.name == REGIONS_INDEX
+    assert drilled_down_df.index.dtype == regions_df.index.dtype
+    assert drilled_down_df.index.is_unique
+    assert_frame_equal(
+        roll_up_h3_regions_df(drilled_down_df, 9, aggregation="first"), regions_df.sort_index()
+    )
+
+
+def test_drill_down_pentagon() -> None:
+    """Test if pentagons are broadcast to their 6 children."""
+    pentagon = sorted(h3.get_pentagons(3))[0]
+    drilled_down_df = drill_down_h3_regions_df(pd.DataFrame({"value": [1]}, index=[pentagon]), 4)
+    assert sorted(drilled_down_df.index) == sorted(h3.cell_to_children(pentagon, 4))
+
+
+def test_drill_down_incorrect_resolution(regions_df: pd.DataFrame) -> None:
+    """Test if regions can't be broadcast to a coarser resolution."""
+    with pytest.raises(ValueError):
+        drill_down_h3_regions_df(regions_df, 8)
@@ -5,9 +5,16 @@ from typing import Any, Callable
 from unittest import TestCase
 
 import geopandas as gpd
+import h3
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 import pytest
+from shapely.geometry import MultiPolygon, Polygon, box
+from shapely.geometry.base import BaseGeometry
 
-from srai.h3 import shapely_geometry_to_h3
+from srai.constants import WGS84_CRS
+from srai.h3 import h3_to_geoseries, shapely_geometry_to_h3, shapely_geometry_to_h3_batches
 from tests.h3.conftest import _gdf_noop, _gdf_to_geometry_list, _gdf_to_geoseries
 from tests.regionalizers.test_h3_regionalizer import H3_RESOLUTION
 
@@ -85,3 +92,149 @@ def test_full_coverage() -> None:
     assert all(len(value) > 0 for value in intersections.values())
     assert len(intersections["way/843232154"]) == 1
     assert "8a2ab5760167fff" in intersections["way/843232154"]
+
+
+@pytest.mark.parametrize("buffer", [True, False])  # type: ignore
+def test_shapely_geometry_to_h3_uint64(buffer: bool, gdf_polygons: gpd.GeoDataFrame) -> None:
+    """Test if uint64 cells are equal to string indexes."""
+    h3_cells = shapely_geometry_to_h3(
+        gdf_polygons, h3_resolution=H3_RESOLUTION, buffer=buffer, return_type="uint64"
+    )
+    h3_indexes = shapely_geometry_to_h3(gdf_polygons, h3_resolution=H3_RESOLUTION, buffer=buffer)
+
+    assert h3_cells.dtype == np.uint64
+    assert (np.diff(h3_cells.astype(np.float64)) > 0).all()
+    ut.assertCountEqual([h3.int_to_str(int(h3_cell)) for h3_cell in h3_cells], h3_indexes)
+
+
+@pytest.mark.parametrize("buffer", [True, False])  # type: ignore
+@pytest.mark.parametrize("resolution", [6, 8, 9])  # type: ignore
+@pytest.mark.parametrize("batch_size", [1, 50, 1_000_000])  # type: ignore
+@pytest.mark.parametrize(
+    "geometry_parser_function",
+    [_gdf_noop, _gdf_to_geoseries, _gdf_to_geometry_list],
+)  # type: ignore
+def test_shapely_geometry_to_h3_batches(
+    buffer: bool,
+    resolution: int,
+    batch_size: int,
+    geometry_parser_function: Callable[[gpd.GeoDataFrame], Any],
+) -> None:
+    """Test if batches contain the same unique cells as the full conversion."""
+    gdf = gpd.GeoDataFrame(
+        geometry=[
+            Polygon([(16.8, 50.9), (17.3, 51.0), (17.2, 51.3), (16.9, 51.2)]).difference(
+                box(17.0, 51.05, 17.1, 51.1)
+            ),
+            box(17.25, 51.25, 17.4, 51.3),
+        ],
+        crs=WGS84_CRS,
+    )
+    geometry = geometry_parser_function(gdf)
+    expected_h3_cells = shapely_geometry_to_h3(
+        geometry, h3_resolution=resolution, buffer=buffer, return_type="uint64"
+    )
+
+    batches = list(
+        shapely_geometry_to_h3_batches(
+            geometry,
+            h3_resolution=resolution,
+            buffer=buffer,
+            batch_size=batch_size,
+            return_type="uint64",
+        )
+    )
+    h3_cells = np.concatenate(batches)
+
+    assert all(0 < len(batch) <= batch_size for batch in batches)
+    assert len(h3_cells) == len(np.unique(h3_cells))
+    np.testing.assert_array_equal(np.sort(h3_cells), expected_h3_cells)
+
+    h3_indexes = [
+        h3_index
+        for batch in shapely_geometry_to_h3_batches(
+            geometry, h3_resolution=resolution, buffer=buffer, batch_size=batch_size
+        )
+        for h3_index in batch
+    ]
+    ut.assertCountEqual(h3_indexes, [h3.int_to_str(int(h3_cell)) for h3_cell in h3_cells])
+
+
+@pytest.mark.parametrize("buffer", [True, False])  # type: ignore
+@pytest.mark.parametrize(
+    "geometry, resolution",
+    [
+        (box(179.5, -1, 180, 1), 7),
+        (box(-180, -1, -179.5, 1), 7),
+        (MultiPolygon([box(177, -20, 180, -15), box(-180, -20, -178, -15)]), 5),
+        (box(170, 65, 180, 72), 5),
+    ],
+)  # type: ignore
+def test_shapely_geometry_to_h3_batches_antimeridian(
+    buffer: bool, geometry: BaseGeometry, resolution: int
+) -> None:
+    """Test if batches contain the same cells as the full conversion next to the antimeridian."""
+    expected_h3_cells = shapely_geometry_to_h3(
+        geometry, h3_resolution=resolution, buffer=buffer, return_type="uint64"
+    )
+
+    h3_cells = np.concatenate(
+        list(
+            shapely_geometry_to_h3_batches(
+                geometry,
+                h3_resolution=resolution,
+                buffer=buffer,
+                batch_size=50,
+                return_type="uint64",
+            )
+        )
+    )
+
+    assert len(h3_cells) == len(np.unique(h3_cells))
+    np.testing.assert_array_equal(np.sort(h3_cells), expected_h3_cells)
+
+
+def test_shapely_geometry_to_h3_batches_incorrect_batch_size(
+    gdf_polygons: gpd.GeoDataFrame,
+) -> None:
+    """Test if non-positive batch size raises an error."""
+    with pytest.raises(ValueError):
+        next(shapely_geometry_to_h3_batches(gdf_polygons, H3_RESOLUTION, batch_size=0))
+
+
+def test_shapely_geometry_to_h3_unknown_return_type(gdf_polygons: gpd.GeoDataFrame) -> None:
+    """Test if unknown return type raises an error."""
+    with pytest.raises(ValueError):
+        shapely_geometry_to_h3(
+            gdf_polygons,
+            h3_resolution=H3_RESOLUTION,
+            return_type="int",  # type: ignore[call-overload]
+        )
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "h3_cells_parser_function",
+    [
+        lambda h3_indexes: h3_indexes,
+        lambda h3_indexes: [h3.str_to_int(h3_index) for h3_index in h3_indexes],
+        lambda h3_indexes: np.array([h3.str_to_int(i) for i in h3_indexes], dtype=np.uint64),
+        lambda h3_indexes: pa.array([h3.str_to_int(i) for i in h3_indexes], type=pa.uint64()),
+        lambda h3_indexes: pa.array(h3_indexes),
+        lambda h3_indexes: pd.Index(h3_indexes),
+    ],
+)
+def test_h3_to_geoseries_array_inputs(
+    h3_cells_parser_function: Callable[[list[str]], Any], expected_h3_indexes: list[str]
+) -> None:
+    """Test if h3_to_geoseries returns the same geometries for different input types."""
+    expected_geometries = gpd.GeoSeries(
+        [
+            Polygon([(lng, lat) for lat, lng in h3.cell_to_boundary(h3_index)])
+            for h3_index in expected_h3_indexes
+        ],
+        crs=WGS84_CRS,
+    )
+
+    geometries = h3_to_geoseries(h3_cells_parser_function(expected_h3_indexes))
+
+    assert geometries.geom_equals_exact(expected_geometries, tolerance=1e-9).all()
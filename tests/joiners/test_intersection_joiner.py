@@ -3,11 +3,14 @@
 from unittest import TestCase
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pytest
+from shapely.geometry import box
 
-from srai.constants import GEOMETRY_COLUMN
+from srai.constants import FEATURES_INDEX, GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
 from srai.joiners import IntersectionJoiner
+from srai.regionalizers import H3Regionalizer
 
 ut = TestCase()
 
@@ -69,3 +72,46 @@ def test_correct_multiindex_intersection_joiner_without_geom(
     ut.assertCountEqual(joint.index, joint_multiindex)
     ut.assertNotIn(GEOMETRY_COLUMN, joint.columns)
     ut.assertIs(len(joint.columns), 0)
+
+
+@pytest.mark.parametrize("return_geom", [False, True])  # type: ignore
+def test_uint64_regions_index(features_gdf: gpd.GeoDataFrame, return_geom: bool) -> None:
+    """Test checks if uint64 H3 cells index of regions is kept in the joint index."""
+    regions_gdf = H3Regionalizer(1, index_dtype="uint64").transform(
+        gpd.GeoDataFrame(geometry=[box(-2, -2, 1, 1)], crs=WGS84_CRS)
+    )
+
+    joint = IntersectionJoiner().transform(
+        regions=regions_gdf, features=features_gdf, return_geom=return_geom
+    )
+
+    assert joint.index.levels[0].dtype == np.uint64
+    assert set(joint.index.get_level_values(REGIONS_INDEX)).issubset(regions_gdf.index)
+    assert set(joint.index.get_level_values(FEATURES_INDEX)) == set(features_gdf.index)
+
+
+@pytest.mark.parametrize("return_geom", [False, True])  # type: ignore
+def test_lazy_geometry_regions(features_gdf: gpd.GeoDataFrame, return_geom: bool) -> None:
+    """Test checks if regions without geometries are joined like the materialized ones."""
+    area_gdf = gpd.GeoDataFrame(geometry=[box(-2, -2, 1, 1)], crs=WGS84_CRS)
+    points_gdf = gpd.GeoDataFrame(
+        geometry=gpd.points_from_xy([-1.7, -0.3, 0.4, 5.0], [-1.2, -0.6, 0.9, 5.0]),
+        crs=WGS84_CRS,
+    )
+    mixed_features_gdf = pd.concat([features_gdf, points_gdf], ignore_index=True)
+    regionalizer = H3Regionalizer(2)
+
+    joint = IntersectionJoiner().transform(
+        regions=regionalizer.transform(area_gdf),
+        features=mixed_features_gdf,
+        return_geom=return_geom,
+    )
+    lazy_joint = IntersectionJoiner().transform(
+        regions=regionalizer.transform_lazy(area_gdf),
+        features=mixed_features_gdf,
+        return_geom=return_geom,
+    )
+
+    ut.assertEqual(lazy_joint.index.names, joint.index.names)
+    ut.assertCountEqual(lazy_joint.index, joint.index)
+    ut.assertEqual(GEOMETRY_COLUMN in lazy_joint.columns, return_geom)
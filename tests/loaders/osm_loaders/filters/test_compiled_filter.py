@@ -0,0 +1,229 @@
+"""Tests for compiled OSM tags filters."""
+
+import duckdb
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import Point
+
+from srai.constants import GEOMETRY_COLUMN, WGS84_CRS
+from srai.loaders.osm_loaders.filters import (
+    GEOFABRIK_LAYERS,
+    CompiledOsmTagsFilter,
+    GroupedOsmTagsFilter,
+    OsmTagsFilter,
+    compile_osm_tags_filter,
+)
+
+GROUPED_FILTER: GroupedOsmTagsFilter = {
+    "food": {"amenity": ["cafe", "restaurant"], "shop": "bakery"},
+    "shop_first": {"shop": True, "amenity": True},
+    "buildings": {"building": ["house", "church"], "amenity": "school"},
+    "no_matches": {"amenity": "bank", "missing_key": True},
+    "disabled": {"shop": False},
+}
+
+
+@pytest.fixture  # type: ignore
+def features_gdf() -> gpd.GeoDataFrame:
+    """Get raw OSM features."""
+    return gpd.GeoDataFrame(
+        {
+            "amenity": ["parking", "cafe", None, "", None, "school", "it's"],
+            "shop": ["bakery", None, "bakery", "books", None, "bakery", None],
+            "building": ["yes", None, None, "house", None, None, None],
+            "missing_key": [None] * 7,
+        },
+        index=pd.Index([f"node/{i}" for i in range(7)], name="feature_id"),
+        geometry=[Point(i, i) for i in range(7)],
+        crs=WGS84_CRS,
+    )
+
+
+def test_compiled_filter_is_cached() -> None:
+    """Test if equal filters are compiled once and the order of groups is respected."""
+    compiled_filter = compile_osm_tags_filter(GROUPED_FILTER)
+
+    assert compile_osm_tags_filter(dict(GROUPED_FILTER.items())) is compiled_filter
+    assert compile_osm_tags_filter(dict(reversed(GROUPED_FILTER.items()))) is not compiled_filter
+    assert compiled_filter.group_names == tuple(GROUPED_FILTER)
+    assert compiled_filter.keys == ("amenity", "shop", "building", "missing_key")
+
+
+def test_compiled_filter_inverted_index() -> None:
+    """Test if groups matched by single tags are found in the inverted index."""
+    compiled_filter = compile_osm_tags_filter(GROUPED_FILTER)
+
+    assert compiled_filter.values_index["amenity"].to_list() == [
+        "cafe",
+        "restaurant",
+        "school",
+        "bank",
+    ]
+    assert compiled_filter.get_matching_groups("amenity", "cafe") == ["food", "shop_first"]
+    assert compiled_filter.get_matching_groups("amenity", "school") == ["shop_first", "buildings"]
+    assert compiled_filter.get_matching_groups("amenity", "") == []
+    assert compiled_filter.get_matching_groups("shop", "books") == ["shop_first"]
+    assert compiled_filter.get_matching_groups("building", "yes") == []
+    assert compiled_filter.get_matching_groups("highway", "primary") == []
+
+
+def test_compiled_filter_groups_features(features_gdf: gpd.GeoDataFrame) -> None:
+    """Test if features are grouped with the first matching tags."""
+    grouped_gdf = compile_osm_tags_filter(GROUPED_FILTER).group_features(features_gdf)
+
+    expected_gdf = gpd.GeoDataFrame(
+        {
+            "food": ["shop=bakery", "amenity=cafe", "shop=bakery", None, None, "shop=bakery", None],
+            "shop_first": [
+                "shop=bakery",
+                "amenity=cafe",
+                "shop=bakery",
+                "shop=books",
+                None,
+                "shop=bakery",
+                "amenity=it's",
+            ],
+            "buildings": [None, None, None, "building=house", None, "amenity=school", None],
+        },
+        index=features_gdf.index,
+        geometry=features_gdf.geometry,
+        crs=WGS84_CRS,
+    ).replace(to_replace=[None], value=np.nan)[[GEOMETRY_COLUMN, "food", "shop_first", "buildings"]]
+    pd.testing.assert_frame_equal(grouped_gdf, expected_gdf)
+
+
+def test_compiled_filter_matches_features(features_gdf: gpd.GeoDataFrame) -> None:
+    """Test if features matching a not grouped filter are selected."""
+    osm_filter: OsmTagsFilter = {"building": "house", "amenity": ["cafe", "school"], "x": True}
+    compiled_filter = compile_osm_tags_filter(osm_filter)
+
+    assert not compiled_filter.is_grouped
+    np.testing.assert_array_equal(
+        compiled_filter.match(features_gdf), [False, True, False, True, False, True, False]
+    )
+    with pytest.raises(ValueError):
+        compiled_filter.group_features(features_gdf)
+
+
+@pytest.mark.parametrize("tags_column", [None, "tags"])  # type: ignore
+@pytest.mark.parametrize("group_name", [None, *GROUPED_FILTER])  # type: ignore
+def test_duckdb_predicate(
+    features_gdf: gpd.GeoDataFrame, group_name: str, tags_column: str
+) -> None:
+    """Test if DuckDB predicate selects the same features as the compiled filter."""
+    compiled_filter = compile_osm_tags_filter(GROUPED_FILTER)
+    connection = _get_duckdb_features_connection(features_gdf, tags_column)
+
+    selected_ids = connection.sql(
+        "SELECT feature_id FROM features"
+        f" WHERE {compiled_filter.to_duckdb_predicate(group_name, tags_column)}"
+        " ORDER BY feature_id"
+    ).fetchall()
+
+    if group_name is None:
+        expected_mask = compiled_filter.match(features_gdf)
+    else:
+        grouped_gdf = compiled_filter.group_features(features_gdf)
+        expected_mask = (
+            grouped_gdf[group_name].notna().to_numpy()
+            if group_name in grouped_gdf.columns
+            else np.zeros(len(features_gdf), dtype=bool)
+        )
+    assert [feature_id for (feature_id,) in selected_ids] == features_gdf.index[
+        expected_mask
+    ].to_list()
+
+
+@pytest.mark.parametrize("tags_column", [None, "tags"])  # type: ignore
+def test_duckdb_group_expressions(features_gdf: gpd.GeoDataFrame, tags_column: str) -> None:
+    """Test if DuckDB expressions calculate the same values as grouping of features."""
+    compiled_filter = compile_osm_tags_filter(GROUPED_FILTER)
+    connection = _get_duckdb_features_connection(features_gdf, tags_column)
+
+    expressions = compiled_filter.to_duckdb_group_expressions(tags_column)
+    grouped_df = (
+        connection.sql(
+            "SELECT feature_id, "
+            + ", ".join(f'{expression} AS "{name}"' for name, expression in expressions.items())
+            + " FROM features ORDER BY feature_id"
+        )
+        .df()
+        .set_index("feature_id")
+    )
+
+    expected_df = (
+        compiled_filter.group_features(features_gdf)
+        .drop(columns=GEOMETRY_COLUMN)
+        .reindex(columns=list(GROUPED_FILTER))
+    )
+    pd.testing.assert_frame_equal(
+        grouped_df.astype(object).where(grouped_df.notna(), None),
+        expected_df.astype(object).where(expected_df.notna(), None),
+        check_index_type=False,
+    )
+
+
+def test_not_grouped_filter_has_no_groups() -> None:
+    """Test if groups of a not grouped filter can't be accessed."""
+    compiled_filter = compile_osm_tags_filter({"amenity": True})
+
+    with pytest.raises(ValueError):
+        compiled_filter.get_matching_groups("amenity", "cafe")
+    with pytest.raises(ValueError):
+        compiled_filter.to_duckdb_group_expressions()
+    with pytest.raises(ValueError):
+        compiled_filter.to_duckdb_predicate("amenity")
+    assert compiled_filter.to_duckdb_predicate() == '("amenity" IS NOT NULL AND "amenity" <> \'\')'
+
+
+def test_empty_filter_predicate() -> None:
+    """Test if an empty filter doesn't match anything."""
+    compiled_filter = CompiledOsmTagsFilter({})
+
+    assert compiled_filter.to_duckdb_predicate() == "FALSE"
+    assert not compiled_filter.match(pd.DataFrame({"amenity": ["cafe"]})).any()
+
+
+def test_wrong_filter_type() -> None:
+    """Test if a filter with a wrong type is rejected."""
+    with pytest.raises(AttributeError):
+        compile_osm_tags_filter(["amenity"])  # type: ignore
+    with pytest.raises(AttributeError):
+        CompiledOsmTagsFilter({"amenity": 1})  # type: ignore
+
+
+def test_geofabrik_layers_predicate() -> None:
+    """Test if a predicate of a big filter is a valid DuckDB expression."""
+    compiled_filter = compile_osm_tags_filter(GEOFABRIK_LAYERS)
+    connection = duckdb.connect()
+    connection.register(
+        "features",
+        pd.DataFrame({key: pd.Series([None], dtype=object) for key in compiled_filter.keys}),
+    )
+
+    assert connection.sql(
+        f"SELECT count(*) FROM features WHERE {compiled_filter.to_duckdb_predicate()}"
+    ).fetchone() == (0,)
+
+
+def _get_duckdb_features_connection(
+    features_gdf: gpd.GeoDataFrame, tags_column: str
+) -> duckdb.DuckDBPyConnection:
+    connection = duckdb.connect()
+    features_df = features_gdf.drop(columns=GEOMETRY_COLUMN).reset_index()
+    connection.register("features_df", features_df)
+    if tags_column is None:
+        connection.sql("CREATE VIEW features AS SELECT * FROM features_df")
+    else:
+        tag_entries = ", ".join(
+            f"{{'k': '{column}', 'v': \"{column}\"}}"
+            for column in features_df.columns
+            if column != "feature_id"
+        )
+        connection.sql(
+            "CREATE VIEW features AS SELECT feature_id, map_from_entries(list_filter("
+            f"[{tag_entries}], x -> x.v IS NOT NULL)) AS {tags_column} FROM features_df"
+        )
+    return connection
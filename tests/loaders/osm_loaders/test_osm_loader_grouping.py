@@ -0,0 +1,89 @@
+"""Tests for grouping features in OSMLoader."""
+
+from typing import Union
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import Point
+
+from srai.constants import GEOMETRY_COLUMN, WGS84_CRS
+from srai.loaders.osm_loaders import OSMLoader
+from srai.loaders.osm_loaders.filters import GroupedOsmTagsFilter, OsmTagsFilter
+
+
+class _GroupingOSMLoader(OSMLoader):
+    """OSMLoader without loading, used for testing the grouping of features."""
+
+    def load(self, area: object, tags: Union[OsmTagsFilter, GroupedOsmTagsFilter]) -> None:
+        """Not used."""
+
+
+@pytest.fixture  # type: ignore
+def features_gdf() -> gpd.GeoDataFrame:
+    """Get raw OSM features."""
+    return gpd.GeoDataFrame(
+        {
+            "amenity": ["parking", "cafe", None, "", np.nan, "school"],
+            "shop": ["bakery", None, "bakery", "books", None, "bakery"],
+            "building": ["yes", None, None, "house", None, None],
+        },
+        index=pd.Index([f"node/{i}" for i in range(6)], name="feature_id"),
+        geometry=[Point(i, i) for i in range(6)],
+        crs=WGS84_CRS,
+    )
+
+
+def test_group_features(features_gdf: gpd.GeoDataFrame) -> None:
+    """Test if features get values of the first matching tag of each group."""
+    group_filter: GroupedOsmTagsFilter = {
+        "food": {"amenity": ["cafe", "restaurant"], "shop": "bakery"},
+        "shop_first": {"shop": True, "amenity": True},
+        "any_amenity": {"amenity": True},
+        "buildings": {"building": ["house", "church"], "amenity": "school"},
+        "no_matches": {"amenity": "bank", "missing_key": True},
+        "disabled": {"shop": False},
+    }
+
+    grouped_gdf = _GroupingOSMLoader()._group_features_gdf(features_gdf, group_filter)
+
+    expected_gdf = gpd.GeoDataFrame(
+        {
+            "food": ["shop=bakery", "amenity=cafe", "shop=bakery", None, None, "shop=bakery"],
+            "shop_first": [
+                "shop=bakery",
+                "amenity=cafe",
+                "shop=bakery",
+                "shop=books",
+                None,
+                "shop=bakery",
+            ],
+            "any_amenity": [
+                "amenity=parking",
+                "amenity=cafe",
+                None,
+                None,
+                None,
+                "amenity=school",
+            ],
+            "buildings": [None, None, None, "building=house", None, "amenity=school"],
+        },
+        index=features_gdf.index,
+        geometry=features_gdf.geometry,
+        crs=WGS84_CRS,
+    ).replace(to_replace=[None], value=np.nan)[
+        [GEOMETRY_COLUMN, "food", "shop_first", "any_amenity", "buildings"]
+    ]
+    pd.testing.assert_frame_equal(grouped_gdf, expected_gdf)
+    assert features_gdf.columns.to_list() == ["amenity", "shop", "building", GEOMETRY_COLUMN]
+
+
+def test_group_empty_features(features_gdf: gpd.GeoDataFrame) -> None:
+    """Test if empty features are returned with only a geometry column."""
+    grouped_gdf = _GroupingOSMLoader()._group_features_gdf(
+        features_gdf.iloc[:0], {"food": {"amenity": "cafe"}}
+    )
+
+    assert grouped_gdf.empty
+    assert grouped_gdf.columns.to_list() == [GEOMETRY_COLUMN]
@@ -5,11 +5,12 @@ from typing import Union
 from unittest import TestCase
 
 import geopandas as gpd
+import pandas as pd
 import pytest
-from shapely.geometry import Polygon
+from shapely.geometry import Point, Polygon
 from shapely.geometry.base import BaseGeometry
 
-from srai.constants import GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
+from srai.constants import FEATURES_INDEX, GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
 from srai.loaders.osm_loaders import OSMPbfLoader
 from srai.loaders.osm_loaders.filters import (
     GEOFABRIK_LAYERS,
@@ -155,3 +156,41 @@ def test_osm_pbf_loader(
         expected_features_columns_names + [GEOMETRY_COLUMN],
         "Mismatched columns names.",
     )
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 100])  # type: ignore
+def test_osm_pbf_loader_iter(
+    batch_size: int, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test if features are loaded from a GeoParquet file in batches."""
+    features_gdf = gpd.GeoDataFrame(
+        {
+            FEATURES_INDEX: [f"node/{i}" for i in range(10)],
+            "shop": [None, "bakery"] * 5,
+            "building": [None] * 10,
+            "landuse": pd.Series([None] * 10, dtype="string"),
+            "amenity": ["cafe"] * 3 + [None] * 7,
+        },
+        geometry=[Point(i, i) for i in range(10)],
+        crs=WGS84_CRS,
+    )
+    geoparquet_file_path = tmp_path / "features.parquet"
+    features_gdf.to_parquet(geoparquet_file_path, row_group_size=4)
+    monkeypatch.setattr(
+        OSMPbfLoader, "load_to_geoparquet", lambda *args, **kwargs: geoparquet_file_path
+    )
+
+    batches = list(OSMPbfLoader().load_iter(area=Point(0, 0), tags={}, batch_size=batch_size))
+
+    assert all(len(batch) <= batch_size for batch in batches)
+    assert all(batch.crs == WGS84_CRS for batch in batches)
+    expected_gdf = features_gdf.set_index(FEATURES_INDEX)[[GEOMETRY_COLUMN, "amenity", "shop"]]
+    pd.testing.assert_frame_equal(
+        pd.concat(batches), expected_gdf, check_like=False, check_dtype=False
+    )
+
+
+def test_osm_pbf_loader_iter_batch_size() -> None:
+    """Test if a wrong batch size is rejected."""
+    with pytest.raises(ValueError):
+        next(OSMPbfLoader().load_iter(area=Point(0, 0), tags={}, batch_size=0))
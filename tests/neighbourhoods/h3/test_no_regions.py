@@ -1,5 +1,7 @@
 """Tests for neigbourhoods with no regions."""
 
+import h3
+import pyarrow as pa
 import pytest
 
 from srai.neighbourhoods import H3Neighbourhood
@@ -263,3 +265,33 @@ def test_get_neighbours_at_distance(
         )
         == expected
     )
+
+
+def test_adjacency_matrix_without_regions_raises() -> None:
+    """Test if adjacency matrix can't be calculated without regions."""
+    with pytest.raises(NotImplementedError):
+        H3Neighbourhood().adjacency_matrix()
+
+
+@pytest.mark.parametrize("distance", [0, 1, 3])  # type: ignore
+@pytest.mark.parametrize("at_distance", [False, True])  # type: ignore
+def test_get_neighbours_cells_no_regions(distance: int, at_distance: bool) -> None:
+    """Test if vectorized neighbours of uint64 cells are equal to neighbours of string indexes."""
+    neighbourhood = H3Neighbourhood()
+    indexes = ["811e3ffffffffff", "831f0bfffffffff", "882baa7b69fffff"]
+
+    offsets, neighbour_cells = neighbourhood.get_neighbours_cells(
+        pa.array([h3.str_to_int(index) for index in indexes], type=pa.uint64()),
+        distance,
+        at_distance=at_distance,
+    )
+
+    for row, index in enumerate(indexes):
+        if at_distance:
+            expected = neighbourhood.get_neighbours_at_distance(index, distance)
+        else:
+            expected = neighbourhood.get_neighbours_up_to_distance(index, distance)
+        row_neighbours = {
+            h3.int_to_str(int(cell)) for cell in neighbour_cells[offsets[row] : offsets[row + 1]]
+        }
+        assert row_neighbours == expected
@@ -3,8 +3,11 @@
 from typing import Any
 
 import geopandas as gpd
+import h3
+import numpy as np
 import pytest
 
+from srai.h3 import convert_h3_index
 from srai.neighbourhoods import H3Neighbourhood
 
 
@@ -304,3 +307,88 @@ def test_get_neighbours_at_distance_with_regions_gdf(
         )
         == expected
     )
+
+
+@pytest.mark.parametrize("distance", [0, 1, 2, 3])  # type: ignore
+@pytest.mark.parametrize("at_distance", [False, True])  # type: ignore
+@pytest.mark.parametrize("include_center", [False, True])  # type: ignore
+def test_get_neighbours_batch_with_regions_gdf(
+    distance: int, at_distance: bool, include_center: bool, request: Any
+) -> None:
+    """Test if batch neighbours are equal to neighbours queried region by region."""
+    regions_gdf = request.getfixturevalue("two_rings_regions_some_missing")
+    neighbourhood = H3Neighbourhood(regions_gdf, include_center=include_center)
+
+    neighbours = neighbourhood.adjacency_matrix(distance, at_distance=at_distance)
+
+    assert len(neighbours.indptr) == len(regions_gdf.index) + 1
+    assert set(neighbours.index) == set(regions_gdf.index)
+    for row, index in enumerate(neighbours.index):
+        if at_distance:
+            expected = neighbourhood.get_neighbours_at_distance(index, distance)
+        else:
+            expected = neighbourhood.get_neighbours_up_to_distance(index, distance)
+        row_neighbours = neighbours.index[
+            neighbours.indices[neighbours.indptr[row] : neighbours.indptr[row + 1]]
+        ]
+        assert set(row_neighbours) == expected
+
+
+@pytest.mark.parametrize("distance", [-1, 0, 1, 2])  # type: ignore
+@pytest.mark.parametrize("at_distance", [False, True])  # type: ignore
+@pytest.mark.parametrize("include_center", [False, True])  # type: ignore
+def test_get_neighbours_cells_with_regions_gdf(
+    distance: int, at_distance: bool, include_center: bool, request: Any
+) -> None:
+    """Test if vectorized neighbours of uint64 cells are equal to neighbours of string indexes."""
+    regions_gdf = request.getfixturevalue("two_rings_regions_some_missing")
+    neighbourhood = H3Neighbourhood(regions_gdf)
+    indexes = [*regions_gdf.index, "811e3ffffffffff"]
+
+    offsets, neighbour_cells = neighbourhood.get_neighbours_cells(
+        np.array([h3.str_to_int(index) for index in indexes], dtype=np.uint64),
+        distance,
+        at_distance=at_distance,
+        include_center=include_center,
+    )
+
+    assert len(offsets) == len(indexes) + 1
+    for row, index in enumerate(indexes):
+        if at_distance:
+            expected = neighbourhood.get_neighbours_at_distance(index, distance, include_center)
+        else:
+            expected = neighbourhood.get_neighbours_up_to_distance(index, distance, include_center)
+        row_neighbours = {
+            h3.int_to_str(int(cell)) for cell in neighbour_cells[offsets[row] : offsets[row + 1]]
+        }
+        assert row_neighbours == expected
+
+
+@pytest.mark.parametrize("distance", [0, 1, 2])  # type: ignore
+@pytest.mark.parametrize("at_distance", [False, True])  # type: ignore
+def test_uint64_regions_index(distance: int, at_distance: bool, request: Any) -> None:
+    """Test if neighbours of regions with uint64 index are equal to neighbours of strings."""
+    regions_gdf = request.getfixturevalue("two_rings_regions_some_missing")
+    uint64_regions_gdf = regions_gdf.set_axis(convert_h3_index(regions_gdf.index, "uint64"))
+    neighbourhood = H3Neighbourhood(regions_gdf)
+    uint64_neighbourhood = H3Neighbourhood(uint64_regions_gdf)
+
+    neighbours = neighbourhood.get_neighbours_batch(
+        regions_gdf.index, distance, at_distance=at_distance
+    )
+    uint64_neighbours = uint64_neighbourhood.get_neighbours_batch(
+        uint64_regions_gdf.index, distance, at_distance=at_distance
+    )
+
+    assert uint64_neighbours.index.dtype == np.uint64
+    assert convert_h3_index(uint64_neighbours.index, "str").equals(neighbours.index)
+    np.testing.assert_array_equal(uint64_neighbours.indptr, neighbours.indptr)
+    np.testing.assert_array_equal(uint64_neighbours.indices, neighbours.indices)
+    for index, uint64_index in zip(regions_gdf.index, uint64_regions_gdf.index):
+        if at_distance:
+            expected = neighbourhood.get_neighbours_at_distance(index, distance)
+            result = uint64_neighbourhood.get_neighbours_at_distance(uint64_index, distance)
+        else:
+            expected = neighbourhood.get_neighbours_up_to_distance(index, distance)
+            result = uint64_neighbourhood.get_neighbours_up_to_distance(uint64_index, distance)
+        assert {h3.int_to_str(h3_cell) for h3_cell in result} == expected
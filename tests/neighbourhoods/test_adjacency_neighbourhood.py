@@ -134,9 +134,25 @@ def test_adjacency_lazy_loading_include_center(rounded_regions_fixture: gpd.GeoD
     neighbours = neighbourhood.get_neighbours("SW")
     assert neighbours == {"W", "S", "SW"}
     assert neighbourhood.lookup == {
-        "SW": {"W", "S", "SW"},
+        "SW": {"W", "S"},
+    }
+
+
+def test_adjacency_lookup_updated_after_queries(rounded_regions_fixture: gpd.GeoDataFrame) -> None:
+    """Test checks if cached lookup table is updated with newly calculated neighbourhoods."""
+    neighbourhood = AdjacencyNeighbourhood(rounded_regions_fixture)
+    neighbourhood.get_neighbours("SW")
+    assert neighbourhood.lookup is neighbourhood.lookup
+
+    neighbourhood.get_neighbours("NE")
+    assert neighbourhood.lookup == {
+        "SW": {"W", "S"},
+        "NE": {"N", "E"},
     }
 
+    neighbourhood.generate_neighbourhoods()
+    assert len(neighbourhood.lookup) == len(rounded_regions_fixture.index)
+
 
 def test_generate_all_neighbourhoods_rounded_regions(
     rounded_regions_fixture: gpd.GeoDataFrame,
@@ -295,3 +311,68 @@ def test_adjacency_lazy_loading_up_to_distance(
     assert neighbours == expected_include_center
     neighbours = neighbourhood.get_neighbours_up_to_distance(index, distance, include_center=False)
     assert neighbours == expected
+
+
+@pytest.mark.parametrize("distance", [0, 1, 2, 3])  # type: ignore
+@pytest.mark.parametrize("at_distance", [False, True])  # type: ignore
+@pytest.mark.parametrize("include_center", [False, True])  # type: ignore
+def test_adjacency_matrix(
+    distance: int,
+    at_distance: bool,
+    include_center: bool,
+    rounded_regions_fixture: gpd.GeoDataFrame,
+) -> None:
+    """Test if adjacency matrix is equal to neighbours queried region by region."""
+    neighbourhood = AdjacencyNeighbourhood(rounded_regions_fixture, include_center=include_center)
+    neighbours = neighbourhood.adjacency_matrix(distance, at_distance=at_distance)
+
+    expected_neighbourhood = AdjacencyNeighbourhood(
+        rounded_regions_fixture, include_center=include_center
+    )
+    assert list(neighbours.index) == list(rounded_regions_fixture.index)
+    for row, index in enumerate(rounded_regions_fixture.index):
+        if at_distance:
+            expected = expected_neighbourhood.get_neighbours_at_distance(index, distance)
+        else:
+            expected = expected_neighbourhood.get_neighbours_up_to_distance(index, distance)
+        row_neighbours = neighbours.index[
+            neighbours.indices[neighbours.indptr[row] : neighbours.indptr[row + 1]]
+        ]
+        assert set(row_neighbours) == expected
+
+
+def test_generate_neighbourhoods_multiprocessing(
+    squares_regions_fixture: gpd.GeoDataFrame,
+) -> None:
+    """Test checks if neighbourhoods generated in multiple processes are the same."""
+    neighbourhood = AdjacencyNeighbourhood(squares_regions_fixture)
+    neighbourhood.generate_neighbourhoods()
+
+    multiprocessing_neighbourhood = AdjacencyNeighbourhood(squares_regions_fixture)
+    multiprocessing_neighbourhood.generate_neighbourhoods(
+        num_of_multiprocessing_workers=2, multiprocessing_activation_threshold=1
+    )
+    assert multiprocessing_neighbourhood.lookup == neighbourhood.lookup
+
+
+@pytest.mark.parametrize("generate_neighbourhoods", [False, True])  # type: ignore
+def test_get_neighbours_batch_lazy_and_generated(
+    generate_neighbourhoods: bool, squares_regions_fixture: gpd.GeoDataFrame
+) -> None:
+    """Test checks if batch neighbours are the same with and without the generated lookup."""
+    neighbourhood = AdjacencyNeighbourhood(squares_regions_fixture)
+    if generate_neighbourhoods:
+        neighbourhood.generate_neighbourhoods()
+    indexes = ["CENTER", "SW", "UNKNOWN"]
+
+    neighbours = neighbourhood.get_neighbours_batch(indexes, 1, include_center=True)
+
+    expected_neighbourhood = AdjacencyNeighbourhood(squares_regions_fixture)
+    for row, index in enumerate(indexes):
+        row_neighbours = neighbours.index[
+            neighbours.indices[neighbours.indptr[row] : neighbours.indptr[row + 1]]
+        ]
+        expected = expected_neighbourhood.get_neighbours_up_to_distance(
+            index, 1, include_center=True
+        )
+        assert set(row_neighbours) == expected
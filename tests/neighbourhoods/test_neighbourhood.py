@@ -4,7 +4,7 @@ from typing import Any, Optional, TypeVar
 
 import pytest
 
-from srai.neighbourhoods import Neighbourhood
+from srai.neighbourhoods import Neighbourhood, NeighbourhoodCSR
 
 T = TypeVar("T")
 
@@ -259,3 +259,50 @@ def test_get_neighbours_up_to_distance(
 
     neighbours = neighbourhood.get_neighbours_up_to_distance(index, distance, include_center=False)
     assert neighbours == expected
+
+
+def _batch_row_to_set(neighbours: NeighbourhoodCSR, row: int) -> set[Any]:
+    return set(
+        neighbours.index[neighbours.indices[neighbours.indptr[row] : neighbours.indptr[row + 1]]]
+    )
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "neighbourhood_fixture",
+    ["grid_3_by_3_neighbourhood", "grid_3_by_3_irrregular_neighbourhood"],
+)
+@pytest.mark.parametrize("distance", [-1, 0, 1, 2, 3])  # type: ignore
+@pytest.mark.parametrize("at_distance", [False, True])  # type: ignore
+@pytest.mark.parametrize("include_center", [False, True])  # type: ignore
+def test_get_neighbours_batch(
+    neighbourhood_fixture: str,
+    distance: int,
+    at_distance: bool,
+    include_center: bool,
+    request: Any,
+) -> None:
+    """Test if batch neighbours are equal to neighbours queried region by region."""
+    neighbourhood_data = request.getfixturevalue(neighbourhood_fixture)
+    neighbourhood = LookupNeighbourhood(neighbourhood_data, include_center=include_center)
+    indexes = list(reversed(neighbourhood_data.keys()))
+
+    neighbours = neighbourhood.get_neighbours_batch(indexes, distance, at_distance=at_distance)
+
+    assert len(neighbours.indptr) == len(indexes) + 1
+    assert neighbours.index.is_unique
+    assert set(indexes).issubset(neighbours.index)
+    for row, index in enumerate(indexes):
+        if at_distance:
+            expected = neighbourhood.get_neighbours_at_distance(index, distance)
+        else:
+            expected = neighbourhood.get_neighbours_up_to_distance(index, distance)
+        assert _batch_row_to_set(neighbours, row) == expected
+
+
+def test_adjacency_matrix_without_regions_raises(
+    grid_3_by_3_neighbourhood: dict[int, set[int]],
+) -> None:
+    """Test if adjacency matrix can't be calculated without a defined set of regions."""
+    neighbourhood = LookupNeighbourhood(grid_3_by_3_neighbourhood)
+    with pytest.raises(NotImplementedError):
+        neighbourhood.adjacency_matrix()
@@ -0,0 +1,139 @@
+"""Tests for saving, loading and PrecomputedNeighbourhood."""
+
+import json
+import pickle
+from pathlib import Path
+from typing import Any
+
+import geopandas as gpd
+import h3
+import numpy as np
+import pandas as pd
+import pytest
+from shapely import geometry
+
+from srai.constants import WGS84_CRS
+from srai.neighbourhoods import (
+    AdjacencyNeighbourhood,
+    H3Neighbourhood,
+    Neighbourhood,
+    PrecomputedNeighbourhood,
+)
+
+
+@pytest.fixture  # type: ignore
+def h3_regions_gdf() -> gpd.GeoDataFrame:
+    """Get H3 regions in a disk around a cell."""
+    return gpd.GeoDataFrame(index=sorted(h3.grid_disk("891e205194bffff", 6)))
+
+
+@pytest.fixture  # type: ignore
+def squares_regions_gdf() -> gpd.GeoDataFrame:
+    """Get 16 square regions in a 4 by 4 grid."""
+    return gpd.GeoDataFrame(
+        geometry=[
+            geometry.box(minx=x, maxx=x + 1, miny=y, maxy=y + 1) for y in range(4) for x in range(4)
+        ],
+        index=[f"{x}_{y}" for y in range(4) for x in range(4)],
+        crs=WGS84_CRS,
+    )
+
+
+def _assert_same_neighbours(
+    loaded: Neighbourhood[Any], expected: Neighbourhood[Any], indexes: pd.Index
+) -> None:
+    for distance in range(5):
+        for index in indexes:
+            assert loaded.get_neighbours_at_distance(
+                index, distance
+            ) == expected.get_neighbours_at_distance(index, distance)
+            assert loaded.get_neighbours_up_to_distance(
+                index, distance, include_center=True
+            ) == expected.get_neighbours_up_to_distance(index, distance, include_center=True)
+
+        neighbours = loaded.get_neighbours_batch(indexes, distance, at_distance=True)
+        for row, index in enumerate(indexes):
+            row_neighbours = neighbours.index[
+                neighbours.indices[neighbours.indptr[row] : neighbours.indptr[row + 1]]
+            ]
+            assert set(row_neighbours) == expected.get_neighbours_at_distance(index, distance)
+
+
+@pytest.mark.parametrize("mmap", [False, True])  # type: ignore
+@pytest.mark.parametrize("ring_distances", [None, [2, 3]])  # type: ignore
+def test_save_load_h3(
+    mmap: bool, ring_distances: Any, h3_regions_gdf: gpd.GeoDataFrame, tmp_path: Path
+) -> None:
+    """Test if loaded H3 neighbourhood returns the same neighbours."""
+    neighbourhood = H3Neighbourhood(h3_regions_gdf)
+    neighbourhood.save(tmp_path / "neighbourhood", ring_distances=ring_distances)
+
+    loaded_neighbourhood = Neighbourhood.load(tmp_path / "neighbourhood", mmap=mmap)
+
+    assert isinstance(loaded_neighbourhood, PrecomputedNeighbourhood)
+    assert loaded_neighbourhood.ring_distances == [1, *(ring_distances or [])]
+    assert isinstance(loaded_neighbourhood._rings[1][1], np.memmap) == mmap
+    _assert_same_neighbours(loaded_neighbourhood, neighbourhood, h3_regions_gdf.index[:20])
+
+
+@pytest.mark.parametrize("mmap", [False, True])  # type: ignore
+def test_pickle_loaded(mmap: bool, h3_regions_gdf: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test if memory-mapped rings are reopened from disk after unpickling."""
+    neighbourhood = H3Neighbourhood(h3_regions_gdf)
+    neighbourhood.save(tmp_path, ring_distances=[2])
+    loaded_neighbourhood = Neighbourhood.load(tmp_path, mmap=mmap)
+
+    pickled_neighbourhood = pickle.dumps(loaded_neighbourhood)
+    unpickled_neighbourhood = pickle.loads(pickled_neighbourhood)
+
+    assert isinstance(unpickled_neighbourhood, PrecomputedNeighbourhood)
+    assert unpickled_neighbourhood.ring_distances == [1, 2]
+    for distance in (1, 2):
+        for array in unpickled_neighbourhood._rings[distance]:
+            assert isinstance(array, np.memmap) == mmap
+    if mmap:
+        in_memory_neighbourhood = Neighbourhood.load(tmp_path, mmap=False)
+        rings_size = sum(
+            array.nbytes for ring in in_memory_neighbourhood._rings.values() for array in ring
+        )
+        assert len(pickled_neighbourhood) < len(pickle.dumps(in_memory_neighbourhood)) - rings_size
+    _assert_same_neighbours(unpickled_neighbourhood, neighbourhood, h3_regions_gdf.index[:20])
+
+
+def test_save_load_adjacency(squares_regions_gdf: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test if loaded adjacency neighbourhood returns the same neighbours."""
+    neighbourhood = AdjacencyNeighbourhood(squares_regions_gdf, include_center=True)
+    neighbourhood.save(tmp_path, ring_distances=[3])
+
+    loaded_neighbourhood = Neighbourhood.load(tmp_path)
+
+    assert loaded_neighbourhood.include_center
+    assert list(loaded_neighbourhood.adjacency_matrix().index) == list(squares_regions_gdf.index)
+    _assert_same_neighbours(loaded_neighbourhood, neighbourhood, squares_regions_gdf.index)
+    assert loaded_neighbourhood.get_neighbours("UNKNOWN") == {"UNKNOWN"}
+
+
+def test_load_unsupported_version(squares_regions_gdf: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test if loading an unsupported format version raises an error."""
+    AdjacencyNeighbourhood(squares_regions_gdf).save(tmp_path)
+    config_path = tmp_path / "config.json"
+    config = json.loads(config_path.read_text())
+    config["format_version"] = 999
+    config_path.write_text(json.dumps(config))
+
+    with pytest.raises(ValueError):
+        Neighbourhood.load(tmp_path)
+
+
+def test_save_without_regions_raises(tmp_path: Path) -> None:
+    """Test if saving a neighbourhood without a defined set of regions raises an error."""
+    with pytest.raises(NotImplementedError):
+        H3Neighbourhood().save(tmp_path)
+
+
+def test_missing_direct_neighbours_raises() -> None:
+    """Test if PrecomputedNeighbourhood requires direct neighbours."""
+    with pytest.raises(ValueError):
+        PrecomputedNeighbourhood(
+            pd.Index(["a"]), {2: (np.zeros(2, dtype=np.int64), np.zeros(0, dtype=np.int64))}
+        )
@@ -0,0 +1,115 @@
+"""Tests for S2Neighbourhood."""
+
+from typing import Optional
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import s2sphere
+from shapely import geometry
+
+from srai.constants import WGS84_CRS
+from srai.neighbourhoods import S2Neighbourhood
+from srai.regionalizers import S2Regionalizer
+from srai.s2 import convert_s2_index
+
+S2_RESOLUTION = 12
+
+
+@pytest.fixture  # type: ignore
+def regions_gdf() -> gpd.GeoDataFrame:
+    """Get S2 cells covering an area with a hole."""
+    area = geometry.box(16.8, 51.0, 17.2, 51.2).difference(geometry.box(16.95, 51.07, 17.05, 51.13))
+    return S2Regionalizer(S2_RESOLUTION).transform(gpd.GeoDataFrame(geometry=[area], crs=WGS84_CRS))
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "token",
+    [
+        "47157a4",  # inside a face
+        "1",  # face cell
+        "04",  # cell in a corner of a cube face
+        "2ac",  # cell on an edge of a cube face
+        "5554",
+        "b",
+    ],
+)
+@pytest.mark.parametrize("vertex_neighbours", [True, False])  # type: ignore
+def test_neighbours_equal_to_s2sphere(token: str, vertex_neighbours: bool) -> None:
+    """Test if direct neighbours are the same as in s2sphere."""
+    cell_id = s2sphere.CellId.from_token(token)
+    expected_neighbours = (
+        cell_id.get_all_neighbors(cell_id.level())
+        if vertex_neighbours
+        else cell_id.get_edge_neighbors()
+    )
+
+    neighbours = S2Neighbourhood(vertex_neighbours=vertex_neighbours).get_neighbours(token)
+
+    assert neighbours == {neighbour.to_token() for neighbour in expected_neighbours}
+
+
+@pytest.mark.parametrize("distance", [0, 1, 2, 3])  # type: ignore
+@pytest.mark.parametrize("at_distance", [False, True])  # type: ignore
+@pytest.mark.parametrize("include_center", [None, True])  # type: ignore
+def test_batch_equal_to_single_queries(
+    distance: int,
+    at_distance: bool,
+    include_center: Optional[bool],
+    regions_gdf: gpd.GeoDataFrame,
+) -> None:
+    """Test if batch neighbours are equal to neighbours of single regions."""
+    neighbourhood = S2Neighbourhood(regions_gdf)
+    single_query = (
+        neighbourhood.get_neighbours_at_distance
+        if at_distance
+        else neighbourhood.get_neighbours_up_to_distance
+    )
+
+    neighbours = neighbourhood.get_neighbours_batch(
+        regions_gdf.index, distance, at_distance=at_distance, include_center=include_center
+    )
+
+    for row, index in enumerate(regions_gdf.index):
+        row_neighbours = neighbours.indices[neighbours.indptr[row] : neighbours.indptr[row + 1]]
+        found_neighbours = set(neighbours.index[row_neighbours])
+        assert found_neighbours == single_query(index, distance, include_center=include_center)
+        assert found_neighbours.issubset(regions_gdf.index)
+
+
+def test_int64_index(regions_gdf: gpd.GeoDataFrame) -> None:
+    """Test if neighbours of int64 cells are the same as of tokens."""
+    int64_index = convert_s2_index(regions_gdf.index, "int64")
+    neighbourhood = S2Neighbourhood(regions_gdf.set_axis(int64_index))
+
+    adjacency = neighbourhood.adjacency_matrix(distance=2)
+    tokens_adjacency = S2Neighbourhood(regions_gdf).adjacency_matrix(distance=2)
+
+    assert adjacency.index.dtype == np.int64
+    assert convert_s2_index(adjacency.index, "str").equals(tokens_adjacency.index)
+    assert (adjacency.indptr == tokens_adjacency.indptr).all()
+    assert (adjacency.indices == tokens_adjacency.indices).all()
+    assert neighbourhood.get_neighbours(int64_index[0]) == set(
+        convert_s2_index(
+            list(S2Neighbourhood(regions_gdf).get_neighbours(regions_gdf.index[0])), "int64"
+        )
+    )
+
+
+def test_adjacency_matrix(regions_gdf: gpd.GeoDataFrame) -> None:
+    """Test if adjacency matrix contains all the regions as rows."""
+    adjacency = S2Neighbourhood(regions_gdf).adjacency_matrix()
+
+    assert set(adjacency.index) == set(regions_gdf.index)
+    assert len(adjacency.indptr) == len(regions_gdf) + 1
+
+
+def test_adjacency_matrix_without_regions() -> None:
+    """Test if adjacency matrix requires the regions."""
+    with pytest.raises(NotImplementedError):
+        S2Neighbourhood().adjacency_matrix()
+
+
+def test_negative_distance() -> None:
+    """Test if there are no neighbours at negative distances."""
+    assert S2Neighbourhood().get_neighbours_up_to_distance("47157a4", -1) == set()
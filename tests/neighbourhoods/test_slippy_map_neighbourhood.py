@@ -0,0 +1,118 @@
+"""Tests for SlippyMapNeighbourhood."""
+
+from typing import Optional
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely import geometry
+
+from srai.constants import WGS84_CRS
+from srai.neighbourhoods import AdjacencyNeighbourhood, SlippyMapNeighbourhood
+from srai.regionalizers import SlippyMapRegionalizer
+
+ZOOM = 12
+
+
+@pytest.fixture  # type: ignore
+def tiles_gdf() -> gpd.GeoDataFrame:
+    """Get Slippy map tiles covering an area with a hole."""
+    area = geometry.box(16.8, 51.0, 17.2, 51.2).difference(geometry.box(16.95, 51.07, 17.05, 51.13))
+    return SlippyMapRegionalizer(zoom=ZOOM).transform(
+        gpd.GeoDataFrame(geometry=[area], crs=WGS84_CRS)
+    )
+
+
+def test_direct_neighbours_equal_to_adjacency(tiles_gdf: gpd.GeoDataFrame) -> None:
+    """Test if direct neighbours are the tiles touching each other."""
+    neighbourhood = SlippyMapNeighbourhood(tiles_gdf)
+    adjacency_neighbourhood = AdjacencyNeighbourhood(tiles_gdf)
+
+    for index in tiles_gdf.index:
+        assert neighbourhood.get_neighbours(index) == adjacency_neighbourhood.get_neighbours(index)
+
+
+@pytest.mark.parametrize("distance", [0, 1, 2, 3])  # type: ignore
+@pytest.mark.parametrize("at_distance", [False, True])  # type: ignore
+@pytest.mark.parametrize("include_center", [None, True])  # type: ignore
+def test_batch_equal_to_single_queries(
+    distance: int,
+    at_distance: bool,
+    include_center: Optional[bool],
+    tiles_gdf: gpd.GeoDataFrame,
+) -> None:
+    """Test if batch neighbours are equal to neighbours of single tiles."""
+    neighbourhood = SlippyMapNeighbourhood(tiles_gdf)
+    single_query = (
+        neighbourhood.get_neighbours_at_distance
+        if at_distance
+        else neighbourhood.get_neighbours_up_to_distance
+    )
+
+    neighbours = neighbourhood.get_neighbours_batch(
+        tiles_gdf.index, distance, at_distance=at_distance, include_center=include_center
+    )
+
+    for row, index in enumerate(tiles_gdf.index):
+        row_neighbours = neighbours.indices[neighbours.indptr[row] : neighbours.indptr[row + 1]]
+        assert set(neighbours.index[row_neighbours]) == single_query(
+            index, distance, include_center=include_center
+        )
+
+
+def test_neighbours_without_regions() -> None:
+    """Test if rings of tiles are squares clipped to the edges of the map."""
+    neighbourhood = SlippyMapNeighbourhood()
+
+    assert neighbourhood.get_neighbours_at_distance("10_20_5", 2) == {
+        f"{x}_{y}_5"
+        for x in range(8, 13)
+        for y in range(18, 23)
+        if max(abs(x - 10), abs(y - 20)) == 2
+    }
+    assert neighbourhood.get_neighbours("0_0_1") == {"1_0_1", "0_1_1", "1_1_1"}
+    assert neighbourhood.get_neighbours_up_to_distance("0_0_0", 3) == set()
+    assert neighbourhood.get_neighbours_up_to_distance("3_3_2", 1, include_center=True) == {
+        "2_2_2",
+        "2_3_2",
+        "3_2_2",
+        "3_3_2",
+    }
+    assert neighbourhood.get_neighbours("3_3_2", include_center=False) == {
+        "2_2_2",
+        "2_3_2",
+        "3_2_2",
+    }
+    assert neighbourhood.get_neighbours_up_to_distance("3_3_2", -1) == set()
+
+
+def test_adjacency_matrix(tiles_gdf: gpd.GeoDataFrame) -> None:
+    """Test if adjacency matrix contains all the regions as rows."""
+    adjacency = SlippyMapNeighbourhood(tiles_gdf).adjacency_matrix()
+
+    assert set(adjacency.index) == set(tiles_gdf.index)
+    assert len(adjacency.indptr) == len(tiles_gdf) + 1
+    for row, index in enumerate(adjacency.index):
+        x, y, _ = map(int, index.split("_"))
+        for neighbour in adjacency.index[
+            adjacency.indices[adjacency.indptr[row] : adjacency.indptr[row + 1]]
+        ]:
+            neighbour_x, neighbour_y, _ = map(int, neighbour.split("_"))
+            assert max(abs(neighbour_x - x), abs(neighbour_y - y)) == 1
+
+
+def test_adjacency_matrix_without_regions() -> None:
+    """Test if adjacency matrix requires the regions."""
+    with pytest.raises(NotImplementedError):
+        SlippyMapNeighbourhood().adjacency_matrix()
+
+
+def test_neighbours_tiles() -> None:
+    """Test if neighbours are returned for arrays of tiles."""
+    offsets, x, y, zoom = SlippyMapNeighbourhood().get_neighbours_tiles(
+        np.array([0, 5]), np.array([0, 5]), np.array([1, 3]), 1
+    )
+
+    assert offsets.tolist() == [0, 3, 11]
+    assert set(zip(x[:3], y[:3])) == {(1, 0), (0, 1), (1, 1)}
+    assert (zoom == [1, 1, 1, 3, 3, 3, 3, 3, 3, 3, 3]).all()
@@ -1,19 +1,22 @@
 """Tests for H3Regionalizer."""
 
 from contextlib import nullcontext as does_not_raise
-from typing import TYPE_CHECKING, Any
+from math import ceil
+from pathlib import Path
+from typing import Any, Literal
 from unittest import TestCase
 
+import geopandas as gpd
+import h3
+import numpy as np
+import pandas as pd
 import pytest
 
 from srai.constants import GEOMETRY_COLUMN
+from srai.h3 import convert_h3_index, get_compacted_h3_parents, uncompact_h3_cells
 from srai.regionalizers import H3Regionalizer
 from srai.regionalizers.geocode import geocode_to_region_gdf
 
-if TYPE_CHECKING:  # pragma: no cover
-    import geopandas as gpd
-
-
 ut = TestCase()
 H3_RESOLUTION = 3
 
@@ -78,3 +81,121 @@ def test_wroclaw_edge_case() -> None:
     edge_region_id = "881e2050bdfffff"
 
     assert edge_region_id in regions_gdf.index, "Edge cell is not in the regions."
+
+
+@pytest.mark.parametrize("buffer", [True, False])  # type: ignore
+def test_transform_uint64_index(
+    buffer: bool, gdf_polygons: gpd.GeoDataFrame, expected_h3_indexes: list[str]
+) -> None:
+    """Test if uint64 index contains the same cells as the string index."""
+    gdf_h3 = H3Regionalizer(H3_RESOLUTION, buffer=buffer).transform(gdf_polygons)
+    gdf_h3_uint64 = H3Regionalizer(H3_RESOLUTION, buffer=buffer, index_dtype="uint64").transform(
+        gdf_polygons
+    )
+
+    assert gdf_h3_uint64.index.dtype == np.uint64
+    assert gdf_h3_uint64.index.name == gdf_h3.index.name
+    ut.assertCountEqual(
+        first=[h3.int_to_str(int(h3_cell)) for h3_cell in gdf_h3_uint64.index],
+        second=gdf_h3.index.to_list(),
+    )
+    assert gdf_h3_uint64.geometry.geom_equals(
+        gdf_h3.loc[convert_h3_index(gdf_h3_uint64.index, "str")].geometry.set_axis(
+            gdf_h3_uint64.index
+        )
+    ).all()
+
+
+def test_unknown_index_dtype() -> None:
+    """Test checks if unknown index dtype is disallowed."""
+    with pytest.raises(ValueError):
+        H3Regionalizer(H3_RESOLUTION, index_dtype="int")  # type: ignore
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 1_000_000])  # type: ignore
+@pytest.mark.parametrize("index_dtype", ["str", "uint64"])  # type: ignore
+def test_transform_iter(
+    batch_size: int, index_dtype: Literal["str", "uint64"], gdf_polygons: gpd.GeoDataFrame
+) -> None:
+    """Test if batches contain the same cells as the full transform."""
+    regionalizer = H3Regionalizer(H3_RESOLUTION, index_dtype=index_dtype)
+    gdf_h3 = regionalizer.transform(gdf_polygons)
+
+    batches = list(regionalizer.transform_iter(gdf_polygons, batch_size=batch_size))
+    gdf_h3_batches = pd.concat(batches)
+
+    assert all(len(batch) <= batch_size for batch in batches)
+    assert all(batch.crs == gdf_polygons.crs for batch in batches)
+    assert gdf_h3_batches.index.is_unique
+    assert gdf_h3_batches.index.dtype == gdf_h3.index.dtype
+    ut.assertCountEqual(first=gdf_h3_batches.index.to_list(), second=gdf_h3.index.to_list())
+    assert (
+        gdf_h3_batches.loc[gdf_h3.index]
+        .geometry.geom_equals_exact(gdf_h3.geometry, tolerance=1e-6)
+        .all()
+    )
+
+
+def test_transform_to_geoparquet(gdf_polygons: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    """Test if cells saved to a partitioned GeoParquet are equal to the full transform."""
+    regionalizer = H3Regionalizer(H3_RESOLUTION)
+    gdf_h3 = regionalizer.transform(gdf_polygons)
+
+    result_path = regionalizer.transform_to_geoparquet(
+        gdf_polygons, tmp_path / "h3_regions", batch_size=3
+    )
+    gdf_h3_loaded = gpd.read_parquet(result_path)
+
+    assert len(list(result_path.glob("*.parquet"))) == ceil(len(gdf_h3) / 3)
+    assert gdf_h3_loaded.crs == gdf_h3.crs
+    assert gdf_h3_loaded.index.name == gdf_h3.index.name
+    ut.assertCountEqual(first=gdf_h3_loaded.index.to_list(), second=gdf_h3.index.to_list())
+
+
+@pytest.mark.parametrize("buffer", [True, False])  # type: ignore
+@pytest.mark.parametrize("resolution", [H3_RESOLUTION, 7])  # type: ignore
+def test_multiprocessing(buffer: bool, resolution: int, gdf_multipolygon: gpd.GeoDataFrame) -> None:
+    """Test if cells filled in multiple processes are equal to the single process result."""
+    gdf_h3 = H3Regionalizer(resolution, buffer=buffer).transform(gdf_multipolygon)
+    gdf_h3_multiprocessing = H3Regionalizer(
+        resolution,
+        buffer=buffer,
+        num_of_multiprocessing_workers=2,
+        multiprocessing_activation_threshold=1,
+    ).transform(gdf_multipolygon)
+
+    assert gdf_h3_multiprocessing.index.equals(gdf_h3.index)
+    assert gdf_h3_multiprocessing.geometry.geom_equals_exact(gdf_h3.geometry, tolerance=1e-6).all()
+
+
+@pytest.mark.parametrize("index_dtype", ["str", "uint64"])  # type: ignore
+def test_compact(index_dtype: Literal["str", "uint64"], gdf_polygons: gpd.GeoDataFrame) -> None:
+    """Test if compacted cells cover the same area as the cells of a single resolution."""
+    resolution = 5
+    gdf_h3 = H3Regionalizer(resolution, index_dtype=index_dtype).transform(gdf_polygons)
+    regionalizer = H3Regionalizer(resolution, index_dtype=index_dtype, compact=True)
+    gdf_h3_compacted = regionalizer.transform(gdf_polygons)
+
+    assert len(gdf_h3_compacted) < len(gdf_h3)
+    assert gdf_h3_compacted.index.dtype == gdf_h3.index.dtype
+    ut.assertCountEqual(
+        first=uncompact_h3_cells(gdf_h3_compacted.index, resolution),
+        second=convert_h3_index(gdf_h3.index, "str").to_list(),
+    )
+
+    lazy_regions = regionalizer.transform_lazy(gdf_polygons)
+    assert lazy_regions.index.equals(gdf_h3_compacted.index)
+    points = gdf_h3.geometry.representative_point()
+    positions = lazy_regions.locate_points(points)
+    assert (positions >= 0).all()
+    assert gdf_h3_compacted.index[positions].equals(
+        convert_h3_index(
+            get_compacted_h3_parents(gdf_h3.index, gdf_h3_compacted.index), index_dtype
+        )
+    )
+
+    batches = list(regionalizer.transform_iter(gdf_polygons, batch_size=10))
+    ut.assertCountEqual(
+        first=uncompact_h3_cells(pd.concat(batches).index, resolution),
+        second=convert_h3_index(gdf_h3.index, "str").to_list(),
+    )
@@ -0,0 +1,96 @@
+"""Tests for LazyGeometryRegions."""
+
+from typing import Literal
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import Point, box
+
+from srai.constants import REGIONS_INDEX, WGS84_CRS
+from srai.regionalizers import H3Regionalizer, LazyGeometryRegions
+
+H3_RESOLUTION = 8
+
+
+@pytest.fixture  # type: ignore
+def area_gdf() -> gpd.GeoDataFrame:
+    """Get an example area in a projected CRS."""
+    return gpd.GeoDataFrame(geometry=[box(17.0, 51.0, 17.1, 51.1)], crs=WGS84_CRS).to_crs(epsg=3857)
+
+
+@pytest.mark.parametrize("index_dtype", ["str", "uint64"])  # type: ignore
+def test_h3_transform_lazy(
+    index_dtype: Literal["str", "uint64"], area_gdf: gpd.GeoDataFrame
+) -> None:
+    """Test if lazy regions materialize the same geometries as the regular transform."""
+    regionalizer = H3Regionalizer(H3_RESOLUTION, index_dtype=index_dtype)
+    regions_gdf = regionalizer.transform(area_gdf)
+    lazy_regions = regionalizer.transform_lazy(area_gdf)
+
+    assert isinstance(lazy_regions, LazyGeometryRegions)
+    assert len(lazy_regions) == len(regions_gdf)
+    assert lazy_regions.index.equals(regions_gdf.index)
+    assert lazy_regions.index.name == REGIONS_INDEX
+    assert lazy_regions.crs.equals(area_gdf.crs)
+
+    materialized_gdf = lazy_regions.to_gdf()
+    assert materialized_gdf.crs.equals(regions_gdf.crs)
+    assert materialized_gdf.geom_equals_exact(regions_gdf.geometry, tolerance=1e-6).all()
+
+    selected_index = regions_gdf.index[[5, 1, 3]]
+    assert (
+        lazy_regions.get_geometry(selected_index)
+        .geom_equals_exact(regions_gdf.geometry.loc[selected_index], tolerance=1e-6)
+        .all()
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1_000_000])  # type: ignore
+def test_iter_chunks(chunk_size: int, area_gdf: gpd.GeoDataFrame) -> None:
+    """Test if chunks cover all the regions and are bounded in size."""
+    regionalizer = H3Regionalizer(H3_RESOLUTION)
+    lazy_regions = regionalizer.transform_lazy(area_gdf)
+
+    chunks = list(lazy_regions.iter_chunks(chunk_size))
+
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert pd.concat(chunks).index.equals(lazy_regions.index)
+    with pytest.raises(ValueError):
+        next(lazy_regions.iter_chunks(0))
+
+
+def test_get_geometry_unknown_index(area_gdf: gpd.GeoDataFrame) -> None:
+    """Test if requesting geometries of unknown regions raises an error."""
+    lazy_regions = H3Regionalizer(H3_RESOLUTION).transform_lazy(area_gdf)
+
+    with pytest.raises(KeyError):
+        lazy_regions.get_geometry(["811e3ffffffffff"])
+
+
+def test_locate_points(area_gdf: gpd.GeoDataFrame) -> None:
+    """Test if points are located in the same regions as with the materialized geometries."""
+    regionalizer = H3Regionalizer(H3_RESOLUTION)
+    regions_gdf = regionalizer.transform(area_gdf).to_crs(WGS84_CRS)
+    lazy_regions = regionalizer.transform_lazy(area_gdf)
+    points = gpd.GeoSeries(
+        [Point(17.05, 51.05), Point(17.01, 51.02), Point(20.0, 50.0)], crs=WGS84_CRS
+    )
+
+    positions = lazy_regions.locate_points(points)
+
+    assert positions[2] == -1
+    for point, position in zip(points[:2], positions[:2]):
+        assert regions_gdf.geometry.iloc[position].contains(point)
+
+
+def test_locate_points_unsupported() -> None:
+    """Test if locating points without a points function raises an error."""
+    lazy_regions = LazyGeometryRegions(
+        index=pd.Index(["a"], name=REGIONS_INDEX),
+        geometry_function=lambda index: gpd.GeoSeries([box(0, 0, 1, 1)], crs=WGS84_CRS),
+    )
+
+    assert not lazy_regions.can_locate_points
+    with pytest.raises(ValueError):
+        lazy_regions.locate_points(gpd.GeoSeries([Point(0.5, 0.5)], crs=WGS84_CRS))
@@ -1,16 +1,16 @@
 """Tests for H3Regionalizer."""
 
 from contextlib import nullcontext as does_not_raise
-from typing import TYPE_CHECKING, Any
+from typing import Any, Literal
 from unittest import TestCase
 
+import geopandas as gpd
+import numpy as np
 import pytest
 
-from srai.constants import GEOMETRY_COLUMN
+from srai.constants import GEOMETRY_COLUMN, REGIONS_INDEX
 from srai.regionalizers import S2Regionalizer
-
-if TYPE_CHECKING:  # pragma: no cover
-    import geopandas as gpd
+from srai.s2 import convert_s2_index
 
 ut = TestCase()
 S2_RESOLUTION = 7
@@ -60,3 +60,62 @@ def test_transform(
 
         ut.assertCountEqual(first=gdf_s2.index.to_list(), second=s2_indexes)
         assert GEOMETRY_COLUMN in gdf_s2
+
+
+@pytest.mark.parametrize("buffer", [True, False])  # type: ignore
+def test_transform_int64_index(buffer: bool, gdf_polygons: gpd.GeoDataFrame) -> None:
+    """Test if int64 index contains the same cells as the token index."""
+    gdf_s2 = S2Regionalizer(S2_RESOLUTION, buffer=buffer).transform(gdf_polygons)
+    gdf_s2_int64 = S2Regionalizer(S2_RESOLUTION, buffer=buffer, index_dtype="int64").transform(
+        gdf_polygons
+    )
+
+    assert gdf_s2_int64.index.dtype == np.int64
+    assert gdf_s2_int64.index.name == gdf_s2.index.name == REGIONS_INDEX
+    assert convert_s2_index(gdf_s2_int64.index, "str").equals(gdf_s2.index)
+    assert gdf_s2_int64.geometry.geom_equals(gdf_s2.geometry.set_axis(gdf_s2_int64.index)).all()
+
+
+def test_unknown_index_dtype() -> None:
+    """Test checks if unknown index dtype is disallowed."""
+    with pytest.raises(ValueError):
+        S2Regionalizer(S2_RESOLUTION, index_dtype="uint64")  # type: ignore
+
+
+def test_transform_without_buffer(gdf_polygons: gpd.GeoDataFrame) -> None:
+    """Test if cells without buffer are within given geometries."""
+    resolution = 10
+    gdf_s2 = S2Regionalizer(resolution).transform(gdf_polygons)
+    gdf_s2_not_buffered = S2Regionalizer(resolution, buffer=False).transform(gdf_polygons)
+
+    assert 0 < len(gdf_s2_not_buffered) < len(gdf_s2)
+    assert gdf_s2_not_buffered.index.isin(gdf_s2.index).all()
+    assert gdf_s2_not_buffered.geometry.within(gdf_polygons.geometry.union_all()).all()
+
+
+def test_attributes_copied(gdf_polygons: gpd.GeoDataFrame) -> None:
+    """Test if attributes of the first matching geometry are copied to the cells."""
+    gdf = gdf_polygons.assign(name=[f"polygon_{i}" for i in range(len(gdf_polygons))])
+    gdf_s2 = S2Regionalizer(S2_RESOLUTION).transform(gdf)
+
+    assert "name" in gdf_s2
+    for cell_geometry, name in zip(gdf_s2.geometry, gdf_s2["name"]):
+        first_matching = gdf[gdf.intersects(cell_geometry)].iloc[0]
+        assert first_matching["name"] == name
+
+
+@pytest.mark.parametrize("index_dtype", ["str", "int64"])  # type: ignore
+def test_transform_lazy(
+    index_dtype: Literal["str", "int64"], gdf_polygons: gpd.GeoDataFrame
+) -> None:
+    """Test if lazy regions are the same as the transformed ones."""
+    regionalizer = S2Regionalizer(S2_RESOLUTION, index_dtype=index_dtype)
+    gdf_s2 = regionalizer.transform(gdf_polygons)
+    lazy_regions = regionalizer.transform_lazy(gdf_polygons)
+
+    assert lazy_regions.index.equals(gdf_s2.index)
+    assert lazy_regions.to_gdf().geometry.geom_equals(gdf_s2.geometry).all()
+
+    points = gdf_s2.geometry.representative_point()
+    positions = lazy_regions.locate_points(points)
+    assert (positions == np.arange(len(gdf_s2))).all()
@@ -4,11 +4,13 @@ from contextlib import nullcontext as does_not_raise
 from typing import Any
 
 import geopandas as gpd
+import numpy as np
 import pytest
-from shapely.geometry import Polygon
+from shapely.geometry import MultiPolygon, Polygon, box
 
 from srai.constants import WGS84_CRS
 from srai.regionalizers import SlippyMapRegionalizer
+from srai.slippy_map import get_slippy_map_index, parse_slippy_map_index
 
 ZOOM = 11
 
@@ -91,3 +93,69 @@ def test_x_y_to_coordinates_should_be_inverse_to_coordinates_to_x_y(
     # then
     assert x_reverse == x
     assert y_reverse == y
+
+
+def test_transform_equal_to_all_tiles_check(gdf: gpd.GeoDataFrame) -> None:
+    """Test if returned tiles are the tiles from the bounding box intersecting the geometry."""
+    zoom = 14
+    regionalizer = SlippyMapRegionalizer(zoom=zoom)
+    polygon = gdf.geometry.iloc[0]
+    x_start, y_start = regionalizer._coordinates_to_x_y(polygon.bounds[3], polygon.bounds[0])
+    x_end, y_end = regionalizer._coordinates_to_x_y(polygon.bounds[1], polygon.bounds[2])
+
+    expected_ids = []
+    for x in range(x_start, x_end + 1):
+        for y in range(y_start, y_end + 1):
+            north, west = regionalizer._x_y_to_coordinates(x, y)
+            south, east = regionalizer._x_y_to_coordinates(x + 1, y + 1)
+            if box(west, south, east, north).intersects(polygon):
+                expected_ids.append(f"{x}_{y}_{zoom}")
+
+    regions = regionalizer.transform(gdf)
+
+    assert regions.index.to_list() == expected_ids
+
+
+def test_transform_deduplicates_tiles(gdf: gpd.GeoDataFrame) -> None:
+    """Test if tiles shared by many geometries are returned once."""
+    polygon = gdf.geometry.iloc[0]
+    shifted_polygon = Polygon([(x + 0.01, y) for x, y in polygon.exterior.coords])
+    multipolygon_gdf = gpd.GeoDataFrame(
+        geometry=[MultiPolygon([polygon, shifted_polygon]), polygon], crs=WGS84_CRS
+    )
+    regionalizer = SlippyMapRegionalizer(zoom=ZOOM)
+
+    regions = regionalizer.transform(multipolygon_gdf)
+
+    assert regions.index.is_unique
+    assert set(regionalizer.transform(gdf).index).issubset(regions.index)
+
+
+def test_transform_lazy(regionalizer: SlippyMapRegionalizer, gdf: gpd.GeoDataFrame) -> None:
+    """Test if lazy regions are the same as the transformed ones."""
+    regions = regionalizer.transform(gdf)
+    lazy_regions = regionalizer.transform_lazy(gdf)
+
+    assert lazy_regions.index.equals(regions.index)
+    assert lazy_regions.to_gdf().geometry.geom_equals(regions.geometry).all()
+
+    points = regions.geometry.representative_point()
+    assert (lazy_regions.locate_points(points) == np.arange(len(regions))).all()
+
+
+def test_slippy_map_index_round_trip() -> None:
+    """Test if tiles identifiers are parsed back into x, y and zoom."""
+    index = get_slippy_map_index([1120, 0], [683, 1], [ZOOM, 1])
+
+    assert index.to_list() == [f"1120_683_{ZOOM}", "0_1_1"]
+    x, y, z = parse_slippy_map_index(index)
+    assert x.tolist() == [1120, 0]
+    assert y.tolist() == [683, 1]
+    assert z.tolist() == [ZOOM, 1]
+
+
+@pytest.mark.parametrize("tile_id", ["1120_683", "1120_683_11_1", "a_683_11"])  # type: ignore
+def test_slippy_map_index_wrong_format(tile_id: str) -> None:
+    """Test if identifiers in a wrong format are disallowed."""
+    with pytest.raises(ValueError):
+        parse_slippy_map_index([tile_id])
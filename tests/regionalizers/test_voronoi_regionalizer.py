@@ -9,13 +9,15 @@ import pytest
 from pymap3d import Ellipsoid
 from shapely.geometry import Point, Polygon
 
+from srai._multiprocessing import (
+    parse_multiprocessing_activation_threshold,
+    parse_num_of_multiprocessing_workers,
+)
 from srai.constants import GEOMETRY_COLUMN, REGIONS_INDEX, WGS84_CRS
 from srai.geometry import merge_disjointed_gdf_geometries
 from srai.regionalizers import VoronoiRegionalizer
 from srai.regionalizers._spherical_voronoi import (
     _map_from_geocentric,
-    _parse_multiprocessing_activation_threshold,
-    _parse_num_of_multiprocessing_workers,
     generate_voronoi_regions,
 )
 
@@ -129,7 +131,7 @@ def test_num_of_multiprocessing_workers(
 ) -> None:
     """Test checks if number of workers is parsed correctly."""
     assert (
-        _parse_num_of_multiprocessing_workers(num_of_multiprocessing_workers)
+        parse_num_of_multiprocessing_workers(num_of_multiprocessing_workers)
         == expected_num_of_multiprocessing_workers
     )
 
@@ -151,7 +153,7 @@ def test_multiprocessing_activation_threshold(
 ) -> None:
     """Test checks if multiprocessing activation threshold is parsed correctly."""
     assert (
-        _parse_multiprocessing_activation_threshold(multiprocessing_activation_threshold)
+        parse_multiprocessing_activation_threshold(multiprocessing_activation_threshold, 100)
         == expected_multiprocessing_activation_threshold
     )
 
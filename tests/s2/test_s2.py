@@ -0,0 +1,185 @@
+"""S2 conversion tests."""
+
+from typing import Any
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import s2sphere
+from shapely.geometry import Point, Polygon, box
+
+from srai.constants import WGS84_CRS
+from srai.s2 import (
+    convert_s2_index,
+    get_s2_disks,
+    points_to_s2,
+    s2_to_geoseries,
+    shapely_geometry_to_s2,
+)
+
+
+def _s2sphere_covering_tokens(geometry: Polygon, level: int) -> set[str]:
+    """Get tokens of cells intersecting the geometry, checked against s2sphere vertices."""
+    min_x, min_y, max_x, max_y = geometry.bounds
+    region = s2sphere.LatLngRect(
+        s2sphere.LatLng.from_degrees(min_y, min_x), s2sphere.LatLng.from_degrees(max_y, max_x)
+    )
+    coverer = s2sphere.RegionCoverer()
+    coverer.min_level = level
+    coverer.max_level = level
+    coverer.max_cells = 10_000
+    tokens = set()
+    for cell_id in coverer.get_covering(region):
+        cell = s2sphere.Cell(cell_id)
+        vertices = [s2sphere.LatLng.from_point(cell.get_vertex(v)) for v in range(4)]
+        polygon = Polygon([(v.lng().degrees, v.lat().degrees) for v in vertices])
+        if polygon.intersects(geometry):
+            tokens.add(cell_id.to_token())
+    return tokens
+
+
+@pytest.mark.parametrize("level", [4, 10, 17, 30])  # type: ignore
+def test_points_equal_to_s2sphere(level: int) -> None:
+    """Test that points are assigned to the same cells as in s2sphere."""
+    rng = np.random.default_rng(0)
+    lngs = rng.uniform(-180, 180, 500)
+    lats = rng.uniform(-90, 90, 500)
+    points = gpd.GeoSeries(gpd.points_from_xy(lngs, lats), crs=WGS84_CRS)
+
+    expected = [
+        s2sphere.CellId.from_lat_lng(s2sphere.LatLng.from_degrees(lat, lng))
+        .parent(level)
+        .to_token()
+        for lng, lat in zip(lngs, lats)
+    ]
+
+    assert points_to_s2(points, level) == expected
+    assert convert_s2_index(points_to_s2(points, level, return_type="int64"), "str").to_list() == (
+        expected
+    )
+
+
+@pytest.mark.parametrize("token", ["0555c", "1aaac", "89c259", "3fe4", "b"])  # type: ignore
+def test_cell_vertices_equal_to_s2sphere(token: str) -> None:
+    """Test that cell polygons have the same vertices as in s2sphere."""
+    cell = s2sphere.Cell(s2sphere.CellId.from_token(token))
+    expected = [
+        (lat_lng.lng().degrees, lat_lng.lat().degrees)
+        for lat_lng in (s2sphere.LatLng.from_point(cell.get_vertex(v)) for v in range(4))
+    ]
+
+    (polygon,) = s2_to_geoseries([token])
+
+    np.testing.assert_allclose(np.array(polygon.exterior.coords)[:4], expected, atol=1e-9)
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "geometry,level",
+    [
+        (box(16.9, 51.0, 17.2, 51.2), 12),
+        (box(-0.5, -0.5, 0.5, 0.5), 9),
+        (box(100, -40, 140, -10), 5),
+    ],
+)
+def test_covering_equal_to_s2sphere(geometry: Polygon, level: int) -> None:
+    """Test that covering contains the same cells as a covering checked in s2sphere."""
+    assert set(shapely_geometry_to_s2(geometry, level)) == _s2sphere_covering_tokens(
+        geometry, level
+    )
+
+
+def test_covering_without_buffer() -> None:
+    """Test that cells without buffer are within the geometry."""
+    geometry = box(16.9, 51.0, 17.2, 51.2)
+    buffered = shapely_geometry_to_s2(geometry, 12)
+    not_buffered = shapely_geometry_to_s2(geometry, 12, buffer=False)
+
+    assert 0 < len(not_buffered) < len(buffered)
+    assert set(not_buffered).issubset(buffered)
+    assert s2_to_geoseries(not_buffered).within(geometry).all()
+
+
+def test_covering_with_hole() -> None:
+    """Test that cells within polygon holes are skipped."""
+    outer = box(16.0, 51.0, 18.0, 52.0)
+    hole = box(16.5, 51.25, 17.5, 51.75)
+    geometry = outer.difference(hole)
+
+    cells = s2_to_geoseries(shapely_geometry_to_s2(geometry, 10))
+
+    assert cells.intersects(geometry).all()
+    assert not cells.within(hole).any()
+    assert len(cells) < len(shapely_geometry_to_s2(outer, 10))
+
+
+def test_covering_int64() -> None:
+    """Test that int64 covering is the same as the token covering."""
+    geometry = box(16.9, 51.0, 17.2, 51.2)
+    tokens = shapely_geometry_to_s2(geometry, 12)
+    ids = shapely_geometry_to_s2(geometry, 12, return_type="int64")
+
+    assert ids.dtype == np.int64
+    assert convert_s2_index(ids, "str").to_list() == tokens
+    assert convert_s2_index(tokens, "int64").to_list() == ids.tolist()
+
+
+def test_geoseries_from_int64() -> None:
+    """Test that geometries are the same for tokens and int64 ids."""
+    tokens = ["0555c", "89c259", "b"]
+    ids = convert_s2_index(tokens, "int64")
+
+    assert s2_to_geoseries(tokens).geom_equals(s2_to_geoseries(ids)).all()
+    assert s2_to_geoseries(ids).crs == WGS84_CRS
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "kwargs",
+    [
+        {"s2_resolution": -1},
+        {"s2_resolution": 31},
+        {"s2_resolution": 5, "return_type": "uint64"},
+    ],
+)
+def test_wrong_parameters(kwargs: dict[str, Any]) -> None:
+    """Test checks of parameters."""
+    with pytest.raises(ValueError):
+        shapely_geometry_to_s2(Point(17, 51), **kwargs)
+
+
+@pytest.mark.parametrize("distance", [0, 1, 3])  # type: ignore
+@pytest.mark.parametrize("vertex_neighbours", [True, False])  # type: ignore
+def test_disks_equal_to_s2sphere_search(distance: int, vertex_neighbours: bool) -> None:
+    """Test if disks are the same as a breadth-first search over s2sphere neighbours."""
+    tokens = ["47157a4", "1", "04", "2ac", "5554", "b", "89c259", "0555c"]
+
+    offsets, s2_cells, distances = get_s2_disks(tokens, distance, vertex_neighbours)
+
+    assert len(offsets) == len(tokens) + 1
+    for row, token in enumerate(tokens):
+        expected_distances = {token: 0}
+        frontier = [s2sphere.CellId.from_token(token)]
+        for current_distance in range(1, distance + 1):
+            next_frontier = []
+            for cell_id in frontier:
+                neighbours = (
+                    cell_id.get_all_neighbors(cell_id.level())
+                    if vertex_neighbours
+                    else cell_id.get_edge_neighbors()
+                )
+                for neighbour in neighbours:
+                    if neighbour.to_token() not in expected_distances:
+                        expected_distances[neighbour.to_token()] = current_distance
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+
+        row_cells = convert_s2_index(s2_cells[offsets[row] : offsets[row + 1]], "str")
+        row_distances = distances[offsets[row] : offsets[row + 1]]
+        assert dict(zip(row_cells, row_distances.tolist())) == expected_distances
+        assert len(row_cells) == len(expected_distances)
+        assert (np.diff(row_distances) >= 0).all()
+
+
+def test_disks_negative_distance() -> None:
+    """Test if negative distance is disallowed."""
+    with pytest.raises(ValueError):
+        get_s2_disks(["47157a4"], -1)